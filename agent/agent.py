@@ -1,19 +1,49 @@
 #!/usr/bin/env python3
 """Generic Agent Framework - auto-discovers and loads skills."""
 
+import concurrent.futures
+import importlib.util
 import json
 import os
 import sys
+import threading
+import time
 from itertools import cycle
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from anthropic import Anthropic
+from anthropic import Anthropic, APITimeoutError
 
 # Import tools dynamically
-from mcp_server.tools import fields, circuits, materials, converters
+from mcp_server.tools import fields, circuits, materials, converters, batch, wire_paths, loops, field_store, reluctance_network, material_store, inductor_design, tolerance, core_loss
 from agent.knowledge_base import KnowledgeBase
+from agent.answer_cache import SemanticAnswerCache
+from agent.fast_path import FastPathRouter
+from agent.model_router import ModelRouter, parse_routing_config
+from agent.tool_selector import ToolSelector, parse_use_case_table
+from agent.mcp_pool import MCPWorkerPool
+from agent.remote_knowledge import RemoteKnowledgeBase
+from agent.hot_reload import SkillFileWatcher
+from agent.skill_router import LoadedSkill, SkillRouter
+from agent import tool_plan
+
+
+SKILLS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "skills")
+
+FINAL_ANSWER_INSTRUCTION = (
+    "Stop calling tools. Give your best final answer now using only the "
+    "tool results above, and say briefly if anything is left unresolved."
+)
+
+
+def _is_error_result(content: str) -> bool:
+    """Whether a tool result's JSON content reports an error."""
+    try:
+        result = json.loads(content)
+    except (TypeError, ValueError):
+        return False
+    return isinstance(result, dict) and "error" in result
 
 
 class ThinkingSpinner:
@@ -36,15 +66,53 @@ class ThinkingSpinner:
 class SkillAgent:
     """Generic agent that auto-discovers and loads skills."""
 
-    def __init__(self, skill_name: str = None):
+    def __init__(
+        self,
+        skill_name: str = None,
+        enable_answer_cache: bool = True,
+        enable_fast_path: bool = True,
+        model_routing: dict = None,
+        latency_budget_s: float = None,
+        max_tool_rounds: int = 10,
+        tool_workers: int = 4,
+        enable_tool_selection: bool = True,
+        mcp_workers: int = 0,
+        knowledge_url: str = None,
+        hot_reload: bool = False,
+        reload_check_interval_s: float = 2.0,
+        skills: list = None,
+    ):
         """
         Initialize agent with a specific skill or auto-discover.
 
         Args:
             skill_name: Name of the skill directory. If None, uses first available skill.
+            enable_answer_cache: Reuse final answers for semantically equivalent
+                questions (requires knowledge base embeddings).
+            enable_fast_path: Answer simple single-tool requests locally
+                without calling the model.
+            model_routing: ModelRouter settings (e.g. {"fast_model": ...}),
+                overriding the skill.md "## Model Routing" section.
+            latency_budget_s: Default wall-time budget per request in seconds
+                (None for no limit)
+            max_tool_rounds: Default maximum number of tool-call rounds per request
+            tool_workers: Threads used to run a response's tool calls concurrently
+            enable_tool_selection: Send only the tools relevant to each request
+                (requires knowledge base embeddings).
+            mcp_workers: Run tools on this many persistent mcp_server
+                subprocesses instead of in-process (0 for in-process).
+            knowledge_url: Streamable HTTP URL of a running MCP server whose
+                shared knowledge service replaces the local KnowledgeBase
+                (e.g. "http://127.0.0.1:8000/mcp/").
+            hot_reload: Before each request, pick up edits to skill.md and
+                knowledge documents without restarting.
+            reload_check_interval_s: Minimum seconds between file checks
+            skills: Load several skills (names from skills/) into this agent.
+                Each request then gets the tools, skill.md, and knowledge of
+                only the skills routed to it. The primary skill (skill_name,
+                or the first listed) supplies model routing and the fast path.
         """
         self.client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-6"
 
         # Discover available skills
         self.available_skills = self._discover_skills()
@@ -53,6 +121,8 @@ class SkillAgent:
             raise RuntimeError(f"No skills found in skills/ directory")
 
         # Use provided skill or default to first
+        if skill_name is None and skills:
+            skill_name = skills[0]
         if skill_name is None:
             self.skill_name = self.available_skills[0]
         else:
@@ -62,29 +132,81 @@ class SkillAgent:
                 )
             self.skill_name = skill_name
 
-        self.skill_dir = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            "skills",
-            self.skill_name,
-        )
+        self.skill_dir = os.path.join(SKILLS_DIR, self.skill_name)
         self.skill_md = self._load_skill_md()
         self.tools = self._setup_tools()
-        self.knowledge_base = KnowledgeBase(self.skill_dir)
+
+        # Route tool-dispatch iterations and simple queries to a faster model
+        routing_config = parse_routing_config(self.skill_md)
+        routing_config.update(model_routing or {})
+        self.model_router = ModelRouter(**routing_config)
+        self.model = self.model_router.strong_model
+
+        # Bounded tail latency: per-request budget and tool-round cap
+        self.latency_budget_s = latency_budget_s
+        self.max_tool_rounds = max_tool_rounds
+        self.final_answer_reserve_s = 5.0
+        self.min_final_answer_s = 1.0
+        self._tool_workers = tool_workers
+        self._tool_executor_lock = threading.Lock()
+        self._tool_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=tool_workers, thread_name_prefix="tool"
+        )
+        if knowledge_url:
+            # Shared index and embedding model served by one long-running server
+            self.knowledge_base = RemoteKnowledgeBase(knowledge_url, skill_name=self.skill_name)
+        else:
+            self.knowledge_base = KnowledgeBase(self.skill_dir)
+
+        # Optional tool backend: long-lived MCP server workers (tools scale across cores)
+        self.mcp_pool = None
+        if mcp_workers:
+            self.mcp_pool = MCPWorkerPool(size=mcp_workers).start()
+
+        # Local intent parser for simple requests (e.g. unit conversions)
+        self.fast_path = None
+        if enable_fast_path:
+            self.fast_path = FastPathRouter(self.tools, self.skill_md, self.call_tool)
+
+        # Semantic cache of final answers, keyed by question embedding
+        self.answer_cache = None
+        if enable_answer_cache and self.knowledge_base.available:
+            self.answer_cache = SemanticAnswerCache(self.knowledge_base.embed)
+
+        # Per-request tool subset, chosen by description embeddings
+        self.tool_selector = None
+        if enable_tool_selection and self.knowledge_base.available:
+            self.tool_selector = ToolSelector(
+                self.tools, self.skill_md, self.knowledge_base.embed, always_include=("run_plan",)
+            )
+
+        # Pick up skill.md and knowledge edits between requests
+        self._model_routing = model_routing or {}
+        self._enable_fast_path = enable_fast_path
+        self._reload_lock = threading.Lock()
+        self.skill_watcher = None
+        if hot_reload:
+            self.skill_watcher = SkillFileWatcher(self.skill_dir, min_interval_s=reload_check_interval_s)
+
+        # Several skills in one process, routed per request by their headers
+        self.skills = {}
+        self.skill_router = None
+        self._skill_tool_owners = {}
+        self._skill_tool_functions = {}
+        if skills and set(skills) != {self.skill_name}:
+            if hot_reload:
+                raise ValueError("hot_reload is only supported for a single skill")
+            self._load_skills(skills, knowledge_url, enable_tool_selection)
 
     @staticmethod
     def _discover_skills() -> list:
         """Discover all available skills in skills/ directory."""
-        skills_dir = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            "skills",
-        )
-
-        if not os.path.exists(skills_dir):
+        if not os.path.exists(SKILLS_DIR):
             return []
 
         skills = []
-        for item in os.listdir(skills_dir):
-            skill_path = os.path.join(skills_dir, item)
+        for item in os.listdir(SKILLS_DIR):
+            skill_path = os.path.join(SKILLS_DIR, item)
             # Check if it's a directory with a skill.md file
             if os.path.isdir(skill_path):
                 skill_file = os.path.join(skill_path, "skill.md")
@@ -93,19 +215,96 @@ class SkillAgent:
 
         return sorted(skills)
 
-    def _load_skill_md(self) -> str:
-        """Load skill definition from skill.md file."""
-        skill_path = os.path.join(self.skill_dir, "skill.md")
+    def _load_skill_md(self, skill_dir: str = None) -> str:
+        """Load skill definition from skill.md file (of this agent's skill, or the given skill directory)."""
+        skill_path = os.path.join(self.skill_dir if skill_dir is None else skill_dir, "skill.md")
         try:
             with open(skill_path, "r") as f:
                 return f.read()
         except FileNotFoundError:
             return f"Skill '{self.skill_name}' not found at {skill_path}"
 
-    def _parse_tools_from_skill_md(self) -> list:
-        """Parse tool definitions from the skill.md file."""
+    def _load_skills(self, skill_names: list, knowledge_url: str, enable_tool_selection: bool) -> None:
+        """
+        Load additional skills next to the primary one and set up the skill router.
+
+        Every skill keeps its own tools, knowledge collection, and tool
+        selector; one embedding model is shared by all of them. Tools that
+        only an added skill defines are run from that skill's tools.py.
+
+        Args:
+            skill_names: Skills to load (the primary skill is added if missing)
+            knowledge_url: Shared knowledge service URL, or None for local knowledge bases
+            enable_tool_selection: Build a tool selector for each skill
+        """
+        for name in skill_names:
+            if name not in self.available_skills:
+                raise ValueError(
+                    f"Skill '{name}' not found. Available: {', '.join(self.available_skills)}"
+                )
+
+        self.skills[self.skill_name] = LoadedSkill(
+            self.skill_name, self.skill_dir, self.skill_md, self.tools, self.knowledge_base, self.tool_selector
+        )
+        for name in skill_names:
+            if name in self.skills:
+                continue
+            skill_dir = os.path.join(SKILLS_DIR, name)
+            skill_md = self._load_skill_md(skill_dir)
+            tools = self._parse_tools_from_skill_md(skill_md)
+            if knowledge_url:
+                knowledge_base = RemoteKnowledgeBase(knowledge_url, skill_name=name)
+            else:
+                knowledge_base = KnowledgeBase(
+                    skill_dir, embedding_function=getattr(self.knowledge_base, "embedding_function", None)
+                )
+            tool_selector = None
+            if enable_tool_selection and self.knowledge_base.available:
+                tool_selector = ToolSelector(tools, skill_md, self.knowledge_base.embed, always_include=("run_plan",))
+            self.skills[name] = LoadedSkill(name, skill_dir, skill_md, tools, knowledge_base, tool_selector)
+
+        # Every tool any skill defines (tool names are global; the first skill wins)
+        tools_by_name = {}
+        for skill in self.skills.values():
+            for tool in skill.tools:
+                if tool["name"] not in tools_by_name and skill.name != self.skill_name:
+                    self._skill_tool_owners[tool["name"]] = skill.name
+                tools_by_name.setdefault(tool["name"], tool)
+        self.tools = list(tools_by_name.values())
+        for name in set(self._skill_tool_owners.values()):
+            self._skill_tool_functions.update(self._load_skill_tool_functions(name, self.skills[name].skill_dir))
+
+        self.skill_router = SkillRouter(
+            {name: skill.skill_md for name, skill in self.skills.items()}, self.knowledge_base.embed
+        )
+
+    @staticmethod
+    def _load_skill_tool_functions(skill_name: str, skill_dir: str) -> dict:
+        """
+        Import a skill's tools.py, whose functions are named after the tools it implements.
+
+        Args:
+            skill_name: Skill name (used for the module name)
+            skill_dir: Skill directory
+
+        Returns:
+            Mapping of function name to function (empty if the skill has no tools.py)
+        """
+        path = os.path.join(skill_dir, "tools.py")
+        if not os.path.exists(path):
+            return {}
+        spec = importlib.util.spec_from_file_location(f"skill_tools_{skill_name}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return {
+            name: value for name, value in vars(module).items()
+            if callable(value) and not name.startswith("_")
+        }
+
+    def _parse_tools_from_skill_md(self, skill_md: str = None) -> list:
+        """Parse tool definitions from the skill.md file (or the given skill.md text)."""
         tools = []
-        lines = self.skill_md.split("\n")
+        lines = (self.skill_md if skill_md is None else skill_md).split("\n")
         in_tool_section = False
         i = 0
 
@@ -236,7 +435,11 @@ class SkillAgent:
 
                         # Map type strings to JSON schema types
                         json_type = "number"
-                        if "int" in type_str:
+                        if "list" in type_str or "array" in type_str:
+                            json_type = "array"
+                        elif "object" in type_str or "dict" in type_str:
+                            json_type = "object"
+                        elif "int" in type_str:
                             json_type = "integer"
                         elif "str" in type_str or "string" in type_str:
                             json_type = "string"
@@ -247,8 +450,9 @@ class SkillAgent:
                             "type": json_type,
                             "description": name.replace("_", " ")
                         }
-                        # All parameters are required unless specified otherwise
-                        schema["required"].append(name)
+                        # All parameters are required unless marked optional or given a default
+                        if "default" not in type_str and "optional" not in type_str:
+                            schema["required"].append(name)
 
                 break
 
@@ -258,8 +462,127 @@ class SkillAgent:
         """Set up tool definitions by parsing from skill.md."""
         return self._parse_tools_from_skill_md()
 
-    def call_tool(self, tool_name: str, tool_input: dict) -> str:
-        """Execute a tool and return the result."""
+    def reload_skill(self) -> bool:
+        """
+        Re-read skill.md and swap in its tools, prompt, and routing settings.
+
+        Everything is rebuilt before anything is replaced, so a request never
+        sees a mix of old and new definitions. Tool descriptions are embedded
+        again only if the tools or the Use Case Decision Table changed. An
+        invalid skill.md is reported and the previous definition kept.
+
+        Returns:
+            True if a new skill.md was loaded
+        """
+        skill_md = self._load_skill_md()
+        if skill_md == self.skill_md:
+            return False
+        try:
+            tools = self._parse_tools_from_skill_md(skill_md)
+        except ValueError as e:
+            print(f"Warning: Keeping previous skill.md: {e}")
+            return False
+
+        fast_path = FastPathRouter(tools, skill_md, self.call_tool) if self._enable_fast_path else None
+        tool_selector = self.tool_selector
+        if tool_selector is not None and (
+            tools != self.tools or parse_use_case_table(skill_md) != parse_use_case_table(self.skill_md)
+        ):
+            tool_selector = ToolSelector(tools, skill_md, self.knowledge_base.embed, always_include=("run_plan",))
+        routing_config = parse_routing_config(skill_md)
+        routing_config.update(self._model_routing)
+        model_router = self.model_router.reconfigured(**routing_config)
+
+        self.skill_md, self.tools = skill_md, tools
+        self.fast_path, self.tool_selector = fast_path, tool_selector
+        # One reference swap, so a request never sees half the new routing settings
+        self.model_router = model_router
+        self.model = model_router.strong_model
+
+        # Cached answers may rest on the old skill definition
+        if self.answer_cache is not None:
+            self.answer_cache.clear()
+        return True
+
+    def reload_knowledge(self) -> dict:
+        """
+        Re-index changed knowledge documents (only modified chunks are re-embedded).
+
+        Returns:
+            Chunk counts from KnowledgeBase.sync_documents (empty for a remote
+            knowledge base, whose index the server owns)
+        """
+        sync_documents = getattr(self.knowledge_base, "sync_documents", None)
+        if sync_documents is None:
+            return {}
+        counts = sync_documents()
+        if self.answer_cache is not None and (counts["added"] or counts["updated"] or counts["removed"]):
+            self.answer_cache.clear()
+        return counts
+
+    def check_for_updates(self, force: bool = False) -> dict:
+        """
+        Reload skill.md and knowledge documents if they changed on disk.
+
+        Called before each request when hot reload is enabled.
+
+        Args:
+            force: Check the files even if the check interval has not passed
+
+        Returns:
+            Dictionary describing what was reloaded (empty if nothing changed)
+        """
+        if self.skill_watcher is None:
+            return {}
+        # One reload at a time; concurrent requests keep using the current state
+        if not self._reload_lock.acquire(blocking=False):
+            return {}
+        try:
+            changes = self.skill_watcher.poll(force=force)
+            reloaded = {}
+            if changes["skill_md"] and self.reload_skill():
+                reloaded["skill_md"] = True
+                print(f"↻ Reloaded skill.md ({len(self.tools)} tools)")
+            if changes["knowledge"]:
+                counts = self.reload_knowledge()
+                reloaded["knowledge"] = counts
+                if counts:
+                    print(
+                        f"↻ Reloaded knowledge: {counts['added']} added, {counts['updated']} updated, "
+                        f"{counts['removed']} removed, {counts['embedded']} embedded"
+                    )
+            return reloaded
+        finally:
+            self._reload_lock.release()
+
+    def call_tool(self, tool_name: str, tool_input: dict, cancel_event: threading.Event = None) -> str:
+        """
+        Execute a tool and return the result.
+
+        Args:
+            tool_name: Tool to run
+            tool_input: Tool arguments
+            cancel_event: Set when the caller's deadline passes; run_plan then
+                starts no further steps (single tool calls run to completion)
+
+        Returns:
+            JSON-encoded tool result
+        """
+        # Tools of other loaded skills run locally from their skill's tools.py
+        owner = self._skill_tool_owners.get(tool_name)
+        if owner is not None:
+            function = self._skill_tool_functions.get(tool_name)
+            if function is None:
+                return json.dumps({"error": f"Tool '{tool_name}' of skill '{owner}' has no function in its tools.py"})
+            try:
+                return json.dumps(function(**tool_input))
+            except Exception as e:
+                return json.dumps({"error": f"Tool execution failed: {str(e)}"})
+
+        # run_plan orchestrates locally; its steps come back through call_tool
+        if self.mcp_pool is not None and tool_name != "run_plan":
+            return json.dumps(self.mcp_pool.call(tool_name, tool_input))
+
         try:
             if tool_name == "solenoid_field":
                 result = fields.solenoid_field(**tool_input)
@@ -274,9 +597,33 @@ class SkillAgent:
             elif tool_name == "energy_stored":
                 result = fields.energy_stored(**tool_input)
             elif tool_name == "material_lookup":
-                result = materials.lookup_material(**tool_input)
+                result = materials.lookup_material(tool_input["material"])
+            elif tool_name == "material_search":
+                result = material_store.material_search(**tool_input)
             elif tool_name == "unit_convert":
                 result = converters.convert_unit(**tool_input)
+            elif tool_name == "batch_calculate":
+                result = batch.batch_calculate(**tool_input)
+            elif tool_name == "wire_path_field":
+                result = wire_paths.wire_path_field(**tool_input)
+            elif tool_name == "solenoid_field_map":
+                result = loops.solenoid_field_map(**tool_input)
+            elif tool_name == "magnetic_circuit_solve":
+                result = reluctance_network.magnetic_circuit_solve(**tool_input)
+            elif tool_name == "saturation_current":
+                result = reluctance_network.saturation_current(**tool_input)
+            elif tool_name == "design_optimize":
+                result = inductor_design.design_optimize(**tool_input)
+            elif tool_name == "tolerance_analysis":
+                result = tolerance.tolerance_analysis(**tool_input)
+            elif tool_name == "core_loss":
+                result = core_loss.core_loss(**tool_input)
+            elif tool_name == "field_map_query":
+                result = field_store.field_map_query(**tool_input)
+            elif tool_name == "run_plan":
+                result = tool_plan.execute_plan(
+                    tool_input["steps"], self._call_tool_for_plan, cancel_event=cancel_event
+                )
             else:
                 result = {"error": f"Unknown tool: {tool_name}"}
 
@@ -284,12 +631,32 @@ class SkillAgent:
         except Exception as e:
             return json.dumps({"error": f"Tool execution failed: {str(e)}"})
 
-    def get_system_prompt(self, user_message: str = None) -> str:
+    def close(self) -> None:
+        """Shut down the tool thread pool, MCP worker processes, and knowledge service connections."""
+        self._tool_executor.shutdown(wait=False, cancel_futures=True)
+        if self.mcp_pool is not None:
+            self.mcp_pool.close()
+        knowledge_bases = [self.knowledge_base] + [
+            skill.knowledge_base for skill in self.skills.values() if skill.knowledge_base is not self.knowledge_base
+        ]
+        for knowledge_base in knowledge_bases:
+            if isinstance(knowledge_base, RemoteKnowledgeBase):
+                knowledge_base.close()
+
+    def _call_tool_for_plan(self, tool_name: str, tool_input: dict) -> dict:
+        """Execute one run_plan step through the regular tool path."""
+        return json.loads(self.call_tool(tool_name, tool_input))
+
+    def get_system_prompt(self, user_message: str = None, retrieved_docs: list = None, skills: list = None) -> str:
         """
         Generate system prompt from skill.md with optional RAG context.
 
         Args:
             user_message: User's question for RAG retrieval (optional)
+            retrieved_docs: Already-retrieved knowledge to use instead of
+                querying the knowledge base again (optional)
+            skills: LoadedSkill objects whose definitions replace this
+                agent's skill.md (optional, for multi-skill agents)
         """
         base_prompt = """You are an expert agent with specialized knowledge and capabilities.
 
@@ -298,83 +665,372 @@ You have access to the following tools to help solve problems. Use them whenever
 Here is your skill definition:
 
 """
-        prompt = base_prompt + self.skill_md
+        if skills:
+            prompt = base_prompt + "\n\n---\n\n".join(skill.skill_md for skill in skills)
+        else:
+            prompt = base_prompt + self.skill_md
 
         # Add retrieved knowledge context if user message provided
-        if user_message:
+        if retrieved_docs is None and user_message:
             retrieved_docs = self.knowledge_base.retrieve(user_message, top_k=3)
-            if retrieved_docs:
-                knowledge_context = self.knowledge_base.format_context(retrieved_docs)
-                prompt += knowledge_context
+        if retrieved_docs:
+            knowledge_context = self.knowledge_base.format_context(retrieved_docs)
+            prompt += knowledge_context
 
         return prompt
 
-    def run_agentic_loop(self, user_message: str) -> None:
-        """Run the main agentic loop."""
+    def _embed_question(self, user_message: str):
+        """
+        Embed a question once for routing, retrieval and tool selection.
+
+        Every skill shares the primary knowledge base's embedding model, so
+        one vector serves them all. Only computed when more than retrieval
+        needs it; None when embeddings are unavailable (each component then
+        falls back to its own behavior).
+        """
+        if self.skill_router is None and self.tool_selector is None:
+            return None
+        vectors = self.knowledge_base.embed([user_message])
+        return vectors[0] if vectors else None
+
+    def _route_skills(self, user_message: str, query_vector: list = None) -> list:
+        """The loaded skills relevant to a request (empty for single-skill agents)."""
+        if self.skill_router is None:
+            return []
+        names = self.skill_router.route(user_message, query_vector)
+        print(f"🧭 Skills: {', '.join(names)}")
+        return [self.skills[name] for name in names]
+
+    def _retrieve(self, user_message: str, skills: list, top_k: int = 3, query_vector: list = None) -> list:
+        """Retrieve knowledge from the routed skills' collections, best matches first."""
+        if not skills:
+            return self.knowledge_base.retrieve(user_message, top_k=top_k, query_vector=query_vector)
+        retrieved = [
+            doc for skill in skills
+            for doc in skill.knowledge_base.retrieve(user_message, top_k=top_k, query_vector=query_vector)
+        ]
+        return sorted(retrieved, key=lambda doc: doc["score"], reverse=True)[:top_k]
+
+    def _select_tools(self, user_message: str, used_tools: set, skills: list, query_vector: list = None) -> list:
+        """The tools to send with one model call: relevant tools of the routed skills."""
+        if not skills:
+            if self.tool_selector is not None:
+                return self.tool_selector.select(user_message, used_tools, query_vector)
+            return self.tools
+
+        tools_by_name = {}
+        for skill in skills:
+            subset = skill.tools
+            if skill.tool_selector is not None:
+                subset = skill.tool_selector.select(user_message, used_tools, query_vector)
+            for tool in subset:
+                tools_by_name.setdefault(tool["name"], tool)
+        return list(tools_by_name.values())
+
+    def _create_message(
+        self,
+        model: str,
+        system_prompt: str,
+        messages: list,
+        escalation: bool = False,
+        tools: list = None,
+        **request_options,
+    ):
+        """Call Claude with tools and record the call's latency and token usage."""
+        # No deadline: keep the client's default timeout
+        if request_options.get("timeout", 0) is None:
+            del request_options["timeout"]
+
+        started = time.perf_counter()
+        response = self.client.messages.create(
+            model=model,
+            max_tokens=4096,
+            system=system_prompt,
+            tools=self.tools if tools is None else tools,
+            messages=messages,
+            **request_options,
+        )
+        self.model_router.record(
+            model,
+            time.perf_counter() - started,
+            getattr(response, "usage", None),
+            escalation=escalation,
+        )
+        return response
+
+    def _model_timeout(self, deadline: float, latency_budget_s: float):
+        """Time left for a regular model call, keeping a reserve for the final answer."""
+        if deadline is None:
+            return None
+        reserve = min(self.final_answer_reserve_s, 0.25 * latency_budget_s)
+        return deadline - time.monotonic() - reserve
+
+    def _run_tool_calls(self, content: list, deadline: float) -> list:
+        """
+        Execute the tool_use blocks of a response concurrently.
+
+        Calls not finished at the deadline are reported to the model as
+        errors. Queued calls are cancelled and run_plan starts no further
+        steps. A call that is already running cannot be interrupted, so its
+        pool is retired (it finishes in the background) and later calls get
+        a fresh pool instead of waiting behind it.
+
+        Args:
+            content: Content blocks of a tool_use response
+            deadline: time.monotonic() deadline, or None for no limit
+
+        Returns:
+            List of tool_result blocks in the order of the tool_use blocks
+        """
+        tool_blocks = []
+        for block in content:
+            if hasattr(block, "text"):
+                # Print any text content
+                if block.text.strip():
+                    print(f"Agent: {block.text}\n")
+
+            if block.type == "tool_use":
+                print(f"🔧 Calling tool: {block.name}")
+                print(f"   Input: {json.dumps(block.input, indent=2)}")
+                tool_blocks.append(block)
+
+        cancel_event = threading.Event()
+        with self._tool_executor_lock:
+            executor = self._tool_executor
+            futures = [
+                executor.submit(self.call_tool, block.name, block.input, cancel_event)
+                for block in tool_blocks
+            ]
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        done, not_done = concurrent.futures.wait(futures, timeout=timeout)
+        if not_done:
+            cancel_event.set()
+            still_running = [future for future in not_done if not future.cancel()]
+            if still_running:
+                self._retire_tool_executor(executor)
+
+        tool_results = []
+        for block, future in zip(tool_blocks, futures):
+            if future in done:
+                result = future.result()
+            else:
+                result = json.dumps({"error": "Tool call cancelled: latency budget exceeded"})
+
+            print(f"   {block.name} result: {json.dumps(json.loads(result), indent=2)}\n")
+            tool_results.append({
+                "type": "tool_result",
+                "tool_use_id": block.id,
+                "content": result,
+            })
+        return tool_results
+
+    def _retire_tool_executor(self, executor: concurrent.futures.Executor) -> None:
+        """Replace a tool pool whose threads are held by overrunning calls; they finish in the background."""
+        with self._tool_executor_lock:
+            if self._tool_executor is executor:
+                self._tool_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self._tool_workers, thread_name_prefix="tool"
+                )
+        # Calls other requests already queued on it still run there
+        executor.shutdown(wait=False)
+
+    def _partial_answer(self, messages: list) -> str:
+        """Summarize the tool results gathered so far when the model cannot answer in time."""
+        tool_names = {}
+        lines = []
+        for message in messages:
+            if not isinstance(message["content"], list):
+                continue
+            for block in message["content"]:
+                if getattr(block, "type", None) == "tool_use":
+                    tool_names[block.id] = block.name
+                elif isinstance(block, dict) and block.get("type") == "tool_result":
+                    name = tool_names.get(block["tool_use_id"], "tool")
+                    lines.append(f"- {name}: {block['content']}")
+
+        if not lines:
+            return "I ran out of time before I could answer. Please try again or simplify the question."
+        return "I ran out of time before finishing. Results gathered so far:\n" + "\n".join(lines)
+
+    def _force_final_answer(
+        self,
+        system_prompt: str,
+        messages: list,
+        deadline: float,
+        model: str,
+        tools: list = None,
+    ) -> str:
+        """
+        Ask the model for a final answer without further tool calls.
+
+        Falls back to a summary of the tool results if there is not enough
+        time left for a model call or the call times out.
+        """
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is None or remaining > self.min_final_answer_s:
+            # Append the instruction to the last user turn (alternation must be kept)
+            last = messages[-1]
+            content = last["content"]
+            if isinstance(content, str):
+                content = [{"type": "text", "text": content}]
+            final_messages = messages[:-1] + [{
+                "role": "user",
+                "content": list(content) + [{"type": "text", "text": FINAL_ANSWER_INSTRUCTION}],
+            }]
+
+            try:
+                response = self._create_message(
+                    model,
+                    system_prompt,
+                    final_messages,
+                    tools=tools,
+                    timeout=remaining,
+                    tool_choice={"type": "none"},
+                )
+                answer = "\n".join(
+                    block.text for block in response.content if hasattr(block, "text")
+                ).strip()
+                if answer:
+                    return answer
+            except APITimeoutError:
+                pass
+
+        return self._partial_answer(messages)
+
+    def run_agentic_loop(
+        self,
+        user_message: str,
+        latency_budget_s: float = None,
+        max_tool_rounds: int = None,
+    ) -> str:
+        """
+        Run the main agentic loop.
+
+        Args:
+            user_message: User's question
+            latency_budget_s: Wall-time budget for the request in seconds
+                (defaults to the agent's latency_budget_s; None for no limit)
+            max_tool_rounds: Maximum number of tool-call rounds
+                (defaults to the agent's max_tool_rounds)
+
+        Returns:
+            Final answer text (empty if the loop ended without one)
+        """
+        if latency_budget_s is None:
+            latency_budget_s = self.latency_budget_s
+        if max_tool_rounds is None:
+            max_tool_rounds = self.max_tool_rounds
+        deadline = time.monotonic() + latency_budget_s if latency_budget_s else None
+
+        if self.skill_watcher is not None:
+            self.check_for_updates()
+
         messages = [{"role": "user", "content": user_message}]
 
         print(f"\n{'='*70}")
         print(f"User: {user_message}")
         print(f"{'='*70}\n")
 
+        # Simple single-tool requests are answered locally
+        if self.fast_path is not None:
+            fast_answer = self.fast_path.try_answer(user_message)
+            if fast_answer is not None:
+                print(f"Agent (fast path): {fast_answer}\n")
+                return fast_answer
+
+        # A semantically equivalent question with identical numbers skips the model
+        if self.answer_cache is not None:
+            cached_answer = self.answer_cache.lookup(user_message)
+            if cached_answer is not None:
+                print(f"Agent (cached): {cached_answer}\n")
+                return cached_answer
+
+        final_answer = ""
+
+        # Embed the question once; routing, retrieval and tool selection share the vector
+        query_vector = self._embed_question(user_message)
+
+        # Multi-skill agents include only the skills relevant to this request
+        active_skills = self._route_skills(user_message, query_vector)
+
+        # Retrieve once per request; the results feed both the prompt and routing
+        retrieved_docs = self._retrieve(user_message, active_skills, query_vector=query_vector)
+        system_prompt = self.get_system_prompt(retrieved_docs=retrieved_docs, skills=active_skills)
+        # One routing configuration for the whole request, even across a reload
+        model_router = self.model_router
+        complexity = model_router.classify(user_message, retrieved_docs)
+        after_tool_results = False
+        tools_failed = False
+        tool_rounds = 0
+        used_tools = set()
+
         while True:
+            # Only the tools relevant to this request (plus any already used)
+            tools = self._select_tools(user_message, used_tools, active_skills, query_vector)
+
+            # Stop calling tools once the round cap or the latency budget is reached
+            timeout = self._model_timeout(deadline, latency_budget_s)
+            if tool_rounds >= max_tool_rounds or (timeout is not None and timeout <= 0):
+                reason = "tool round limit" if tool_rounds >= max_tool_rounds else "latency budget"
+                print(f"⏱ Reached {reason}; answering with results so far\n")
+                final_model = model_router.fast_model if reason == "latency budget" else self.model
+                final_answer = self._force_final_answer(
+                    system_prompt, messages, deadline, final_model, tools=tools
+                )
+                print(f"Agent: {final_answer}\n")
+                break
+
             # Show spinner while thinking
             spinner = ThinkingSpinner()
             spinner.start()
 
             # Call Claude with tools
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=4096,
-                system=self.get_system_prompt(user_message),
-                tools=self.tools,
-                messages=messages,
-            )
+            # Complex questions get their likely final synthesis from the strong model
+            model = model_router.choose(complexity, after_tool_results, tools_failed)
+            try:
+                response = self._create_message(
+                    model, system_prompt, messages, tools=tools, timeout=timeout,
+                    escalation=model_router.should_escalate(complexity, after_tool_results, tools_failed),
+                )
+            except APITimeoutError:
+                spinner.stop()
+                print("⏱ Latency budget reached during model call; answering with results so far\n")
+                final_answer = self._force_final_answer(
+                    system_prompt, messages, deadline, model_router.fast_model, tools=tools
+                )
+                print(f"Agent: {final_answer}\n")
+                break
 
             spinner.stop()
 
             # Check stop reason
             if response.stop_reason == "end_turn":
                 # Extract final text response
+                answer_parts = []
                 for block in response.content:
                     if hasattr(block, "text"):
                         print(f"Agent: {block.text}\n")
+                        answer_parts.append(block.text)
+                final_answer = "\n".join(answer_parts)
+
+                if self.answer_cache is not None:
+                    self.answer_cache.store(user_message, final_answer)
                 break
 
             elif response.stop_reason == "tool_use":
-                # Process tool calls
-                tool_results = []
-                for block in response.content:
-                    if hasattr(block, "text"):
-                        # Print any text content
-                        if block.text.strip():
-                            print(f"Agent: {block.text}\n")
-
-                    if block.type == "tool_use":
-                        tool_name = block.name
-                        tool_input = block.input
-                        tool_use_id = block.id
-
-                        print(f"🔧 Calling tool: {tool_name}")
-                        print(f"   Input: {json.dumps(tool_input, indent=2)}")
-
-                        # Execute tool
-                        result = self.call_tool(tool_name, tool_input)
-                        result_obj = json.loads(result)
-
-                        print(f"   Result: {json.dumps(result_obj, indent=2)}\n")
-
-                        # Collect tool result
-                        tool_results.append({
-                            "type": "tool_result",
-                            "tool_use_id": tool_use_id,
-                            "content": result,
-                        })
+                # Process tool calls (concurrently, bounded by the deadline)
+                tool_results = self._run_tool_calls(response.content, deadline)
 
                 # Add assistant response and tool results to messages
                 messages.append({"role": "assistant", "content": response.content})
                 messages.append({"role": "user", "content": tool_results})
+                used_tools.update(block.name for block in response.content if block.type == "tool_use")
+                after_tool_results = True
+                tools_failed = any(_is_error_result(result["content"]) for result in tool_results)
+                tool_rounds += 1
 
             else:
                 print(f"Unexpected stop reason: {response.stop_reason}")
                 break
+
+        return final_answer
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Semantic cache of final agent answers keyed by question embedding."""
+
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from mcp_server.tools.converters import parse_unit
+from mcp_server.tools.material_store import get_store, normalize_name
+
+# A number optionally followed by a unit-like word, e.g. "500-turn", "20 cm", "2A"
+_PARAMETER_PATTERN = re.compile(
+    r"(?<![\w.])([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)(?:\s*-?\s*([A-Za-zµμΩ°²³/]+))?"
+)
+
+# The unit a result is asked for, e.g. "to Gauss", "into kA/m", "in mT"
+_TARGET_UNIT_PATTERN = re.compile(r"\b(?:to|into|in)\s+([A-Za-zµμΩ°²³/^\d-]+)")
+
+# Longest material name or alias looked up, in words ("Iron powder -26")
+MAX_ENTITY_WORDS = 4
+
+
+def extract_parameters(text: str) -> tuple:
+    """
+    Extract the numeric parameters of a question as a canonical signature.
+
+    Each number is paired with the unit word that follows it, so "500 turns,
+    20 cm, 2 A" and "2 A through 500 turns over 20 cm" produce the same
+    signature while "20 cm" and "20 mm" do not.
+
+    Args:
+        text: Question text
+
+    Returns:
+        Sorted tuple of (value, unit) pairs
+    """
+    parameters = []
+    for number, unit in _PARAMETER_PATTERN.findall(text):
+        try:
+            value = float(number)
+        except ValueError:
+            continue
+
+        unit = unit or ""
+        # Fold simple plurals ("turns" -> "turn") but keep case, since
+        # "mT" and "MT" are different units
+        if unit.islower() and len(unit) > 3 and unit.endswith("s") and not unit.endswith("ss"):
+            unit = unit[:-1]
+        parameters.append((value, unit))
+
+    return tuple(sorted(parameters))
+
+
+def extract_target_units(text: str) -> tuple:
+    """
+    Extract the units a question asks its result in.
+
+    "Convert 1.2 T to Gauss" and "Convert 1.2 T to mT" share their numeric
+    parameters but not their answer, so the word after "to", "into" or "in"
+    counts when it parses as a unit ("in a solenoid" does not).
+
+    Args:
+        text: Question text
+
+    Returns:
+        Sorted tuple of unit strings
+    """
+    units = set()
+    for word in _TARGET_UNIT_PATTERN.findall(text):
+        word = word.rstrip("-/")
+        try:
+            parse_unit(word)
+        except ValueError:
+            continue
+        units.add(word)
+    return tuple(sorted(units))
+
+
+def extract_entities(text: str) -> tuple:
+    """
+    Extract the materials a question names, by catalog name or alias.
+
+    The longest name starting at each word wins, so "cast iron" is one
+    entity rather than also "iron"; aliases map to the catalog name.
+    All-digit names (the "77" ferrite) are skipped since they read as numbers.
+
+    Args:
+        text: Question text
+
+    Returns:
+        Sorted tuple of canonical material names
+    """
+    store = get_store()
+    words = normalize_name(text).split()
+    entities = set()
+    i = 0
+    while i < len(words):
+        for size in range(min(MAX_ENTITY_WORDS, len(words) - i), 0, -1):
+            phrase = " ".join(words[i:i + size])
+            row = None if phrase.isdigit() else store.find(phrase)
+            if row is not None:
+                entities.add(store.names[row])
+                i += size
+                break
+        else:
+            i += 1
+    return tuple(sorted(entities))
+
+
+def question_signature(text: str) -> tuple:
+    """
+    Exact-match key of a question: its parameters, target units and materials.
+
+    Args:
+        text: Question text
+
+    Returns:
+        Tuple (parameters, target units, entities)
+    """
+    return extract_parameters(text), extract_target_units(text), extract_entities(text)
+
+
+def _normalize(vector: list) -> list:
+    """Scale a vector to unit length (cosine similarity becomes a dot product)."""
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0:
+        return list(vector)
+    return [x / norm for x in vector]
+
+
+class _CacheEntry:
+    """A cached question/answer pair."""
+
+    __slots__ = ("question", "answer", "vector", "signature", "created_at")
+
+    def __init__(self, question: str, answer: str, vector: list, signature: tuple, created_at: float):
+        self.question = question
+        self.answer = answer
+        self.vector = vector
+        self.signature = signature
+        self.created_at = created_at
+
+
+class SemanticAnswerCache:
+    """LRU + TTL cache of final answers, matched by embedding similarity."""
+
+    def __init__(
+        self,
+        embed_fn: Callable[[list], list],
+        similarity_threshold: float = 0.92,
+        ttl_seconds: Optional[float] = 3600.0,
+        max_entries: int = 512,
+    ):
+        """
+        Initialize the answer cache.
+
+        Args:
+            embed_fn: Function mapping a list of texts to a list of vectors
+                (e.g. KnowledgeBase.embed). An empty result disables caching.
+            similarity_threshold: Minimum cosine similarity for a hit
+            ttl_seconds: Entry lifetime in seconds (None for no expiry)
+            max_entries: Maximum number of cached answers (LRU eviction)
+        """
+        if not 0 < similarity_threshold <= 1:
+            raise ValueError("similarity_threshold must be in (0, 1]")
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()  # entry id -> _CacheEntry, oldest first
+        self._buckets = {}  # parameter signature -> set of entry ids
+        self._next_id = 0
+        self._last_embedding = (None, None)  # (question, vector) memo
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def _embed(self, question: str) -> Optional[list]:
+        """
+        Embed a question, reusing the vector from the previous call if identical.
+
+        Called without the lock held: the memo is one tuple replaced by a
+        single assignment, so a concurrent caller sees an old or a new pair
+        but never a question paired with another question's vector.
+        """
+        memo_question, memo_vector = self._last_embedding
+        if memo_question == question:
+            return memo_vector
+
+        vectors = self.embed_fn([question])
+        vector = _normalize(vectors[0]) if vectors else None
+        self._last_embedding = (question, vector)
+        return vector
+
+    def _remove(self, entry_id: int) -> None:
+        """Remove an entry from the LRU order and its signature bucket."""
+        entry = self._entries.pop(entry_id)
+        bucket = self._buckets.get(entry.signature)
+        if bucket is not None:
+            bucket.discard(entry_id)
+            if not bucket:
+                del self._buckets[entry.signature]
+
+    def _is_expired(self, entry: _CacheEntry, now: float) -> bool:
+        """Check whether an entry has outlived the TTL."""
+        return self.ttl_seconds is not None and now - entry.created_at > self.ttl_seconds
+
+    def lookup(self, question: str) -> Optional[str]:
+        """
+        Return a cached answer for a semantically equivalent question.
+
+        Only entries whose parameters, target units and materials match the
+        question exactly are considered, so the embedding is computed only
+        when such entries exist. The embedding runs without the lock, so
+        other sessions' lookups do not wait on the embedding model.
+
+        Args:
+            question: User question
+
+        Returns:
+            Cached answer text, or None on a miss
+        """
+        signature = question_signature(question)
+
+        with self._lock:
+            now = time.monotonic()
+            candidates = []
+            for entry_id in list(self._buckets.get(signature, ())):
+                entry = self._entries[entry_id]
+                if self._is_expired(entry, now):
+                    self._remove(entry_id)
+                    self._expirations += 1
+                else:
+                    candidates.append(entry_id)
+
+            if not candidates:
+                self._misses += 1
+                return None
+
+        vector = self._embed(question)
+
+        with self._lock:
+            if vector is None:
+                self._misses += 1
+                return None
+
+            best_id, best_score = None, -1.0
+            for entry_id in candidates:
+                # Evicted or cleared while the question was being embedded
+                entry = self._entries.get(entry_id)
+                if entry is None:
+                    continue
+                score = sum(a * b for a, b in zip(vector, entry.vector))
+                if score > best_score:
+                    best_id, best_score = entry_id, score
+
+            if best_score < self.similarity_threshold:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(best_id)
+            self._hits += 1
+            return self._entries[best_id].answer
+
+    def store(self, question: str, answer: str) -> None:
+        """
+        Cache the final answer to a question.
+
+        Args:
+            question: User question
+            answer: Final answer text returned to the user
+        """
+        if not answer:
+            return
+
+        vector = self._embed(question)
+        if vector is None:
+            return
+        signature = question_signature(question)
+
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = _CacheEntry(
+                question, answer, vector, signature, time.monotonic()
+            )
+            self._buckets.setdefault(signature, set()).add(entry_id)
+
+            while len(self._entries) > self.max_entries:
+                oldest_id = next(iter(self._entries))
+                self._remove(oldest_id)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached answers (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self._last_embedding = (None, None)
+
+    def get_stats(self) -> dict:
+        """Get hit-rate and size statistics for the cache."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "lookups": lookups,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "similarity_threshold": self.similarity_threshold,
+                "ttl_seconds": self.ttl_seconds,
+            }
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Deterministic local fast path for simple single-tool requests."""
+
+import json
+import re
+from typing import Callable, Optional
+
+from mcp_server.tools.converters import DIMENSION_NAMES, UNIT_NAMES, dimension_name, parse_unit
+
+# Counts the unit converter does not cover: token -> (dimension, factor, symbol)
+COUNT_UNITS = {
+    "turn": ("turns", 1.0, "turns"),
+    "turns": ("turns", 1.0, "turns"),
+    "deg": ("angle", 1.0, "deg"),
+    "degree": ("angle", 1.0, "deg"),
+    "degrees": ("angle", 1.0, "deg"),
+    "°": ("angle", 1.0, "deg"),
+}
+
+# Symbols spelled out in answers, as the conversion tool's examples write them
+DISPLAY_SYMBOLS = {"G": "Gauss", "Oe": "Oersted", "Mx": "Maxwell"}
+
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+_UNIT = r"[A-Za-zµμ°²³/]+[23]?"
+
+_QUANTITY_PATTERN = re.compile(rf"(?<![\w.])({_NUMBER})(?:\s*-?\s*({_UNIT}))?")
+_RELATIVE_PERMEABILITY_PATTERN = re.compile(
+    rf"(?:μr|μᵣ|mu_?r|relative permeability)\s*(?:=|:|of|is)?\s*({_NUMBER})",
+    re.IGNORECASE,
+)
+_CONVERSION_PATTERNS = [
+    re.compile(rf"({_NUMBER})\s*({_UNIT})\s+(?:to|into|in|as)\s+({_UNIT})"),
+    re.compile(rf"how many\s+({_UNIT})\s+(?:is|are|in)\s+({_NUMBER})\s*({_UNIT})", re.IGNORECASE),
+]
+
+# Questions asking for reasoning rather than a number go to the model
+_REASONING_WORDS = re.compile(
+    r"\b(why|explain|compare|comparison|versus|vs|design|should|recommend|difference|best|trade-?offs?)\b",
+    re.IGNORECASE,
+)
+
+_STOPWORDS = {
+    "a", "an", "and", "the", "of", "to", "in", "for", "with", "at", "by", "on",
+    "from", "use", "when", "you", "have", "calculate", "returns", "magnetic",
+    "between", "need", "get", "is", "it", "or", "etc",
+}
+
+
+def _resolve_unit(token: str) -> Optional[tuple]:
+    """
+    Resolve a unit token to (dimension, SI factor, canonical symbol).
+
+    Units come from the converter's table (prefixes, names and compounds),
+    so the fast path and convert_unit always agree on a factor; dimensions
+    are the converter's names ("magnetic flux density", "length", ...).
+    """
+    count = COUNT_UNITS.get(token.lower())
+    if count is not None:
+        return count
+    try:
+        mantissa, power, dimensions = parse_unit(token)
+    except ValueError:
+        return None
+    symbol = UNIT_NAMES.get(token.lower(), token)
+    return dimension_name(dimensions), mantissa * 10.0 ** power, DISPLAY_SYMBOLS.get(symbol, symbol)
+
+
+def _param_dimension(name: str) -> Optional[str]:
+    """Infer the physical dimension of a tool parameter from its name."""
+    lowered = name.lower()
+    if "permeability" in lowered:
+        return "relative_permeability"
+    if lowered == "turns" or lowered.endswith("_turns"):
+        return "turns"
+    if lowered.startswith("b_") or "tesla" in lowered:
+        return DIMENSION_NAMES[(0, 1, -2, -1)]
+    if lowered.startswith("h_") or lowered.endswith("_a_per_m"):
+        return DIMENSION_NAMES[(-1, 0, 0, 1)]
+    if lowered.endswith("_m2") or "area" in lowered:
+        return DIMENSION_NAMES[(2, 0, 0, 0)]
+    if lowered.endswith("_m3") or "volume" in lowered:
+        return DIMENSION_NAMES[(3, 0, 0, 0)]
+    if lowered.endswith("_deg") or "angle" in lowered:
+        return "angle"
+    if lowered.endswith("_a") or "current" in lowered:
+        return DIMENSION_NAMES[(0, 0, 0, 1)]
+    if lowered.endswith("_m") or "length" in lowered or "distance" in lowered:
+        return DIMENSION_NAMES[(1, 0, 0, 0)]
+    return None
+
+
+def _keywords(text: str) -> set:
+    """Split text into lowercase keyword stems, dropping stopwords."""
+    words = re.findall(r"[a-z]+", text.lower())
+    return {word.rstrip("s") for word in words if len(word) > 2 and word not in _STOPWORDS}
+
+
+class FastPathRouter:
+    """Answers simple single-tool requests locally, without a model round trip."""
+
+    def __init__(self, tools: list, skill_md: str, call_tool: Callable[[str, dict], str]):
+        """
+        Initialize the fast path from parsed tool schemas.
+
+        Args:
+            tools: Tool definitions parsed from skill.md (name, description, input_schema)
+            skill_md: Raw skill.md text, used for value lists and answer templates
+            call_tool: Function executing a tool and returning its JSON result
+        """
+        self.tools = tools
+        self.call_tool = call_tool
+        self.tool_keywords = {
+            tool["name"]: _keywords(tool["name"].replace("_", " ") + " " + tool["description"])
+            for tool in tools
+        }
+        self.value_lists, self.templates = self._parse_tool_sections(skill_md)
+        self.attempts = 0
+        self.answered = 0
+
+    @staticmethod
+    def _parse_tool_sections(skill_md: str) -> tuple:
+        """
+        Collect per-tool value lists and answer templates from skill.md.
+
+        A bulleted list of backticked values (e.g. "- `iron` - ...") in a
+        tool's section enumerates accepted values for its string parameter;
+        a "**Answer Template:**" line gives the format of a fast-path answer.
+        """
+        value_lists = {}
+        templates = {}
+        current_tool = None
+        for line in skill_md.split("\n"):
+            stripped = line.strip()
+            if line.startswith("### "):
+                current_tool = line[4:].strip()
+            elif line.startswith("## "):
+                current_tool = None
+            elif current_tool is None:
+                continue
+            elif "**Answer Template:**" in stripped:
+                template = stripped.split("**Answer Template:**", 1)[1].strip()
+                templates[current_tool] = template.strip("`")
+            else:
+                match = re.match(r"- `([^`]+)`", stripped)
+                if match:
+                    value_lists.setdefault(current_tool, []).append(match.group(1))
+        return value_lists, templates
+
+    @staticmethod
+    def _extract_quantities(question: str) -> list:
+        """Extract (dimension, SI value, raw number, unit token) tuples from a question."""
+        quantities = []
+        consumed = []
+
+        for match in _RELATIVE_PERMEABILITY_PATTERN.finditer(question):
+            value = float(match.group(1))
+            quantities.append(("relative_permeability", value, value, ""))
+            consumed.append(match.span(1))
+
+        for match in _QUANTITY_PATTERN.finditer(question):
+            if any(start <= match.start(1) < end for start, end in consumed):
+                continue
+            value = float(match.group(1))
+            unit = match.group(2) or ""
+            resolved = _resolve_unit(unit) if unit else None
+            if resolved is None:
+                quantities.append((None, value, value, unit))
+            else:
+                dimension, factor, _symbol = resolved
+                quantities.append((dimension, value * factor, value, unit))
+
+        return quantities
+
+    @staticmethod
+    def _extract_conversion(question: str) -> Optional[dict]:
+        """Parse '<value> <unit> to <unit>' style conversion requests."""
+        candidates = [match.groups() for match in _CONVERSION_PATTERNS[0].finditer(question)]
+        candidates += [
+            (value, from_token, to_token)
+            for to_token, value, from_token in (
+                match.groups() for match in _CONVERSION_PATTERNS[1].finditer(question)
+            )
+        ]
+
+        for value, from_token, to_token in candidates:
+            from_unit = _resolve_unit(from_token)
+            to_unit = _resolve_unit(to_token)
+            if from_unit is not None and to_unit is not None and from_unit[0] == to_unit[0]:
+                return {"value": float(value), "from_unit": from_unit[2], "to_unit": to_unit[2]}
+
+        return None
+
+    def _fill_arguments(self, tool: dict, question: str, quantities: list, conversion: Optional[dict]) -> Optional[dict]:
+        """
+        Map extracted values onto a tool's parameters.
+
+        Every required parameter must receive exactly one value and every
+        extracted quantity must be used, otherwise the request is ambiguous.
+        """
+        schema = tool["input_schema"]
+        properties = schema.get("properties", {})
+        required = set(schema.get("required", []))
+        string_params = [name for name, spec in properties.items() if spec.get("type") == "string"]
+
+        # Unit conversion: value + from/to units, nothing else
+        if {"from_unit", "to_unit"} <= set(string_params):
+            if conversion is None or len(quantities) != 1:
+                return None
+            value_params = [name for name in properties if name not in ("from_unit", "to_unit")]
+            if len(value_params) != 1:
+                return None
+            return {value_params[0]: conversion["value"], "from_unit": conversion["from_unit"], "to_unit": conversion["to_unit"]}
+
+        arguments = {}
+        for name in string_params:
+            normalized = question.lower().replace("-", " ").replace("_", " ")
+            matches = [
+                value for value in self.value_lists.get(tool["name"], [])
+                if re.search(rf"\b{re.escape(value.lower().replace('_', ' '))}\b", normalized)
+            ]
+            if len(matches) != 1:
+                if name in required:
+                    return None
+                continue
+            arguments[name] = matches[0]
+
+        remaining = list(quantities)
+        for name, spec in properties.items():
+            if spec.get("type") == "string":
+                continue
+            dimension = _param_dimension(name)
+            candidates = [q for q in remaining if dimension is not None and q[0] == dimension]
+            if len(candidates) != 1:
+                if name in required or candidates:
+                    return None
+                continue
+
+            quantity = candidates[0]
+            remaining.remove(quantity)
+            value = quantity[1]
+            if spec.get("type") == "integer":
+                if value != int(value):
+                    return None
+                value = int(value)
+            arguments[name] = value
+
+        if remaining:
+            return None
+        # A tool whose parameters are all optional still needs something from the question
+        if properties and not arguments:
+            return None
+        return arguments
+
+    def _format_answer(self, tool_name: str, arguments: dict, result: dict) -> str:
+        """Render the answer from the tool's template, or a generic summary."""
+        template = self.templates.get(tool_name)
+        if template:
+            try:
+                return template.format(**{**arguments, **result})
+            except (KeyError, ValueError, TypeError, IndexError):
+                pass
+
+        parts = [
+            f"{key} = {value:.6g}" if isinstance(value, float) else f"{key} = {value}"
+            for key, value in result.items()
+            if key not in arguments and key != "equation"
+        ]
+        answer = f"{tool_name}: " + ", ".join(parts)
+        if "equation" in result:
+            answer += f" ({result['equation']})"
+        return answer
+
+    def try_answer(self, question: str) -> Optional[str]:
+        """
+        Answer a simple request locally.
+
+        Args:
+            question: User question
+
+        Returns:
+            Formatted answer, or None when the request should go to the model
+        """
+        self.attempts += 1
+        if _REASONING_WORDS.search(question):
+            return None
+
+        quantities = self._extract_quantities(question)
+        conversion = self._extract_conversion(question)
+        question_keywords = _keywords(question)
+
+        scored = []
+        for tool in self.tools:
+            score = len(self.tool_keywords[tool["name"]] & question_keywords)
+            if conversion is not None and "from_unit" in tool["input_schema"].get("properties", {}):
+                score += 1
+            if score == 0:
+                continue
+            arguments = self._fill_arguments(tool, question, quantities, conversion)
+            if arguments is not None:
+                scored.append((score, tool["name"], arguments))
+
+        if not scored:
+            return None
+        scored.sort(key=lambda item: item[0], reverse=True)
+        if len(scored) > 1 and scored[0][0] == scored[1][0]:
+            return None
+
+        _score, tool_name, arguments = scored[0]
+        try:
+            result = json.loads(self.call_tool(tool_name, arguments))
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(result, dict) or "error" in result:
+            return None
+
+        self.answered += 1
+        return self._format_answer(tool_name, arguments, result)
+
+    def get_stats(self) -> dict:
+        """Get fast-path usage statistics."""
+        return {
+            "attempts": self.attempts,
+            "answered": self.answered,
+            "fallbacks": self.attempts - self.answered,
+            "answer_rate": self.answered / self.attempts if self.attempts else 0.0,
+        }
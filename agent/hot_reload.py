@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Modification-time polling for skill.md and knowledge documents."""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class SkillFileWatcher:
+    """Detects edits to a skill's skill.md and knowledge/*.md files by polling mtimes."""
+
+    def __init__(self, skill_dir: str, min_interval_s: float = 2.0):
+        """
+        Take the initial snapshot.
+
+        Args:
+            skill_dir: Path to skills/<skill-name>/ directory
+            min_interval_s: Minimum seconds between two filesystem scans;
+                poll() calls in between return no changes
+        """
+        self.skill_file = os.path.join(skill_dir, "skill.md")
+        self.knowledge_dir = os.path.join(skill_dir, "knowledge")
+        self.min_interval_s = min_interval_s
+
+        self._lock = threading.Lock()
+        self._last_scan = time.monotonic()
+        self._snapshot = self._scan()
+
+    def _paths(self) -> list:
+        paths = [self.skill_file]
+        if os.path.isdir(self.knowledge_dir):
+            paths.extend(str(path) for path in sorted(Path(self.knowledge_dir).glob("*.md")))
+        return paths
+
+    def _scan(self) -> dict:
+        """Map each watched path to its (mtime_ns, size)."""
+        snapshot = {}
+        for path in self._paths():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, force: bool = False) -> dict:
+        """
+        Report what changed since the previous scan.
+
+        Args:
+            force: Scan even if min_interval_s has not passed
+
+        Returns:
+            Dictionary with "skill_md" (bool) and "knowledge" (set of added,
+            modified, or removed knowledge file paths)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_scan < self.min_interval_s:
+                return {"skill_md": False, "knowledge": set()}
+            self._last_scan = now
+
+            snapshot = self._scan()
+            changed = {
+                path for path in set(snapshot) | set(self._snapshot)
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+
+        return {
+            "skill_md": self.skill_file in changed,
+            "knowledge": changed - {self.skill_file},
+        }
@@ -1,41 +1,110 @@
 #!/usr/bin/env python3
 """Knowledge base and RAG retrieval using Chroma vector database."""
 
+import contextlib
+import hashlib
 import os
+import time
 from pathlib import Path
 from typing import Optional
 
+try:
+    import fcntl
+except ImportError:  # Windows: index builds are not coordinated across processes
+    fcntl = None
+
+
+@contextlib.contextmanager
+def index_lock(persist_dir: str, timeout_s: float):
+    """
+    Hold the exclusive lock that serializes index builds across processes.
+
+    Args:
+        persist_dir: Chroma storage directory (the lock file lives inside it)
+        timeout_s: How long to wait for another process to finish its build
+
+    Yields:
+        True if the lock is held, False if the wait timed out
+    """
+    if fcntl is None:
+        yield True
+        return
+
+    with open(os.path.join(persist_dir, ".build.lock"), "a") as lock_file:
+        deadline = time.monotonic() + timeout_s
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    yield False
+                    return
+                time.sleep(0.05)
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
 
 class KnowledgeBase:
     """Vector database-backed RAG system using Chroma."""
 
-    def __init__(self, skill_dir: str):
+    def __init__(self, skill_dir: str, lock_timeout_s: float = 300.0, embedding_function=None):
         """
         Initialize knowledge base for a skill.
 
         Args:
             skill_dir: Path to skills/<skill-name>/ directory
+            lock_timeout_s: How long to wait while another process builds the
+                index before opening it read-only
+            embedding_function: Chroma embedding function to use (e.g. another
+                skill's, so one model serves several skills). Defaults to
+                Chroma's DefaultEmbeddingFunction.
         """
         self.skill_dir = skill_dir
         self.knowledge_dir = os.path.join(skill_dir, "knowledge")
         self.skill_name = os.path.basename(skill_dir)
+        self.persist_dir = os.path.join(skill_dir, ".chroma_db")
+        self.lock_timeout_s = lock_timeout_s
 
         # Initialize Chroma client
         try:
             import chromadb
+            from chromadb.utils import embedding_functions
 
             # Use persistent storage in skill directory
-            persist_dir = os.path.join(skill_dir, ".chroma_db")
-            os.makedirs(persist_dir, exist_ok=True)
-
-            # Use new Chroma API with persistent client
-            self.client = chromadb.PersistentClient(path=persist_dir)
-
-            # Create or get collection (one per skill)
-            self.collection = self.client.get_or_create_collection(
-                name=f"{self.skill_name}_knowledge",
-                metadata={"hnsw:space": "cosine"},
-            )
+            os.makedirs(self.persist_dir, exist_ok=True)
+
+            # Keep a handle on the embedding function so other components
+            # (e.g. the answer cache) can embed text with the same model
+            self.embedding_function = embedding_function or embedding_functions.DefaultEmbeddingFunction()
+
+            # Concurrent get_or_create_collection calls can collide on the
+            # collection name, so creation is serialized with index builds
+            with index_lock(self.persist_dir, self.lock_timeout_s) as locked:
+                # Use new Chroma API with persistent client
+                self.client = chromadb.PersistentClient(path=self.persist_dir)
+
+                if locked:
+                    # Create or get collection (one per skill)
+                    self.collection = self.client.get_or_create_collection(
+                        name=f"{self.skill_name}_knowledge",
+                        metadata={"hnsw:space": "cosine"},
+                        embedding_function=self.embedding_function,
+                    )
+                else:
+                    # Another process is still building; creating here could collide
+                    # with it, so only open a collection that already exists (raises
+                    # if there is none yet, which disables retrieval below)
+                    print(
+                        f"Warning: Knowledge index for '{self.skill_name}' is locked by another process; "
+                        "opening the existing collection."
+                    )
+                    self.collection = self.client.get_collection(
+                        name=f"{self.skill_name}_knowledge",
+                        embedding_function=self.embedding_function,
+                    )
 
             self.available = True
         except ImportError:
@@ -44,33 +113,27 @@ class KnowledgeBase:
             )
             self.client = None
             self.collection = None
+            self.embedding_function = None
             self.available = False
         except Exception as e:
             print(f"Warning: Failed to initialize Chroma: {e}")
             self.client = None
             self.collection = None
+            self.embedding_function = None
             self.available = False
 
         self._load_documents()
 
     def _load_documents(self) -> None:
         """Load all knowledge documents into vector database."""
-        if not self.available or not os.path.exists(self.knowledge_dir):
-            return
-
-        # Check if collection is already populated
-        if self.collection.count() > 0:
-            return  # Already loaded
+        self.sync_documents()
 
+    def _read_chunks(self) -> dict:
+        """Split every knowledge document into chunks keyed by chunk id."""
+        chunks = {}
         doc_files = sorted(Path(self.knowledge_dir).glob("*.md"))
-        if not doc_files:
-            return
 
-        documents = []
-        ids = []
-        metadatas = []
-
-        for idx, doc_file in enumerate(doc_files):
+        for doc_file in doc_files:
             try:
                 with open(doc_file, "r") as f:
                     content = f.read()
@@ -86,74 +149,245 @@ class KnowledgeBase:
                     chunk_id = f"{doc_name}_{section_idx}"
                     chunk_text = section if section_idx == 0 else f"## {section}"
 
-                    documents.append(chunk_text)
-                    ids.append(chunk_id)
-                    metadatas.append(
+                    chunks[chunk_id] = (
+                        chunk_text,
                         {
                             "document": doc_name,
                             "section": section_idx,
                             "source_file": str(doc_file),
-                        }
+                            "content_hash": hashlib.sha1(chunk_text.encode("utf-8")).hexdigest(),
+                        },
                     )
 
             except Exception as e:
                 print(f"Warning: Failed to load {doc_file}: {e}")
 
+        return chunks
+
+    def _knowledge_fingerprint(self) -> str:
+        """Hash of every knowledge document's name and content."""
+        digest = hashlib.sha1()
+        for doc_file in sorted(Path(self.knowledge_dir).glob("*.md")):
+            digest.update(doc_file.name.encode("utf-8") + b"\0")
+            try:
+                digest.update(doc_file.read_bytes())
+            except OSError:
+                pass
+        return digest.hexdigest()
+
+    def _stamp_path(self) -> str:
+        return os.path.join(self.persist_dir, f"{self.skill_name}_knowledge.stamp")
+
+    def _read_stamp(self) -> Optional[str]:
+        try:
+            with open(self._stamp_path()) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _write_stamp(self, fingerprint: str) -> None:
+        # Write-then-rename so a crashed build never leaves a valid-looking stamp
+        tmp_path = f"{self._stamp_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(fingerprint)
+        os.replace(tmp_path, self._stamp_path())
+
+    def sync_documents(self) -> dict:
+        """
+        Bring the collection in line with the knowledge/ directory.
+
+        Only chunks whose text changed are embedded again; a chunk whose text
+        already exists under another id (e.g. after a section was inserted
+        above it) reuses the stored embedding.
+
+        Builds are serialized across processes with a lock file in
+        .chroma_db/: one process embeds while the others wait, then find the
+        index stamp current and skip straight to retrieval. If the lock is
+        not released within lock_timeout_s the index is used read-only.
+
+        Returns:
+            Counts of added, updated, removed, and unchanged chunks, plus how
+            many were embedded
+        """
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0, "embedded": 0}
+        if not self.available or not os.path.exists(self.knowledge_dir):
+            return counts
+
+        os.makedirs(self.persist_dir, exist_ok=True)
+        with index_lock(self.persist_dir, self.lock_timeout_s) as locked:
+            if not locked:
+                print(
+                    f"Warning: Knowledge index for '{self.skill_name}' is locked by another process; "
+                    "opening it read-only."
+                )
+                return counts
+
+            fingerprint = self._knowledge_fingerprint()
+            if fingerprint == self._read_stamp():
+                counts["unchanged"] = self.collection.count()
+                return counts
+
+            self._sync_chunks(counts)
+            self._write_stamp(fingerprint)
+        return counts
+
+    def _sync_chunks(self, counts: dict) -> None:
+        """Upsert added or edited chunks and delete removed ones (caller holds the index lock)."""
+        chunks = self._read_chunks()
+        existing = self.collection.get(include=["metadatas"])
+        existing_hashes = {
+            chunk_id: (metadata or {}).get("content_hash")
+            for chunk_id, metadata in zip(existing["ids"], existing["metadatas"])
+        }
+        ids_by_hash = {content_hash: chunk_id for chunk_id, content_hash in existing_hashes.items() if content_hash}
+
+        changed = []
+        for chunk_id, (_, metadata) in chunks.items():
+            if chunk_id not in existing_hashes:
+                counts["added"] += 1
+                changed.append(chunk_id)
+            elif existing_hashes[chunk_id] != metadata["content_hash"]:
+                counts["updated"] += 1
+                changed.append(chunk_id)
+            else:
+                counts["unchanged"] += 1
+
+        removed = [chunk_id for chunk_id in existing_hashes if chunk_id not in chunks]
+        counts["removed"] = len(removed)
+
+        # Reuse stored embeddings for text that only moved to a new id
+        reusable = {
+            chunk_id: ids_by_hash[chunks[chunk_id][1]["content_hash"]]
+            for chunk_id in changed
+            if chunks[chunk_id][1]["content_hash"] in ids_by_hash
+        }
+        if reusable:
+            stored = self.collection.get(ids=list(set(reusable.values())), include=["embeddings"])
+            vectors = dict(zip(stored["ids"], stored["embeddings"]))
+            moved = [chunk_id for chunk_id in changed if reusable.get(chunk_id) in vectors]
+            if moved:
+                self.collection.upsert(
+                    ids=moved,
+                    documents=[chunks[chunk_id][0] for chunk_id in moved],
+                    metadatas=[chunks[chunk_id][1] for chunk_id in moved],
+                    embeddings=[list(vectors[reusable[chunk_id]]) for chunk_id in moved],
+                )
+                changed = [chunk_id for chunk_id in changed if chunk_id not in set(moved)]
+
         # Add to collection
-        if documents:
-            self.collection.add(
-                documents=documents,
-                ids=ids,
-                metadatas=metadatas,
+        if changed:
+            self.collection.upsert(
+                ids=changed,
+                documents=[chunks[chunk_id][0] for chunk_id in changed],
+                metadatas=[chunks[chunk_id][1] for chunk_id in changed],
             )
+            counts["embedded"] = len(changed)
+        if removed:
+            self.collection.delete(ids=removed)
 
-    def retrieve(self, query: str, top_k: int = 3) -> list:
+    def retrieve(self, query: str, top_k: int = 3, query_vector: list = None) -> list:
         """
         Retrieve relevant knowledge using semantic search.
 
         Args:
             query: User question or context
             top_k: Number of top results to return
+            query_vector: The query's embedding from the same model, if already
+                computed (skips embedding it again)
 
         Returns:
             List of relevant document chunks with metadata
         """
-        if not self.available or not self.collection:
-            return []
+        query_vectors = None if query_vector is None else [query_vector]
+        return self.retrieve_many([query], top_k=top_k, query_vectors=query_vectors)[0]
+
+    def retrieve_many(self, queries: list, top_k: int = 3, query_vectors: list = None) -> list:
+        """
+        Retrieve knowledge for several queries with one batched embedding call.
+
+        Args:
+            queries: List of user questions
+            top_k: Number of top results to return per query
+            query_vectors: Embeddings already computed for the queries, one per
+                query (None entries are embedded here, in one batch)
+
+        Returns:
+            One list of document chunks (as returned by retrieve) per query
+        """
+        if not self.available or not self.collection or not queries:
+            return [[] for _ in queries]
 
         try:
+            if query_vectors is None:
+                query = {"query_texts": list(queries)}
+            else:
+                vectors = list(query_vectors)
+                missing = [i for i, vector in enumerate(vectors) if vector is None]
+                if missing:
+                    embedded = self.embed([queries[i] for i in missing])
+                    if len(embedded) != len(missing):
+                        return [[] for _ in queries]
+                    for i, vector in zip(missing, embedded):
+                        vectors[i] = vector
+                query = {"query_embeddings": vectors}
             results = self.collection.query(
-                query_texts=[query],
+                **query,
                 n_results=top_k,
                 include=["documents", "metadatas", "distances"],
             )
 
             # Format results
-            retrieved = []
-            if results and results["documents"]:
-                for doc, metadata, distance in zip(
-                    results["documents"][0],
-                    results["metadatas"][0],
-                    results["distances"][0],
-                ):
-                    # Chroma returns distances (0 = identical, 2 = opposite)
-                    # Convert to similarity score (higher is better)
-                    similarity = 1 - (distance / 2)
-
-                    retrieved.append(
-                        {
-                            "name": metadata.get("document", "Unknown"),
-                            "section": metadata.get("section", 0),
-                            "content": doc,
-                            "score": similarity,
-                            "source": metadata.get("source_file", ""),
-                        }
-                    )
-
-            return retrieved
+            all_retrieved = []
+            for query_idx in range(len(queries)):
+                retrieved = []
+                if results and results["documents"]:
+                    for doc, metadata, distance in zip(
+                        results["documents"][query_idx],
+                        results["metadatas"][query_idx],
+                        results["distances"][query_idx],
+                    ):
+                        # Chroma returns distances (0 = identical, 2 = opposite)
+                        # Convert to similarity score (higher is better)
+                        similarity = 1 - (distance / 2)
+
+                        retrieved.append(
+                            {
+                                "name": metadata.get("document", "Unknown"),
+                                "section": metadata.get("section", 0),
+                                "content": doc,
+                                "score": similarity,
+                                "source": metadata.get("source_file", ""),
+                            }
+                        )
+                all_retrieved.append(retrieved)
+
+            return all_retrieved
 
         except Exception as e:
             print(f"Warning: Retrieval failed: {e}")
+            return [[] for _ in queries]
+
+    def embed(self, texts: list) -> list:
+        """
+        Embed texts with the same model used for the knowledge collection.
+
+        Args:
+            texts: List of strings to embed
+
+        Returns:
+            List of embedding vectors (lists of floats), or an empty list if
+            embeddings are unavailable
+        """
+        if not self.available or self.embedding_function is None or not texts:
+            return []
+
+        try:
+            return [
+                [float(x) for x in vector]
+                for vector in self.embedding_function(list(texts))
+            ]
+        except Exception as e:
+            print(f"Warning: Embedding failed: {e}")
             return []
 
     def format_context(self, retrieved_docs: list) -> str:
@@ -180,5 +414,5 @@ class KnowledgeBase:
             "status": "available",
             "collection_name": self.collection.name,
             "document_count": self.collection.count(),
-            "storage_path": os.path.join(self.skill_dir, ".chroma_db"),
+            "storage_path": self.persist_dir,
         }
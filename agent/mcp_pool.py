@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""Pool of long-lived MCP server subprocesses used as the agent's tool backend."""
+
+import asyncio
+import atexit
+import contextlib
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+try:
+    from mcp.client.streamable_http import streamable_http_client
+except ImportError:  # mcp < 1.24
+    from mcp.client.streamable_http import streamablehttp_client as streamable_http_client
+
+SERVER_SCRIPT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "mcp_server",
+    "server.py",
+)
+
+
+class _Worker:
+    """One server subprocess and its client session."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.session = None
+        self.healthy = False
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.restarts = 0
+        self.restart_requested = None  # asyncio.Event, created on the pool loop
+
+
+class MCPWorkerPool:
+    """Sends tool calls to a pool of persistent mcp_server workers over stdio (or HTTP sessions)."""
+
+    def __init__(
+        self,
+        size: int = 2,
+        server_args: tuple = (),
+        url: str = None,
+        call_timeout_s: float = 60.0,
+        start_timeout_s: float = 30.0,
+        health_check_interval_s: float = 5.0,
+        restart_backoff_s: float = 0.5,
+    ):
+        """
+        Initialize the pool. Workers are started by start().
+
+        Args:
+            size: Number of server subprocesses
+            server_args: Extra command-line options for server.py
+                (e.g. ("--pool", "process"))
+            url: Streamable HTTP endpoint of an already running server
+                (e.g. "http://127.0.0.1:8000/mcp/"). If given, the pool holds
+                `size` sessions to that server instead of starting subprocesses.
+            call_timeout_s: Per-call timeout in seconds
+            start_timeout_s: How long calls wait for a healthy worker
+            health_check_interval_s: Interval between pings to each worker
+            restart_backoff_s: Delay before restarting a crashed worker
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+
+        self.size = size
+        self.url = url
+        self.server_params = StdioServerParameters(
+            command=sys.executable, args=[SERVER_SCRIPT, *server_args]
+        )
+        self.call_timeout_s = call_timeout_s
+        self.start_timeout_s = start_timeout_s
+        self.health_check_interval_s = health_check_interval_s
+        self.restart_backoff_s = restart_backoff_s
+
+        self.workers = [_Worker(i) for i in range(size)]
+        self._round_robin = itertools.count()
+        self._loop = None
+        self._thread = None
+        self._tasks = []
+        self._closing = False
+        self._lock = threading.Lock()
+
+    def start(self, wait: bool = True) -> "MCPWorkerPool":
+        """
+        Start the workers on a background event loop.
+
+        Args:
+            wait: Block until every worker is ready (or start_timeout_s passes)
+
+        Returns:
+            The pool itself
+        """
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name="mcp-pool", daemon=True)
+            self._thread.start()
+            asyncio.run_coroutine_threadsafe(self._start_workers(), self._loop).result()
+            atexit.register(self.close)
+
+        if wait:
+            deadline = time.monotonic() + self.start_timeout_s
+            while time.monotonic() < deadline and not all(w.healthy for w in self.workers):
+                time.sleep(0.02)
+        return self
+
+    async def _start_workers(self) -> None:
+        for worker in self.workers:
+            worker.restart_requested = asyncio.Event()
+            self._tasks.append(asyncio.create_task(self._supervise(worker)))
+
+    @contextlib.asynccontextmanager
+    async def _open_transport(self):
+        """Open one worker connection; yields its (read, write) streams."""
+        if self.url:
+            async with streamable_http_client(self.url) as (read, write, _):
+                yield read, write
+        else:
+            async with stdio_client(self.server_params) as (read, write):
+                yield read, write
+
+    async def _supervise(self, worker: _Worker) -> None:
+        """Keep one worker connection open, reconnecting after crashes."""
+        while not self._closing:
+            try:
+                async with self._open_transport() as (read, write):
+                    async with ClientSession(read, write) as session:
+                        await session.initialize()
+                        worker.session = session
+                        worker.restart_requested.clear()
+                        worker.healthy = True
+                        await self._watch(worker, session)
+            except Exception:
+                # Crashed or unreachable worker; restarted below
+                pass
+            finally:
+                worker.healthy = False
+                worker.session = None
+
+            if self._closing:
+                break
+            worker.restarts += 1
+            await asyncio.sleep(self.restart_backoff_s)
+
+    async def _watch(self, worker: _Worker, session: ClientSession) -> None:
+        """Return when the worker should be restarted or the pool is closing."""
+        while not self._closing:
+            try:
+                await asyncio.wait_for(worker.restart_requested.wait(), self.health_check_interval_s)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await asyncio.wait_for(session.send_ping(), self.health_check_interval_s)
+            except Exception:
+                return
+
+    async def _pick_worker(self) -> _Worker:
+        """Healthy worker with the fewest calls in flight (round-robin among ties)."""
+        deadline = time.monotonic() + self.start_timeout_s
+        while True:
+            healthy = [w for w in self.workers if w.healthy and w.session is not None]
+            if healthy:
+                offset = next(self._round_robin)
+                rotated = healthy[offset % len(healthy):] + healthy[: offset % len(healthy)]
+                return min(rotated, key=lambda w: w.in_flight)
+            if self._closing or time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(0.02)
+
+    async def _call(self, name: str, arguments: dict) -> dict:
+        last_error = None
+        # Tools are pure functions, so a call lost to a crashed worker is retried once
+        for _ in range(2):
+            worker = await self._pick_worker()
+            if worker is None:
+                return {"error": "Tool execution failed: no MCP worker available"}
+
+            worker.in_flight += 1
+            worker.calls += 1
+            try:
+                response = await asyncio.wait_for(
+                    worker.session.call_tool(name, arguments), self.call_timeout_s
+                )
+                text = response.content[0].text if response.content else "{}"
+                try:
+                    return json.loads(text)
+                except json.JSONDecodeError:
+                    return {"error": f"Tool execution failed: {text}"}
+            except asyncio.TimeoutError:
+                return {"error": f"Tool execution timed out after {self.call_timeout_s}s: {name}"}
+            except Exception as e:
+                last_error = e
+                worker.failures += 1
+                worker.healthy = False
+                worker.restart_requested.set()
+            finally:
+                worker.in_flight -= 1
+
+        return {"error": f"Tool execution failed: MCP worker error ({last_error})"}
+
+    def call(self, name: str, arguments: dict) -> dict:
+        """
+        Execute a tool call on the least-loaded worker. Safe to call from many threads.
+
+        Args:
+            name: Tool name
+            arguments: Tool input arguments
+
+        Returns:
+            Tool result dictionary (with an "error" key on failure)
+        """
+        if self._thread is None:
+            self.start()
+        future = asyncio.run_coroutine_threadsafe(self._call(name, arguments), self._loop)
+        return future.result()
+
+    def get_stats(self) -> dict:
+        """Get per-worker health, load, and restart counts."""
+        return {
+            "size": self.size,
+            "healthy": sum(w.healthy for w in self.workers),
+            "workers": [
+                {
+                    "index": w.index,
+                    "healthy": w.healthy,
+                    "in_flight": w.in_flight,
+                    "calls": w.calls,
+                    "failures": w.failures,
+                    "restarts": w.restarts,
+                }
+                for w in self.workers
+            ],
+        }
+
+    def close(self, timeout_s: float = 10.0) -> None:
+        """Stop all workers and the background loop."""
+        with self._lock:
+            if self._thread is None or self._closing:
+                return
+            self._closing = True
+
+        async def stop():
+            for worker in self.workers:
+                worker.restart_requested.set()
+            await asyncio.wait(self._tasks, timeout=timeout_s)
+
+        try:
+            asyncio.run_coroutine_threadsafe(stop(), self._loop).result(timeout_s + 1)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout_s)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Per-turn routing between a fast model and a strong model."""
+
+import math
+import re
+import threading
+
+DEFAULT_STRONG_MODEL = "claude-sonnet-4-6"
+DEFAULT_FAST_MODEL = "claude-haiku-4-5"
+
+# skill.md "## Model Routing" bullet labels -> config keys
+_CONFIG_KEYS = {
+    "strong model": "strong_model",
+    "fast model": "fast_model",
+    "simple query max words": "simple_query_max_words",
+    "strong retrieval score": "strong_retrieval_score",
+    "escalate final synthesis": "escalate_final_synthesis",
+}
+
+_REASONING_WORDS = re.compile(
+    r"\b(why|explain|compare|comparison|versus|vs|design|designing|recommend|should|"
+    r"trade-?offs?|optimi[sz]e|troubleshoot|difference|pros|cons)\b",
+    re.IGNORECASE,
+)
+
+
+def parse_routing_config(skill_md: str) -> dict:
+    """
+    Parse the optional "## Model Routing" section of a skill.md file.
+
+    The section is a bullet list such as "- **Fast model:** claude-haiku-4-5".
+
+    Args:
+        skill_md: Raw skill.md text
+
+    Returns:
+        Dictionary of routing settings found in the section
+    """
+    config = {}
+    in_section = False
+    for line in skill_md.split("\n"):
+        if line.startswith("## "):
+            in_section = "Model Routing" in line
+            continue
+        if not in_section:
+            continue
+
+        match = re.match(r"\s*-\s*\*\*(.+?):\*\*\s*(.+)", line)
+        if not match:
+            continue
+        key = _CONFIG_KEYS.get(match.group(1).strip().lower())
+        if key is None:
+            continue
+
+        value = match.group(2).strip().strip("`")
+        if key == "simple_query_max_words":
+            value = int(value)
+        elif key == "strong_retrieval_score":
+            value = float(value)
+        elif key == "escalate_final_synthesis":
+            value = value.lower() in ("true", "yes", "on", "1")
+        config[key] = value
+    return config
+
+
+def _percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+class ModelRouter:
+    """Chooses a model per loop iteration and records per-model latency and tokens."""
+
+    def __init__(
+        self,
+        strong_model: str = DEFAULT_STRONG_MODEL,
+        fast_model: str = DEFAULT_FAST_MODEL,
+        simple_query_max_words: int = 30,
+        strong_retrieval_score: float = 0.6,
+        escalate_final_synthesis: bool = True,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            strong_model: Model used for planning and final synthesis
+            fast_model: Model used for simple queries and tool-dispatch iterations
+                (set equal to strong_model to disable routing)
+            simple_query_max_words: Longer questions are treated as complex
+            strong_retrieval_score: Questions whose best knowledge-base match
+                scores at least this high are treated as complex (they need
+                synthesis over retrieved material)
+            escalate_final_synthesis: For complex questions, send the call after
+                a clean round of tool results (the likely final synthesis) to the
+                strong model instead of the fast model
+        """
+        self.strong_model = strong_model
+        self.fast_model = fast_model
+        self.simple_query_max_words = simple_query_max_words
+        self.strong_retrieval_score = strong_retrieval_score
+        self.escalate_final_synthesis = escalate_final_synthesis
+
+        # Per-model call statistics and the escalation count, shared by
+        # reconfigured copies of the router
+        self._usage = {"models": {}, "escalations": 0}
+        self._lock = threading.Lock()
+
+    def reconfigured(self, **settings) -> "ModelRouter":
+        """
+        A router with new settings that records into this router's statistics.
+
+        Swapping the returned router in with one assignment changes every
+        setting at once, while requests still holding this router keep
+        counting toward the same totals.
+
+        Args:
+            **settings: ModelRouter constructor arguments
+
+        Returns:
+            New ModelRouter sharing this one's statistics
+        """
+        router = ModelRouter(**settings)
+        router._usage, router._lock = self._usage, self._lock
+        return router
+
+    @property
+    def enabled(self) -> bool:
+        """Whether two distinct models are being routed between."""
+        return self.fast_model != self.strong_model
+
+    def classify(self, query: str, retrieved_docs: list = None) -> str:
+        """
+        Classify a question as "simple" or "complex".
+
+        Args:
+            query: User question
+            retrieved_docs: Knowledge-base results for the question (optional)
+
+        Returns:
+            "simple" or "complex"
+        """
+        if _REASONING_WORDS.search(query):
+            return "complex"
+        if query.count("?") > 1 or len(query.split()) > self.simple_query_max_words:
+            return "complex"
+        if retrieved_docs:
+            best_score = max(doc.get("score", 0.0) for doc in retrieved_docs)
+            if best_score >= self.strong_retrieval_score:
+                return "complex"
+        return "simple"
+
+    def choose(self, complexity: str, after_tool_results: bool, tools_failed: bool = False) -> str:
+        """
+        Pick the model for the next call.
+
+        Args:
+            complexity: Result of classify()
+            after_tool_results: Whether the call follows a round of tool results
+            tools_failed: Whether any call of that round returned an error
+
+        Returns:
+            Model name
+        """
+        if self.should_escalate(complexity, after_tool_results, tools_failed):
+            return self.strong_model
+        if complexity == "simple" or after_tool_results:
+            return self.fast_model
+        return self.strong_model
+
+    def should_escalate(self, complexity: str, after_tool_results: bool, tools_failed: bool = False) -> bool:
+        """
+        Whether a call that would go to the fast model goes to the strong model instead.
+
+        After a clean round of tool results, a complex question's next call
+        most likely writes the final answer, so it is sent to the strong model
+        up front rather than drafted by the fast model and redone. A round
+        with tool errors is more likely followed by retries, which stay fast.
+        """
+        return (
+            self.enabled
+            and self.escalate_final_synthesis
+            and complexity == "complex"
+            and after_tool_results
+            and not tools_failed
+        )
+
+    def record(self, model: str, latency_s: float, usage=None, escalation: bool = False) -> None:
+        """
+        Record one model call.
+
+        Args:
+            model: Model that served the call
+            latency_s: Wall time of the call in seconds
+            usage: Response usage object with input_tokens/output_tokens (optional)
+            escalation: Whether the call was escalated from the fast model
+        """
+        with self._lock:
+            stats = self._usage["models"].setdefault(
+                model, {"calls": 0, "input_tokens": 0, "output_tokens": 0, "latencies": []}
+            )
+            stats["calls"] += 1
+            stats["latencies"].append(latency_s)
+            if usage is not None:
+                stats["input_tokens"] += getattr(usage, "input_tokens", 0) or 0
+                stats["output_tokens"] += getattr(usage, "output_tokens", 0) or 0
+            if escalation:
+                self._usage["escalations"] += 1
+
+    def get_stats(self) -> dict:
+        """Get per-model call counts, token totals, and latency percentiles."""
+        with self._lock:
+            models = {}
+            for model, stats in self._usage["models"].items():
+                latencies = stats["latencies"]
+                models[model] = {
+                    "calls": stats["calls"],
+                    "input_tokens": stats["input_tokens"],
+                    "output_tokens": stats["output_tokens"],
+                    "total_latency_s": sum(latencies),
+                    "mean_latency_s": sum(latencies) / len(latencies) if latencies else 0.0,
+                    "p50_latency_s": _percentile(latencies, 0.50),
+                    "p95_latency_s": _percentile(latencies, 0.95),
+                }
+            return {
+                "strong_model": self.strong_model,
+                "fast_model": self.fast_model,
+                "escalations": self._usage["escalations"],
+                "models": models,
+            }
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""KnowledgeBase stand-in that queries the MCP server's shared retrieval service."""
+
+from agent.knowledge_base import KnowledgeBase
+from agent.mcp_pool import MCPWorkerPool
+
+
+class RemoteKnowledgeBase:
+    """Same interface as KnowledgeBase, served by a long-running MCP server over HTTP."""
+
+    # Formatting is local and identical to the in-process knowledge base
+    format_context = KnowledgeBase.format_context
+
+    def __init__(self, url: str, skill_name: str = None, connections: int = 1, timeout_s: float = 30.0):
+        """
+        Connect to the server's knowledge tools.
+
+        Args:
+            url: Streamable HTTP endpoint (e.g. "http://127.0.0.1:8000/mcp/")
+            skill_name: Skill whose knowledge to query (default: the server's
+                skill); retrieval is disabled if the server cannot serve it
+            connections: Number of sessions to hold open to the server
+            timeout_s: Connection and per-call timeout in seconds
+        """
+        self.url = url
+        self.skill_name = skill_name
+        self._pool = MCPWorkerPool(
+            size=connections, url=url, call_timeout_s=timeout_s, start_timeout_s=timeout_s
+        ).start()
+        self._skill_args = {"skill": skill_name} if skill_name else {}
+
+        stats = self._pool.call("knowledge_stats", dict(self._skill_args))
+        self.available = bool(stats.get("available"))
+        if "error" in stats:
+            print(f"Warning: Knowledge service at {url} unavailable: {stats['error']}")
+        elif skill_name and stats.get("skill") != skill_name:
+            print(
+                f"Warning: Knowledge service at {url} serves '{stats.get('skill')}', "
+                f"not '{skill_name}'. Knowledge base retrieval will be disabled."
+            )
+            self.available = False
+
+    def retrieve(self, query: str, top_k: int = 3, query_vector: list = None) -> list:
+        """
+        Retrieve relevant knowledge using the server's semantic search.
+
+        Args:
+            query: User question or context
+            top_k: Number of top results to return
+            query_vector: The query's vector from embed, if already computed
+                (the server then skips embedding it)
+
+        Returns:
+            List of relevant document chunks with metadata
+        """
+        if not self.available:
+            return []
+        arguments = {"query": query, "top_k": top_k, **self._skill_args}
+        if query_vector is not None:
+            arguments["embedding"] = list(query_vector)
+        result = self._pool.call("knowledge_search", arguments)
+        if "error" in result:
+            print(f"Warning: Retrieval failed: {result['error']}")
+            return []
+        return result["results"]
+
+    def retrieve_many(self, queries: list, top_k: int = 3) -> list:
+        """
+        Retrieve knowledge for several queries in one request, embedded as one batch on the server.
+
+        Args:
+            queries: User questions or contexts
+            top_k: Number of top results per query
+
+        Returns:
+            One list of document chunks per query (empty lists if retrieval fails)
+        """
+        if not self.available or not queries:
+            return [[] for _ in queries]
+        result = self._pool.call(
+            "knowledge_search_many", {"queries": list(queries), "top_k": top_k, **self._skill_args}
+        )
+        if "error" in result:
+            print(f"Warning: Retrieval failed: {result['error']}")
+            return [[] for _ in queries]
+        return result["results"]
+
+    def embed(self, texts: list) -> list:
+        """
+        Embed texts with the server's embedding model.
+
+        Args:
+            texts: List of strings to embed
+
+        Returns:
+            List of embedding vectors, or an empty list if embeddings are unavailable
+        """
+        if not self.available or not texts:
+            return []
+        result = self._pool.call("embed_texts", {"texts": list(texts)})
+        if "error" in result:
+            print(f"Warning: Embedding failed: {result['error']}")
+            return []
+        return result["embeddings"]
+
+    def get_stats(self) -> dict:
+        """Get statistics about the remote knowledge base."""
+        stats = self._pool.call("knowledge_stats", dict(self._skill_args))
+        if "error" in stats:
+            return {"status": "unavailable", "remote_url": self.url}
+        return {**stats.get("knowledge_base", {}), "remote_url": self.url}
+
+    def close(self) -> None:
+        """Close the connections to the server."""
+        self._pool.close()
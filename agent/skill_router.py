@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Per-request routing of questions to the relevant loaded skills."""
+
+import math
+import re
+import threading
+from typing import Callable
+
+
+def parse_skill_header(skill_md: str) -> dict:
+    """
+    Read the title and the **Purpose:** / **Domain:** lines at the top of a skill.md.
+
+    Args:
+        skill_md: Raw skill.md text
+
+    Returns:
+        Dictionary with "title", "purpose", and "domain" (empty strings if missing)
+    """
+    header = {"title": "", "purpose": "", "domain": ""}
+    for line in skill_md.split("\n"):
+        line = line.strip()
+        if line.startswith("# ") and not header["title"]:
+            header["title"] = line[2:].strip()
+        elif line.startswith("## "):
+            break
+        else:
+            match = re.match(r"\*\*(Purpose|Domain):\*\*\s*(.*)", line)
+            if match:
+                header[match.group(1).lower()] = match.group(2).strip()
+    return header
+
+
+class LoadedSkill:
+    """One skill's definition, tools, knowledge base, and tool selector."""
+
+    def __init__(self, name: str, skill_dir: str, skill_md: str, tools: list, knowledge_base, tool_selector=None):
+        self.name = name
+        self.skill_dir = skill_dir
+        self.skill_md = skill_md
+        self.tools = tools
+        self.knowledge_base = knowledge_base
+        self.tool_selector = tool_selector
+
+
+def _normalize(vector: list) -> list:
+    """Scale a vector to unit length."""
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else list(vector)
+
+
+class SkillRouter:
+    """Picks the skills whose Purpose/Domain header best matches a question."""
+
+    def __init__(
+        self,
+        skills: dict,
+        embed_fn: Callable[[list], list],
+        max_skills: int = 2,
+        min_similarity: float = 0.2,
+        relative_margin: float = 0.1,
+    ):
+        """
+        Embed each skill's header once.
+
+        Args:
+            skills: Mapping of skill name to raw skill.md text
+            embed_fn: Function mapping a list of texts to a list of vectors
+                (e.g. KnowledgeBase.embed). An empty result disables routing.
+            max_skills: Most skills included in one request
+            min_similarity: If no skill matches at least this well, every
+                skill is included instead
+            relative_margin: Skills after the best match are included only if
+                they score within this margin of it
+        """
+        self.names = list(skills)
+        self.embed_fn = embed_fn
+        self.max_skills = max_skills
+        self.min_similarity = min_similarity
+        self.relative_margin = relative_margin
+
+        documents = []
+        for name, skill_md in skills.items():
+            header = parse_skill_header(skill_md)
+            documents.append(
+                f"{name.replace('_', ' ')}. {header['title']}. {header['purpose']} Domain: {header['domain']}"
+            )
+        vectors = embed_fn(documents) if documents else []
+        self.skill_vectors = [_normalize(v) for v in vectors] if len(vectors) == len(documents) else []
+
+        self._lock = threading.Lock()
+        self._routes = 0
+        self._fallbacks = 0
+        self._skills_included = 0
+        self._counts = {name: 0 for name in self.names}
+
+    @property
+    def available(self) -> bool:
+        """Whether skill headers could be embedded."""
+        return bool(self.skill_vectors)
+
+    def score(self, query: str, query_vector: list = None) -> dict:
+        """
+        Cosine similarity of a question to each skill header.
+
+        Args:
+            query: User question
+            query_vector: The question's embedding, if already computed
+                (embedded here if omitted)
+
+        Returns:
+            Dictionary mapping skill name to similarity (empty if embeddings
+            are unavailable)
+        """
+        if not self.available:
+            return {}
+        if query_vector is None:
+            vectors = self.embed_fn([query])
+            if not vectors:
+                return {}
+            query_vector = vectors[0]
+        query_vector = _normalize(query_vector)
+        return {
+            name: sum(a * b for a, b in zip(query_vector, skill_vector))
+            for name, skill_vector in zip(self.names, self.skill_vectors)
+        }
+
+    def route(self, query: str, query_vector: list = None) -> list:
+        """
+        Choose the skills to include for one request.
+
+        Args:
+            query: User question
+            query_vector: The question's embedding, if already computed
+
+        Returns:
+            Skill names in load order
+        """
+        scores = self.score(query, query_vector)
+        selected = None
+        if scores:
+            ranked = sorted(self.names, key=lambda name: scores[name], reverse=True)
+            best = scores[ranked[0]]
+            if best >= self.min_similarity:
+                keep = {
+                    name for name in ranked[: self.max_skills]
+                    if scores[name] >= self.min_similarity and scores[name] >= best - self.relative_margin
+                }
+                selected = [name for name in self.names if name in keep]
+
+        with self._lock:
+            self._routes += 1
+            if selected is None:
+                self._fallbacks += 1
+                selected = list(self.names)
+            self._skills_included += len(selected)
+            for name in selected:
+                self._counts[name] += 1
+
+        return selected
+
+    def get_stats(self) -> dict:
+        """Get routing counts per skill and the mean number of skills per request."""
+        with self._lock:
+            return {
+                "routes": self._routes,
+                "all_skills_fallbacks": self._fallbacks,
+                "skill_count": len(self.names),
+                "mean_skills_included": self._skills_included / self._routes if self._routes else 0.0,
+                "requests_per_skill": dict(self._counts),
+            }
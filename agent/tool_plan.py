@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""Local executor for a small DAG of chained tool calls (the run_plan tool)."""
+
+import concurrent.futures
+import re
+import threading
+from typing import Callable
+
+# "$step1.relative_permeability" or "$step1" (whole result)
+_REFERENCE_PATTERN = re.compile(r"^\$([A-Za-z_][\w-]*)(?:\.(.+))?$")
+
+MAX_PLAN_STEPS = 20
+
+# How often a cancellable plan checks its cancel event while steps run
+CANCEL_POLL_S = 0.05
+
+
+class PlanError(ValueError):
+    """Raised when a plan is malformed (bad steps, unknown references, cycles)."""
+
+
+def _find_references(value) -> set:
+    """Collect the step ids referenced anywhere inside an argument value."""
+    if isinstance(value, str):
+        match = _REFERENCE_PATTERN.match(value)
+        return {match.group(1)} if match else set()
+    if isinstance(value, dict):
+        return set().union(*(_find_references(v) for v in value.values())) if value else set()
+    if isinstance(value, list):
+        return set().union(*(_find_references(v) for v in value)) if value else set()
+    return set()
+
+
+def _lookup_path(result, path: str):
+    """Follow a dotted path (keys or list indices) into a step result."""
+    value = result
+    for part in path.split("."):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        elif isinstance(value, list) and part.lstrip("-").isdigit():
+            value = value[int(part)]
+        else:
+            raise KeyError(part)
+    return value
+
+
+def _resolve(value, results: dict):
+    """Replace references with values from earlier step results."""
+    if isinstance(value, str):
+        match = _REFERENCE_PATTERN.match(value)
+        if not match:
+            return value
+        step_id, path = match.groups()
+        if path is None:
+            return results[step_id]
+        try:
+            return _lookup_path(results[step_id], path)
+        except (KeyError, IndexError):
+            raise PlanError(f"Step '{step_id}' result has no field '{path}'")
+    if isinstance(value, dict):
+        return {key: _resolve(v, results) for key, v in value.items()}
+    if isinstance(value, list):
+        return [_resolve(v, results) for v in value]
+    return value
+
+
+def validate_plan(steps: list) -> dict:
+    """
+    Check a plan and compute each step's dependencies.
+
+    Args:
+        steps: List of {"id": str, "tool": str, "args": dict} step definitions
+
+    Returns:
+        Dictionary mapping step id to the set of step ids it depends on
+
+    Raises:
+        PlanError: If the plan is malformed or contains a cycle
+    """
+    if not isinstance(steps, list) or not steps:
+        raise PlanError("steps must be a non-empty list")
+    if len(steps) > MAX_PLAN_STEPS:
+        raise PlanError(f"Plans are limited to {MAX_PLAN_STEPS} steps")
+
+    dependencies = {}
+    for step in steps:
+        if not isinstance(step, dict) or not step.get("id") or not step.get("tool"):
+            raise PlanError("Each step needs an 'id' and a 'tool'")
+        if step["id"] in dependencies:
+            raise PlanError(f"Duplicate step id '{step['id']}'")
+        if step["tool"] == "run_plan":
+            raise PlanError("Plans cannot contain run_plan steps")
+        if not isinstance(step.get("args", {}), dict):
+            raise PlanError(f"Step '{step['id']}' args must be an object")
+        dependencies[step["id"]] = _find_references(step.get("args", {}))
+
+    for step_id, deps in dependencies.items():
+        unknown = deps - set(dependencies)
+        if unknown:
+            raise PlanError(f"Step '{step_id}' references unknown step(s): {', '.join(sorted(unknown))}")
+
+    # Kahn's algorithm: every step must become ready eventually
+    remaining = {step_id: set(deps) for step_id, deps in dependencies.items()}
+    ready = [step_id for step_id, deps in remaining.items() if not deps]
+    visited = 0
+    while ready:
+        current = ready.pop()
+        visited += 1
+        for step_id, deps in remaining.items():
+            if current in deps:
+                deps.discard(current)
+                if not deps:
+                    ready.append(step_id)
+    if visited != len(dependencies):
+        raise PlanError("Plan contains a dependency cycle")
+
+    return dependencies
+
+
+def execute_plan(
+    steps: list,
+    call_tool: Callable[[str, dict], dict],
+    max_workers: int = 4,
+    cancel_event: threading.Event = None,
+) -> dict:
+    """
+    Execute a DAG of tool calls locally, running independent steps in parallel.
+
+    A string argument of the form "$<step id>.<field>" is replaced by that
+    field of the referenced step's result ("$<step id>" alone passes the whole
+    result). A step whose dependency failed is skipped.
+
+    Args:
+        steps: List of {"id": str, "tool": str, "args": dict} step definitions
+        call_tool: Function executing one tool call and returning its result dict
+        max_workers: Maximum number of steps running at once
+        cancel_event: Once set, no further steps start and the plan returns
+            without waiting for running steps (reported as cancelled)
+
+    Returns:
+        Dictionary with per-step results, completion order, and errors
+    """
+    try:
+        dependencies = validate_plan(steps)
+    except PlanError as e:
+        return {"error": f"Invalid plan: {e}"}
+
+    by_id = {step["id"]: step for step in steps}
+    results = {}
+    errors = {}
+    order = []
+    pending = set(by_id)
+    running = {}
+    # Poll for cancellation only when it can happen
+    poll_s = None if cancel_event is None else CANCEL_POLL_S
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit_ready():
+        # A skip settles its dependents at once, whatever their id order, so
+        # repeat the pass until it stops making progress
+        progressed = True
+        while progressed:
+            progressed = False
+            for step_id in sorted(pending):
+                deps = dependencies[step_id]
+                if not deps <= set(results) | set(errors):
+                    continue
+                pending.discard(step_id)
+                progressed = True
+                failed = sorted(deps & set(errors))
+                if failed:
+                    errors[step_id] = f"Skipped: depends on failed step(s) {', '.join(failed)}"
+                    continue
+                try:
+                    arguments = _resolve(by_id[step_id].get("args", {}), results)
+                except PlanError as e:
+                    errors[step_id] = str(e)
+                    continue
+                future = executor.submit(call_tool, by_id[step_id]["tool"], arguments)
+                running[future] = step_id
+
+    try:
+        submit_ready()
+        while running or pending:
+            if cancel_event is not None and cancel_event.is_set():
+                for step_id in list(running.values()) + sorted(pending):
+                    errors[step_id] = "Cancelled: deadline reached"
+                break
+            if not running:
+                # Nothing can unblock the remaining steps (reported below)
+                break
+
+            done, _ = concurrent.futures.wait(
+                running, timeout=poll_s, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                step_id = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"error": f"Tool execution failed: {e}"}
+
+                if isinstance(result, dict) and "error" in result:
+                    errors[step_id] = result["error"]
+                else:
+                    results[step_id] = result
+                    order.append(step_id)
+            submit_ready()
+    finally:
+        # Steps still running after a cancel finish on their own; nothing waits for them
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    # Every step is reported: one never started is an error, not a silent gap
+    for step_id in sorted(set(by_id) - set(results) - set(errors)):
+        errors[step_id] = "Not run: its dependencies never completed"
+
+    return {
+        "results": results,
+        "order": order,
+        "errors": errors,
+        "steps_run": len(order),
+    }
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Per-request selection of the tool subset sent to the model."""
+
+import json
+import math
+import re
+import threading
+from typing import Callable
+
+
+def parse_use_case_table(skill_md: str) -> dict:
+    """
+    Collect the Use Case Decision Table text for each tool.
+
+    Args:
+        skill_md: Raw skill.md text
+
+    Returns:
+        Dictionary mapping tool name to "<problem type>. <notes>" text (rows
+        naming several tools contribute to each of them)
+    """
+    documents = {}
+    in_table = False
+    for line in skill_md.split("\n"):
+        if "## Use Case Decision Table" in line:
+            in_table = True
+        elif line.startswith("## "):
+            in_table = False
+        elif in_table and "|" in line and "`" in line:
+            parts = [part.strip() for part in line.strip().strip("|").split("|")]
+            if len(parts) < 2:
+                continue
+            problem_type, tool_part = parts[0], parts[1]
+            notes = parts[2] if len(parts) > 2 else ""
+            for tool_name in re.findall(r"`([^`]+)`", tool_part):
+                text = f"{problem_type}. {notes}".strip()
+                documents[tool_name] = f"{documents[tool_name]} {text}" if tool_name in documents else text
+    return documents
+
+
+def estimate_tokens(tools: list) -> int:
+    """Rough token count of a tools payload (about 4 characters per token)."""
+    return math.ceil(len(json.dumps(tools, ensure_ascii=False)) / 4)
+
+
+def _normalize(vector: list) -> list:
+    """Scale a vector to unit length."""
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else list(vector)
+
+
+class ToolSelector:
+    """Sends only the tools relevant to a request, based on description embeddings."""
+
+    def __init__(
+        self,
+        tools: list,
+        skill_md: str,
+        embed_fn: Callable[[list], list],
+        top_k: int = 3,
+        min_similarity: float = 0.25,
+        always_include: tuple = (),
+    ):
+        """
+        Embed the tool descriptions once.
+
+        Args:
+            tools: Tool definitions parsed from skill.md
+            skill_md: Raw skill.md text (for the Use Case Decision Table)
+            embed_fn: Function mapping a list of texts to a list of vectors
+                (e.g. KnowledgeBase.embed). An empty result disables selection.
+            top_k: Number of best-matching tools to send
+            min_similarity: If no tool matches at least this well, the full
+                tool list is sent instead
+            always_include: Tool names that are sent with every request
+        """
+        self.tools = tools
+        self.embed_fn = embed_fn
+        self.top_k = top_k
+        self.min_similarity = min_similarity
+        self.always_include = set(always_include)
+
+        use_cases = parse_use_case_table(skill_md)
+        documents = [
+            f"{tool['name'].replace('_', ' ')}: {use_cases.get(tool['name'], '')} {tool['description']}"
+            for tool in tools
+        ]
+        vectors = embed_fn(documents) if documents else []
+        self.tool_vectors = [_normalize(v) for v in vectors] if len(vectors) == len(tools) else []
+        self.full_tokens = estimate_tokens(tools)
+
+        self._lock = threading.Lock()
+        self._selections = 0
+        self._fallbacks = 0
+        self._tools_sent = 0
+        self._tokens_sent = 0
+
+    @property
+    def available(self) -> bool:
+        """Whether tool descriptions could be embedded."""
+        return bool(self.tool_vectors)
+
+    def embed_query(self, query: str):
+        """
+        Embed a question for select (once per question, not per model call).
+
+        Args:
+            query: User question
+
+        Returns:
+            Unit-length query vector, or None when embeddings are unavailable
+        """
+        if not self.available:
+            return None
+        vectors = self.embed_fn([query])
+        return _normalize(vectors[0]) if vectors else None
+
+    def select(self, query: str, used_tool_names: set = frozenset(), query_vector: list = None) -> list:
+        """
+        Choose the tools to send for one model call.
+
+        Args:
+            query: User question
+            used_tool_names: Tools already called in this conversation (always kept)
+            query_vector: The question's embedding, computed once per request
+                (embedded here if omitted)
+
+        Returns:
+            Subset of the tool definitions, in skill.md order
+        """
+        if query_vector is None:
+            query_vector = self.embed_query(query)
+        elif self.available:
+            query_vector = _normalize(query_vector)
+        else:
+            query_vector = None
+
+        selected = None
+        if query_vector is not None:
+            scores = [
+                sum(a * b for a, b in zip(query_vector, tool_vector))
+                for tool_vector in self.tool_vectors
+            ]
+            ranked = sorted(range(len(self.tools)), key=lambda i: scores[i], reverse=True)
+            if scores[ranked[0]] >= self.min_similarity:
+                keep = {self.tools[i]["name"] for i in ranked[: self.top_k]}
+                keep |= set(used_tool_names) | self.always_include
+                # A tool named verbatim in the question is always relevant
+                keep |= {tool["name"] for tool in self.tools if tool["name"] in query}
+                selected = [tool for tool in self.tools if tool["name"] in keep]
+
+        with self._lock:
+            self._selections += 1
+            if selected is None:
+                self._fallbacks += 1
+                selected = self.tools
+            self._tools_sent += len(selected)
+            self._tokens_sent += self.full_tokens if selected is self.tools else estimate_tokens(selected)
+
+        return selected
+
+    def get_stats(self) -> dict:
+        """Get selection counts and estimated tool-schema token savings."""
+        with self._lock:
+            full_tokens_total = self.full_tokens * self._selections
+            return {
+                "selections": self._selections,
+                "full_list_fallbacks": self._fallbacks,
+                "tool_count": len(self.tools),
+                "mean_tools_sent": self._tools_sent / self._selections if self._selections else 0.0,
+                "estimated_tokens_sent": self._tokens_sent,
+                "estimated_tokens_saved": full_tokens_total - self._tokens_sent,
+                "savings_rate": (
+                    (full_tokens_total - self._tokens_sent) / full_tokens_total if full_tokens_total else 0.0
+                ),
+            }
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""Throughput, latency, and memory load test for the MCP server.
+
+Drives mcp_server/server.py with a weighted mix of tool calls, either
+in-process (memory streams, no serialization to a pipe) or over stdio (one
+server subprocess per session), and compares the results with a stored
+baseline.
+
+    python benchmarks/mcp_load.py --transport both --calls 2000 --concurrency 16
+    python benchmarks/mcp_load.py --baseline benchmarks/baseline.json
+    python benchmarks/mcp_load.py --save-baseline benchmarks/baseline.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.shared.memory import create_connected_server_and_client_session
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_SCRIPT = os.path.join(REPO_ROOT, "mcp_server", "server.py")
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+
+DEFAULT_MIX = "solenoid_field=4,biot_savart_wire=2,reluctance=2,material_lookup=1,unit_convert=1,batch_calculate=1"
+
+# Representative arguments for each tool in the mix
+SAMPLE_ARGUMENTS = {
+    "solenoid_field": {"turns": 500, "length_m": 0.2, "current_A": 2.0},
+    "biot_savart_wire": {"current_A": 10.0, "distance_m": 0.05},
+    "magnetic_flux": {"B_tesla": 1.2, "area_m2": 0.01, "angle_deg": 30},
+    "reluctance": {"length_m": 0.1, "area_m2": 0.0002, "relative_permeability": 5000},
+    "mmf_required": {"H_field": 1000, "path_length_m": 0.3},
+    "energy_stored": {"B_tesla": 0.05, "volume_m3": 0.0005},
+    "material_lookup": {"material": "silicon_steel"},
+    "unit_convert": {"value": 1.2, "from_unit": "T", "to_unit": "Gauss"},
+    "batch_calculate": {
+        "tool": "solenoid_field",
+        "grid": {"turns": 500, "length_m": 0.2, "current_A": {"start": 0.1, "stop": 5, "step": 0.1}},
+    },
+}
+
+# Baseline comparisons: metric path, direction in which it gets worse, and the
+# smallest absolute change that counts (in-process per-session RSS is a few
+# hundred kB of allocator noise, so a relative tolerance alone would flap)
+_REGRESSION_METRICS = [
+    (("throughput_cps",), "lower", 0.0),
+    (("latency_ms", "p50"), "higher", 0.0),
+    (("latency_ms", "p99"), "higher", 0.0),
+    (("rss_kb", "per_session"), "higher", 4096.0),
+]
+
+# Run settings that must match the baseline's for a comparison to mean anything
+_ENVIRONMENT_KEYS = ("cpu_count", "calls", "concurrency", "sessions", "mix")
+
+
+def parse_mix(text: str) -> list:
+    """
+    Parse a tool mix such as "solenoid_field=4,unit_convert=1".
+
+    Args:
+        text: Comma-separated tool=weight pairs (weight defaults to 1)
+
+    Returns:
+        List of (tool name, weight) pairs
+
+    Raises:
+        ValueError: If a tool has no sample arguments or a weight is invalid
+    """
+    mix = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SAMPLE_ARGUMENTS:
+            raise ValueError(f"No sample arguments for tool '{name}'")
+        weight = float(weight) if weight else 1.0
+        if weight <= 0:
+            raise ValueError(f"Weight for '{name}' must be positive")
+        mix.append((name, weight))
+    if not mix:
+        raise ValueError("Tool mix is empty")
+    return mix
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def read_rss_kb(pid: int) -> int:
+    """Resident set size of a process in kB from /proc, or None if unavailable."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _child_pids(parent_pid: int) -> list:
+    """PIDs of the direct children of a process (Linux /proc only)."""
+    children = []
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return children
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields resume after ")"
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if int(fields[1]) == parent_pid:
+            children.append(int(entry))
+    return children
+
+
+def _total_rss_kb(pids: list) -> int:
+    """Sum of RSS over processes, or None if it cannot be read."""
+    values = [read_rss_kb(pid) for pid in pids]
+    return sum(values) if values and None not in values else None
+
+
+async def _drive(sessions: list, mix: list, calls: int, concurrency: int, seed: int) -> dict:
+    """Issue `calls` tool calls over the sessions with `concurrency` workers."""
+    rng = random.Random(seed)
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    schedule = rng.choices(names, weights=weights, k=calls)
+
+    latencies = []
+    errors = 0
+    next_call = 0
+
+    async def worker(index: int):
+        nonlocal next_call, errors
+        session = sessions[index % len(sessions)]
+        while next_call < len(schedule):
+            name = schedule[next_call]
+            next_call += 1
+            started = time.perf_counter()
+            try:
+                response = await session.call_tool(name, SAMPLE_ARGUMENTS[name])
+                failed = response.isError or "error" in json.loads(response.content[0].text)
+            except Exception:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            if failed:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies_ms = [latency * 1000 for latency in latencies]
+    return {
+        "calls": len(latencies),
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "throughput_cps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies_ms, 0.50),
+            "p90": percentile(latencies_ms, 0.90),
+            "p99": percentile(latencies_ms, 0.99),
+            "max": max(latencies_ms) if latencies_ms else 0.0,
+        },
+    }
+
+
+def _rss_report(before: int, connected: int, after: int, sessions: int) -> dict:
+    """RSS numbers for a run; per_session is the connection cost of one session."""
+    report = {"before": before, "after_connect": connected, "after_run": after,
+              "per_session": None, "growth": None}
+    if before is not None and connected is not None:
+        report["per_session"] = (connected - before) / sessions
+    if connected is not None and after is not None:
+        report["growth"] = after - connected
+    return report
+
+
+async def run_in_process(mix: list, calls: int, concurrency: int, sessions: int, seed: int = 0) -> dict:
+    """
+    Benchmark the server handlers over in-memory client sessions.
+
+    Args:
+        mix: Tool mix from parse_mix()
+        calls: Total number of tool calls
+        concurrency: Number of calls in flight at once
+        sessions: Number of client sessions sharing the calls
+        seed: Random seed for the call schedule
+
+    Returns:
+        Report dictionary (throughput, latency percentiles, RSS of this process)
+    """
+    from mcp_server import server
+
+    pid = os.getpid()
+    before = read_rss_kb(pid)
+    async with contextlib.AsyncExitStack() as stack:
+        clients = [
+            await stack.enter_async_context(create_connected_server_and_client_session(server.app))
+            for _ in range(sessions)
+        ]
+        connected = read_rss_kb(pid)
+        report = await _drive(clients, mix, calls, concurrency, seed)
+        after = read_rss_kb(pid)
+
+    report.update({"transport": "in_process", "concurrency": concurrency, "sessions": sessions})
+    report["rss_kb"] = _rss_report(before, connected, after, sessions)
+    return report
+
+
+async def run_stdio(
+    mix: list, calls: int, concurrency: int, sessions: int, seed: int = 0, server_args: list = ()
+) -> dict:
+    """
+    Benchmark the server over stdio, with one server subprocess per session.
+
+    Args:
+        mix: Tool mix from parse_mix()
+        calls: Total number of tool calls
+        concurrency: Number of calls in flight at once
+        sessions: Number of server subprocesses (stdio serves one client each)
+        seed: Random seed for the call schedule
+        server_args: Extra command-line options for server.py
+
+    Returns:
+        Report dictionary (throughput, latency percentiles, RSS of the servers)
+    """
+    params = StdioServerParameters(command=sys.executable, args=[SERVER_SCRIPT, *server_args], cwd=REPO_ROOT)
+    existing = set(_child_pids(os.getpid()))
+
+    async with contextlib.AsyncExitStack() as stack:
+        clients = []
+        for _ in range(sessions):
+            read, write = await stack.enter_async_context(stdio_client(params))
+            client = await stack.enter_async_context(ClientSession(read, write))
+            await client.initialize()
+            clients.append(client)
+
+        server_pids = [pid for pid in _child_pids(os.getpid()) if pid not in existing]
+        connected = _total_rss_kb(server_pids)
+        report = await _drive(clients, mix, calls, concurrency, seed)
+        after = _total_rss_kb(server_pids)
+
+    report.update({"transport": "stdio", "concurrency": concurrency, "sessions": sessions})
+    # A fresh server process is the whole cost of a stdio session, so RSS
+    # counts from zero rather than from a measurement before connecting
+    report["rss_kb"] = _rss_report(0 if connected is not None else None, connected, after, sessions)
+    return report
+
+
+def compare_to_baseline(report: dict, baseline: dict, tolerance: float = 0.25) -> list:
+    """
+    Find metrics that regressed beyond a tolerance.
+
+    Args:
+        report: Report for one transport
+        baseline: Baseline report for the same transport
+        tolerance: Allowed relative change (0.25 = 25%)
+
+    Returns:
+        List of human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    for path, worse, floor in _REGRESSION_METRICS:
+        current, reference = report, baseline
+        for key in path:
+            current = current.get(key) if isinstance(current, dict) else None
+            reference = reference.get(key) if isinstance(reference, dict) else None
+        if current is None or not reference:
+            continue
+
+        name = ".".join(path)
+        change = current - reference
+        if abs(change) <= floor:
+            continue
+        if worse == "lower" and current < reference * (1 - tolerance):
+            regressions.append(f"{name} dropped to {current:.4g} (baseline {reference:.4g})")
+        elif worse == "higher" and current > reference * (1 + tolerance):
+            regressions.append(f"{name} rose to {current:.4g} (baseline {reference:.4g})")
+
+    if report.get("errors", 0) > baseline.get("errors", 0):
+        regressions.append(f"errors rose to {report['errors']} (baseline {baseline.get('errors', 0)})")
+    return regressions
+
+
+def run_environment(args: argparse.Namespace) -> dict:
+    """The machine and run settings a report was measured with."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "calls": args.calls,
+        "concurrency": args.concurrency,
+        "sessions": args.sessions,
+        "mix": args.mix,
+    }
+
+
+def environment_mismatches(recorded: dict, current: dict) -> list:
+    """
+    Run settings that differ between a baseline and this run.
+
+    Args:
+        recorded: The baseline's "environment" entry
+        current: run_environment() of this run
+
+    Returns:
+        List of "key: baseline X, this run Y" descriptions (empty if comparable)
+    """
+    return [
+        f"{key}: baseline {recorded.get(key)!r}, this run {current[key]!r}"
+        for key in _ENVIRONMENT_KEYS
+        if recorded.get(key) != current[key]
+    ]
+
+
+def format_report(report: dict) -> str:
+    """Render one transport's report as text."""
+    latency = report["latency_ms"]
+    rss = report["rss_kb"]
+    lines = [
+        f"[{report['transport']}] {report['calls']} calls, concurrency {report['concurrency']}, "
+        f"{report['sessions']} session(s), {report['errors']} error(s)",
+        f"  throughput: {report['throughput_cps']:.1f} calls/s",
+        f"  latency ms: p50 {latency['p50']:.3f}  p90 {latency['p90']:.3f}  "
+        f"p99 {latency['p99']:.3f}  max {latency['max']:.3f}",
+    ]
+    if rss["per_session"] is not None:
+        lines.append(f"  rss kB:     per session {rss['per_session']:.0f}  growth during run {rss['growth']}")
+    return "\n".join(lines)
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    """Parse benchmark options."""
+    parser = argparse.ArgumentParser(description="MCP server load test")
+    parser.add_argument("--transport", choices=["in_process", "stdio", "both"], default="both")
+    parser.add_argument("--calls", type=int, default=2000, help="Tool calls per transport")
+    parser.add_argument("--concurrency", type=int, default=16, help="Calls in flight at once")
+    parser.add_argument("--sessions", type=int, default=4, help="Client sessions")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted tool mix, e.g. solenoid_field=4,unit_convert=1")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the call schedule")
+    parser.add_argument("--server-args", default="", help="Extra server.py options for stdio runs")
+    parser.add_argument("--baseline", nargs="?", const=DEFAULT_BASELINE, default=None,
+                        help="Baseline JSON to compare against (default path: benchmarks/baseline.json)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument("--save-baseline", default=None, help="Write this run's results as a baseline")
+    parser.add_argument("--json", action="store_true", help="Print the full results as JSON")
+    return parser.parse_args(argv)
+
+
+async def main(argv: list = None) -> int:
+    """Run the benchmark; returns 1 if a regression was found, else 0."""
+    args = parse_args(argv)
+    mix = parse_mix(args.mix)
+    transports = ["in_process", "stdio"] if args.transport == "both" else [args.transport]
+
+    results = {}
+    for transport in transports:
+        if transport == "in_process":
+            results[transport] = await run_in_process(mix, args.calls, args.concurrency, args.sessions, args.seed)
+        else:
+            results[transport] = await run_stdio(
+                mix, args.calls, args.concurrency, args.sessions, args.seed, args.server_args.split()
+            )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for report in results.values():
+            print(format_report(report))
+
+    environment = run_environment(args)
+    if args.save_baseline:
+        # Baselines are machine-specific; record where this one came from
+        with open(args.save_baseline, "w") as f:
+            json.dump({"environment": environment, **results}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.save_baseline}")
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        mismatches = environment_mismatches(baseline.get("environment", {}), environment)
+        if mismatches:
+            print(f"Skipping the baseline comparison; {args.baseline} was recorded with different settings:")
+            for mismatch in mismatches:
+                print(f"  {mismatch}")
+            print("Re-run with the same settings, or record a new baseline with --save-baseline.")
+            return 0
+        for transport, report in results.items():
+            if transport not in baseline:
+                continue
+            regressions = compare_to_baseline(report, baseline[transport], args.tolerance)
+            for regression in regressions:
+                print(f"REGRESSION [{transport}] {regression}")
+            status = status or int(bool(regressions))
+        if status == 0:
+            print("No regressions against baseline.")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -17,7 +17,8 @@ EXAMPLE_PROMPTS = [
 def print_welcome(agent: SkillAgent):
     """Print welcome message and instructions."""
     print("=" * 70)
-    print(f"SKILL AGENT - {agent.skill_name.upper()}")
+    skill_names = list(agent.skills) or [agent.skill_name]
+    print(f"SKILL AGENT - {' + '.join(name.upper() for name in skill_names)}")
     print("=" * 70)
     print("\nExample prompts you can use:")
     for i, example in enumerate(EXAMPLE_PROMPTS, 1):
@@ -26,34 +27,37 @@ def print_welcome(agent: SkillAgent):
     print("Type 'quit' or 'exit' to exit.\n")
 
 
-def select_skill(available_skills: list) -> str:
+def select_skill(available_skills: list) -> list:
     """
-    Let user select a skill if multiple are available.
+    Let user select a skill, or all skills, if multiple are available.
 
     Args:
         available_skills: List of available skill names
 
     Returns:
-        Selected skill name
+        Selected skill names (all of them if the user picks "all skills")
     """
     if len(available_skills) == 1:
-        return available_skills[0]
+        return available_skills
 
     print("=" * 70)
     print("AVAILABLE SKILLS")
     print("=" * 70)
     for i, skill in enumerate(available_skills, 1):
         print(f"  {i}. {skill}")
+    print("  0. All skills (routed per question)")
     print()
 
     while True:
         try:
             choice = input("Select a skill (number): ").strip()
+            if choice == "0":
+                return available_skills
             choice_idx = int(choice) - 1
             if 0 <= choice_idx < len(available_skills):
-                return available_skills[choice_idx]
+                return [available_skills[choice_idx]]
             else:
-                print(f"Invalid choice. Please select 1-{len(available_skills)}")
+                print(f"Invalid choice. Please select 0-{len(available_skills)}")
         except ValueError:
             print("Please enter a number")
 
@@ -110,12 +114,12 @@ def main():
             sys.exit(1)
 
         # Select skill if multiple available
-        selected_skill = select_skill(available_skills)
+        selected_skills = select_skill(available_skills)
 
-        # Initialize agent with selected skill
-        agent = SkillAgent(skill_name=selected_skill)
+        # Initialize agent with selected skill(s)
+        agent = SkillAgent(skills=selected_skills)
 
-        print(f"✓ Agent initialized with skill: {selected_skill}")
+        print(f"✓ Agent initialized with skill: {', '.join(selected_skills)}")
         print(f"✓ Loaded {len(agent.tools)} tools\n")
 
         print_welcome(agent)
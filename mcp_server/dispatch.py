@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""Tool dispatch for the MCP server, with an optional worker pool for heavy tools."""
+
+import asyncio
+import concurrent.futures
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_server.tools import fields, circuits, materials, converters, batch, wire_paths, loops, field_store, reluctance_network, material_store, inductor_design, tolerance, core_loss
+
+# Closed-form tools that finish in microseconds; pool overhead would dominate
+INLINE_TOOLS = frozenset({
+    "solenoid_field",
+    "biot_savart_wire",
+    "magnetic_flux",
+    "reluctance",
+    "mmf_required",
+    "energy_stored",
+    "material_lookup",
+    "material_search",
+    "unit_convert",
+})
+
+
+def run_tool(name: str, arguments: dict) -> dict:
+    """
+    Execute one tool call synchronously.
+
+    Module-level so it can be pickled into a process pool.
+
+    Args:
+        name: Tool name
+        arguments: Tool input arguments
+
+    Returns:
+        Tool result dictionary (with an "error" key on failure)
+    """
+    try:
+        if name == "solenoid_field":
+            return fields.solenoid_field(
+                turns=arguments["turns"],
+                length_m=arguments["length_m"],
+                current_A=arguments["current_A"]
+            )
+        elif name == "biot_savart_wire":
+            return fields.biot_savart_wire(
+                current_A=arguments["current_A"],
+                distance_m=arguments["distance_m"]
+            )
+        elif name == "magnetic_flux":
+            return fields.magnetic_flux(
+                B_tesla=arguments["B_tesla"],
+                area_m2=arguments["area_m2"],
+                angle_deg=arguments.get("angle_deg", 0)
+            )
+        elif name == "reluctance":
+            return circuits.reluctance(
+                length_m=arguments["length_m"],
+                area_m2=arguments["area_m2"],
+                relative_permeability=arguments["relative_permeability"]
+            )
+        elif name == "mmf_required":
+            return circuits.mmf_required(
+                H_field=arguments["H_field"],
+                path_length_m=arguments["path_length_m"]
+            )
+        elif name == "energy_stored":
+            return fields.energy_stored(
+                B_tesla=arguments["B_tesla"],
+                volume_m3=arguments["volume_m3"]
+            )
+        elif name == "material_lookup":
+            return materials.lookup_material(arguments["material"])
+        elif name == "material_search":
+            return material_store.material_search(
+                name=arguments.get("name"),
+                filters=arguments.get("filters"),
+                category=arguments.get("category"),
+                sort_by=arguments.get("sort_by"),
+                descending=arguments.get("descending", False),
+                limit=arguments.get("limit", 10)
+            )
+        elif name == "unit_convert":
+            return converters.convert_unit(
+                value=arguments["value"],
+                from_unit=arguments["from_unit"],
+                to_unit=arguments["to_unit"]
+            )
+        elif name == "batch_calculate":
+            return batch.batch_calculate(
+                tool=arguments["tool"],
+                arg_sets=arguments.get("arg_sets"),
+                grid=arguments.get("grid")
+            )
+        elif name == "wire_path_field":
+            return wire_paths.wire_path_field(
+                path=arguments["path"],
+                points=arguments["points"],
+                current_A=arguments["current_A"],
+                closed=arguments.get("closed", False),
+                store=arguments.get("store")
+            )
+        elif name == "solenoid_field_map":
+            return loops.solenoid_field_map(
+                turns=arguments["turns"],
+                length_m=arguments["length_m"],
+                radius_m=arguments["radius_m"],
+                current_A=arguments["current_A"],
+                r_m=arguments.get("r_m", 0.0),
+                z_m=arguments.get("z_m", 0.0),
+                outer_radius_m=arguments.get("outer_radius_m"),
+                layers=arguments.get("layers", 1),
+                store=arguments.get("store")
+            )
+        elif name == "magnetic_circuit_solve":
+            return reluctance_network.magnetic_circuit_solve(
+                branches=arguments["branches"],
+                windings=arguments.get("windings"),
+                nonlinear=arguments.get("nonlinear", False)
+            )
+        elif name == "saturation_current":
+            return reluctance_network.saturation_current(
+                branches=arguments["branches"],
+                windings=arguments["windings"],
+                winding=arguments.get("winding"),
+                max_current_A=arguments.get("max_current_A"),
+                points=arguments.get("points", 200),
+                inductance_drop=arguments.get("inductance_drop", 0.2)
+            )
+        elif name == "design_optimize":
+            return inductor_design.design_optimize(
+                inductance_H=arguments["inductance_H"],
+                current_A=arguments["current_A"],
+                window_area_m2=arguments["window_area_m2"],
+                materials=arguments.get("materials"),
+                core_area_m2=arguments.get("core_area_m2"),
+                path_length_m=arguments.get("path_length_m"),
+                turns=arguments.get("turns"),
+                max_flux_density_fraction=arguments.get("max_flux_density_fraction", 0.8),
+                max_gap_m=arguments.get("max_gap_m"),
+                current_density_A_per_m2=arguments.get("current_density_A_per_m2", 5e6),
+                fill_factor=arguments.get("fill_factor", 0.4),
+                objectives=arguments.get("objectives"),
+                max_results=arguments.get("max_results", 20)
+            )
+        elif name == "tolerance_analysis":
+            return tolerance.tolerance_analysis(
+                tool=arguments["tool"],
+                inputs=arguments["inputs"],
+                samples=arguments.get("samples", 100_000),
+                limits=arguments.get("limits"),
+                percentiles=arguments.get("percentiles"),
+                bins=arguments.get("bins", 20),
+                seed=arguments.get("seed"),
+                workers=arguments.get("workers", 1)
+            )
+        elif name == "core_loss":
+            return core_loss.core_loss(
+                frequency_Hz=arguments["frequency_Hz"],
+                flux_density_T=arguments["flux_density_T"],
+                material=arguments.get("material"),
+                waveform=arguments.get("waveform"),
+                volume_m3=arguments.get("volume_m3"),
+                steinmetz=arguments.get("steinmetz")
+            )
+        elif name == "field_map_query":
+            return field_store.field_map_query(
+                handle=arguments["handle"],
+                bounds=arguments.get("bounds"),
+                at=arguments.get("at")
+            )
+        else:
+            return {"error": f"Unknown tool: {name}"}
+
+    except (TypeError, KeyError, ValueError) as e:
+        return {"error": f"Tool execution failed: {str(e)}"}
+
+
+class ToolExecutor:
+    """Runs tool calls inline or on a thread/process pool, with timeouts and a concurrency limit."""
+
+    def __init__(
+        self,
+        mode: str = "thread",
+        max_workers: int = 4,
+        max_concurrent: int = None,
+        timeout_s: float = 30.0,
+        inline_tools: frozenset = INLINE_TOOLS,
+        tool_fn=run_tool,
+    ):
+        """
+        Initialize the executor. The pool is created on first use.
+
+        Args:
+            mode: "thread" or "process" (processes sidestep the GIL for
+                pure-Python numeric tools)
+            max_workers: Pool size
+            max_concurrent: Maximum pooled calls in flight, including queued
+                ones; extra calls wait (default 2 × max_workers)
+            timeout_s: Per-call timeout for pooled calls (None for no limit)
+            inline_tools: Tool names run directly on the event loop
+            tool_fn: Function (name, arguments) -> dict; must be picklable in
+                process mode
+        """
+        if mode not in ("thread", "process"):
+            raise ValueError(f"mode must be 'thread' or 'process', got '{mode}'")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_concurrent = max_concurrent or 2 * max_workers
+        self.timeout_s = timeout_s
+        self.inline_tools = frozenset(inline_tools)
+        self.tool_fn = tool_fn
+
+        self._pool = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+        self._stats = {"inline_calls": 0, "pooled_calls": 0, "timeouts": 0, "cancelled": 0, "in_flight": 0}
+
+    def _get_pool(self) -> concurrent.futures.Executor:
+        """Create the worker pool on first use."""
+        with self._lock:
+            if self._pool is None:
+                if self.mode == "process":
+                    self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._pool = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="mcp-tool"
+                    )
+            return self._pool
+
+    def _count(self, key: str, delta: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += delta
+
+    async def execute(self, name: str, arguments: dict) -> dict:
+        """
+        Execute a tool call without blocking the event loop.
+
+        If the awaiting task is cancelled (e.g. the client cancelled the
+        request or disconnected), a call that has not started yet is dropped
+        from the pool queue. A call already running in a thread cannot be
+        interrupted; its result is discarded.
+
+        Args:
+            name: Tool name
+            arguments: Tool input arguments
+
+        Returns:
+            Tool result dictionary (with an "error" key on failure or timeout)
+        """
+        if name in self.inline_tools:
+            self._count("inline_calls")
+            return self.tool_fn(name, arguments)
+
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._semaphore:
+                self._count("pooled_calls")
+                self._count("in_flight")
+                try:
+                    future = loop.run_in_executor(self._get_pool(), self.tool_fn, name, arguments)
+                    return await asyncio.wait_for(future, timeout=self.timeout_s)
+                finally:
+                    self._count("in_flight", -1)
+        except asyncio.TimeoutError:
+            self._count("timeouts")
+            return {"error": f"Tool execution timed out after {self.timeout_s}s: {name}"}
+        except asyncio.CancelledError:
+            self._count("cancelled")
+            raise
+        except concurrent.futures.BrokenExecutor as e:
+            with self._lock:
+                self._pool = None
+            return {"error": f"Tool execution failed: worker pool crashed ({e})"}
+        except Exception as e:
+            return {"error": f"Tool execution failed: {str(e)}"}
+
+    def get_stats(self) -> dict:
+        """Get call counts for inline and pooled execution."""
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "max_workers": self.max_workers,
+                "max_concurrent": self.max_concurrent,
+                **self._stats,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the worker pool, cancelling queued calls."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Streamable HTTP transport for the MCP server (many clients, one process)."""
+
+import contextlib
+import inspect
+import sys
+from typing import Callable
+
+from mcp.server import Server
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+# Session limits added to StreamableHTTPSessionManager after mcp 1.8
+_MANAGER_PARAMS = inspect.signature(StreamableHTTPSessionManager.__init__).parameters
+
+
+def session_manager_options(session_idle_timeout: float, max_sessions: int) -> dict:
+    """The session-limit keyword arguments this mcp version accepts (older ones accept neither)."""
+    options = {}
+    if "session_idle_timeout" in _MANAGER_PARAMS:
+        options["session_idle_timeout"] = session_idle_timeout
+    if "max_sessions" in _MANAGER_PARAMS:
+        options["max_sessions"] = max_sessions
+    if len(options) < 2:
+        print("MCP server: this mcp version has no session idle timeout/limit; upgrade mcp to enforce them",
+              file=sys.stderr)
+    return options
+
+
+def create_http_app(
+    server: Server,
+    session_idle_timeout: float = 1800,
+    max_sessions: int = 1000,
+    json_response: bool = False,
+    get_stats: Callable[[], dict] = None,
+    on_shutdown: Callable[[], None] = None,
+) -> Starlette:
+    """
+    Build an ASGI app serving an MCP server over streamable HTTP at /mcp.
+
+    Each client gets its own session (identified by the Mcp-Session-Id
+    header). Sessions share the server process, so warm caches and the tool
+    worker pool are shared across clients.
+
+    Args:
+        server: MCP server whose handlers answer requests
+        session_idle_timeout: Seconds without any request before a session is closed
+        max_sessions: Maximum number of open sessions (new sessions get 503)
+        json_response: Answer with plain JSON instead of SSE streams
+        get_stats: Optional function whose result is served at GET /stats
+        on_shutdown: Optional cleanup run after all sessions have closed
+
+    Returns:
+        Starlette application
+    """
+    session_manager = StreamableHTTPSessionManager(
+        app=server,
+        json_response=json_response,
+        **session_manager_options(session_idle_timeout, max_sessions),
+    )
+
+    async def handle_mcp(scope, receive, send):
+        await session_manager.handle_request(scope, receive, send)
+
+    async def health(request):
+        return JSONResponse({"status": "ok"})
+
+    async def stats(request):
+        return JSONResponse(get_stats() if get_stats else {})
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        try:
+            async with session_manager.run():
+                yield
+        finally:
+            if on_shutdown:
+                on_shutdown()
+
+    return Starlette(
+        routes=[
+            Route("/health", health),
+            Route("/stats", stats),
+            Mount("/mcp", app=handle_mcp),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def create_uvicorn_server(
+    app: Starlette,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    keep_alive_s: int = 30,
+    shutdown_timeout_s: float = 10.0,
+):
+    """
+    Wrap an ASGI app in a uvicorn server.
+
+    On SIGINT/SIGTERM uvicorn stops accepting connections and waits up to
+    shutdown_timeout_s for in-flight requests before closing the sessions.
+
+    Args:
+        app: ASGI application from create_http_app()
+        host: Interface to bind (loopback by default)
+        port: TCP port (0 picks a free port)
+        keep_alive_s: Idle HTTP keep-alive timeout in seconds
+        shutdown_timeout_s: Grace period for in-flight requests on shutdown
+
+    Returns:
+        uvicorn.Server (run with `await server.serve()`)
+    """
+    import uvicorn
+
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        timeout_keep_alive=keep_alive_s,
+        timeout_graceful_shutdown=shutdown_timeout_s,
+        log_level="warning",
+    )
+    return uvicorn.Server(config)
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""Shared knowledge-base retrieval for MCP clients, with batched embeddings."""
+
+import asyncio
+import concurrent.futures
+import os
+import sys
+import threading
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SKILLS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "skills")
+
+KNOWLEDGE_TOOLS = frozenset({"knowledge_search", "knowledge_search_many", "embed_texts", "knowledge_stats"})
+
+MAX_QUERIES = 100
+
+
+class _Batcher:
+    """Collects concurrent requests and serves them with one call to a batch function."""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list], list],
+        executor: concurrent.futures.Executor,
+        window_s: float,
+        max_batch: int,
+    ):
+        self.batch_fn = batch_fn
+        self.executor = executor
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self._loop = None
+        self._queue = None
+        self._task = None
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    async def submit(self, item):
+        """Queue one item and wait for its result."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+        future = loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            # Give concurrent requests a short window to join this batch
+            deadline = loop.time() + self.window_s
+            while len(pending) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            pending = [(item, future) for item, future in pending if not future.cancelled()]
+            if not pending:
+                continue
+
+            self.batches += 1
+            self.items += len(pending)
+            self.largest_batch = max(self.largest_batch, len(pending))
+            try:
+                results = await loop.run_in_executor(
+                    self.executor, self.batch_fn, [item for item, _ in pending]
+                )
+                for (_, future), result in zip(pending, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def get_stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "largest_batch": self.largest_batch,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+        }
+
+
+class KnowledgeService:
+    """Warm knowledge bases and one embedding model shared by every client of the server."""
+
+    def __init__(
+        self,
+        skill_name: str = "maxwell_magnetics",
+        knowledge_base_factory: Callable[[str], object] = None,
+        batch_window_s: float = 0.005,
+        max_batch: int = 32,
+        max_top_k: int = 20,
+    ):
+        """
+        Initialize the service. Knowledge bases are loaded on first use.
+
+        Args:
+            skill_name: Default skill, served when a request names none. Any
+                other skill in skills/ gets its own collection on first request.
+            knowledge_base_factory: Function mapping a skill directory to a
+                KnowledgeBase-like object (default: agent.knowledge_base.KnowledgeBase,
+                sharing the default skill's embedding model)
+            batch_window_s: How long a request waits for others to share its
+                embedding batch
+            max_batch: Maximum requests per batch
+            max_top_k: Upper limit for top_k in knowledge_search
+        """
+        self.skill_name = skill_name
+        self.skill_dir = os.path.join(SKILLS_DIR, skill_name)
+        self.knowledge_base_factory = knowledge_base_factory
+        self.max_top_k = max_top_k
+
+        self._knowledge_bases = {}
+        self._lock = threading.Lock()
+        # One thread owns the embedding model, so batches never contend for it
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="knowledge")
+        self._search_batcher = _Batcher(self._search_batch, self._executor, batch_window_s, max_batch)
+        self._embed_batcher = _Batcher(self._embed_batch, self._executor, batch_window_s, max_batch)
+
+    @property
+    def knowledge_base(self):
+        """The default skill's knowledge base, created on first access."""
+        return self.knowledge_base_for(self.skill_name)
+
+    def knowledge_base_for(self, skill: str):
+        """
+        A skill's knowledge base, created on first access.
+
+        Args:
+            skill: Skill directory name under skills/
+
+        Returns:
+            KnowledgeBase-like object
+
+        Raises:
+            ValueError: If the skill does not exist
+        """
+        with self._lock:
+            if skill not in self._knowledge_bases:
+                self._knowledge_bases[skill] = self._create(skill)
+            return self._knowledge_bases[skill]
+
+    def _skill_dir(self, skill: str) -> str:
+        """Directory of a servable skill (the default one, or any skill with a skill.md)."""
+        if skill == self.skill_name:
+            return self.skill_dir
+        if not isinstance(skill, str) or os.path.basename(skill) != skill or \
+                not os.path.isfile(os.path.join(SKILLS_DIR, skill, "skill.md")):
+            raise ValueError(f"Unknown skill: {skill}")
+        return os.path.join(SKILLS_DIR, skill)
+
+    def _create(self, skill: str):
+        """Build a skill's knowledge base; other skills reuse the default skill's embedding model."""
+        skill_dir = self._skill_dir(skill)
+        if self.knowledge_base_factory is not None:
+            return self.knowledge_base_factory(skill_dir)
+
+        from agent.knowledge_base import KnowledgeBase
+
+        if skill == self.skill_name:
+            return KnowledgeBase(skill_dir)
+        if self.skill_name not in self._knowledge_bases:
+            self._knowledge_bases[self.skill_name] = KnowledgeBase(self.skill_dir)
+        embedding_function = getattr(self._knowledge_bases[self.skill_name], "embedding_function", None)
+        return KnowledgeBase(skill_dir, embedding_function=embedding_function)
+
+    def _search_batch(self, items: list) -> list:
+        """Run (skill, query, top_k, embedding) requests as one retrieve_many call per skill."""
+        results = [None] * len(items)
+        by_skill = {}
+        for i, (skill, _, _, _) in enumerate(items):
+            by_skill.setdefault(skill, []).append(i)
+        for skill, indices in by_skill.items():
+            top_k = max(items[i][2] for i in indices)
+            queries = [items[i][1] for i in indices]
+            embeddings = [items[i][3] for i in indices]
+            if any(embedding is not None for embedding in embeddings):
+                # Queries without a client embedding are embedded with the rest of the batch
+                docs = self.knowledge_base_for(skill).retrieve_many(queries, top_k=top_k, query_vectors=embeddings)
+            else:
+                docs = self.knowledge_base_for(skill).retrieve_many(queries, top_k=top_k)
+            for i, found in zip(indices, docs):
+                results[i] = found[:items[i][2]]
+        return results
+
+    def _embed_batch(self, items: list) -> list:
+        """Embed every request's texts in one model call and split the vectors back."""
+        texts = [text for item in items for text in item]
+        vectors = self.knowledge_base.embed(texts)
+        if len(vectors) != len(texts):
+            return [[] for _ in items]
+        results, start = [], 0
+        for item in items:
+            results.append(vectors[start:start + len(item)])
+            start += len(item)
+        return results
+
+    async def handle(self, name: str, arguments: dict) -> dict:
+        """
+        Execute one knowledge tool call.
+
+        Args:
+            name: "knowledge_search", "knowledge_search_many", "embed_texts", or "knowledge_stats"
+            arguments: Tool input arguments; the search tools and
+                knowledge_stats take an optional "skill" (default: the service's skill)
+
+        Returns:
+            Tool result dictionary (with an "error" key on failure)
+        """
+        try:
+            if name == "knowledge_search":
+                query = arguments["query"]
+                top_k = int(arguments.get("top_k", 3))
+                if not isinstance(query, str) or not query.strip():
+                    return {"error": "query must be a non-empty string"}
+                if not 1 <= top_k <= self.max_top_k:
+                    return {"error": f"top_k must be between 1 and {self.max_top_k}"}
+                embedding = arguments.get("embedding")
+                if embedding is not None and (
+                    not isinstance(embedding, list) or not embedding
+                    or not all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in embedding)
+                ):
+                    return {"error": "embedding must be a non-empty list of numbers"}
+                skill = arguments.get("skill") or self.skill_name
+                self._skill_dir(skill)
+                results = await self._search_batcher.submit((skill, query, top_k, embedding))
+                return {"skill": skill, "query": query, "results": results}
+            elif name == "knowledge_search_many":
+                queries = arguments["queries"]
+                top_k = int(arguments.get("top_k", 3))
+                if not isinstance(queries, list) or not queries or \
+                        not all(isinstance(query, str) and query.strip() for query in queries):
+                    return {"error": "queries must be a non-empty list of non-empty strings"}
+                if len(queries) > MAX_QUERIES:
+                    return {"error": f"At most {MAX_QUERIES} queries per call"}
+                if not 1 <= top_k <= self.max_top_k:
+                    return {"error": f"top_k must be between 1 and {self.max_top_k}"}
+                skill = arguments.get("skill") or self.skill_name
+                self._skill_dir(skill)
+                # Queued together, so they share embedding batches with each other and other clients
+                results = await asyncio.gather(*(
+                    self._search_batcher.submit((skill, query, top_k, None)) for query in queries
+                ))
+                return {"skill": skill, "results": list(results)}
+            elif name == "embed_texts":
+                texts = arguments["texts"]
+                if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                    return {"error": "texts must be a list of strings"}
+                if not texts:
+                    return {"embeddings": []}
+                return {"embeddings": await self._embed_batcher.submit(texts)}
+            elif name == "knowledge_stats":
+                # May load the knowledge base; keep that off the event loop
+                skill = arguments.get("skill") or self.skill_name
+                self._skill_dir(skill)
+                return await asyncio.get_running_loop().run_in_executor(self._executor, self.get_stats, skill)
+            else:
+                return {"error": f"Unknown tool: {name}"}
+        except (TypeError, KeyError, ValueError) as e:
+            return {"error": f"Tool execution failed: {str(e)}"}
+
+    def get_stats(self, skill: str = None) -> dict:
+        """Get a skill's knowledge-base status (default skill if None) and batching statistics."""
+        skill = skill or self.skill_name
+        knowledge_base = self.knowledge_base_for(skill)
+        return {
+            "skill": skill,
+            "loaded_skills": sorted(self._knowledge_bases),
+            "available": bool(getattr(knowledge_base, "available", False)),
+            "knowledge_base": knowledge_base.get_stats(),
+            "search_batching": self._search_batcher.get_stats(),
+            "embed_batching": self._embed_batcher.get_stats(),
+        }
+
+    def shutdown(self) -> None:
+        """Stop the embedding thread."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
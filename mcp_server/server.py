@@ -1,16 +1,32 @@
 #!/usr/bin/env python3
 """MCP Server for magnetics physics calculations."""
 
+import argparse
+import os
 import sys
 import json
+import time
+import weakref
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 
-# Import tool modules
-from tools import fields, circuits, materials, converters
+# Add parent directory to path so the package imports work when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_server.dispatch import ToolExecutor
+from mcp_server.knowledge_service import KNOWLEDGE_TOOLS, KnowledgeService
 
 app = Server("magnetics-sme")
 
+# Replaced in main() from the command-line options
+tool_executor = ToolExecutor()
+
+# Shared retrieval service (one warm index and embedding model for all clients)
+knowledge_service = KnowledgeService()
+
+# Per-client session state, dropped when the session object goes away
+session_state = weakref.WeakKeyDictionary()
+
 
 # Tool definitions
 def get_tools() -> list[Tool]:
@@ -139,31 +155,64 @@ def get_tools() -> list[Tool]:
         ),
         Tool(
             name="material_lookup",
-            description="Return properties of a named magnetic material (iron, silicon_steel, ferrite, neodymium, mu_metal, air)",
+            description="Return properties of a named magnetic material (iron, silicon_steel, ferrite, neodymium, mu_metal, air, or a catalog grade such as M19, N87, NdFeB N52)",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "material": {
                         "type": "string",
-                        "description": "Name of the material (e.g., 'iron', 'silicon_steel', 'ferrite', 'neodymium')"
+                        "description": "Name of the material (e.g., 'iron', 'silicon_steel', 'ferrite', 'neodymium', 'M19', 'NdFeB N52')"
                     }
                 },
                 "required": ["material"]
             }
         ),
+        Tool(
+            name="material_search",
+            description="Search the material catalog (electrical steels, ferrites, powder cores, amorphous/nanocrystalline, NiFe/CoFe alloys, permanent magnets) by approximate name and by property ranges, sorted by any property",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "name": {
+                        "type": "string",
+                        "description": "Approximate material name (e.g., 'silicon-steel', 'NdFeB N52', '3C95'); results are ranked by match score"
+                    },
+                    "filters": {
+                        "type": "object",
+                        "description": "Property ranges, inclusive: {\"relative_permeability\": {\"min\": 3000}, \"saturation_flux_density_T\": {\"min\": 1.5}}. Properties: relative_permeability (mu_r), saturation_flux_density_T (b_sat), coercivity_A_per_m (hc), remanence_T (br)"
+                    },
+                    "category": {
+                        "type": "string",
+                        "description": "Keep one category: electrical_steel, grain_oriented_steel, ferrite_mnzn, ferrite_nizn, powder_core, amorphous, nanocrystalline, nickel_iron, cobalt_iron, structural_steel, element, permanent_magnet, generic"
+                    },
+                    "sort_by": {
+                        "type": "string",
+                        "description": "Property to sort by (e.g., 'coercivity_A_per_m')"
+                    },
+                    "descending": {
+                        "type": "boolean",
+                        "description": "Sort from largest to smallest (default false)"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum materials returned, 1–100 (default 10)"
+                    }
+                }
+            }
+        ),
         Tool(
             name="unit_convert",
-            description="Convert between magnetic units (T↔Gauss, Wb↔Maxwell, A/m↔Oersted, H↔mH↔uH)",
+            description="Convert between magnetic units of the same dimension, SI or CGS, with any SI prefix and compound units (mT↔Gauss, kA/m↔Oe, nWb↔Maxwell, Wb/m²↔T, H↔mH↔uH, J/m³↔erg/cm³); accepts a list of values",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "value": {
-                        "type": "number",
-                        "description": "The numerical value to convert"
+                        "anyOf": [{"type": "number"}, {"type": "array", "items": {"type": "number"}}],
+                        "description": "The numerical value to convert, or a list of values"
                     },
                     "from_unit": {
                         "type": "string",
-                        "description": "The unit to convert from (e.g., 'T', 'Gauss', 'Wb', 'Maxwell', 'A/m', 'Oersted', 'H', 'mH', 'uH')"
+                        "description": "The unit to convert from (e.g., 'T', 'mT', 'Gauss', 'Wb', 'Maxwell', 'A/m', 'kA/m', 'Oersted', 'H', 'uH', 'Wb/m^2')"
                     },
                     "to_unit": {
                         "type": "string",
@@ -173,6 +222,404 @@ def get_tools() -> list[Tool]:
                 "required": ["value", "from_unit", "to_unit"]
             }
         ),
+        Tool(
+            name="batch_calculate",
+            description="Evaluate solenoid_field, biot_savart_wire, magnetic_flux, energy_stored, reluctance, or mmf_required over many inputs at once (parameter sweeps); returns columnar results with summary statistics",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "tool": {
+                        "type": "string",
+                        "enum": ["solenoid_field", "biot_savart_wire", "magnetic_flux", "energy_stored", "reluctance", "mmf_required"],
+                        "description": "Name of the tool to evaluate"
+                    },
+                    "arg_sets": {
+                        "type": "array",
+                        "items": {"type": "object"},
+                        "description": "List of argument objects, one per evaluation (use this or grid)"
+                    },
+                    "grid": {
+                        "type": "object",
+                        "description": "Parameter sweep: each parameter maps to a value, a list of values, or an inclusive range {\"start\", \"stop\", \"step\"}; every combination is evaluated (use this or arg_sets)"
+                    }
+                },
+                "required": ["tool"]
+            }
+        ),
+        Tool(
+            name="wire_path_field",
+            description="Compute 3-D B vectors of a current along an arbitrary polyline path (PCB traces, bus bars, rectangular loops) at many points, using the exact finite-segment Biot–Savart formula",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "array",
+                        "items": {"type": "array", "items": {"type": "number"}},
+                        "description": "Path vertices [[x, y, z], ...] in meters, in the direction of current flow"
+                    },
+                    "points": {
+                        "description": "Field points [[x, y, z], ...] in meters, or a grid {\"x_m\", \"y_m\", \"z_m\"} with each axis a number, a list, or {\"start\", \"stop\", \"num\"}"
+                    },
+                    "current_A": {
+                        "type": "number",
+                        "description": "Current in amperes"
+                    },
+                    "closed": {
+                        "type": "boolean",
+                        "description": "Close the path back to its first vertex (a loop)"
+                    },
+                    "store": {
+                        "type": "boolean",
+                        "description": "Write the field to the binary field-map store and return a handle (default: only results over 100 points)"
+                    }
+                },
+                "required": ["path", "points", "current_A"]
+            }
+        ),
+        Tool(
+            name="solenoid_field_map",
+            description="Compute the exact off-axis field (B_r, B_z) of a finite solenoid, multi-layer coil, or single loop over an (r, z) grid, including end fringing; each turn is an exact circular loop (elliptic integrals)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "turns": {
+                        "type": "integer",
+                        "description": "Total number of turns"
+                    },
+                    "length_m": {
+                        "type": "number",
+                        "description": "Winding length in meters (0 for a single loop or flat coil)"
+                    },
+                    "radius_m": {
+                        "type": "number",
+                        "description": "(Inner) winding radius in meters"
+                    },
+                    "current_A": {
+                        "type": "number",
+                        "description": "Current in amperes"
+                    },
+                    "r_m": {
+                        "description": "Radial position(s) in meters: a number, a list, or {\"start\", \"stop\", \"num\"}"
+                    },
+                    "z_m": {
+                        "description": "Axial position(s) from the coil center in meters: a number, a list, or {\"start\", \"stop\", \"num\"}"
+                    },
+                    "outer_radius_m": {
+                        "type": "number",
+                        "description": "Outer winding radius in meters (multi-layer coils)"
+                    },
+                    "layers": {
+                        "type": "integer",
+                        "description": "Number of winding layers (default 1)"
+                    },
+                    "store": {
+                        "type": "boolean",
+                        "description": "Write the field to the binary field-map store and return a handle (default: only results over 100 points)"
+                    }
+                },
+                "required": ["turns", "length_m", "radius_m", "current_A"]
+            }
+        ),
+        Tool(
+            name="magnetic_circuit_solve",
+            description="Solve a whole magnetic circuit (gapped cores, parallel legs, several windings) from a netlist of reluctance branches and windings: every branch flux, flux density and MMF drop, plus winding inductances, in one call",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "branches": {
+                        "type": "array",
+                        "items": {"type": "object"},
+                        "description": "Branches {\"name\", \"from\", \"to\", \"length_m\", \"area_m2\", \"material\" or \"relative_permeability\"} (or \"reluctance_H_inv\"), optional series \"mmf_AT\"; positive flux flows from → to"
+                    },
+                    "windings": {
+                        "type": "array",
+                        "items": {"type": "object"},
+                        "description": "Windings {\"name\", \"branch\", \"turns\", \"current_A\", \"direction\" (1 drives flux from → to, -1 reverse)}"
+                    },
+                    "nonlinear": {
+                        "type": "boolean",
+                        "description": "Saturate branches along their material's B–H curve (Newton solve) instead of using constant μr"
+                    }
+                },
+                "required": ["branches"]
+            }
+        ),
+        Tool(
+            name="saturation_current",
+            description="Find the winding current at which a magnetic circuit saturates: sweeps the current with the materials' B–H curves and reports where the incremental inductance drops and which branch saturates first",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "branches": {
+                        "type": "array",
+                        "items": {"type": "object"},
+                        "description": "Branches as for magnetic_circuit_solve"
+                    },
+                    "windings": {
+                        "type": "array",
+                        "items": {"type": "object"},
+                        "description": "Windings as for magnetic_circuit_solve"
+                    },
+                    "winding": {
+                        "type": "string",
+                        "description": "Name of the winding whose current is swept (default: the first)"
+                    },
+                    "max_current_A": {
+                        "type": "number",
+                        "description": "End of the sweep in amperes (default: 3x the current reaching B_sat with constant μr)"
+                    },
+                    "points": {
+                        "type": "integer",
+                        "description": "Number of sweep points (default 200)"
+                    },
+                    "inductance_drop": {
+                        "type": "number",
+                        "description": "Fractional inductance loss that defines saturation (default 0.2)"
+                    }
+                },
+                "required": ["branches", "windings"]
+            }
+        ),
+        Tool(
+            name="design_optimize",
+            description="Search gapped-core inductor designs (core material, core area, path length, turns) for a target inductance and current; returns the Pareto front of core volume, copper loss, turns, gap, or flux density under saturation and window-fill limits",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "inductance_H": {
+                        "type": "number",
+                        "description": "Target inductance in Henries"
+                    },
+                    "current_A": {
+                        "type": "number",
+                        "description": "Peak winding current in Amperes"
+                    },
+                    "window_area_m2": {
+                        "type": "number",
+                        "description": "Winding window area in square meters"
+                    },
+                    "materials": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Core materials (built-in or catalog names; default: the built-in soft materials)"
+                    },
+                    "core_area_m2": {
+                        "description": "Core cross-section(s) in m²: a number, a list, or {\"start\", \"stop\", \"num\"} (default 1e-5 to 1e-2, 61 log-spaced)"
+                    },
+                    "path_length_m": {
+                        "description": "Magnetic path length(s) in meters: a number, a list, or {\"start\", \"stop\", \"num\"} (default: square frame around the window)"
+                    },
+                    "turns": {
+                        "description": "Turn counts to consider: a number, a list, or {\"start\", \"stop\", \"num\"} (default: every count the window fits)"
+                    },
+                    "max_flux_density_fraction": {
+                        "type": "number",
+                        "description": "Allowed peak B as a fraction of B_sat (default 0.8)"
+                    },
+                    "max_gap_m": {
+                        "type": "number",
+                        "description": "Largest allowed air gap in meters (default: no limit)"
+                    },
+                    "current_density_A_per_m2": {
+                        "type": "number",
+                        "description": "Wire current density (default 5e6 A/m²)"
+                    },
+                    "fill_factor": {
+                        "type": "number",
+                        "description": "Copper fraction of the window (default 0.4)"
+                    },
+                    "objectives": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": ["core_volume_m3", "copper_loss_W", "turns", "gap_m", "flux_density_T"]},
+                        "description": "Quantities to minimize (default core_volume_m3 and copper_loss_W)"
+                    },
+                    "max_results": {
+                        "type": "integer",
+                        "description": "Pareto designs returned (default 20, max 100)"
+                    }
+                },
+                "required": ["inductance_H", "current_A", "window_area_m2"]
+            }
+        ),
+        Tool(
+            name="tolerance_analysis",
+            description="Monte Carlo tolerance analysis of one field or circuit tool: sample each input from a distribution (e.g. μr spread, gap tolerance, current ripple) 10⁵–10⁶ times and return output percentiles, a histogram, sensitivity rankings, and the yield against limits",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "tool": {
+                        "type": "string",
+                        "enum": ["solenoid_field", "biot_savart_wire", "magnetic_flux", "energy_stored", "reluctance", "mmf_required"],
+                        "description": "Tool to evaluate"
+                    },
+                    "inputs": {
+                        "type": "object",
+                        "description": "Parameter -> number (fixed) or distribution: {\"nominal\", \"tolerance\"} (relative, ±tolerance as 3σ; add \"distribution\": \"uniform\" for a flat spread), or {\"distribution\": \"normal\"|\"uniform\"|\"triangular\"|\"lognormal\", ...} with mean/std, low/high, low/mode/high, or median/sigma"
+                    },
+                    "samples": {
+                        "type": "integer",
+                        "description": "Number of samples (default 100,000; 100 to 1,000,000)"
+                    },
+                    "limits": {
+                        "type": "object",
+                        "description": "Output -> {\"min\", \"max\"} acceptance limits; adds the yield"
+                    },
+                    "percentiles": {
+                        "type": "array",
+                        "items": {"type": "number"},
+                        "description": "Percentiles to report (default 1, 5, 25, 50, 75, 95, 99)"
+                    },
+                    "bins": {
+                        "type": "integer",
+                        "description": "Histogram bins (default 20, max 200)"
+                    },
+                    "seed": {
+                        "type": "integer",
+                        "description": "Random seed for reproducible results"
+                    },
+                    "workers": {
+                        "type": "integer",
+                        "description": "Processes that evaluate chunks of samples (default 1)"
+                    }
+                },
+                "required": ["tool", "inputs"]
+            }
+        ),
+        Tool(
+            name="core_loss",
+            description="Core loss density (W/m³) of a material from its Steinmetz coefficients, for sinusoidal or piecewise-linear (triangle, trapezoid, custom) flux via the iGSE; frequency and flux-amplitude grids return a whole loss map in one call",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "frequency_Hz": {
+                        "description": "Frequency in Hz: a number, a list, or {\"start\", \"stop\", \"num\", \"log\": true}"
+                    },
+                    "flux_density_T": {
+                        "description": "Peak flux density amplitude (half of peak-to-peak) in Tesla, in the same forms"
+                    },
+                    "material": {
+                        "type": "string",
+                        "description": "Material with core-loss coefficients (e.g. 'ferrite', 'silicon_steel', 'N87', '3C95', 'M19', 'Kool Mu 60')"
+                    },
+                    "waveform": {
+                        "type": "object",
+                        "description": "Flux waveform (default sine): {\"type\": \"triangle\", \"duty\": 0.3}, {\"type\": \"trapezoid\", \"duty\": 0.8}, or {\"type\": \"piecewise_linear\", \"times\": [fractions of the period], \"flux\": [values]}"
+                    },
+                    "volume_m3": {
+                        "type": "number",
+                        "description": "Core volume in m³, to add the total loss in Watts"
+                    },
+                    "steinmetz": {
+                        "type": "object",
+                        "description": "Coefficients {\"k\", \"alpha\", \"beta\"} (P in W/m³, f in Hz, B in T) overriding the material's"
+                    }
+                },
+                "required": ["frequency_Hz", "flux_density_T"]
+            }
+        ),
+        Tool(
+            name="field_map_query",
+            description="Summarize a sub-region of, or sample values from, a field map stored by solenoid_field_map or wire_path_field, by its handle",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "handle": {
+                        "type": "string",
+                        "description": "field_map.handle returned by the field-map tool"
+                    },
+                    "bounds": {
+                        "type": "object",
+                        "description": "Grid maps: {axis: [min, max]} limiting the summary, e.g. {\"r_m\": [0, 0.005]}"
+                    },
+                    "at": {
+                        "type": "array",
+                        "description": "Grid maps: coordinate objects sampled at the nearest grid point, e.g. [{\"r_m\": 0, \"z_m\": 0.1}]; point maps: point indices"
+                    }
+                },
+                "required": ["handle"]
+            }
+        ),
+        Tool(
+            name="knowledge_search",
+            description="Semantic search over the skill's knowledge documents, served from one shared index",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Question or context to search for"
+                    },
+                    "top_k": {
+                        "type": "integer",
+                        "description": "Number of results to return (default 3)",
+                        "default": 3
+                    },
+                    "skill": {
+                        "type": "string",
+                        "description": "Skill whose knowledge to search (default: the server's --skill)"
+                    },
+                    "embedding": {
+                        "type": "array",
+                        "items": {"type": "number"},
+                        "description": "The query's vector from embed_texts, if the client already has it "
+                                       "(skips embedding the query again)"
+                    }
+                },
+                "required": ["query"]
+            }
+        ),
+        Tool(
+            name="knowledge_search_many",
+            description="Semantic search for several queries in one call, embedded together",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "queries": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Questions or contexts to search for (at most 100)"
+                    },
+                    "top_k": {
+                        "type": "integer",
+                        "description": "Number of results per query (default 3)",
+                        "default": 3
+                    },
+                    "skill": {
+                        "type": "string",
+                        "description": "Skill whose knowledge to search (default: the server's --skill)"
+                    }
+                },
+                "required": ["queries"]
+            }
+        ),
+        Tool(
+            name="embed_texts",
+            description="Embed texts with the knowledge base's embedding model",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "texts": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Texts to embed"
+                    }
+                },
+                "required": ["texts"]
+            }
+        ),
+        Tool(
+            name="knowledge_stats",
+            description="Knowledge base status and embedding batch statistics",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "skill": {
+                        "type": "string",
+                        "description": "Skill whose knowledge base to report (default: the server's --skill)"
+                    }
+                }
+            }
+        ),
     ]
 
 
@@ -182,69 +629,120 @@ async def list_tools():
     return get_tools()
 
 
+def _current_session_state() -> dict:
+    """State dict for the session serving the current request."""
+    try:
+        session = app.request_context.session
+    except LookupError:
+        return {}
+    if session not in session_state:
+        session_state[session] = {"connected_at": time.time(), "tool_calls": 0, "last_call_at": None}
+    return session_state[session]
+
+
+def get_server_stats() -> dict:
+    """Get session and tool-execution statistics."""
+    sessions = list(session_state.values())
+    return {
+        "active_sessions": len(sessions),
+        "session_tool_calls": sum(state["tool_calls"] for state in sessions),
+        "executor": tool_executor.get_stats(),
+    }
+
+
 @app.call_tool()
 async def call_tool(name: str, arguments: dict):
     """Execute a tool and return the result."""
-    try:
-        if name == "solenoid_field":
-            result = fields.solenoid_field(
-                turns=arguments["turns"],
-                length_m=arguments["length_m"],
-                current_A=arguments["current_A"]
-            )
-        elif name == "biot_savart_wire":
-            result = fields.biot_savart_wire(
-                current_A=arguments["current_A"],
-                distance_m=arguments["distance_m"]
-            )
-        elif name == "magnetic_flux":
-            result = fields.magnetic_flux(
-                B_tesla=arguments["B_tesla"],
-                area_m2=arguments["area_m2"],
-                angle_deg=arguments.get("angle_deg", 0)
-            )
-        elif name == "reluctance":
-            result = circuits.reluctance(
-                length_m=arguments["length_m"],
-                area_m2=arguments["area_m2"],
-                relative_permeability=arguments["relative_permeability"]
-            )
-        elif name == "mmf_required":
-            result = circuits.mmf_required(
-                H_field=arguments["H_field"],
-                path_length_m=arguments["path_length_m"]
-            )
-        elif name == "energy_stored":
-            result = fields.energy_stored(
-                B_tesla=arguments["B_tesla"],
-                volume_m3=arguments["volume_m3"]
-            )
-        elif name == "material_lookup":
-            result = materials.lookup_material(arguments["material"])
-        elif name == "unit_convert":
-            result = converters.convert_unit(
-                value=arguments["value"],
-                from_unit=arguments["from_unit"],
-                to_unit=arguments["to_unit"]
-            )
-        else:
-            result = {"error": f"Unknown tool: {name}"}
-
-        return [TextContent(type="text", text=json.dumps(result))]
-
-    except (TypeError, KeyError, ValueError) as e:
-        error_result = {"error": f"Tool execution failed: {str(e)}"}
-        return [TextContent(type="text", text=json.dumps(error_result))]
-
-
-async def main():
+    state = _current_session_state()
+    if state:
+        state["tool_calls"] += 1
+        state["last_call_at"] = time.time()
+
+    if name in KNOWLEDGE_TOOLS:
+        result = await knowledge_service.handle(name, arguments)
+    else:
+        result = await tool_executor.execute(name, arguments)
+    return [TextContent(type="text", text=json.dumps(result))]
+
+
+def _shutdown() -> None:
+    """Release the tool worker pool and the knowledge thread."""
+    tool_executor.shutdown(wait=False)
+    knowledge_service.shutdown()
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    """Parse the server's command-line options."""
+    parser = argparse.ArgumentParser(description="Magnetics MCP server")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio",
+                        help="stdio (one client) or streamable HTTP (many clients) (default: stdio)")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="HTTP bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000,
+                        help="HTTP port (default: 8000)")
+    parser.add_argument("--keep-alive", type=int, default=30,
+                        help="HTTP keep-alive timeout in seconds (default: 30)")
+    parser.add_argument("--session-idle-timeout", type=float, default=1800,
+                        help="Close HTTP sessions idle for this many seconds (default: 1800)")
+    parser.add_argument("--max-sessions", type=int, default=1000,
+                        help="Maximum open HTTP sessions (default: 1000)")
+    parser.add_argument("--shutdown-timeout", type=float, default=10.0,
+                        help="Seconds to let in-flight HTTP requests finish on shutdown (default: 10)")
+    parser.add_argument("--skill", default="maxwell_magnetics",
+                        help="Default skill for knowledge_search; other skills are served on request "
+                             "(default: maxwell_magnetics)")
+    parser.add_argument("--pool", choices=["thread", "process"], default="thread",
+                        help="Worker pool type for non-inline tools (default: thread)")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Worker pool size (default: 4)")
+    parser.add_argument("--max-concurrent", type=int, default=None,
+                        help="Maximum pooled tool calls in flight (default: 2 x workers)")
+    parser.add_argument("--tool-timeout", type=float, default=30.0,
+                        help="Per-call timeout in seconds for pooled tools (default: 30)")
+    return parser.parse_args(argv)
+
+
+async def main(argv: list = None):
     """Run the MCP server."""
-    import asyncio
+    global tool_executor, knowledge_service
+
+    args = parse_args(argv)
+    knowledge_service = KnowledgeService(skill_name=args.skill)
+    tool_executor = ToolExecutor(
+        mode=args.pool,
+        max_workers=args.workers,
+        max_concurrent=args.max_concurrent,
+        timeout_s=args.tool_timeout,
+    )
+
+    if args.transport == "http":
+        from mcp_server.http_transport import create_http_app, create_uvicorn_server
+
+        http_app = create_http_app(
+            app,
+            session_idle_timeout=args.session_idle_timeout,
+            max_sessions=args.max_sessions,
+            get_stats=get_server_stats,
+            on_shutdown=_shutdown,
+        )
+        server = create_uvicorn_server(
+            http_app,
+            host=args.host,
+            port=args.port,
+            keep_alive_s=args.keep_alive,
+            shutdown_timeout_s=args.shutdown_timeout,
+        )
+        await server.serve()
+        return
+
     from mcp.server.stdio import stdio_server
 
-    # Run the server with stdio transport
-    async with stdio_server() as streams:
-        await app.run(streams[0], streams[1], asyncio.Event())
+    try:
+        # Run the server with stdio transport
+        async with stdio_server() as streams:
+            await app.run(streams[0], streams[1], app.create_initialization_options())
+    finally:
+        _shutdown()
 
 
 if __name__ == "__main__":
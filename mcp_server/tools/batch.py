@@ -0,0 +1,172 @@
+"""Vectorized batch evaluation of the closed-form field and circuit tools."""
+
+import itertools
+import math
+
+import numpy as np
+
+from . import circuits, fields
+
+MAX_BATCH_POINTS = 100_000
+MAX_REPORTED_ERRORS = 100
+
+# Parameters, validity checks, vectorized formula, and equation of each tool,
+# shared with the scalar tools so a formula or message lives in one place
+_BATCH_TOOLS = {
+    "solenoid_field": fields.SOLENOID_FIELD,
+    "biot_savart_wire": fields.BIOT_SAVART_WIRE,
+    "magnetic_flux": fields.MAGNETIC_FLUX,
+    "energy_stored": fields.ENERGY_STORED,
+    "reluctance": circuits.RELUCTANCE,
+    "mmf_required": circuits.MMF_REQUIRED,
+}
+
+BATCH_TOOLS = tuple(_BATCH_TOOLS)
+
+
+def _expand_range(spec: dict) -> list:
+    """Expand {"start", "stop", "step"} into an inclusive list of values."""
+    start, stop, step = float(spec["start"]), float(spec["stop"]), float(spec["step"])
+    if step == 0 or (stop - start) / step < 0:
+        raise ValueError("Range step must be non-zero and point from start to stop")
+    count = int(math.floor((stop - start) / step + 1e-9)) + 1
+    if count > MAX_BATCH_POINTS:
+        raise ValueError(f"Range has more than {MAX_BATCH_POINTS} points")
+    return (start + step * np.arange(count)).tolist()
+
+
+def _grid_columns(grid: dict) -> tuple:
+    """Cartesian product of grid values; returns (columns, varied parameter names)."""
+    axes = {}
+    for name, spec in grid.items():
+        if isinstance(spec, dict):
+            axes[name] = _expand_range(spec)
+        elif isinstance(spec, list):
+            if not spec:
+                raise ValueError(f"Grid values for '{name}' are empty")
+            axes[name] = spec
+        else:
+            axes[name] = [spec]
+
+    size = math.prod(len(values) for values in axes.values())
+    if size > MAX_BATCH_POINTS:
+        raise ValueError(f"Grid has {size} points; the limit is {MAX_BATCH_POINTS}")
+
+    varied = [name for name, values in axes.items() if len(values) > 1]
+    rows = list(itertools.product(*axes.values()))
+    columns = {name: [row[i] for row in rows] for i, name in enumerate(axes)}
+    return columns, varied
+
+
+def _arg_set_columns(arg_sets: list) -> tuple:
+    """Turn a list of argument dicts into columns; returns (columns, varied parameter names)."""
+    if len(arg_sets) > MAX_BATCH_POINTS:
+        raise ValueError(f"Batch has {len(arg_sets)} argument sets; the limit is {MAX_BATCH_POINTS}")
+    names = []
+    for arg_set in arg_sets:
+        if not isinstance(arg_set, dict):
+            raise ValueError("Each argument set must be an object")
+        names.extend(name for name in arg_set if name not in names)
+
+    columns = {name: [arg_set.get(name) for arg_set in arg_sets] for name in names}
+    varied = [name for name, values in columns.items() if len(set(map(repr, values))) > 1]
+    return columns, varied
+
+
+def _to_json_list(values: np.ndarray) -> list:
+    """Convert an array to a list with None in place of NaN."""
+    return [None if math.isnan(v) else v for v in values.tolist()]
+
+
+def batch_calculate(tool: str, arg_sets: list = None, grid: dict = None) -> dict:
+    """
+    Evaluate one closed-form tool over many inputs at once.
+
+    Exactly one of arg_sets or grid must be given. A grid maps each parameter
+    to a single value, a list of values, or an inclusive range
+    {"start": 0.1, "stop": 5, "step": 0.1}; every combination is evaluated.
+
+    Args:
+        tool: Name of the tool to evaluate (see BATCH_TOOLS)
+        arg_sets: List of argument dictionaries, one per evaluation
+        grid: Parameter grid to sweep
+
+    Returns:
+        Dictionary with columnar inputs/outputs, per-row errors (invalid rows
+        have null outputs; at most the first 100 are listed), and summary
+        statistics (min, max, mean, and the row index of min/max) of each output
+    """
+    spec = _BATCH_TOOLS.get(tool)
+    if spec is None:
+        return {"error": f"batch_calculate does not support '{tool}'. Supported: {', '.join(BATCH_TOOLS)}"}
+    if (arg_sets is None) == (grid is None):
+        return {"error": "Provide exactly one of arg_sets or grid"}
+
+    try:
+        if grid is not None:
+            columns, varied = _grid_columns(grid)
+        else:
+            columns, varied = _arg_set_columns(arg_sets)
+    except (KeyError, TypeError, ValueError) as e:
+        return {"error": f"Invalid batch input: {e}"}
+
+    count = len(next(iter(columns.values()))) if columns else 0
+    if count == 0:
+        return {"error": "Batch is empty"}
+
+    unknown = set(columns) - set(spec["params"])
+    if unknown:
+        return {"error": f"Unknown parameter(s) for {tool}: {', '.join(sorted(unknown))}"}
+
+    params = {}
+    for name, default in spec["params"].items():
+        values = columns.get(name, [None] * count)
+        if default is not None:
+            values = [default if v is None else v for v in values]
+        if any(v is None for v in values):
+            return {"error": f"Missing parameter '{name}' for {tool}"}
+        try:
+            params[name] = np.asarray(values, dtype=float)
+        except (TypeError, ValueError):
+            return {"error": f"Parameter '{name}' must be numeric"}
+
+    # First failing check wins per row, matching the scalar tools
+    messages = np.full(count, None, dtype=object)
+    for check, message in spec["checks"]:
+        failed = check(params) & (messages == None)  # noqa: E711 (elementwise)
+        messages[failed] = message
+    valid = messages == None  # noqa: E711
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        outputs = spec["compute"](params)
+    outputs = {name: np.where(valid, values, np.nan) for name, values in outputs.items()}
+
+    summary = {}
+    if valid.any():
+        for name, values in outputs.items():
+            summary[name] = {
+                "min": float(np.nanmin(values)),
+                "max": float(np.nanmax(values)),
+                "mean": float(np.nanmean(values)),
+                "argmin": int(np.nanargmin(values)),
+                "argmax": int(np.nanargmax(values)),
+            }
+
+    result_columns = {name: params[name].tolist() for name in spec["params"] if name in varied}
+    result_columns.update({name: _to_json_list(values) for name, values in outputs.items()})
+
+    return {
+        "tool": tool,
+        "count": count,
+        "valid_count": int(valid.sum()),
+        "fixed": {
+            name: float(params[name][0]) for name in spec["params"] if name not in varied
+        },
+        "columns": result_columns,
+        "errors": [
+            {"index": int(index), "error": messages[index]}
+            for index in np.flatnonzero(~valid)[:MAX_REPORTED_ERRORS]
+        ],
+        "summary": summary,
+        "equation": spec["equation"],
+    }
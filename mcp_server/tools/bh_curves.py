@@ -0,0 +1,180 @@
+"""B–H magnetization curves of the soft materials, as monotone piecewise-cubic tables."""
+
+import functools
+
+import numpy as np
+
+from .circuits import MU_0
+
+# Initial magnetization curves (H in A/m, B in Tesla), starting at the origin.
+# Tabulated from the Frohlich–Kennelly law B = μ₀H + B_sat · H / (H + H_k),
+# H_k = B_sat / (μ₀(μᵣ − 1)), with the μᵣ and B_sat listed in MATERIALS, so the
+# curves agree with the linear tools at low field. Measured curves can replace
+# any table as long as both columns stay increasing.
+BH_TABLES = {
+    "iron": {
+        "H_A_per_m": [0.0, 17.1, 34.2, 68.5, 120.0, 171.0, 257.0, 342.0, 513.0, 685.0, 1030.0, 1710.0,
+                      3420.0, 6850.0, 17100.0, 34200.0, 103000.0, 342000.0],
+        "B_T": [0.0, 0.1023, 0.1954, 0.3586, 0.5583, 0.7165, 0.9224, 1.075, 1.29, 1.435, 1.615, 1.794,
+                1.959, 2.056, 2.129, 2.172, 2.272, 2.578],
+    },
+    "silicon_steel": {
+        "H_A_per_m": [0.0, 19.9, 39.8, 79.6, 139.0, 199.0, 298.0, 398.0, 597.0, 796.0, 1190.0, 1990.0,
+                      3980.0, 7960.0, 19900.0, 39800.0, 119000.0, 398000.0],
+        "B_T": [0.0, 0.09527, 0.1819, 0.3334, 0.5179, 0.6669, 0.8567, 1.001, 1.201, 1.334, 1.5, 1.669,
+                1.823, 1.915, 1.986, 2.03, 2.143, 2.498],
+    },
+    "ferrite": {
+        "H_A_per_m": [0.0, 7.96, 15.9, 31.8, 55.7, 79.6, 119.0, 159.0, 239.0, 318.0, 478.0, 796.0,
+                      1590.0, 3180.0, 7960.0, 15900.0, 47800.0, 159000.0],
+        "B_T": [0.0, 0.01905, 0.03633, 0.06662, 0.1037, 0.1334, 0.1712, 0.2001, 0.2404, 0.2669, 0.3006,
+                0.3343, 0.3656, 0.3849, 0.4022, 0.416, 0.4587, 0.5994],
+    },
+    "mu_metal": {
+        "H_A_per_m": [0.0, 0.398, 0.796, 1.59, 2.79, 3.98, 5.97, 7.96, 11.9, 15.9, 23.9, 39.8, 79.6,
+                      159.0, 398.0, 796.0, 2390.0, 7960.0],
+        "B_T": [0.0, 0.03811, 0.07275, 0.1332, 0.2077, 0.2667, 0.3429, 0.4001, 0.4794, 0.5332, 0.6002,
+                0.6667, 0.7274, 0.7621, 0.7848, 0.7931, 0.8003, 0.8092],
+    },
+}
+
+
+def _pchip_slopes(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Fritsch–Carlson node slopes that keep the cubic interpolant monotone."""
+    h = np.diff(x)
+    delta = np.diff(y) / h
+    slopes = np.zeros_like(y)
+
+    # Interior: weighted harmonic mean of the neighbouring secants (0 at extrema)
+    w1 = 2 * h[1:] + h[:-1]
+    w2 = h[1:] + 2 * h[:-1]
+    same_sign = (delta[:-1] * delta[1:]) > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        harmonic = (w1 + w2) / (w1 / delta[:-1] + w2 / delta[1:])
+    slopes[1:-1] = np.where(same_sign, harmonic, 0.0)
+
+    # Ends: one-sided three-point estimate, limited to preserve monotonicity
+    def end_slope(h0, h1, d0, d1):
+        slope = ((2 * h0 + h1) * d0 - h0 * d1) / (h0 + h1)
+        if np.sign(slope) != np.sign(d0):
+            return 0.0
+        if np.sign(d0) != np.sign(d1) and abs(slope) > 3 * abs(d0):
+            return 3 * d0
+        return slope
+
+    if len(x) == 2:
+        slopes[:] = delta[0]
+    else:
+        slopes[0] = end_slope(h[0], h[1], delta[0], delta[1])
+        slopes[-1] = end_slope(h[-1], h[-2], delta[-1], delta[-2])
+    return slopes
+
+
+class BHCurve:
+    """
+    Monotone piecewise-cubic (PCHIP) B(H) curve with precomputed coefficients.
+
+    The table covers H ≥ 0; the curve is odd (B(−H) = −B(H)) and continues
+    beyond the last point with slope μ₀, as a fully saturated material does.
+
+    Attributes:
+        H: Table field strengths in A/m
+        B: Table flux densities in Tesla
+        coefficients: (intervals, 4) array of c₀..c₃ with
+            B = c₀ + c₁t + c₂t² + c₃t³ and t = H − H_i on interval i
+    """
+
+    def __init__(self, H, B):
+        self.H = np.asarray(H, dtype=float)
+        self.B = np.asarray(B, dtype=float)
+        if self.H.ndim != 1 or self.H.shape != self.B.shape or len(self.H) < 2:
+            raise ValueError("A B–H table needs matching H and B columns of at least 2 points")
+        if self.H[0] != 0 or self.B[0] != 0:
+            raise ValueError("A B–H table must start at H = 0, B = 0")
+        if np.any(np.diff(self.H) <= 0) or np.any(np.diff(self.B) <= 0):
+            raise ValueError("B–H table columns must be strictly increasing")
+
+        h = np.diff(self.H)
+        delta = np.diff(self.B) / h
+        slopes = _pchip_slopes(self.H, self.B)
+        self.coefficients = np.column_stack([
+            self.B[:-1],
+            slopes[:-1],
+            (3 * delta - 2 * slopes[:-1] - slopes[1:]) / h,
+            (slopes[:-1] + slopes[1:] - 2 * delta) / h ** 2,
+        ])
+        # ∫B dH from the origin to the start of each interval, for the energy density
+        self.coenergy = np.concatenate([[0.0], np.cumsum(self._interval_integral(np.arange(len(h)), h))])
+
+    def _interval_integral(self, index: np.ndarray, t: np.ndarray) -> np.ndarray:
+        """∫B dH over the first t A/m of the given intervals."""
+        c0, c1, c2, c3 = np.moveaxis(self.coefficients[index], -1, 0)
+        return t * (c0 + t * (c1 / 2 + t * (c2 / 3 + t * c3 / 4)))
+
+    def evaluate(self, H) -> tuple:
+        """
+        Flux density and differential permeability at any field strengths.
+
+        Args:
+            H: Field strength(s) in A/m (any shape)
+
+        Returns:
+            Tuple (B in Tesla, dB/dH in H/m) with the shape of H
+        """
+        H = np.asarray(H, dtype=float)
+        magnitude = np.abs(H)
+        index = np.clip(np.searchsorted(self.H, magnitude, side="right") - 1, 0, len(self.H) - 2)
+        t = magnitude - self.H[index]
+        c0, c1, c2, c3 = np.moveaxis(self.coefficients[index], -1, 0)
+        B = c0 + t * (c1 + t * (c2 + t * c3))
+        dB = c1 + t * (2 * c2 + t * 3 * c3)
+
+        beyond = magnitude > self.H[-1]
+        B = np.where(beyond, self.B[-1] + MU_0 * (magnitude - self.H[-1]), B)
+        dB = np.where(beyond, MU_0, dB)
+        return np.sign(H) * B, dB
+
+    def energy_density(self, H) -> np.ndarray:
+        """
+        Stored magnetic energy density w = ∫₀ᴮ H dB' (= H·B − ∫₀ᴴ B dH').
+
+        Args:
+            H: Field strength(s) in A/m (any shape)
+
+        Returns:
+            Energy density in J/m³ with the shape of H
+        """
+        magnitude = np.abs(np.asarray(H, dtype=float))
+        B, _ = self.evaluate(magnitude)
+        index = np.clip(np.searchsorted(self.H, magnitude, side="right") - 1, 0, len(self.H) - 2)
+        inside = np.minimum(magnitude, self.H[-1])
+        coenergy = self.coenergy[index] + self._interval_integral(index, inside - self.H[index])
+        excess = np.maximum(magnitude - self.H[-1], 0.0)
+        coenergy = coenergy + excess * (self.B[-1] + MU_0 * excess / 2)
+        return magnitude * B - coenergy
+
+    def initial_permeability(self) -> float:
+        """Slope dB/dH at the origin in H/m."""
+        return float(self.coefficients[0, 1])
+
+
+def get_curve(material: str):
+    """
+    B–H curve of a material in BH_TABLES.
+
+    Args:
+        material: Material name (case-insensitive)
+
+    Returns:
+        BHCurve, or None if the material has no table (linear materials)
+    """
+    return _curve(str(material).lower().strip())
+
+
+@functools.lru_cache(maxsize=None)
+def _curve(name: str):
+    """One BHCurve per material, so coefficients are computed once."""
+    table = BH_TABLES.get(name)
+    if table is None:
+        return None
+    return BHCurve(table["H_A_per_m"], table["B_T"])
@@ -2,10 +2,64 @@
 
 import math
 
+from .fields import first_error
+
 # Physical constant
 MU_0 = 4 * math.pi * 1e-7  # H/m (permeability of free space)
 
 
+def _reluctance_outputs(p: dict) -> dict:
+    mu = MU_0 * p["relative_permeability"]
+    R = p["length_m"] / (mu * p["area_m2"])
+    return {
+        "reluctance_H_inv": R,
+        "reluctance_AT_per_Wb": R,  # Same units, different name
+        "permeability_H_per_m": mu,
+    }
+
+
+# Parameters, validity checks, scalar-or-array formula, and equation, as in fields.py
+RELUCTANCE = {
+    "params": {"length_m": None, "area_m2": None, "relative_permeability": None},
+    "checks": [
+        (lambda p: p["length_m"] <= 0, "Length must be positive"),
+        (lambda p: p["area_m2"] <= 0, "Area must be positive"),
+        (lambda p: p["relative_permeability"] <= 0, "Relative permeability must be positive"),
+    ],
+    "compute": _reluctance_outputs,
+    "equation": "R = l / (μ₀ · μᵣ · A)",
+}
+
+MMF_REQUIRED = {
+    "params": {"H_field": None, "path_length_m": None},
+    "checks": [
+        (lambda p: p["path_length_m"] < 0, "Path length must be non-negative"),
+    ],
+    "compute": lambda p: {"mmf_AT": p["H_field"] * p["path_length_m"]},
+    "equation": "MMF = H · l",
+}
+
+
+def gap_for_inductance(inductance_H, turns, core_reluctance_H_inv, area_m2) -> tuple:
+    """
+    Air gap that gives a wound core the target inductance (scalars or NumPy arrays).
+
+    Using L = N² / (R_core + R_gap) and R_gap = g / (μ₀ · A) for a gap of the
+    core's area. Both results are negative where the core alone has too
+    little reluctance.
+
+    Returns:
+        (gap reluctance in H⁻¹, gap length in meters)
+    """
+    gap_reluctance = turns ** 2 / inductance_H - core_reluctance_H_inv
+    return gap_reluctance, gap_reluctance * MU_0 * area_m2
+
+
+def peak_flux_density(inductance_H, current_A, turns, area_m2):
+    """Peak flux density B = L · I / (N · A) in a winding's core (scalars or NumPy arrays)."""
+    return inductance_H * current_A / (turns * area_m2)
+
+
 def reluctance(length_m: float, area_m2: float, relative_permeability: float) -> dict:
     """
     Compute reluctance of a magnetic circuit path.
@@ -20,24 +74,20 @@ def reluctance(length_m: float, area_m2: float, relative_permeability: float) ->
     Returns:
         Dictionary with reluctance in H⁻¹ (Ampere-turns per Weber)
     """
-    if length_m <= 0:
-        return {"error": "Length must be positive"}
-    if area_m2 <= 0:
-        return {"error": "Area must be positive"}
-    if relative_permeability <= 0:
-        return {"error": "Relative permeability must be positive"}
-
-    mu = MU_0 * relative_permeability
-    R = length_m / (mu * area_m2)
+    params = {"length_m": length_m, "area_m2": area_m2, "relative_permeability": relative_permeability}
+    error = first_error(RELUCTANCE["checks"], params)
+    if error is not None:
+        return {"error": error}
+    outputs = RELUCTANCE["compute"](params)
 
     return {
-        "reluctance_H_inv": R,
-        "reluctance_AT_per_Wb": R,  # Same units, different name
+        "reluctance_H_inv": outputs["reluctance_H_inv"],
+        "reluctance_AT_per_Wb": outputs["reluctance_AT_per_Wb"],
         "length_m": length_m,
         "area_m2": area_m2,
         "relative_permeability": relative_permeability,
-        "permeability_H_per_m": mu,
-        "equation": "R = l / (μ₀ · μᵣ · A)"
+        "permeability_H_per_m": outputs["permeability_H_per_m"],
+        "equation": RELUCTANCE["equation"]
     }
 
 
@@ -54,14 +104,14 @@ def mmf_required(H_field: float, path_length_m: float) -> dict:
     Returns:
         Dictionary with MMF in Ampere-turns
     """
-    if path_length_m < 0:
-        return {"error": "Path length must be non-negative"}
-
-    mmf = H_field * path_length_m
+    params = {"H_field": H_field, "path_length_m": path_length_m}
+    error = first_error(MMF_REQUIRED["checks"], params)
+    if error is not None:
+        return {"error": error}
 
     return {
-        "mmf_AT": mmf,
+        "mmf_AT": MMF_REQUIRED["compute"](params)["mmf_AT"],
         "H_field_A_per_m": H_field,
         "path_length_m": path_length_m,
-        "equation": "MMF = H · l"
+        "equation": MMF_REQUIRED["equation"]
     }
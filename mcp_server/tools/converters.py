@@ -1,30 +1,243 @@
 """Unit conversion tools for magnetic quantities."""
 
-# Conversion factors
-CONVERSIONS = {
-    "T_to_Gauss": 10000,
-    "Gauss_to_T": 1 / 10000,
-    "Wb_to_Maxwell": 1e8,
-    "Maxwell_to_Wb": 1e-8,
-    "A_per_m_to_Oersted": 1 / 79.577,
-    "Oersted_to_A_per_m": 79.577,
-    "H_to_mH": 1000,
-    "mH_to_H": 1 / 1000,
-    "H_to_uH": 1e6,
-    "uH_to_H": 1e-6,
-    "mH_to_uH": 1000,
-    "uH_to_mH": 1 / 1000,
+import functools
+import math
+import re
+
+import numpy as np
+
+# Dimensions are exponent vectors over these SI base units
+BASE_UNITS = ("m", "kg", "s", "A")
+
+# Unit symbol -> (mantissa, power of ten, dimension vector); the SI value of
+# one unit is mantissa · 10^power. Keeping powers of ten exact makes prefix
+# conversions (mH -> uH, Wb -> Mx) exact in floating point.
+UNITS = {
+    # Base and mechanical
+    "m": (1.0, 0, (1, 0, 0, 0)),
+    "g": (1.0, -3, (0, 1, 0, 0)),
+    "s": (1.0, 0, (0, 0, 1, 0)),
+    "A": (1.0, 0, (0, 0, 0, 1)),
+    "in": (2.54, -2, (1, 0, 0, 0)),
+    "L": (1.0, -3, (3, 0, 0, 0)),
+    "Hz": (1.0, 0, (0, 0, -1, 0)),
+    "N": (1.0, 0, (1, 1, -2, 0)),
+    "J": (1.0, 0, (2, 1, -2, 0)),
+    "erg": (1.0, -7, (2, 1, -2, 0)),
+    "W": (1.0, 0, (2, 1, -3, 0)),
+    "V": (1.0, 0, (2, 1, -3, -1)),
+    "Ω": (1.0, 0, (2, 1, -3, -2)),
+    # Magnetic (SI)
+    "T": (1.0, 0, (0, 1, -2, -1)),
+    "Wb": (1.0, 0, (2, 1, -2, -1)),
+    "H": (1.0, 0, (2, 1, -2, -2)),
+    "At": (1.0, 0, (0, 0, 0, 1)),
+    # Magnetic (Gaussian CGS)
+    "G": (1.0, -4, (0, 1, -2, -1)),
+    "Mx": (1.0, -8, (2, 1, -2, -1)),
+    "Oe": (1 / (4 * math.pi), 3, (-1, 0, 0, 1)),
+    "Gb": (1 / (4 * math.pi), 1, (0, 0, 0, 1)),
+}
+
+# Spelled-out names (matched case-insensitively) -> symbol
+UNIT_NAMES = {
+    "meter": "m", "meters": "m", "metre": "m", "metres": "m",
+    "gram": "g", "grams": "g",
+    "second": "s", "seconds": "s", "sec": "s",
+    "amp": "A", "amps": "A", "ampere": "A", "amperes": "A",
+    "inch": "in", "inches": "in",
+    "liter": "L", "liters": "L", "litre": "L", "litres": "L",
+    "hertz": "Hz",
+    "newton": "N", "newtons": "N",
+    "joule": "J", "joules": "J",
+    "watt": "W", "watts": "W",
+    "volt": "V", "volts": "V",
+    "ohm": "Ω", "ohms": "Ω",
+    "tesla": "T", "teslas": "T",
+    "weber": "Wb", "webers": "Wb",
+    "henry": "H", "henries": "H", "henrys": "H",
+    "ampere-turn": "At", "ampere-turns": "At", "amp-turn": "At", "amp-turns": "At",
+    "gauss": "G", "gs": "G",
+    "maxwell": "Mx", "maxwells": "Mx",
+    "oersted": "Oe", "oersteds": "Oe",
+    "gilbert": "Gb", "gilberts": "Gb",
+}
+
+# SI prefixes: symbol -> power of ten, and the spelled-out forms
+PREFIXES = {
+    "Y": 24, "Z": 21, "E": 18, "P": 15, "T": 12, "G": 9, "M": 6, "k": 3, "h": 2, "da": 1,
+    "d": -1, "c": -2, "m": -3, "u": -6, "µ": -6, "μ": -6, "n": -9, "p": -12, "f": -15, "a": -18,
 }
+PREFIX_NAMES = {
+    "yotta": 24, "zetta": 21, "exa": 18, "peta": 15, "tera": 12, "giga": 9, "mega": 6, "kilo": 3,
+    "hecto": 2, "deca": 1, "deci": -1, "centi": -2, "milli": -3, "micro": -6, "nano": -9, "pico": -12,
+    "femto": -15, "atto": -18,
+}
+
+DIMENSION_NAMES = {
+    (0, 0, 0, 0): "dimensionless",
+    (1, 0, 0, 0): "length",
+    (2, 0, 0, 0): "area",
+    (3, 0, 0, 0): "volume",
+    (0, 1, 0, 0): "mass",
+    (0, 0, 1, 0): "time",
+    (0, 0, -1, 0): "frequency",
+    (0, 0, 0, 1): "current / magnetomotive force",
+    (1, 1, -2, 0): "force",
+    (2, 1, -2, 0): "energy",
+    (-1, 1, -2, 0): "energy density",
+    (2, 1, -3, 0): "power",
+    (2, 1, -3, -1): "voltage",
+    (2, 1, -3, -2): "resistance",
+    (0, 1, -2, -1): "magnetic flux density",
+    (2, 1, -2, -1): "magnetic flux",
+    (-1, 0, 0, 1): "magnetic field strength",
+    (2, 1, -2, -2): "inductance",
+    (1, 1, -2, -2): "permeability",
+    (-2, -1, 2, 2): "reluctance",
+}
+
+# Largest value list converted in one call
+MAX_VALUES = 1_000_000
+
+_SUPERSCRIPTS = str.maketrans({"⁻": "-", "⁰": "0", "¹": "1", "²": "2", "³": "3", "⁴": "4"})
+_FACTOR_PATTERN = re.compile(r"^(?P<unit>[^\d^+\-]+?)\^?(?P<power>[-+]?\d+)?$")
+
+SUPPORTED_UNITS = (
+    ", ".join(UNITS) + " (with SI prefixes, e.g. mT, kA/m, nWb, uH, kOe; "
+    "products and quotients, e.g. Wb/m2, H/m, A/Wb, J/m^3)"
+)
+
 
+def _unit_symbol(token: str):
+    """(mantissa, power of ten, dimensions) of one unit token without exponent, or None."""
+    if token in UNITS:
+        return UNITS[token]
+    name = UNIT_NAMES.get(token.lower())
+    if name is not None:
+        return UNITS[name]
+    for prefix, power in sorted(PREFIXES.items(), key=lambda item: -len(item[0])):
+        rest = token[len(prefix):]
+        if token.startswith(prefix) and rest in UNITS:
+            mantissa, unit_power, dimensions = UNITS[rest]
+            return mantissa, unit_power + power, dimensions
+    lower = token.lower()
+    for prefix, power in PREFIX_NAMES.items():
+        name = UNIT_NAMES.get(lower[len(prefix):])
+        if lower.startswith(prefix) and name is not None:
+            mantissa, unit_power, dimensions = UNITS[name]
+            return mantissa, unit_power + power, dimensions
+    return None
 
-def convert_unit(value: float, from_unit: str, to_unit: str) -> dict:
+
+@functools.lru_cache(maxsize=4096)
+def parse_unit(text: str) -> tuple:
+    """
+    Parse a (possibly prefixed, compound) unit expression.
+
+    Factors are separated by "*", "·" or spaces and divided by "/" (or
+    "per", "_per_");
+    exponents are written "m^2", "m2", "m²" or "m^-1".
+
+    Args:
+        text: Unit expression, e.g. "mT", "kA/m", "Wb/m^2", "amperes per meter"
+
+    Returns:
+        Tuple (mantissa, power of ten, dimension vector over BASE_UNITS)
+
+    Raises:
+        ValueError: If a factor is not a known unit
+    """
+    # "per" as a word, or "_per_" as in the older "A_per_m" unit keys, means "/"
+    expression = re.sub(r"\s+per\s+|_per_", "/", text.strip().translate(_SUPERSCRIPTS))
+    if not expression:
+        raise ValueError("Empty unit")
+    mantissa, power, dimensions = 1.0, 0, np.zeros(len(BASE_UNITS), dtype=int)
+    for position, part in enumerate(expression.split("/")):
+        sign = 1 if position == 0 else -1
+        tokens = [token for token in re.split(r"[*·⋅\s]+", part.strip()) if token]
+        if not tokens:
+            raise ValueError(f"Missing unit in '{text}'")
+        for token in tokens:
+            if token == "1" and position == 0:
+                continue
+            # Whole token first, so hyphenated names ("ampere-turn") are not read as exponents
+            unit, exponent = _unit_symbol(token), 1
+            if unit is None:
+                match = _FACTOR_PATTERN.match(token)
+                unit = _unit_symbol(match.group("unit")) if match else None
+                exponent = int(match.group("power") or 1) if match else 1
+            if unit is None:
+                raise ValueError(f"Unknown unit '{token}' in '{text}'")
+            exponent *= sign
+            mantissa *= unit[0] ** exponent
+            power += unit[1] * exponent
+            dimensions += exponent * np.array(unit[2])
+    return mantissa, power, tuple(int(d) for d in dimensions)
+
+
+def dimension_name(dimensions: tuple) -> str:
+    """Name of a dimension vector, or its base-unit form (e.g. "m^2 kg s^-2")."""
+    if dimensions in DIMENSION_NAMES:
+        return DIMENSION_NAMES[dimensions]
+    return " ".join(base if d == 1 else f"{base}^{d}" for base, d in zip(BASE_UNITS, dimensions) if d)
+
+
+@functools.lru_cache(maxsize=4096)
+def conversion_factor(from_unit: str, to_unit: str) -> tuple:
+    """
+    Factor converting values in from_unit to to_unit (cached per pair).
+
+    Args:
+        from_unit: Source unit expression
+        to_unit: Target unit expression
+
+    Returns:
+        Tuple (factor, dimension name)
+
+    Raises:
+        ValueError: If a unit is unknown or the dimensions differ
+    """
+    from_mantissa, from_power, from_dimensions = parse_unit(from_unit)
+    to_mantissa, to_power, to_dimensions = parse_unit(to_unit)
+    if from_dimensions != to_dimensions:
+        raise ValueError(
+            f"Cannot convert '{from_unit}' ({dimension_name(from_dimensions)}) "
+            f"to '{to_unit}' ({dimension_name(to_dimensions)})"
+        )
+    power = from_power - to_power
+    scale = 10.0 ** power if power >= 0 else 1 / 10.0 ** -power
+    factor = scale if from_mantissa == to_mantissa else scale * from_mantissa / to_mantissa
+    return factor, dimension_name(from_dimensions)
+
+
+def convert_array(values, from_unit: str, to_unit: str) -> np.ndarray:
+    """
+    Convert an array of values between units in one vectorized multiply.
+
+    Args:
+        values: Numbers (any shape)
+        from_unit: Source unit expression
+        to_unit: Target unit expression
+
+    Returns:
+        Float array of converted values
+
+    Raises:
+        ValueError: If a unit is unknown or the dimensions differ
+    """
+    factor, _ = conversion_factor(from_unit.strip(), to_unit.strip())
+    return np.asarray(values, dtype=float) * factor
+
+
+def convert_unit(value, from_unit: str, to_unit: str) -> dict:
     """
     Convert between magnetic units.
 
     Args:
-        value: The numerical value to convert
-        from_unit: The unit to convert from (e.g., 'T', 'Gauss', 'A/m')
-        to_unit: The unit to convert to (e.g., 'Gauss', 'T', 'Oersted')
+        value: The numerical value to convert, or a list of values
+        from_unit: The unit to convert from (e.g., 'T', 'Gauss', 'kA/m', 'nWb')
+        to_unit: The unit to convert to (e.g., 'Gauss', 'mT', 'Oersted')
 
     Returns:
         Dictionary with converted value or error message
@@ -42,35 +255,32 @@ def convert_unit(value: float, from_unit: str, to_unit: str) -> dict:
             "message": "Input and output units are the same"
         }
 
-    # Normalize units for key lookup (replace "/" with "_per_")
-    from_unit_normalized = from_unit.replace("/", "_per_")
-    to_unit_normalized = to_unit.replace("/", "_per_")
-
-    # Try to find conversion key
-    conversion_key = f"{from_unit_normalized}_to_{to_unit_normalized}"
-    reverse_key = f"{to_unit_normalized}_to_{from_unit_normalized}"
-
-    if conversion_key in CONVERSIONS:
-        converted = value * CONVERSIONS[conversion_key]
+    try:
+        factor, dimension = conversion_factor(from_unit, to_unit)
+    except ValueError as e:
         return {
-            "original_value": value,
-            "from_unit": from_unit,
-            "to_unit": to_unit,
-            "converted_value": converted
+            "error": str(e),
+            "supported_units": SUPPORTED_UNITS
         }
-    elif reverse_key in CONVERSIONS:
-        converted = value / CONVERSIONS[reverse_key]
+
+    if isinstance(value, (list, tuple)):
+        values = np.asarray(value, dtype=float)
+        if values.size > MAX_VALUES:
+            return {"error": f"At most {MAX_VALUES:,} values can be converted per call"}
         return {
-            "original_value": value,
+            "count": int(values.size),
             "from_unit": from_unit,
             "to_unit": to_unit,
-            "converted_value": converted
-        }
-    else:
-        supported = ", ".join(sorted(set(
-            k.split("_to_")[0].replace("_per_", "/") for k in CONVERSIONS.keys()
-        )))
-        return {
-            "error": f"Conversion from '{from_unit}' to '{to_unit}' not supported",
-            "supported_units": supported
+            "converted_value": (values * factor).tolist(),
+            "factor": factor,
+            "dimension": dimension
         }
+
+    return {
+        "original_value": value,
+        "from_unit": from_unit,
+        "to_unit": to_unit,
+        "converted_value": value * factor,
+        "factor": factor,
+        "dimension": dimension
+    }
@@ -0,0 +1,305 @@
+"""Compact binary storage of field maps (.npy arrays + JSON header), referenced by handle."""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+# Shared by the MCP server, its workers, and the agent on the same machine
+STORE_DIR = os.environ.get("MAXWELL_FIELD_STORE", os.path.join(tempfile.gettempdir(), "maxwell_field_maps"))
+# Results with more points than this are stored instead of returned inline
+INLINE_MAX_POINTS = 100
+# Oldest maps are removed once the store exceeds either limit
+MAX_STORED_MAPS = 200
+MAX_STORE_BYTES = 2 * 1024 ** 3
+MAX_QUERY_SAMPLES = 100
+# Values of a map reduced at once, so a summary never holds a whole stored map in memory
+SUMMARY_CHUNK_ELEMENTS = 1 << 20
+
+_HANDLE_PATTERN = re.compile(r"^fm_[0-9a-f]{16}$")
+
+
+def grid_axis(name: str, spec) -> np.ndarray:
+    """
+    A grid axis from a value, a list of values, or {"start", "stop", "num"}
+    (evenly spaced; with "log": true, log-spaced).
+
+    Args:
+        name: Parameter name (for error messages)
+        spec: Axis specification
+
+    Returns:
+        1-D array of axis values
+    """
+    if isinstance(spec, dict):
+        start, stop, num = float(spec["start"]), float(spec["stop"]), int(spec["num"])
+        if num < 1:
+            raise ValueError(f"{name} needs at least one point")
+        if spec.get("log"):
+            if start <= 0 or stop <= 0:
+                raise ValueError(f"{name} needs a positive start and stop for log spacing")
+            return np.geomspace(start, stop, num)
+        return np.linspace(start, stop, num)
+    values = np.atleast_1d(np.asarray(spec, dtype=float))
+    if values.ndim != 1 or len(values) == 0:
+        raise ValueError(f"{name} must be a number, a list of numbers, or {{start, stop, num}}")
+    return values
+
+
+def should_store(point_count: int, store=None) -> bool:
+    """Whether a result with point_count points goes to the store (store=None decides by size)."""
+    return point_count > INLINE_MAX_POINTS if store is None else bool(store)
+
+
+def map_path(handle: str) -> str:
+    """Directory holding one stored field map."""
+    if not _HANDLE_PATTERN.match(str(handle)):
+        raise ValueError(f"Invalid field map handle: {handle}")
+    return os.path.join(STORE_DIR, handle)
+
+
+def save_field_map(
+    kind: str,
+    arrays: dict,
+    axes: dict = None,
+    units: dict = None,
+    metadata: dict = None,
+    summary: dict = None,
+    dtype: str = "float32",
+) -> dict:
+    """
+    Write a field map to the store.
+
+    Each array is saved as its own .npy file so it can be memory-mapped;
+    a small header.json holds the axes, units, inputs, and summary. The map
+    is written to a temporary directory and renamed into place, so readers
+    never see a partial map.
+
+    Args:
+        kind: Producing tool (e.g. "solenoid_field_map")
+        arrays: Mapping of array name to NumPy array
+        axes: Mapping of axis name to 1-D coordinate values (grid maps)
+        units: Mapping of array/axis name to unit string
+        metadata: Tool inputs to record
+        summary: Summary statistics to record
+        dtype: Storage dtype for floating-point arrays
+
+    Returns:
+        Dictionary with the handle, storage path, and stored size in bytes
+    """
+    os.makedirs(STORE_DIR, exist_ok=True)
+    handle = f"fm_{uuid.uuid4().hex[:16]}"
+    staging = tempfile.mkdtemp(prefix=f".{handle}.", dir=STORE_DIR)
+
+    header = {
+        "handle": handle,
+        "kind": kind,
+        "created": time.time(),
+        "arrays": {},
+        "axes": {name: np.asarray(values, dtype=float).tolist() for name, values in (axes or {}).items()},
+        "units": dict(units or {}),
+        "metadata": dict(metadata or {}),
+        "summary": dict(summary or {}),
+    }
+    size = 0
+    for name, values in arrays.items():
+        values = np.asarray(values)
+        if np.issubdtype(values.dtype, np.floating):
+            values = values.astype(dtype)
+        file_name = f"{name}.npy"
+        np.save(os.path.join(staging, file_name), values)
+        size += os.path.getsize(os.path.join(staging, file_name))
+        header["arrays"][name] = {"file": file_name, "dtype": str(values.dtype), "shape": list(values.shape)}
+
+    with open(os.path.join(staging, "header.json"), "w") as f:
+        json.dump(header, f)
+    os.rename(staging, os.path.join(STORE_DIR, handle))
+
+    _evict()
+    return {"handle": handle, "path": os.path.join(STORE_DIR, handle), "stored_bytes": size}
+
+
+def load_field_map(handle: str, mmap: bool = True) -> tuple:
+    """
+    Open a stored field map.
+
+    Args:
+        handle: Handle returned by save_field_map
+        mmap: Memory-map the arrays instead of reading them into memory
+
+    Returns:
+        Tuple (header dict, mapping of array name to array)
+    """
+    path = map_path(handle)
+    try:
+        with open(os.path.join(path, "header.json")) as f:
+            header = json.load(f)
+    except FileNotFoundError:
+        raise KeyError(f"Field map not found: {handle}") from None
+    arrays = {
+        name: np.load(os.path.join(path, info["file"]), mmap_mode="r" if mmap else None)
+        for name, info in header["arrays"].items()
+    }
+    return header, arrays
+
+
+def _evict() -> None:
+    """Remove the oldest maps while the store is over its count or size limit."""
+    maps = []
+    for entry in os.scandir(STORE_DIR):
+        try:
+            if entry.is_dir() and _HANDLE_PATTERN.match(entry.name):
+                size = sum(f.stat().st_size for f in os.scandir(entry.path) if f.is_file())
+                maps.append((entry.stat().st_mtime, entry.path, size))
+        except OSError:
+            # Another process evicted this map while we were scanning
+            continue
+    maps.sort()
+    total = sum(size for _, _, size in maps)
+    while maps and (len(maps) > MAX_STORED_MAPS or total > MAX_STORE_BYTES):
+        _, path, size = maps.pop(0)
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+def magnitude_summary(magnitude: np.ndarray, coordinates) -> dict:
+    """
+    Peak, spread, and mean of |B| over a map.
+
+    The array is read in slabs of about SUMMARY_CHUNK_ELEMENTS values along
+    its first axis, so a memory-mapped map is never copied whole.
+
+    Args:
+        magnitude: Array of |B| values (NaN where undefined)
+        coordinates: Function mapping a flat index of magnitude to a
+            coordinate dictionary for the peak location
+
+    Returns:
+        Dictionary with max, min, and mean |B| in Tesla, the peak location,
+        and uniformity (max − min) / mean (empty if every value is NaN)
+    """
+    if magnitude.size == 0:
+        return {}
+    row_size = magnitude.size // magnitude.shape[0]
+    rows = max(1, SUMMARY_CHUNK_ELEMENTS // row_size)
+    maximum = minimum = peak = None
+    total, count = 0.0, 0
+    for start in range(0, magnitude.shape[0], rows):
+        chunk = np.asarray(magnitude[start:start + rows], dtype=float)
+        defined = int(np.count_nonzero(~np.isnan(chunk)))
+        if not defined:
+            continue
+        chunk_peak = int(np.nanargmax(chunk))
+        # Strictly greater keeps the first peak, as np.nanargmax over the whole map would
+        if maximum is None or chunk.flat[chunk_peak] > maximum:
+            maximum, peak = float(chunk.flat[chunk_peak]), start * row_size + chunk_peak
+        chunk_min = float(np.nanmin(chunk))
+        minimum = chunk_min if minimum is None else min(minimum, chunk_min)
+        total += float(np.nansum(chunk))
+        count += defined
+    if not count:
+        return {}
+    mean = total / count
+    return {
+        "max_B_tesla": maximum,
+        "max_B_point": coordinates(peak),
+        "min_B_tesla": minimum,
+        "mean_B_tesla": mean,
+        "uniformity": (maximum - minimum) / mean if mean else None,
+    }
+
+
+def field_map_query(handle: str, bounds: dict = None, at: list = None) -> dict:
+    """
+    Summarize or sample a stored field map without loading it into memory.
+
+    Args:
+        handle: Handle returned by a field-map tool
+        bounds: For grid maps, {axis: [min, max]} restricting the summary to
+            a sub-region (e.g. {"r_m": [0, 0.005], "z_m": [-0.05, 0.05]})
+        at: For grid maps, coordinate dictionaries (e.g. {"r_m": 0, "z_m": 0.1})
+            sampled at the nearest grid point; for point maps, point indices
+
+    Returns:
+        Dictionary with the map's header information, the |B| summary of the
+        selected region, and any sampled values
+    """
+    try:
+        header, arrays = load_field_map(handle)
+    except (KeyError, ValueError) as e:
+        return {"error": str(e)}
+
+    magnitude = arrays.get("B_magnitude")
+    if magnitude is None:
+        return {"error": f"Field map {handle} has no B_magnitude array"}
+    axis_names = list(header["axes"])
+    result = {
+        "handle": handle,
+        "kind": header["kind"],
+        "shape": header["arrays"]["B_magnitude"]["shape"],
+        "axes": {name: {"min": min(values), "max": max(values), "num": len(values)}
+                 for name, values in header["axes"].items()},
+        "units": header["units"],
+        "metadata": header["metadata"],
+    }
+
+    selection = tuple(slice(None) for _ in magnitude.shape)
+    if bounds:
+        if not axis_names:
+            return {"error": "bounds apply only to grid maps"}
+        unknown = set(bounds) - set(axis_names)
+        if unknown:
+            return {"error": f"Unknown axis: {', '.join(sorted(unknown))}. Axes: {', '.join(axis_names)}"}
+        selection = []
+        for name in axis_names:
+            values = np.asarray(header["axes"][name])
+            low, high = bounds.get(name, [values.min(), values.max()])
+            inside = np.flatnonzero((values >= low) & (values <= high))
+            if not len(inside):
+                return {"error": f"No grid points with {low} ≤ {name} ≤ {high}"}
+            selection.append(slice(inside[0], inside[-1] + 1))
+        selection = tuple(selection)
+
+    # A view into the memory map; magnitude_summary reads it in chunks
+    region = magnitude[selection]
+    offsets = [s.start or 0 for s in selection]
+
+    def coordinates(flat_index):
+        index = np.unravel_index(flat_index, region.shape)
+        if axis_names:
+            return {name: header["axes"][name][offset + i] for name, offset, i in zip(axis_names, offsets, index)}
+        return {"index": int(index[0]), **({"point": arrays["points"][index[0]].tolist()} if "points" in arrays else {})}
+
+    result["region"] = {"bounds": bounds or {}, **magnitude_summary(region, coordinates)}
+
+    if at:
+        if len(at) > MAX_QUERY_SAMPLES:
+            return {"error": f"At most {MAX_QUERY_SAMPLES} samples per query"}
+        samples = []
+        for position in at:
+            if axis_names:
+                if not isinstance(position, dict):
+                    return {"error": "Grid map samples must be coordinate objects"}
+                index = tuple(
+                    int(np.abs(np.asarray(header["axes"][name]) - float(position.get(name, 0.0))).argmin())
+                    for name in axis_names
+                )
+                sample = {name: header["axes"][name][i] for name, i in zip(axis_names, index)}
+            else:
+                index = (int(position),)
+                if not 0 <= index[0] < magnitude.shape[0]:
+                    return {"error": f"Point index {position} out of range"}
+                sample = {"index": index[0]}
+            for name, values in arrays.items():
+                if name != "points" and values.shape[:len(index)] == magnitude.shape:
+                    value = np.asarray(values[index], dtype=float)
+                    sample[name] = None if np.isnan(value).any() else value.tolist()
+            samples.append(sample)
+        result["samples"] = samples
+
+    return result
@@ -2,10 +2,81 @@
 
 import math
 
+import numpy as np
+
 # Physical constant
 MU_0 = 4 * math.pi * 1e-7  # H/m (permeability of free space)
 
 
+def first_error(checks: list, params: dict):
+    """
+    Message of the first failing validity check.
+
+    Args:
+        checks: (predicate, message) pairs; each predicate takes the parameter dict
+        params: Parameter values by name
+
+    Returns:
+        Error message, or None if every check passes
+    """
+    for check, message in checks:
+        if check(params):
+            return message
+    return None
+
+
+def _solenoid_outputs(p: dict) -> dict:
+    n = p["turns"] / p["length_m"]  # turns per meter
+    return {"B_tesla": MU_0 * n * p["current_A"], "turns_per_meter": n}
+
+
+def _flux_outputs(p: dict) -> dict:
+    cos_theta = np.cos(np.radians(p["angle_deg"]))
+    return {"flux_Wb": p["B_tesla"] * p["area_m2"] * cos_theta, "cos_theta": cos_theta}
+
+
+# Per tool: parameters (name -> default, None = required), validity checks in
+# order, the outputs as one formula that takes scalars or NumPy arrays, and the
+# equation. The tools below, batch_calculate, and tolerance_analysis all
+# evaluate these.
+SOLENOID_FIELD = {
+    "params": {"turns": None, "length_m": None, "current_A": None},
+    "checks": [
+        (lambda p: p["length_m"] <= 0, "Length must be positive"),
+        (lambda p: p["turns"] < 0, "Turns cannot be negative"),
+    ],
+    "compute": _solenoid_outputs,
+    "equation": "B = μ₀ · n · I",
+}
+
+BIOT_SAVART_WIRE = {
+    "params": {"current_A": None, "distance_m": None},
+    "checks": [
+        (lambda p: p["distance_m"] <= 0, "Distance must be positive"),
+    ],
+    "compute": lambda p: {"B_tesla": (MU_0 * p["current_A"]) / (2 * math.pi * p["distance_m"])},
+    "equation": "B = μ₀ · I / (2π · r)",
+}
+
+MAGNETIC_FLUX = {
+    "params": {"B_tesla": None, "area_m2": None, "angle_deg": 0},
+    "checks": [
+        (lambda p: p["area_m2"] < 0, "Area must be non-negative"),
+    ],
+    "compute": _flux_outputs,
+    "equation": "Φ = B · A · cos(θ)",
+}
+
+ENERGY_STORED = {
+    "params": {"B_tesla": None, "volume_m3": None},
+    "checks": [
+        (lambda p: p["volume_m3"] < 0, "Volume must be non-negative"),
+    ],
+    "compute": lambda p: {"energy_J": (p["B_tesla"] ** 2 / (2 * MU_0)) * p["volume_m3"]},
+    "equation": "W = (B² / (2μ₀)) · Volume",
+}
+
+
 def solenoid_field(turns: int, length_m: float, current_A: float) -> dict:
     """
     Compute magnetic field at the center of a solenoid.
@@ -21,21 +92,19 @@ def solenoid_field(turns: int, length_m: float, current_A: float) -> dict:
     Returns:
         Dictionary with B field in Tesla
     """
-    if length_m <= 0:
-        return {"error": "Length must be positive"}
-    if turns < 0:
-        return {"error": "Turns cannot be negative"}
-
-    n = turns / length_m  # turns per meter
-    B = MU_0 * n * current_A
+    params = {"turns": turns, "length_m": length_m, "current_A": current_A}
+    error = first_error(SOLENOID_FIELD["checks"], params)
+    if error is not None:
+        return {"error": error}
+    outputs = SOLENOID_FIELD["compute"](params)
 
     return {
-        "B_tesla": B,
+        "B_tesla": outputs["B_tesla"],
         "turns": turns,
         "length_m": length_m,
         "current_A": current_A,
-        "turns_per_meter": n,
-        "equation": "B = μ₀ · n · I"
+        "turns_per_meter": outputs["turns_per_meter"],
+        "equation": SOLENOID_FIELD["equation"]
     }
 
 
@@ -52,16 +121,16 @@ def biot_savart_wire(current_A: float, distance_m: float) -> dict:
     Returns:
         Dictionary with B field in Tesla
     """
-    if distance_m <= 0:
-        return {"error": "Distance must be positive"}
-
-    B = (MU_0 * current_A) / (2 * math.pi * distance_m)
+    params = {"current_A": current_A, "distance_m": distance_m}
+    error = first_error(BIOT_SAVART_WIRE["checks"], params)
+    if error is not None:
+        return {"error": error}
 
     return {
-        "B_tesla": B,
+        "B_tesla": BIOT_SAVART_WIRE["compute"](params)["B_tesla"],
         "current_A": current_A,
         "distance_m": distance_m,
-        "equation": "B = μ₀ · I / (2π · r)"
+        "equation": BIOT_SAVART_WIRE["equation"]
     }
 
 
@@ -79,20 +148,19 @@ def magnetic_flux(B_tesla: float, area_m2: float, angle_deg: float = 0) -> dict:
     Returns:
         Dictionary with flux in Webers
     """
-    if area_m2 < 0:
-        return {"error": "Area must be non-negative"}
-
-    angle_rad = math.radians(angle_deg)
-    cos_theta = math.cos(angle_rad)
-    flux = B_tesla * area_m2 * cos_theta
+    params = {"B_tesla": B_tesla, "area_m2": area_m2, "angle_deg": angle_deg}
+    error = first_error(MAGNETIC_FLUX["checks"], params)
+    if error is not None:
+        return {"error": error}
+    outputs = MAGNETIC_FLUX["compute"](params)
 
     return {
-        "flux_Wb": flux,
+        "flux_Wb": float(outputs["flux_Wb"]),
         "B_tesla": B_tesla,
         "area_m2": area_m2,
         "angle_deg": angle_deg,
-        "cos_theta": cos_theta,
-        "equation": "Φ = B · A · cos(θ)"
+        "cos_theta": float(outputs["cos_theta"]),
+        "equation": MAGNETIC_FLUX["equation"]
     }
 
 
@@ -109,14 +177,14 @@ def energy_stored(B_tesla: float, volume_m3: float) -> dict:
     Returns:
         Dictionary with energy in Joules
     """
-    if volume_m3 < 0:
-        return {"error": "Volume must be non-negative"}
-
-    W = (B_tesla ** 2 / (2 * MU_0)) * volume_m3
+    params = {"B_tesla": B_tesla, "volume_m3": volume_m3}
+    error = first_error(ENERGY_STORED["checks"], params)
+    if error is not None:
+        return {"error": error}
 
     return {
-        "energy_J": W,
+        "energy_J": ENERGY_STORED["compute"](params)["energy_J"],
         "B_tesla": B_tesla,
         "volume_m3": volume_m3,
-        "equation": "W = (B² / (2μ₀)) · Volume"
+        "equation": ENERGY_STORED["equation"]
     }
@@ -0,0 +1,263 @@
+"""Vectorized design-space search for gapped-core inductors and electromagnets."""
+
+import math
+
+import numpy as np
+
+from .circuits import RELUCTANCE, gap_for_inductance, peak_flux_density
+from .field_store import grid_axis
+from .materials import MATERIALS, find_material
+
+# Copper at 20 °C
+COPPER_RESISTIVITY_OHM_M = 1.72e-8
+MAX_AXIS_POINTS = 1_000
+MAX_TURNS = 100_000
+# Candidates left after pruning that are evaluated in one call
+MAX_CANDIDATES = 5_000_000
+MAX_RESULTS = 100
+
+DEFAULT_CORE_AREAS_M2 = np.geomspace(1e-5, 1e-2, 61)
+
+# Objectives (all minimized) -> candidate column
+OBJECTIVES = ("core_volume_m3", "copper_loss_W", "turns", "gap_m", "flux_density_T")
+
+
+def _axis(name: str, spec, default: np.ndarray) -> np.ndarray:
+    """A positive, sorted design axis (default if spec is None)."""
+    values = default if spec is None else np.unique(grid_axis(name, spec))
+    if len(values) > MAX_AXIS_POINTS:
+        raise ValueError(f"{name} has {len(values)} points; the limit is {MAX_AXIS_POINTS}")
+    if np.any(values <= 0) or not np.all(np.isfinite(values)):
+        raise ValueError(f"{name} values must be positive")
+    return values
+
+
+def _soft_materials(names) -> list:
+    """(name, μᵣ, B_sat) of each material; default: every MATERIALS entry with a B_sat and μᵣ > 1."""
+    if names is None:
+        names = [name for name, p in MATERIALS.items()
+                 if p["saturation_flux_density_T"] is not None and p["relative_permeability"] > 1]
+    if isinstance(names, str):
+        names = [names]
+    materials = []
+    for name in names:
+        properties = find_material(name)
+        if properties is None:
+            raise ValueError(f"Material '{name}' not found; use material_search to find a grade")
+        if properties["saturation_flux_density_T"] is None:
+            raise ValueError(f"Material '{name}' has no saturation flux density")
+        materials.append((name, float(properties["relative_permeability"]),
+                          float(properties["saturation_flux_density_T"])))
+    if not materials:
+        raise ValueError("At least one material is needed")
+    return materials
+
+
+def pareto_front(objectives: np.ndarray) -> np.ndarray:
+    """
+    Indices of the non-dominated rows (all columns minimized).
+
+    The lexicographically smallest remaining row is always non-dominated;
+    it is kept and every row it dominates is dropped, so each pass costs
+    one vectorized comparison and the loop runs once per front member.
+
+    Args:
+        objectives: (candidates, objectives) array
+
+    Returns:
+        Front indices in ascending order of the first objective
+    """
+    order = np.lexsort(objectives.T[::-1])
+    remaining = objectives[order]
+    index = order
+    front = []
+    while len(index):
+        best = remaining[0]
+        front.append(index[0])
+        keep = np.any(remaining < best, axis=1)
+        remaining, index = remaining[keep], index[keep]
+    return np.array(front, dtype=int)
+
+
+def design_optimize(
+    inductance_H: float,
+    current_A: float,
+    window_area_m2: float,
+    materials: list = None,
+    core_area_m2=None,
+    path_length_m=None,
+    turns=None,
+    max_flux_density_fraction: float = 0.8,
+    max_gap_m: float = None,
+    current_density_A_per_m2: float = 5e6,
+    fill_factor: float = 0.4,
+    objectives: list = None,
+    max_results: int = 20
+) -> dict:
+    """
+    Search core material, core area, path length, and turns for an inductor.
+
+    Each candidate gets the air gap that gives exactly the target inductance,
+    L = N² / (l/(μ₀μᵣA) + g/(μ₀A)), and peak flux density B = L·I/(N·A).
+    Without path_length_m, each core is a square frame of leg width √A around
+    a square window of the given area, with mean path l = 4(√W + √A). The
+    constraints bound the turns of every (material, area, length) core in
+    closed form (gap ≥ 0, B ≤ fraction · B_sat, winding fits the window,
+    gap ≤ max_gap_m), so cores with no feasible turns are pruned before any
+    turns are expanded. The rest are evaluated as arrays and reduced to the
+    Pareto front of the objectives.
+
+    Args:
+        inductance_H: Target inductance in Henries
+        current_A: Peak (DC) winding current in Amperes
+        window_area_m2: Winding window area available in square meters
+        materials: Core material names (MATERIALS or catalog grades); default:
+            the soft materials in MATERIALS
+        core_area_m2: Core cross-section values (number, list, or
+            {"start", "stop", "num"}); default 0.1–100 cm², 61 log-spaced
+        path_length_m: Magnetic path length values (number, list, or
+            {"start", "stop", "num"}); default: from the frame geometry
+        turns: Turn counts to consider; default every integer the window allows
+        max_flux_density_fraction: Allowed peak B as a fraction of B_sat
+        max_gap_m: Largest allowed air gap (default: no limit)
+        current_density_A_per_m2: Wire current density (sets the wire size)
+        fill_factor: Fraction of the window that is copper
+        objectives: Quantities to minimize, from OBJECTIVES
+            (default ["core_volume_m3", "copper_loss_W"])
+        max_results: Front designs returned, evenly spread along the first objective
+
+    Returns:
+        Dictionary with candidate counts, the Pareto-optimal designs, and the
+        best design for each objective
+    """
+    objectives = list(objectives or ["core_volume_m3", "copper_loss_W"])
+    for name, value in [("inductance_H", inductance_H), ("current_A", current_A),
+                        ("window_area_m2", window_area_m2), ("current_density_A_per_m2", current_density_A_per_m2)]:
+        if not value > 0:
+            return {"error": f"{name} must be positive"}
+    if not 0 < max_flux_density_fraction <= 1:
+        return {"error": "max_flux_density_fraction must be in (0, 1]"}
+    if not 0 < fill_factor <= 1:
+        return {"error": "fill_factor must be in (0, 1]"}
+    if max_gap_m is not None and not max_gap_m > 0:
+        return {"error": "max_gap_m must be positive"}
+    unknown = [name for name in objectives if name not in OBJECTIVES]
+    if unknown or not objectives:
+        return {"error": f"Unknown objective(s) {', '.join(unknown)}; use {', '.join(OBJECTIVES)}"}
+    if not 1 <= max_results <= MAX_RESULTS:
+        return {"error": f"max_results must be between 1 and {MAX_RESULTS}"}
+
+    wire_area = current_A / current_density_A_per_m2
+    window_turns = math.floor(fill_factor * window_area_m2 / wire_area)
+    if window_turns < 1:
+        return {"error": f"The window fits no turns: one turn needs {wire_area / fill_factor:.3g} m² at this "
+                         "current density and fill factor"}
+    try:
+        cores = _soft_materials(materials)
+        areas = _axis("core_area_m2", core_area_m2, DEFAULT_CORE_AREAS_M2)
+        lengths = None if path_length_m is None else _axis("path_length_m", path_length_m, None)
+        if turns is None:
+            turn_values = np.arange(1, min(window_turns, MAX_TURNS) + 1, dtype=float)
+        else:
+            turn_values = _axis("turns", turns, None)
+            if np.any(turn_values != np.round(turn_values)):
+                raise ValueError("turns must be whole numbers")
+    except (KeyError, TypeError, ValueError) as e:
+        return {"error": str(e)}
+
+    # Turn bounds of every (material, area, length) core, broadcast over the grid
+    mu_r = np.array([core[1] for core in cores])[:, None, None]
+    b_max = max_flux_density_fraction * np.array([core[2] for core in cores])[:, None, None]
+    A = areas[None, :, None]
+    if lengths is None:
+        lengths = 4 * (math.sqrt(window_area_m2) + np.sqrt(areas))
+        l = lengths[None, :, None]
+    else:
+        l = lengths[None, None, :]
+    core_grid = RELUCTANCE["compute"]({"length_m": l, "area_m2": A, "relative_permeability": mu_r})["reluctance_H_inv"]
+    # gap ≥ 0: N² ≥ L·R_core;  B ≤ B_max: N ≥ B(N=1)/B_max;  window: N ≤ window_turns
+    low = np.maximum(np.sqrt(inductance_H * core_grid), peak_flux_density(inductance_H, current_A, 1.0, A) / b_max)
+    core_grid = np.broadcast_to(core_grid, low.shape)
+    high = np.full(low.shape, float(window_turns))
+    if max_gap_m is not None:
+        # gap ≤ max_gap: N² ≤ L·(R_core + R_max_gap)
+        max_gap = RELUCTANCE["compute"]({"length_m": max_gap_m, "area_m2": A, "relative_permeability": 1.0})
+        high = np.minimum(high, np.sqrt(inductance_H * (core_grid + max_gap["reluctance_H_inv"])))
+    first = np.searchsorted(turn_values, low * (1 - 1e-12), side="left")
+    last = np.searchsorted(turn_values, high * (1 + 1e-12), side="right")
+    counts = np.maximum(last - first, 0).ravel()
+    evaluated = counts.size * len(turn_values)
+    total = int(counts.sum())
+    if total == 0:
+        return {
+            "error": "No design meets all constraints",
+            "evaluated": evaluated,
+            "min_turns_needed": math.ceil(float(low.min())),
+            "window_turns": window_turns,
+            "hint": "Allow larger cores or window area, lower current density, or a higher flux density fraction",
+        }
+    if total > MAX_CANDIDATES:
+        return {"error": f"{total:,} feasible candidates exceed the limit of {MAX_CANDIDATES:,}; "
+                         "use coarser core_area_m2/path_length_m/turns grids"}
+
+    # Expand only the feasible turn ranges (ragged: one run of turns per surviving core)
+    blocks = np.repeat(np.arange(counts.size), counts)
+    starts = np.cumsum(counts) - counts
+    offsets = np.arange(total) - starts[blocks]
+    N = turn_values[first.ravel()[blocks] + offsets]
+    m_index, a_index, l_index = np.unravel_index(blocks, low.shape)
+    A = areas[a_index]
+    l = lengths[a_index] if path_length_m is None else lengths[l_index]
+
+    # The gap supplies the reluctance N²/L that the core lacks (clipped at 0 against rounding)
+    core_reluctance = core_grid.ravel()[blocks]
+    gap_reluctance, gap = (np.maximum(values, 0.0) for values in
+                           gap_for_inductance(inductance_H, N, core_reluctance, A))
+    B = peak_flux_density(inductance_H, current_A, N, A)
+    # Winding: square cross-section of N wires at the fill factor around a square leg
+    build = np.sqrt(N * wire_area / fill_factor)
+    turn_length = 4 * np.sqrt(A) + math.pi * build
+    resistance = COPPER_RESISTIVITY_OHM_M * N * turn_length / wire_area
+    columns = {
+        "core_volume_m3": A * l,
+        "copper_loss_W": current_A ** 2 * resistance,
+        "turns": N,
+        "gap_m": gap,
+        "flux_density_T": B,
+    }
+
+    front = pareto_front(np.column_stack([columns[name] for name in objectives]))
+    shown = front[np.unique(np.linspace(0, len(front) - 1, min(max_results, len(front))).round().astype(int))]
+
+    def design(i: int) -> dict:
+        return {
+            "material": cores[m_index[i]][0],
+            "core_area_m2": float(A[i]),
+            "path_length_m": float(l[i]),
+            "turns": int(N[i]),
+            "gap_m": float(gap[i]),
+            "flux_density_T": float(B[i]),
+            "saturation_fraction": float(B[i] / cores[m_index[i]][2]),
+            "core_reluctance_H_inv": float(core_reluctance[i]),
+            "gap_reluctance_H_inv": float(gap_reluctance[i]),
+            "inductance_H": float(N[i] ** 2 / (core_reluctance[i] + gap_reluctance[i])),
+            "core_volume_m3": float(columns["core_volume_m3"][i]),
+            "copper_loss_W": float(columns["copper_loss_W"][i]),
+            "winding_resistance_ohm": float(resistance[i]),
+            "mean_turn_length_m": float(turn_length[i]),
+            "window_fill": float(N[i] * wire_area / (fill_factor * window_area_m2)),
+        }
+
+    return {
+        "evaluated": evaluated,
+        "pruned": evaluated - total,
+        "feasible": total,
+        "pareto_count": len(front),
+        "objectives": objectives,
+        "designs": [design(i) for i in shown],
+        "best": {name: design(int(np.argmin(columns[name]))) for name in objectives},
+        "wire_area_m2": wire_area,
+        "equation": "L = N² / (l/(μ₀μᵣA) + g/(μ₀A)),  B = L·I / (N·A)",
+        "assumptions": "Linear core (constant μᵣ) up to the B limit, gap area = core area (no fringing), "
+                       "DC copper loss at 20 °C, no core loss",
+    }
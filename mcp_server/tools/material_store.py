@@ -0,0 +1,363 @@
+"""Columnar material catalog with sorted property indexes and n-gram name search."""
+
+import csv
+import functools
+import json
+import os
+import re
+
+import numpy as np
+
+from .materials import MATERIALS
+
+# Bundled catalog of common commercial grades (typical datasheet values)
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "material_catalog.csv")
+# Numeric columns; each gets a sorted index. Missing values are stored as NaN.
+NUMERIC_COLUMNS = ("relative_permeability", "saturation_flux_density_T", "coercivity_A_per_m", "remanence_T")
+# Steinmetz core-loss coefficients (P = k · f^α · B^β in W/m³); stored but not indexed
+CORE_LOSS_COLUMNS = ("steinmetz_k", "steinmetz_alpha", "steinmetz_beta")
+# Short property names accepted in filters and sort_by
+PROPERTY_ALIASES = {
+    "mu_r": "relative_permeability",
+    "b_sat": "saturation_flux_density_T",
+    "bsat": "saturation_flux_density_T",
+    "hc": "coercivity_A_per_m",
+    "coercivity": "coercivity_A_per_m",
+    "br": "remanence_T",
+}
+NGRAM = 3
+# Name matches scoring below this (Dice coefficient of n-gram sets) are dropped
+MIN_MATCH_SCORE = 0.3
+MAX_RESULTS = 100
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase words of a name, so "Silicon-Steel", "silicon_steel" and "silicon steel" agree."""
+    return " ".join(re.findall(r"[a-z0-9]+", str(name).lower()))
+
+
+def name_ngrams(normalized: str) -> set:
+    """Character n-grams of each word, padded so word starts and ends count."""
+    grams = set()
+    for word in normalized.split():
+        padded = f" {word} "
+        grams.update(padded[i:i + NGRAM] for i in range(max(len(padded) - NGRAM + 1, 1)))
+    return grams
+
+
+def _number(value):
+    """A catalog cell as a float (NaN if empty)."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return np.nan
+    return float(value)
+
+
+def load_catalog(path: str) -> list:
+    """
+    Read material records from a CSV or JSON catalog.
+
+    CSV files have a header row with "name", optional "aliases" (separated
+    by ";"), "category", "description", and any of NUMERIC_COLUMNS and
+    CORE_LOSS_COLUMNS. JSON
+    files hold a list of such objects (aliases as a list), optionally under
+    a "materials" key.
+
+    Args:
+        path: Catalog file path (.csv or .json)
+
+    Returns:
+        List of record dictionaries
+    """
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data["materials"] if isinstance(data, dict) else data
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+class MaterialStore:
+    """
+    Material records held column-wise, with per-property sorted indexes.
+
+    Range queries binary-search the sorted index of the most selective
+    property and check the other conditions on those rows only; name
+    queries score every name and alias at once from an inverted n-gram
+    index.
+
+    Attributes:
+        names: Material name of each row
+        categories: Category of each row ("" if not given)
+        descriptions: Description of each row
+        aliases: Alternative names of each row
+        columns: NUMERIC_COLUMNS name -> float array (NaN where missing)
+        core_loss: CORE_LOSS_COLUMNS name -> float array (NaN where missing)
+    """
+
+    def __init__(self, records):
+        merged = {}
+        for record in records:
+            if not str(record.get("name") or "").strip():
+                raise ValueError("Every catalog record needs a name")
+            # Later records replace earlier ones of the same name
+            merged[normalize_name(record["name"])] = record
+        if not merged:
+            raise ValueError("A material store needs at least one record")
+        rows = list(merged.values())
+
+        self.names = [str(row["name"]).strip() for row in rows]
+        self.categories = np.array([str(row.get("category") or "").strip() for row in rows])
+        self.descriptions = [str(row.get("description") or "") for row in rows]
+        self.aliases = []
+        for row in rows:
+            aliases = row.get("aliases") or []
+            if isinstance(aliases, str):
+                aliases = aliases.split(";")
+            self.aliases.append([alias.strip() for alias in aliases if alias.strip()])
+        self.columns = {column: np.array([_number(row.get(column)) for row in rows]) for column in NUMERIC_COLUMNS}
+        self.core_loss = {column: np.array([_number(row.get(column)) for row in rows]) for column in CORE_LOSS_COLUMNS}
+
+        # Sorted index per property: row order and sorted values, NaN rows left out
+        self._indexes = {}
+        for column, values in self.columns.items():
+            order = np.argsort(values, kind="stable")
+            order = order[~np.isnan(values[order])]
+            self._indexes[column] = (order, values[order])
+
+        # Exact keys (names before aliases) and the n-gram index over all of them
+        self._keys = {}
+        for row, name in enumerate(self.names):
+            self._keys[normalize_name(name)] = row
+        strings, string_rows = [], []
+        for row, name in enumerate(self.names):
+            for text in [name] + self.aliases[row]:
+                self._keys.setdefault(normalize_name(text), row)
+                strings.append(name_ngrams(normalize_name(text)))
+                string_rows.append(row)
+        postings = {}
+        for string, grams in enumerate(strings):
+            for gram in grams:
+                postings.setdefault(gram, []).append(string)
+        self._postings = {gram: np.array(ids) for gram, ids in postings.items()}
+        self._string_sizes = np.array([len(grams) for grams in strings])
+        # Each row's strings are contiguous, so per-row maxima are one reduceat
+        self._row_starts = np.searchsorted(np.array(string_rows), np.arange(len(rows)))
+
+    @classmethod
+    def from_files(cls, paths, base_records=()):
+        """
+        Build a store from catalog files, after any base records.
+
+        Args:
+            paths: CSV or JSON catalog paths, merged in order
+            base_records: Records loaded before the files
+
+        Returns:
+            MaterialStore
+        """
+        records = list(base_records)
+        for path in paths:
+            records.extend(load_catalog(path))
+        return cls(records)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def find(self, name: str):
+        """Row of a material by exact (normalized) name or alias, or None."""
+        return self._keys.get(normalize_name(name))
+
+    def match_scores(self, query: str) -> np.ndarray:
+        """
+        Fuzzy name score of every row for a query.
+
+        Args:
+            query: Material name as typed (e.g. "NdFeB N52", "silicon-steel")
+
+        Returns:
+            Array of scores in [0, 1] (Dice coefficient of n-gram sets, best
+            over each row's name and aliases; 1 for an exact match)
+        """
+        grams = name_ngrams(normalize_name(query))
+        ids = [self._postings[gram] for gram in grams if gram in self._postings]
+        shared = np.bincount(np.concatenate(ids), minlength=len(self._string_sizes)) if ids else \
+            np.zeros(len(self._string_sizes))
+        dice = 2 * shared / (len(grams) + self._string_sizes)
+        scores = np.maximum.reduceat(dice, self._row_starts)
+        exact = self.find(query)
+        if exact is not None:
+            scores[exact] = 1.0
+        return scores
+
+    def range_rows(self, column: str, minimum=None, maximum=None) -> np.ndarray:
+        """
+        Rows with minimum ≤ value ≤ maximum, by binary search of the sorted index.
+
+        Args:
+            column: Property name (one of NUMERIC_COLUMNS)
+            minimum: Lower bound (None for unbounded)
+            maximum: Upper bound (None for unbounded)
+
+        Returns:
+            Row indices in ascending order of the property
+        """
+        order, values = self._indexes[column]
+        low = 0 if minimum is None else np.searchsorted(values, minimum, side="left")
+        high = len(values) if maximum is None else np.searchsorted(values, maximum, side="right")
+        return order[low:high]
+
+    def query(self, ranges=None, category=None, sort_by=None, descending=False, rows=None) -> np.ndarray:
+        """
+        Rows satisfying every range and the category, in the requested order.
+
+        Args:
+            ranges: {column: (minimum, maximum)} with None for an open end
+            category: Keep only this category
+            sort_by: Property to order by (rows missing it come last)
+            descending: Order from largest to smallest
+            rows: Candidate rows in their current order (default: all, by row)
+
+        Returns:
+            Array of row indices
+        """
+        ranges = ranges or {}
+        candidates = None
+        if ranges:
+            # Start from the most selective index; check the rest on its rows only
+            hits = sorted((self.range_rows(column, *bounds) for column, bounds in ranges.items()), key=len)
+            candidates = np.sort(hits[0])
+            for column, (minimum, maximum) in ranges.items():
+                values = self.columns[column][candidates]
+                keep = ~np.isnan(values)
+                if minimum is not None:
+                    keep &= values >= minimum
+                if maximum is not None:
+                    keep &= values <= maximum
+                candidates = candidates[keep]
+        selected = np.ones(len(self), dtype=bool) if candidates is None else np.zeros(len(self), dtype=bool)
+        if candidates is not None:
+            selected[candidates] = True
+        if category is not None:
+            selected &= self.categories == category
+
+        if sort_by is not None:
+            order = self._indexes[sort_by][0]
+            if rows is not None:
+                # Keep only the candidates, by sorting them on the index rank
+                rank = np.empty(len(self), dtype=int)
+                rank[order] = np.arange(len(order))
+                present = np.zeros(len(self), dtype=bool)
+                present[order] = True
+                rows = rows[selected[rows]]
+                with_value = rows[present[rows]]
+                with_value = with_value[np.argsort(rank[with_value], kind="stable")]
+                missing = rows[~present[rows]]
+            else:
+                with_value = order[selected[order]]
+                missing = np.flatnonzero(selected & np.isnan(self.columns[sort_by]))
+            if descending:
+                with_value = with_value[::-1]
+            return np.concatenate([with_value, missing])
+        if rows is not None:
+            return rows[selected[rows]]
+        return np.flatnonzero(selected)
+
+    def record(self, row: int) -> dict:
+        """One row as a JSON-ready dictionary (missing values as None)."""
+        record = {"name": self.names[row], "category": str(self.categories[row]) or None}
+        for column in NUMERIC_COLUMNS:
+            value = self.columns[column][row]
+            record[column] = None if np.isnan(value) else float(value)
+        if not np.isnan(self.core_loss["steinmetz_k"][row]):
+            record.update({column: float(values[row]) for column, values in self.core_loss.items()})
+        record["description"] = self.descriptions[row]
+        if self.aliases[row]:
+            record["aliases"] = list(self.aliases[row])
+        return record
+
+
+@functools.lru_cache(maxsize=None)
+def get_store() -> MaterialStore:
+    """
+    The shared store: MATERIALS, the bundled catalog, then any catalogs
+    listed (separated by os.pathsep) in the MAXWELL_MATERIAL_CATALOG
+    environment variable. Built once per process.
+    """
+    base = [dict(properties, name=name, category="generic") for name, properties in MATERIALS.items()]
+    extra = [path for path in os.environ.get("MAXWELL_MATERIAL_CATALOG", "").split(os.pathsep) if path]
+    return MaterialStore.from_files([CATALOG_PATH] + extra, base_records=base)
+
+
+def _property(name: str) -> str:
+    """Full column name of a property or its short alias."""
+    column = PROPERTY_ALIASES.get(str(name).lower(), name)
+    if column not in NUMERIC_COLUMNS:
+        raise ValueError(
+            f"Unknown property '{name}'. Use one of: {', '.join(NUMERIC_COLUMNS + tuple(PROPERTY_ALIASES))}"
+        )
+    return column
+
+
+def material_search(
+    name: str = None,
+    filters: dict = None,
+    category: str = None,
+    sort_by: str = None,
+    descending: bool = False,
+    limit: int = 10
+) -> dict:
+    """
+    Search the material catalog by fuzzy name and by property ranges.
+
+    Args:
+        name: Approximate material name (e.g. "NdFeB N52", "silicon-steel");
+            results are ranked by match score unless sort_by is given
+        filters: {property: {"min": x, "max": y}} (either bound optional,
+            both inclusive) or {property: [min, max]} with null for an open end
+        category: Keep only this category (e.g. "ferrite_mnzn", "permanent_magnet")
+        sort_by: Property to order the results by
+        descending: Order sort_by from largest to smallest
+        limit: Maximum number of materials returned (1–100)
+
+    Returns:
+        Dictionary with the total match count and the matching materials
+    """
+    if not 1 <= limit <= MAX_RESULTS:
+        return {"error": f"limit must be between 1 and {MAX_RESULTS}"}
+    try:
+        ranges = {}
+        for key, bounds in (filters or {}).items():
+            column = _property(key)
+            if isinstance(bounds, dict):
+                unknown = set(bounds) - {"min", "max"}
+                if unknown:
+                    return {"error": f"Filter on {key} accepts only 'min' and 'max', got {', '.join(sorted(unknown))}"}
+                bounds = (bounds.get("min"), bounds.get("max"))
+            if len(bounds) != 2:
+                return {"error": f"Filter on {key} must be {{\"min\", \"max\"}} or [min, max]"}
+            ranges[column] = tuple(None if bound is None else float(bound) for bound in bounds)
+        sort_column = None if sort_by is None else _property(sort_by)
+    except (TypeError, ValueError) as e:
+        return {"error": str(e)}
+
+    store = get_store()
+    scores = None
+    rows = None
+    if name is not None and str(name).strip():
+        scores = store.match_scores(name)
+        rows = np.flatnonzero(scores >= MIN_MATCH_SCORE)
+        rows = rows[np.argsort(-scores[rows], kind="stable")]
+    rows = store.query(ranges, category=category, sort_by=sort_column, descending=descending, rows=rows)
+
+    results = []
+    for row in rows[:limit]:
+        record = store.record(row)
+        if scores is not None:
+            record["match_score"] = round(float(scores[row]), 3)
+        results.append(record)
+    result = {"count": len(rows), "materials": results}
+    if len(rows) > limit:
+        result["note"] = f"Showing the first {limit} of {len(rows)} matches; raise limit or narrow the filters"
+    if not len(rows) and category is not None and not np.any(store.categories == category):
+        result["available_categories"] = sorted(set(store.categories) - {""})
+    return result
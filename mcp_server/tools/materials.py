@@ -1,62 +1,114 @@
 """Magnetic material property lookup."""
 
+# steinmetz_k/alpha/beta: core loss P = k · f^α · B^β in W/m³ (f in Hz, B the
+# peak flux density in T) for sinusoidal excitation, or None where no fit is
+# given. Typical fits to datasheet loss curves; see core_loss.py.
+
 MATERIALS = {
     "air": {
         "relative_permeability": 1.0,
         "saturation_flux_density_T": None,
         "coercivity_A_per_m": 0.0,
+        "steinmetz_k": None,
+        "steinmetz_alpha": None,
+        "steinmetz_beta": None,
         "description": "Vacuum/air"
     },
     "iron": {
         "relative_permeability": 5000.0,
         "saturation_flux_density_T": 2.15,
         "coercivity_A_per_m": 800.0,
+        "steinmetz_k": None,
+        "steinmetz_alpha": None,
+        "steinmetz_beta": None,
         "description": "Pure iron (soft magnetic)"
     },
     "silicon_steel": {
         "relative_permeability": 4000.0,
         "saturation_flux_density_T": 2.0,
         "coercivity_A_per_m": 400.0,
+        "steinmetz_k": 49.3,
+        "steinmetz_alpha": 1.35,
+        "steinmetz_beta": 1.9,
         "description": "Silicon steel (transformer core)"
     },
     "ferrite": {
         "relative_permeability": 2000.0,
         "saturation_flux_density_T": 0.4,
         "coercivity_A_per_m": 250000.0,
+        "steinmetz_k": 7.95,
+        "steinmetz_alpha": 1.3,
+        "steinmetz_beta": 2.5,
         "description": "Ferrite (hard magnetic)"
     },
     "neodymium": {
         "relative_permeability": 1.05,
         "saturation_flux_density_T": 1.4,
         "coercivity_A_per_m": 955000.0,
+        "steinmetz_k": None,
+        "steinmetz_alpha": None,
+        "steinmetz_beta": None,
         "description": "Neodymium magnet (NdFeB, hard magnetic)"
     },
     "mu_metal": {
         "relative_permeability": 80000.0,
         "saturation_flux_density_T": 0.8,
         "coercivity_A_per_m": 8.0,
+        "steinmetz_k": None,
+        "steinmetz_alpha": None,
+        "steinmetz_beta": None,
         "description": "Mu-metal (high permeability shielding)"
     }
 }
 
 
+def find_material(material_name: str):
+    """
+    Properties of a material in MATERIALS or the catalog, or None if unknown.
+
+    Args:
+        material_name: Name or alias of the material (case-insensitive)
+
+    Returns:
+        Property dictionary (relative_permeability, saturation_flux_density_T,
+        coercivity_A_per_m, description, ...) or None
+    """
+    material_lower = str(material_name).lower().strip()
+    if material_lower in MATERIALS:
+        return MATERIALS[material_lower]
+
+    # Imported here: the store itself is built on MATERIALS
+    from .material_store import get_store
+    store = get_store()
+    row = store.find(material_name)
+    if row is None:
+        return None
+    return MATERIALS.get(store.names[row]) or store.record(row)
+
+
 def lookup_material(material_name: str) -> dict:
     """
     Look up properties of a named magnetic material.
 
     Args:
-        material_name: Name of the material (case-insensitive)
+        material_name: Name of the material (case-insensitive); catalog
+            grades such as "M19" or "NdFeB N52" are found by name or alias
 
     Returns:
         Dictionary with material properties or error message
     """
-    material_lower = material_name.lower().strip()
+    properties = find_material(material_name)
 
-    if material_lower not in MATERIALS:
+    if properties is None:
+        from .material_store import material_search
         available = ", ".join(MATERIALS.keys())
-        return {
+        result = {
             "error": f"Material '{material_name}' not found",
             "available_materials": available
         }
+        similar = material_search(name=material_name, limit=5).get("materials", [])
+        if similar:
+            result["similar_materials"] = [material["name"] for material in similar]
+        return result
 
-    return MATERIALS[material_lower]
+    return properties
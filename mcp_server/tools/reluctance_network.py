@@ -0,0 +1,674 @@
+"""Magnetic reluctance networks solved by nodal analysis (magnetic scalar potentials)."""
+
+import numpy as np
+
+from .bh_curves import BH_TABLES, get_curve
+from .circuits import MU_0
+from .materials import MATERIALS, find_material
+
+try:
+    import scipy.sparse
+    import scipy.sparse.linalg
+except ImportError:  # Dense fallback: fine for small networks
+    scipy = None
+
+MAX_BRANCHES = 100_000
+# Without scipy the nodal matrix is solved densely, so keep it small
+MAX_DENSE_NODES = 2_000
+# Nonlinear solves of networks this small factor all excitation levels at once as a stack
+MAX_STACKED_NODES = 64
+# Newton stops once every node's flux imbalance is below this fraction of the largest branch flux
+NEWTON_TOLERANCE = 1e-10
+NEWTON_MAX_ITERATIONS = 100
+MAX_LINE_SEARCH_HALVINGS = 30
+MAX_SWEEP_POINTS = 2_000
+
+
+class Network:
+    """
+    A parsed reluctance network: branches between nodes, with series MMF sources.
+
+    Attributes:
+        nodes: Node identifiers in order of first appearance
+        names: Branch names
+        tail, head: Node indices of each branch (positive flux flows tail → head)
+        reluctance: Branch reluctances in H⁻¹ (NumPy array)
+        area: Branch cross-sections in m² (NaN where not given)
+        length: Branch path lengths in meters (NaN for explicit reluctances)
+        mu_r: Branch relative permeabilities (NaN for explicit reluctances)
+        b_sat: Material saturation flux densities in Tesla (NaN if unknown)
+        materials: Material name of each branch (None if not given)
+        curves: B–H curve of each branch (None for linear branches); used
+            by the nonlinear solvers
+        curve_groups: (curve, branch indices) for each distinct curve
+        mmf: Series MMF of each branch from fixed sources in ampere-turns
+        windings: Parsed windings as dicts with name, turns, current_A,
+            branch index, and direction
+    """
+
+    def __init__(self, branches: list, windings: list = None):
+        if not branches:
+            raise ValueError("The network needs at least one branch")
+        if len(branches) > MAX_BRANCHES:
+            raise ValueError(f"Network has {len(branches)} branches; the limit is {MAX_BRANCHES}")
+
+        node_index = {}
+        count = len(branches)
+        self.names = []
+        self.materials = []
+        self.curves = []
+        self.tail = np.empty(count, dtype=np.int64)
+        self.head = np.empty(count, dtype=np.int64)
+        self.reluctance = np.empty(count)
+        self.area = np.full(count, np.nan)
+        self.length = np.full(count, np.nan)
+        self.mu_r = np.full(count, np.nan)
+        self.b_sat = np.full(count, np.nan)
+        self.mmf = np.zeros(count)
+
+        for k, branch in enumerate(branches):
+            name = str(branch.get("name", k))
+            if "from" not in branch or "to" not in branch:
+                raise ValueError(f"Branch {name} needs 'from' and 'to' nodes")
+            if branch["from"] == branch["to"]:
+                raise ValueError(f"Branch {name} starts and ends at the same node")
+            self.names.append(name)
+            self.tail[k] = node_index.setdefault(branch["from"], len(node_index))
+            self.head[k] = node_index.setdefault(branch["to"], len(node_index))
+            self.mmf[k] = float(branch.get("mmf_AT", 0.0))
+            self._set_reluctance(k, name, branch)
+
+        if len(set(self.names)) != count:
+            raise ValueError("Branch names must be unique")
+        self.nodes = list(node_index)
+        self.branch_index = {name: k for k, name in enumerate(self.names)}
+        self.windings = [self._parse_winding(i, winding) for i, winding in enumerate(windings or [])]
+        # Branches sharing a B–H curve are evaluated together
+        groups = {}
+        for k, curve in enumerate(self.curves):
+            if curve is not None:
+                groups.setdefault(id(curve), (curve, []))[1].append(k)
+        self.curve_groups = [(curve, np.array(index)) for curve, index in groups.values()]
+        for winding in self.windings:
+            self.mmf[winding["branch"]] += winding["direction"] * winding["turns"] * winding["current_A"]
+
+    def _set_reluctance(self, k: int, name: str, branch: dict) -> None:
+        """Fill in branch k's reluctance, area, and material data."""
+        material = branch.get("material")
+        self.materials.append(material)
+        self.curves.append(None)
+        if "area_m2" in branch:
+            if branch["area_m2"] <= 0:
+                raise ValueError(f"Branch {name}: area must be positive")
+            self.area[k] = float(branch["area_m2"])
+
+        if "reluctance_H_inv" in branch:
+            if branch["reluctance_H_inv"] <= 0:
+                raise ValueError(f"Branch {name}: reluctance must be positive")
+            self.reluctance[k] = float(branch["reluctance_H_inv"])
+            return
+
+        if "length_m" not in branch or "area_m2" not in branch:
+            raise ValueError(f"Branch {name} needs length_m and area_m2, or reluctance_H_inv")
+        if branch["length_m"] <= 0:
+            raise ValueError(f"Branch {name}: length must be positive")
+        if "relative_permeability" in branch:
+            mu_r = float(branch["relative_permeability"])
+        elif material is not None:
+            properties = find_material(material)
+            if properties is None:
+                raise ValueError(
+                    f"Branch {name}: material '{material}' not found. Available: {', '.join(MATERIALS)}, "
+                    "or any catalog grade from material_search"
+                )
+            mu_r = properties["relative_permeability"]
+            self.curves[k] = get_curve(material)
+            if properties["saturation_flux_density_T"] is not None:
+                self.b_sat[k] = properties["saturation_flux_density_T"]
+        else:
+            raise ValueError(f"Branch {name} needs a material or relative_permeability")
+        if mu_r <= 0:
+            raise ValueError(f"Branch {name}: relative permeability must be positive")
+
+        self.length[k] = float(branch["length_m"])
+        self.mu_r[k] = mu_r
+        self.reluctance[k] = self.length[k] / (MU_0 * mu_r * self.area[k])
+
+    def _parse_winding(self, i: int, winding: dict) -> dict:
+        """Resolve a winding's branch and check its turns and direction."""
+        name = str(winding.get("name", f"winding_{i}"))
+        branch = winding.get("branch")
+        if str(branch) not in self.branch_index:
+            raise ValueError(f"Winding {name}: unknown branch '{branch}'")
+        turns = float(winding.get("turns", 0))
+        if turns <= 0:
+            raise ValueError(f"Winding {name}: turns must be positive")
+        direction = int(winding.get("direction", 1))
+        if direction not in (1, -1):
+            raise ValueError(f"Winding {name}: direction must be 1 or -1")
+        return {
+            "name": name,
+            "turns": turns,
+            "current_A": float(winding.get("current_A", 0.0)),
+            "branch": self.branch_index[str(branch)],
+            "direction": direction,
+        }
+
+    def unit_mmf(self) -> np.ndarray:
+        """(branches, windings) MMF per ampere of each winding."""
+        columns = np.zeros((len(self.names), len(self.windings)))
+        for j, winding in enumerate(self.windings):
+            columns[winding["branch"], j] = winding["direction"] * winding["turns"]
+        return columns
+
+    def references(self) -> np.ndarray:
+        """One reference node (potential 0) per connected part of the network."""
+        parent = np.arange(len(self.nodes))
+
+        def root(node):
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        for a, b in zip(self.tail, self.head):
+            ra, rb = root(a), root(b)
+            if ra != rb:
+                parent[max(ra, rb)] = min(ra, rb)
+        return np.array(sorted({root(node) for node in range(len(self.nodes))}))
+
+    def nodal_pattern(self) -> tuple:
+        """
+        Free (non-reference) nodes and where each branch stamps the nodal matrix.
+
+        Returns:
+            Tuple (free node indices, matrix rows, matrix columns, stamp
+            signs, stamp branch indices); the matrix is Σ sign · P[branch]
+        """
+        if getattr(self, "_pattern", None) is None:
+            n, count = len(self.nodes), len(self.names)
+            free = np.setdiff1d(np.arange(n), self.references())
+            column = np.full(n, -1)
+            column[free] = np.arange(len(free))
+            # Conductance-style stamps: +P on both diagonals, −P off-diagonal
+            rows = np.concatenate([self.tail, self.head, self.tail, self.head])
+            cols = np.concatenate([self.tail, self.head, self.head, self.tail])
+            signs = np.repeat([1.0, 1.0, -1.0, -1.0], count)
+            branch = np.tile(np.arange(count), 4)
+            keep = (column[rows] >= 0) & (column[cols] >= 0)
+            self._pattern = (free, column[rows[keep]], column[cols[keep]], signs[keep], branch[keep])
+        return self._pattern
+
+    def node_sum(self, flux: np.ndarray) -> np.ndarray:
+        """Net flux leaving each node, A·Φ (rows are nodes, extra axes kept)."""
+        total = np.zeros((len(self.nodes),) + flux.shape[1:])
+        np.add.at(total, self.tail, flux)
+        np.add.at(total, self.head, -flux)
+        return total
+
+
+def solve_potentials(network: Network, permeance: np.ndarray, mmf: np.ndarray) -> tuple:
+    """
+    Solve the nodal equations A·P·Aᵀ·U = −A·P·F for the node potentials.
+
+    Each branch carries Φ = P · (U_tail − U_head + F), with P = 1/R its
+    permeance and F its series MMF; flux is conserved at every node.
+    Extra right-hand sides (columns of mmf) share one factorization.
+
+    Args:
+        network: Parsed network
+        permeance: Branch permeances in H
+        mmf: Branch MMFs in ampere-turns, shape (branches,) or (branches, k)
+
+    Returns:
+        Tuple (node potentials in ampere-turns with the shape of mmf per node,
+        name of the solver used)
+    """
+    free, rows, cols, signs, branch = network.nodal_pattern()
+    mmf = np.asarray(mmf, dtype=float)
+    # Flux injected at each node by the sources: −A·P·F
+    injection = -network.node_sum(permeance.reshape((-1,) + (1,) * (mmf.ndim - 1)) * mmf)
+
+    potentials = np.zeros((len(network.nodes),) + mmf.shape[1:])
+    if not len(free):
+        return potentials, "none"
+    values = signs * permeance[branch]
+
+    if scipy is not None:
+        matrix = scipy.sparse.csc_matrix((values, (rows, cols)), shape=(len(free), len(free)))
+        potentials[free] = scipy.sparse.linalg.splu(matrix).solve(injection[free])
+        return potentials, "sparse LU (scipy)"
+
+    if len(free) > MAX_DENSE_NODES:
+        raise ValueError(f"Networks over {MAX_DENSE_NODES} nodes need scipy for the sparse solver")
+    matrix = np.zeros((len(free), len(free)))
+    np.add.at(matrix, (rows, cols), values)
+    potentials[free] = np.linalg.solve(matrix, injection[free])
+    return potentials, "dense (scipy not installed)"
+
+
+def solve_columns(network: Network, permeance: np.ndarray, rhs: np.ndarray) -> tuple:
+    """
+    Solve a different nodal system for each column: (A·diag(P[:, k])·Aᵀ)·U[:, k] = rhs[:, k].
+
+    Small networks are solved for all columns at once as a stack of dense
+    systems; larger ones factor each column's sparse matrix in turn.
+
+    Args:
+        network: Parsed network
+        permeance: (branches, k) branch permeances in H, one column per system
+        rhs: (nodes, k) flux balance right-hand sides in Webers
+
+    Returns:
+        Tuple ((nodes, k) potentials in ampere-turns, 0 at the reference
+        nodes; name of the solver used)
+    """
+    free, rows, cols, signs, branch = network.nodal_pattern()
+    m, k = len(free), permeance.shape[1]
+    potentials = np.zeros((len(network.nodes), k))
+    if not m:
+        return potentials, "none"
+    values = signs[:, None] * permeance[branch]
+
+    if m <= MAX_STACKED_NODES or (scipy is None and m * m * k <= MAX_DENSE_NODES ** 2):
+        stacked = np.zeros((m * m, k))
+        np.add.at(stacked, rows * m + cols, values)
+        matrices = stacked.T.reshape(k, m, m)
+        potentials[free] = np.linalg.solve(matrices, rhs[free].T[..., None])[..., 0].T
+        return potentials, "stacked dense"
+
+    if scipy is None:
+        raise ValueError(f"Networks over {MAX_STACKED_NODES} nodes need scipy for the sparse solver")
+    for j in range(k):
+        matrix = scipy.sparse.csc_matrix((values[:, j], (rows, cols)), shape=(m, m))
+        potentials[free, j] = scipy.sparse.linalg.splu(matrix).solve(rhs[free, j])
+    return potentials, "sparse LU (scipy)"
+
+
+def branch_response(network: Network, drop: np.ndarray) -> tuple:
+    """
+    Branch fluxes and incremental permeances for given MMF drops.
+
+    Linear branches carry Φ = drop / R; branches with a B–H curve carry
+    Φ = A · B(drop / l), with dΦ/d(drop) = A · B′(H) / l.
+
+    Args:
+        network: Parsed network
+        drop: (branches, k) MMF across each branch (U_tail − U_head + F)
+
+    Returns:
+        Tuple ((branches, k) fluxes in Webers, (branches, k) dΦ/d(drop) in H)
+    """
+    flux = drop / network.reluctance[:, None]
+    incremental = np.broadcast_to(1.0 / network.reluctance[:, None], drop.shape).copy()
+    for curve, index in network.curve_groups:
+        B, dB = curve.evaluate(drop[index] / network.length[index, None])
+        flux[index] = network.area[index, None] * B
+        incremental[index] = network.area[index, None] * dB / network.length[index, None]
+    return flux, incremental
+
+
+def _initial_permeance(network: Network) -> np.ndarray:
+    """Branch permeances at zero field (each B–H curve's initial slope)."""
+    permeance = 1.0 / network.reluctance
+    for k, curve in enumerate(network.curves):
+        if curve is not None:
+            permeance[k] = curve.initial_permeability() * network.area[k] / network.length[k]
+    return permeance
+
+
+def solve_nonlinear(network: Network, mmf: np.ndarray) -> dict:
+    """
+    Solve a network with saturating branches by damped Newton iteration.
+
+    The unknowns are the node potentials U; the residual is the flux
+    imbalance A·Φ(U) at every free node and its Jacobian is the nodal
+    matrix of incremental permeances, A·diag(dΦ/d(drop))·Aᵀ, evaluated
+    analytically from the B–H curves. Each step is halved until the
+    residual decreases. Columns of mmf (excitation levels) are solved
+    together.
+
+    Args:
+        network: Parsed network
+        mmf: (branches, k) branch MMFs in ampere-turns, one column per case
+
+    Returns:
+        Dictionary with (nodes, k) potentials, (branches, k) drops, fluxes,
+        and incremental permeances, the (k,) converged mask, the number of
+        iterations, and the solver name
+    """
+    free = network.nodal_pattern()[0]
+    # Start from the linear solution with each curve's initial permeability
+    potentials, solver = solve_potentials(network, _initial_permeance(network), mmf)
+
+    def evaluate(potentials):
+        drop = potentials[network.tail] - potentials[network.head] + mmf
+        flux, incremental = branch_response(network, drop)
+        residual = network.node_sum(flux)[free]
+        scale = np.max(np.abs(flux), axis=0) + 1e-300
+        return drop, flux, incremental, np.max(np.abs(residual), axis=0, initial=0.0) / scale, residual
+
+    drop, flux, incremental, error, residual = evaluate(potentials)
+    iterations = 0
+    while iterations < NEWTON_MAX_ITERATIONS and np.any(error > NEWTON_TOLERANCE):
+        iterations += 1
+        active = error > NEWTON_TOLERANCE
+        rhs = np.zeros((len(network.nodes), mmf.shape[1]))
+        rhs[free] = -residual
+        step, solver = solve_columns(network, incremental, rhs)
+        step[:, ~active] = 0.0
+
+        # Halve the step of each case until its residual decreases
+        length = np.ones(mmf.shape[1])
+        for _ in range(MAX_LINE_SEARCH_HALVINGS):
+            trial = evaluate(potentials + step * length)
+            worse = active & (trial[3] >= error) & (trial[3] > NEWTON_TOLERANCE)
+            if not worse.any():
+                break
+            length[worse] /= 2
+        else:
+            trial = evaluate(potentials + step * length)
+        potentials = potentials + step * length
+        drop, flux, incremental, error, residual = trial
+
+    return {
+        "potentials": potentials,
+        "drop": drop,
+        "flux": flux,
+        "incremental_permeance": incremental,
+        "converged": error <= NEWTON_TOLERANCE,
+        "iterations": iterations,
+        "solver": f"Newton ({solver})",
+    }
+
+
+def branch_fluxes(network: Network, potentials: np.ndarray, permeance: np.ndarray, mmf: np.ndarray) -> np.ndarray:
+    """Branch fluxes Φ = P · (U_tail − U_head + F) in Webers."""
+    shape = (-1,) + (1,) * (np.ndim(mmf) - 1)
+    return permeance.reshape(shape) * (potentials[network.tail] - potentials[network.head] + mmf)
+
+
+def _finite(value):
+    """JSON-friendly float (None for NaN)."""
+    return None if np.isnan(value) else float(value)
+
+
+def _inductances(network: Network, permeance: np.ndarray) -> np.ndarray:
+    """Inductance matrix L_ij = N_i · d_i · Φ(branch_i) per ampere in winding j, for branch permeances P."""
+    columns = network.unit_mmf()
+    potentials, _ = solve_potentials(network, permeance, columns)
+    unit_flux = branch_fluxes(network, potentials, permeance, columns)
+    return np.array([w["direction"] * w["turns"] * unit_flux[w["branch"]] for w in network.windings])
+
+
+def _branch_energy(network: Network, flux: np.ndarray, drop: np.ndarray, nonlinear: bool) -> np.ndarray:
+    """Energy stored in each branch in Joules (½Φ²R, or volume · ∫H dB on a B–H curve)."""
+    energy = 0.5 * flux * drop
+    if nonlinear:
+        for k, curve in enumerate(network.curves):
+            if curve is not None:
+                volume = network.area[k] * network.length[k]
+                energy[k] = volume * curve.energy_density(drop[k] / network.length[k])
+    return energy
+
+
+def magnetic_circuit_solve(branches: list, windings: list = None, nonlinear: bool = False) -> dict:
+    """
+    Solve a magnetic circuit given as a netlist of reluctance branches.
+
+    Each branch joins two nodes and has a reluctance from its geometry and
+    material (or explicit μᵣ or reluctance); windings add N·I of MMF in
+    series with a branch. The node potentials are found by nodal analysis
+    (sparse LU), giving every branch flux at once. With windings, the
+    inductance matrix follows from one extra solve per winding against the
+    same factorization.
+
+    With nonlinear=True, branches made of a material with a B–H curve
+    saturate: the circuit is solved by Newton iteration and the inductances
+    are incremental (small-signal) values at the operating point.
+
+    Args:
+        branches: Branches, each {"name", "from", "to", and either
+            "length_m" + "area_m2" + "material" / "relative_permeability",
+            or "reluctance_H_inv" (optional "area_m2" for B)}, plus an
+            optional series "mmf_AT" driving flux from → to
+        windings: Coils, each {"name", "branch", "turns", "current_A",
+            "direction" (1: drives flux from → to of its branch, -1: reverse)}
+        nonlinear: Use the materials' B–H curves instead of constant μᵣ
+
+    Returns:
+        Dictionary with the flux, flux density, field strength, and MMF drop
+        of every branch, the stored energy, warnings for saturated branches,
+        and per-winding flux linkage and inductances
+    """
+    try:
+        network = Network(branches, windings)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        return {"error": str(e)}
+
+    warnings = []
+    nonlinear = bool(nonlinear) and any(curve is not None for curve in network.curves)
+    try:
+        if nonlinear:
+            solution = solve_nonlinear(network, network.mmf[:, None])
+            potentials = solution["potentials"][:, 0]
+            flux, drop = solution["flux"][:, 0], solution["drop"][:, 0]
+            permeance = solution["incremental_permeance"][:, 0]
+            solver = solution["solver"]
+            if not solution["converged"][0]:
+                warnings.append(f"Newton iteration did not converge in {solution['iterations']} iterations")
+        else:
+            permeance = 1.0 / network.reluctance
+            potentials, solver = solve_potentials(network, permeance, network.mmf)
+            flux = branch_fluxes(network, potentials, permeance, network.mmf)
+            drop = flux * network.reluctance
+    except (ValueError, RuntimeError, np.linalg.LinAlgError) as e:
+        return {"error": f"Could not solve the network: {e}"}
+    B = flux / network.area
+    H = drop / network.length
+    # Saturating branches report their secant reluctance at the operating point
+    reluctance = network.reluctance.copy()
+    if nonlinear:
+        secant = np.array([curve is not None for curve in network.curves]) & (flux != 0)
+        reluctance[secant] = drop[secant] / flux[secant]
+
+    result_branches = []
+    for k, name in enumerate(network.names):
+        entry = {
+            "name": name,
+            "from": network.nodes[network.tail[k]],
+            "to": network.nodes[network.head[k]],
+            "reluctance_H_inv": float(reluctance[k]),
+            "flux_Wb": float(flux[k]),
+            "B_tesla": _finite(B[k]),
+            "H_A_per_m": _finite(H[k]),
+            "mmf_drop_AT": float(drop[k]),
+        }
+        if nonlinear and network.curves[k] is not None:
+            incremental_mu_r = network.curves[k].evaluate(H[k])[1] / MU_0
+            entry["relative_permeability_effective"] = float(B[k] / (MU_0 * H[k])) if H[k] else network.mu_r[k]
+            entry["relative_permeability_incremental"] = float(incremental_mu_r)
+            if abs(B[k]) > network.b_sat[k] or incremental_mu_r < 0.1 * network.mu_r[k]:
+                warnings.append(
+                    f"Branch {name} is saturated: |B| = {abs(B[k]):.3g} T, incremental μᵣ = {incremental_mu_r:.3g} "
+                    f"(initial {network.mu_r[k]:.3g})"
+                )
+        elif abs(B[k]) > network.b_sat[k]:
+            warnings.append(
+                f"Branch {name}: |B| = {abs(B[k]):.3g} T exceeds the {network.materials[k]} saturation "
+                f"flux density {network.b_sat[k]:.3g} T; the linear result overestimates its flux"
+                " (solve with nonlinear=true)"
+            )
+        result_branches.append(entry)
+
+    result = {
+        "branches": result_branches,
+        "node_potentials_AT": dict(zip((str(node) for node in network.nodes), potentials.tolist())),
+        "energy_J": float(np.sum(_branch_energy(network, flux, drop, nonlinear))),
+        "nonlinear": nonlinear,
+        "warnings": warnings,
+        "solver": solver,
+        "equation": "Φ = (U_from − U_to + N·I) / R, ΣΦ = 0 at every node",
+    }
+    if nonlinear:
+        result["equation"] = "Φ = A · B((U_from − U_to + N·I) / l) on the B–H curve, ΣΦ = 0 at every node"
+        result["iterations"] = solution["iterations"]
+
+    if network.windings:
+        linkage = _inductances(network, permeance)
+        self_inductance = np.diag(linkage)
+
+        result["windings"] = []
+        for i, winding in enumerate(network.windings):
+            k = winding["branch"]
+            flux_linkage = winding["direction"] * winding["turns"] * flux[k]
+            entry = {
+                "name": winding["name"],
+                "branch": network.names[k],
+                "turns": winding["turns"],
+                "current_A": winding["current_A"],
+                "flux_linkage_Wb_turns": float(flux_linkage),
+                "inductance_H": float(self_inductance[i]),
+            }
+            if nonlinear:
+                entry["incremental_inductance_H"] = entry.pop("inductance_H")
+                if len(network.windings) == 1 and winding["current_A"]:
+                    entry["secant_inductance_H"] = float(flux_linkage / winding["current_A"])
+            result["windings"].append(entry)
+        result["inductance_matrix_H"] = linkage.tolist()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            coupling = linkage / np.sqrt(np.outer(self_inductance, self_inductance))
+        result["coupling_coefficients"] = np.where(np.isfinite(coupling), coupling, 0.0).tolist()
+
+    return result
+
+
+def _crossing(x: np.ndarray, y: np.ndarray, level: float, falling: bool = False):
+    """First x where y reaches level (linear interpolation), or None."""
+    reached = y <= level if falling else y >= level
+    if not reached.any():
+        return None
+    i = int(np.argmax(reached))
+    if i == 0:
+        return float(x[0])
+    return float(x[i - 1] + (level - y[i - 1]) * (x[i] - x[i - 1]) / (y[i] - y[i - 1]))
+
+
+def saturation_current(
+    branches: list,
+    windings: list,
+    winding: str = None,
+    max_current_A: float = None,
+    points: int = 200,
+    inductance_drop: float = 0.2,
+) -> dict:
+    """
+    Find the winding current at which a magnetic circuit saturates.
+
+    Sweeps the current of one winding from 0 to max_current_A (other
+    windings keep their current_A), solving the nonlinear circuit at every
+    point together. The saturation current is where the winding's
+    incremental inductance has fallen by inductance_drop from its value at
+    zero current; the current at which each branch reaches its material's
+    saturation flux density is reported too.
+
+    Args:
+        branches: Branches as for magnetic_circuit_solve (materials with
+            B–H curves saturate)
+        windings: Windings as for magnetic_circuit_solve
+        winding: Name of the winding to sweep (default: the first)
+        max_current_A: End of the sweep (default: 3× the current that would
+            bring the first branch to B_sat with constant μᵣ)
+        points: Number of sweep points
+        inductance_drop: Fractional inductance loss that defines saturation
+
+    Returns:
+        Dictionary with the saturation current, the initial inductance, the
+        branch that saturates first, per-branch currents reaching B_sat, and
+        the sweep (current, flux linkage, incremental inductance, peak |B|)
+    """
+    try:
+        network = Network(branches, windings)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        return {"error": str(e)}
+    saturable = np.array([curve is not None for curve in network.curves])
+    if not saturable.any():
+        return {"error": f"No branch has a B–H curve; use a material from: {', '.join(BH_TABLES)}"}
+    if not network.windings:
+        return {"error": "Give at least one winding"}
+    names = [w["name"] for w in network.windings]
+    j = names.index(winding) if winding in names else 0 if winding is None else None
+    if j is None:
+        return {"error": f"Unknown winding '{winding}'. Windings: {', '.join(names)}"}
+    if not 2 <= points <= MAX_SWEEP_POINTS:
+        return {"error": f"Points must be between 2 and {MAX_SWEEP_POINTS}"}
+    if not 0 < inductance_drop < 1:
+        return {"error": "inductance_drop must be between 0 and 1"}
+
+    swept = network.windings[j]
+    pattern = network.unit_mmf()[:, j]
+    base = network.mmf - pattern * swept["current_A"]
+
+    try:
+        if max_current_A is None:
+            # Current that brings the first branch to B_sat with constant (initial) μᵣ
+            permeance = _initial_permeance(network)
+            potentials, _ = solve_potentials(network, permeance, pattern)
+            B_per_ampere = np.abs(branch_fluxes(network, potentials, permeance, pattern)) / network.area
+            limits = network.b_sat / B_per_ampere
+            limits = limits[saturable & np.isfinite(limits)]
+            if not len(limits):
+                return {"error": "The winding drives no flux through a saturable branch; give max_current_A"}
+            max_current_A = 3 * float(limits.min())
+        if max_current_A <= 0:
+            return {"error": "max_current_A must be positive"}
+
+        currents = np.linspace(0.0, max_current_A, points)
+        mmf = base[:, None] + pattern[:, None] * currents[None, :]
+        solution = solve_nonlinear(network, mmf)
+
+        # Small-signal response to 1 A more in the swept winding, at every sweep point
+        incremental = solution["incremental_permeance"]
+        rhs = -network.node_sum(incremental * pattern[:, None])
+        step, _ = solve_columns(network, incremental, rhs)
+        step_flux = incremental * (step[network.tail] - step[network.head] + pattern[:, None])
+    except (ValueError, RuntimeError, np.linalg.LinAlgError) as e:
+        return {"error": f"Could not solve the network: {e}"}
+
+    sign_turns = swept["direction"] * swept["turns"]
+    linkage = sign_turns * solution["flux"][swept["branch"]]
+    inductance = sign_turns * step_flux[swept["branch"]]
+    B = np.abs(solution["flux"]) / network.area[:, None]
+
+    initial = float(inductance[0])
+    i_sat = _crossing(currents, inductance, (1 - inductance_drop) * initial, falling=True)
+    branch_currents = {
+        network.names[k]: _crossing(currents, B[k], network.b_sat[k])
+        for k in np.flatnonzero(saturable & np.isfinite(network.b_sat))
+    }
+    # The branch closest to (or furthest past) its B_sat at the saturation current
+    at = int(np.searchsorted(currents, i_sat)) if i_sat is not None else points - 1
+    ratio = np.where(saturable, B[:, min(at, points - 1)] / network.b_sat, -np.inf)
+    ratio = np.where(np.isnan(ratio), -np.inf, ratio)
+
+    result = {
+        "winding": swept["name"],
+        "saturation_current_A": i_sat,
+        "criterion": f"incremental inductance {inductance_drop:.0%} below its zero-current value",
+        "initial_inductance_H": initial,
+        "limiting_branch": network.names[int(np.argmax(ratio))],
+        "branch_saturation_current_A": branch_currents,
+        "max_current_A": float(max_current_A),
+        "sweep": {
+            "current_A": currents.tolist(),
+            "flux_linkage_Wb_turns": linkage.tolist(),
+            "incremental_inductance_H": inductance.tolist(),
+            "max_B_tesla": np.nanmax(B, axis=0).tolist(),
+        },
+        "converged": bool(solution["converged"].all()),
+        "iterations": solution["iterations"],
+        "solver": solution["solver"],
+    }
+    if i_sat is None:
+        result["note"] = "The inductance did not drop that far within the sweep; raise max_current_A"
+    return result
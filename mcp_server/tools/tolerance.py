@@ -0,0 +1,314 @@
+"""Monte Carlo tolerance analysis of the closed-form field and circuit tools."""
+
+import concurrent.futures
+import math
+import os
+
+import numpy as np
+
+from .batch import BATCH_TOOLS, _BATCH_TOOLS
+
+MAX_SAMPLES = 1_000_000
+MIN_SAMPLES = 100
+# Samples drawn and evaluated at once; bounds the temporaries of each step
+CHUNK_SIZE = 65_536
+MAX_BINS = 200
+DEFAULT_PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+# Percentiles spanned by the histogram bins
+HISTOGRAM_RANGE = (0.1, 99.9)
+
+# Distribution -> required parameters
+DISTRIBUTIONS = {
+    "normal": ("mean", "std"),
+    "uniform": ("low", "high"),
+    "triangular": ("low", "mode", "high"),
+    "lognormal": ("median", "sigma"),
+}
+
+
+def _distribution(name: str, spec) -> tuple:
+    """
+    Parse one input into (kind, parameters).
+
+    A number is fixed. {"nominal": x, "tolerance": t} is a relative
+    tolerance: ±t·|x| uniform, or normal with ±t·|x| as 3σ (the default).
+    Otherwise "distribution" names one of DISTRIBUTIONS with its parameters.
+    """
+    if isinstance(spec, (int, float)) and not isinstance(spec, bool):
+        return "fixed", (float(spec),)
+    if not isinstance(spec, dict):
+        raise ValueError(f"Input '{name}' must be a number or a distribution object")
+    kind = spec.get("distribution", "normal")
+    if "nominal" in spec:
+        nominal, tolerance = float(spec["nominal"]), float(spec.get("tolerance", 0))
+        if tolerance < 0:
+            raise ValueError(f"Tolerance of '{name}' must be non-negative")
+        spread = tolerance * abs(nominal)
+        if kind == "normal":
+            return "normal", (nominal, spread / 3)
+        if kind == "uniform":
+            return "uniform", (nominal - spread, nominal + spread)
+        raise ValueError(f"A nominal ± tolerance input must be 'normal' or 'uniform', not '{kind}'")
+    if kind not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution '{kind}' for '{name}'. Use: {', '.join(DISTRIBUTIONS)}")
+    missing = [key for key in DISTRIBUTIONS[kind] if key not in spec]
+    if missing:
+        raise ValueError(f"Distribution '{kind}' of '{name}' needs {', '.join(DISTRIBUTIONS[kind])}")
+    values = tuple(float(spec[key]) for key in DISTRIBUTIONS[kind])
+    if kind in ("normal", "lognormal") and values[1] < 0:
+        raise ValueError(f"Spread of '{name}' must be non-negative")
+    if kind == "uniform" and values[0] > values[1]:
+        raise ValueError(f"Uniform '{name}' needs low <= high")
+    if kind == "triangular" and not values[0] <= values[1] <= values[2]:
+        raise ValueError(f"Triangular '{name}' needs low <= mode <= high")
+    if kind == "lognormal" and values[0] <= 0:
+        raise ValueError(f"Lognormal '{name}' needs a positive median")
+    return kind, values
+
+
+def _describe(kind: str, values: tuple) -> str:
+    """Readable form of a parsed distribution, e.g. "normal(mean=1, std=0.01)"."""
+    keys = DISTRIBUTIONS.get(kind, ("value",))
+    return f"{kind}({', '.join(f'{key}={value:g}' for key, value in zip(keys, values))})"
+
+
+def _sample(rng: np.random.Generator, kind: str, values: tuple, size: int) -> np.ndarray:
+    """Draw size samples of one parsed distribution."""
+    if kind == "fixed":
+        return np.full(size, values[0])
+    if kind == "normal":
+        return rng.normal(values[0], values[1], size)
+    if kind == "uniform":
+        return rng.uniform(values[0], values[1], size)
+    if kind == "triangular":
+        low, mode, high = values
+        return np.full(size, low) if low == high else rng.triangular(low, mode, high, size)
+    return values[0] * np.exp(rng.normal(0.0, values[1], size))
+
+
+def _evaluate_chunk(tool: str, inputs: dict, varied: list, seed: np.random.SeedSequence, size: int) -> tuple:
+    """
+    Sample and evaluate one chunk.
+
+    Module-level so it can be pickled into a process pool. Only the moments
+    of the valid rows and the valid output values leave the chunk.
+
+    Returns:
+        (count, column means, centered cross-products, outputs, error counts);
+        the columns are the varied inputs followed by the outputs
+    """
+    spec = _BATCH_TOOLS[tool]
+    rng = np.random.default_rng(seed)
+    params = {name: _sample(rng, *inputs[name], size) for name in spec["params"]}
+
+    # First failing check wins per sample, as in batch_calculate
+    valid = np.ones(size, dtype=bool)
+    errors = {}
+    for check, message in spec["checks"]:
+        failed = check(params) & valid
+        if failed.any():
+            errors[message] = errors.get(message, 0) + int(failed.sum())
+            valid &= ~failed
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        outputs = spec["compute"](params)
+    for values in outputs.values():
+        valid &= np.isfinite(values)
+    non_finite = int(size - valid.sum() - sum(errors.values()))
+    if non_finite:
+        errors["Non-finite result"] = non_finite
+
+    outputs = {name: values[valid] for name, values in outputs.items()}
+    columns = np.column_stack([params[name][valid] for name in varied] + list(outputs.values()))
+    count = len(columns)
+    mean = columns.mean(axis=0) if count else np.zeros(columns.shape[1])
+    centered = columns - mean
+    return count, mean, centered.T @ centered, outputs, errors
+
+
+def _merge_moments(a: tuple, b: tuple) -> tuple:
+    """Combine (count, mean, centered cross-products) of two sample sets (Chan et al.)."""
+    count_a, mean_a, cross_a = a
+    count_b, mean_b, cross_b = b
+    count = count_a + count_b
+    if count_a == 0 or count_b == 0:
+        return b if count_a == 0 else a
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (count_b / count)
+    return count, mean, cross_a + cross_b + np.outer(delta, delta) * (count_a * count_b / count)
+
+
+def _limits(limits: dict, outputs: list) -> dict:
+    """Parse {output: {"min", "max"}} or {output: [min, max]} into (low, high) with None for open ends."""
+    parsed = {}
+    for name, bounds in (limits or {}).items():
+        if name not in outputs:
+            raise ValueError(f"Unknown output '{name}' in limits. Outputs: {', '.join(outputs)}")
+        if isinstance(bounds, dict):
+            unknown = set(bounds) - {"min", "max"}
+            if unknown:
+                raise ValueError(f"Limits of '{name}' take 'min' and 'max'")
+            low, high = bounds.get("min"), bounds.get("max")
+        else:
+            low, high = bounds
+        parsed[name] = (None if low is None else float(low), None if high is None else float(high))
+    return parsed
+
+
+def tolerance_analysis(
+    tool: str,
+    inputs: dict,
+    samples: int = 100_000,
+    limits: dict = None,
+    percentiles: list = None,
+    bins: int = 20,
+    seed: int = None,
+    workers: int = 1
+) -> dict:
+    """
+    Propagate input tolerances through one closed-form tool by Monte Carlo.
+
+    Samples are drawn and evaluated in chunks of CHUNK_SIZE with the same
+    vectorized formulas and validity checks as batch_calculate. Chunk i
+    always uses the i-th child of the seed, so results do not depend on
+    workers. Only summaries are returned: percentiles, a histogram, and
+    the correlation of each output with each varied input.
+
+    Args:
+        tool: Name of the tool to evaluate (see BATCH_TOOLS)
+        inputs: Parameter -> number (fixed) or distribution, e.g.
+            {"nominal": 0.001, "tolerance": 0.05} (±5% as 3σ),
+            {"distribution": "uniform", "low": 0.9, "high": 1.1},
+            {"distribution": "normal", "mean": 2000, "std": 200},
+            {"distribution": "triangular", "low", "mode", "high"},
+            {"distribution": "lognormal", "median", "sigma"}
+        samples: Number of samples (100 to 1,000,000)
+        limits: Output -> {"min", "max"} (or [min, max]) acceptance limits for the yield
+        percentiles: Percentiles to report (default 1, 5, 25, 50, 75, 95, 99)
+        bins: Histogram bins (1 to 200)
+        seed: Random seed (default: fresh entropy, returned for reproduction)
+        workers: Processes that evaluate chunks (1 = in this process)
+
+    Returns:
+        Dictionary with per-output statistics, sensitivity rankings, invalid
+        sample counts by reason, and the yield when limits are given
+    """
+    spec = _BATCH_TOOLS.get(tool)
+    if spec is None:
+        return {"error": f"tolerance_analysis does not support '{tool}'. Supported: {', '.join(BATCH_TOOLS)}"}
+    if not isinstance(inputs, dict):
+        return {"error": "inputs must map parameter names to numbers or distributions"}
+    unknown = set(inputs) - set(spec["params"])
+    if unknown:
+        return {"error": f"Unknown parameter(s) for {tool}: {', '.join(sorted(unknown))}"}
+    if not MIN_SAMPLES <= samples <= MAX_SAMPLES:
+        return {"error": f"samples must be between {MIN_SAMPLES:,} and {MAX_SAMPLES:,}"}
+    if not 1 <= bins <= MAX_BINS:
+        return {"error": f"bins must be between 1 and {MAX_BINS}"}
+    if workers < 1:
+        return {"error": "workers must be at least 1"}
+    percentiles = list(DEFAULT_PERCENTILES if percentiles is None else percentiles)
+    if not percentiles or any(not 0 <= q <= 100 for q in percentiles):
+        return {"error": "percentiles must be between 0 and 100"}
+
+    parsed = {}
+    try:
+        for name, default in spec["params"].items():
+            if name not in inputs and default is None:
+                raise ValueError(f"Missing parameter '{name}' for {tool}")
+            parsed[name] = _distribution(name, inputs.get(name, default))
+        output_names = list(spec["compute"]({name: np.ones(1) for name in spec["params"]}))
+        acceptance = _limits(limits, output_names)
+    except (KeyError, TypeError, ValueError) as e:
+        return {"error": str(e)}
+    varied = [name for name, (kind, _) in parsed.items() if kind != "fixed"]
+    if not varied:
+        return {"error": "At least one input needs a distribution"}
+
+    seed_sequence = np.random.SeedSequence(seed)
+    sizes = [min(CHUNK_SIZE, samples - start) for start in range(0, samples, CHUNK_SIZE)]
+    children = seed_sequence.spawn(len(sizes))
+    workers = min(workers, len(sizes), os.cpu_count() or 1)
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_evaluate_chunk, [tool] * len(sizes), [parsed] * len(sizes),
+                                   [varied] * len(sizes), children, sizes))
+    else:
+        chunks = [_evaluate_chunk(tool, parsed, varied, child, size) for child, size in zip(children, sizes)]
+
+    moments = (0, None, None)
+    errors = {}
+    for count, mean, cross, _, chunk_errors in chunks:
+        moments = _merge_moments(moments, (count, mean, cross))
+        for message, number in chunk_errors.items():
+            errors[message] = errors.get(message, 0) + number
+    valid_count = moments[0]
+    if valid_count < 2:
+        return {"error": "Fewer than two samples are valid", "invalid": errors}
+    values = {name: np.concatenate([chunk[3][name] for chunk in chunks]) for name in output_names}
+
+    # Correlations from the merged cross-products; variance_share is r² normalized
+    # over the inputs (the first-order contribution when inputs are independent)
+    cross = moments[2]
+    scale = np.sqrt(np.diag(cross))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlation = np.nan_to_num(cross / np.outer(scale, scale))
+    sensitivity = {}
+    for j, name in enumerate(output_names):
+        r = correlation[len(varied) + j, :len(varied)]
+        total = float(np.sum(r ** 2))
+        ranking = [
+            {"input": varied[i], "correlation": float(r[i]),
+             "variance_share": float(r[i] ** 2 / total) if total > 0 else 0.0}
+            for i in np.argsort(-np.abs(r), kind="stable")
+        ]
+        sensitivity[name] = ranking
+
+    outputs = {}
+    for j, name in enumerate(output_names):
+        column = values[name]
+        # Bin the central 99.8% so a long tail does not squeeze the bulk into one bin
+        low, high = np.percentile(column, HISTOGRAM_RANGE)
+        counts, edges = np.histogram(column, bins=bins, range=(low, high) if high > low else None)
+        outputs[name] = {
+            "mean": float(moments[1][len(varied) + j]),
+            "std": float(math.sqrt(cross[len(varied) + j, len(varied) + j] / (valid_count - 1))),
+            "min": float(column.min()),
+            "max": float(column.max()),
+            "percentiles": {f"p{q:g}": float(v) for q, v in zip(percentiles, np.percentile(column, percentiles))},
+            "histogram": {"edges": edges.tolist(), "counts": counts.tolist(),
+                          "below": int(np.sum(column < edges[0])), "above": int(np.sum(column > edges[-1]))},
+        }
+
+    result = {
+        "tool": tool,
+        "samples": samples,
+        "valid_samples": int(valid_count),
+        "invalid": errors,
+        "inputs": {name: _describe(*parsed[name]) for name in varied},
+        "fixed": {name: parsed[name][1][0] for name in parsed if name not in varied},
+        "outputs": outputs,
+        "sensitivity": sensitivity,
+        "seed": seed_sequence.entropy,
+        "chunks": len(sizes),
+        "equation": spec["equation"],
+    }
+    if acceptance:
+        passing = np.ones(valid_count, dtype=bool)
+        failing = {}
+        for name, (low, high) in acceptance.items():
+            inside = np.ones(valid_count, dtype=bool)
+            if low is not None:
+                inside &= values[name] >= low
+            if high is not None:
+                inside &= values[name] <= high
+            failing[name] = int(valid_count - inside.sum())
+            passing &= inside
+        fraction = float(passing.sum() / samples)
+        result["yield"] = {
+            "fraction": fraction,
+            "standard_error": math.sqrt(fraction * (1 - fraction) / samples),
+            "passing": int(passing.sum()),
+            "failing_by_output": failing,
+            "note": "Invalid samples count as failing",
+        }
+    return result
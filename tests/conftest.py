@@ -0,0 +1,50 @@
+"""Shared fixtures for agent tests: a scripted Anthropic client and a temporary field store."""
+
+import pytest
+
+
+class FakeMessages:
+    """Stand-in for client.messages that replays scripted responses."""
+
+    def __init__(self, responses: list):
+        self.responses = list(responses)
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class FakeClient:
+    """Stand-in for the Anthropic client."""
+
+    def __init__(self, responses: list):
+        self.messages = FakeMessages(responses)
+
+
+@pytest.fixture
+def scripted_agent():
+    """Factory for a SkillAgent whose model calls replay scripted responses."""
+    from agent.agent import SkillAgent
+
+    def make(responses: list, **kwargs):
+        kwargs.setdefault("enable_answer_cache", False)
+        kwargs.setdefault("enable_fast_path", False)
+        agent = SkillAgent(**kwargs)
+        agent.client = FakeClient(responses)
+        return agent
+
+    return make
+
+
+@pytest.fixture(autouse=True)
+def field_store_dir(tmp_path, monkeypatch):
+    """Keep stored field maps in the test's temporary directory."""
+    from mcp_server.tools import field_store
+
+    store_dir = tmp_path / "field_maps"
+    monkeypatch.setattr(field_store, "STORE_DIR", str(store_dir))
+    return store_dir
@@ -0,0 +1,37 @@
+"""Fake embeddings and model responses shared by the agent tests."""
+
+import re
+from types import SimpleNamespace
+
+
+def bag_of_words_embed(texts):
+    """Deterministic stand-in for a sentence embedding (word counts over letters)."""
+    vectors = []
+    for text in texts:
+        vector = [0.0] * 64
+        for word in re.findall(r"[a-z]+", text.lower()):
+            vector[sum(map(ord, word)) % 64] += 1.0
+        vectors.append(vector)
+    return vectors
+
+
+def text_response(text: str, input_tokens: int = 100, output_tokens: int = 20):
+    """Build a fake end_turn response with a single text block."""
+    return SimpleNamespace(
+        stop_reason="end_turn",
+        content=[SimpleNamespace(type="text", text=text)],
+        usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens),
+    )
+
+
+def tool_use_response(*calls, input_tokens: int = 100, output_tokens: int = 20):
+    """Build a fake tool_use response from (tool_name, tool_input) pairs."""
+    content = [
+        SimpleNamespace(type="tool_use", name=name, input=tool_input, id=f"toolu_{i}")
+        for i, (name, tool_input) in enumerate(calls)
+    ]
+    return SimpleNamespace(
+        stop_reason="tool_use",
+        content=content,
+        usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens),
+    )
@@ -0,0 +1,101 @@
+"""Tests for latency budgets and tool-round caps in the agentic loop."""
+
+import json
+import time
+
+import httpx
+from anthropic import APITimeoutError
+from tests.helpers import text_response, tool_use_response
+
+SOLENOID = ("solenoid_field", {"turns": 500, "length_m": 0.2, "current_A": 2})
+
+
+def api_timeout():
+    """Build the exception the SDK raises when a request times out."""
+    return APITimeoutError(request=httpx.Request("POST", "https://api.anthropic.com/v1/messages"))
+
+
+class TestToolRoundCap:
+    """Tests for the maximum number of tool rounds."""
+
+    def test_forced_final_answer(self, scripted_agent):
+        """Test that the loop stops calling tools after max_tool_rounds."""
+        agent = scripted_agent(
+            [
+                tool_use_response(SOLENOID),
+                tool_use_response(SOLENOID),
+                text_response("B is 6.28 mT"),
+            ],
+            max_tool_rounds=2,
+        )
+        answer = agent.run_agentic_loop("Field of a 500-turn 20 cm solenoid at 2 A?")
+        final_call = agent.client.messages.calls[-1]
+        assert answer == "B is 6.28 mT"
+        assert final_call["tool_choice"] == {"type": "none"}
+        assert final_call["messages"][-1]["content"][-1]["type"] == "text"
+
+    def test_tool_results_kept_in_order(self, scripted_agent):
+        """Test that concurrent tool calls report results in request order."""
+        agent = scripted_agent(
+            [
+                tool_use_response(SOLENOID, ("material_lookup", {"material": "iron"})),
+                text_response("done"),
+            ]
+        )
+        agent.run_agentic_loop("Field and iron properties?")
+        tool_results = agent.client.messages.calls[-1]["messages"][-1]["content"]
+        assert [block["tool_use_id"] for block in tool_results] == ["toolu_0", "toolu_1"]
+        assert "B_tesla" in json.loads(tool_results[0]["content"])
+
+
+class TestLatencyBudget:
+    """Tests for deadline handling."""
+
+    def test_model_timeout_forces_answer(self, scripted_agent):
+        """Test that a timed-out model call falls back to a forced final answer."""
+        agent = scripted_agent([api_timeout(), text_response("best effort")], latency_budget_s=30)
+        answer = agent.run_agentic_loop("Field of a 500-turn 20 cm solenoid at 2 A?")
+        assert answer == "best effort"
+        assert agent.client.messages.calls[0]["timeout"] < 30
+
+    def test_slow_tool_cancelled(self, scripted_agent):
+        """Test that a tool still running at the deadline is cancelled."""
+        agent = scripted_agent([tool_use_response(SOLENOID)], latency_budget_s=0.3)
+
+        def slow_tool(tool_name, tool_input, cancel_event=None):
+            time.sleep(1.0)
+            return json.dumps({"B_tesla": 0.00628})
+
+        agent.call_tool = slow_tool
+        started = time.monotonic()
+        answer = agent.run_agentic_loop("Field of a 500-turn 20 cm solenoid at 2 A?")
+        assert time.monotonic() - started < 0.9
+        assert "latency budget exceeded" in answer
+        assert len(agent.client.messages.calls) == 1
+
+    def test_overrunning_call_does_not_block_pool(self, scripted_agent):
+        """Test that a call still running past the deadline leaves no busy thread for the next request."""
+        agent = scripted_agent(
+            [tool_use_response(SOLENOID), tool_use_response(SOLENOID), text_response("done")],
+            latency_budget_s=0.3, tool_workers=1,
+        )
+        calls = []
+
+        def tool(tool_name, tool_input, cancel_event=None):
+            calls.append(tool_name)
+            if len(calls) == 1:
+                time.sleep(1.0)
+            return json.dumps({"B_tesla": 0.00628})
+
+        agent.call_tool = tool
+        agent.run_agentic_loop("Field of a 500-turn 20 cm solenoid at 2 A?")
+        started = time.monotonic()
+        assert agent.run_agentic_loop("Field of a 500-turn 20 cm solenoid at 2 A?") == "done"
+        assert time.monotonic() - started < 0.3
+        assert len(calls) == 2
+
+    def test_no_budget_means_no_timeout(self, scripted_agent):
+        """Test that requests without a budget keep the client's default timeout."""
+        agent = scripted_agent([text_response("hi")])
+        agent.run_agentic_loop("Hello")
+        assert "timeout" not in agent.client.messages.calls[0]
@@ -0,0 +1,139 @@
+"""Tests for the semantic answer cache."""
+
+import threading
+
+import pytest
+from agent import answer_cache
+from agent.answer_cache import SemanticAnswerCache
+from tests.helpers import bag_of_words_embed
+
+
+class TestExtractParameters:
+    """Tests for numeric parameter extraction."""
+
+    def test_order_independent(self):
+        """Test that parameter order does not matter."""
+        a = answer_cache.extract_parameters("B field in a 500-turn 20 cm solenoid at 2 A")
+        b = answer_cache.extract_parameters("solenoid at 2 A, 20 cm long with 500 turns")
+        assert a == b
+
+    def test_units_distinguish_parameters(self):
+        """Test that the same numbers with different units differ."""
+        a = answer_cache.extract_parameters("Convert 1.2 Tesla to Gauss")
+        b = answer_cache.extract_parameters("Convert 1.2 Gauss to Tesla")
+        assert a != b
+
+    def test_numeric_equivalence(self):
+        """Test that 2 and 2.0 are the same parameter."""
+        assert answer_cache.extract_parameters("2 A") == answer_cache.extract_parameters("2.0 A")
+
+    def test_no_numbers(self):
+        """Test a question without numbers."""
+        assert answer_cache.extract_parameters("What is mu-metal used for?") == ()
+
+    def test_target_units(self):
+        """Test that the unit asked for is part of the signature and plain words are not."""
+        assert answer_cache.extract_target_units("Convert 1.2 T to Gauss") == ("Gauss",)
+        assert answer_cache.extract_target_units("Convert 1.2 T into kA/m") == ("kA/m",)
+        assert answer_cache.extract_target_units("B field in a solenoid, in mT") == ("mT",)
+        assert answer_cache.question_signature("Convert 1.2 T to Gauss") != \
+            answer_cache.question_signature("Convert 1.2 T to mT")
+
+    def test_entities(self):
+        """Test material names and aliases, longest match first, numbers skipped."""
+        assert answer_cache.extract_entities("Permeability of mu-metal vs M-19") == ("M19", "mu_metal")
+        assert answer_cache.extract_entities("Is cast iron saturated at 77 A?") == ("Cast iron",)
+        assert answer_cache.question_signature("Saturation of iron at 2 T") != \
+            answer_cache.question_signature("Saturation of ferrite at 2 T")
+
+
+class TestSemanticAnswerCache:
+    """Tests for cache lookups, limits, and statistics."""
+
+    def test_hit_on_rephrased_question(self):
+        """Test that a rephrased question with identical numbers hits."""
+        cache = SemanticAnswerCache(bag_of_words_embed, similarity_threshold=0.7)
+        cache.store("B field in a 500-turn 20 cm solenoid at 2 A", "6.28 mT")
+        answer = cache.lookup("What is the B field in a 20 cm solenoid with 500 turns at 2 A?")
+        assert answer == "6.28 mT"
+
+    def test_miss_on_different_numbers(self):
+        """Test that different numbers never reuse an answer."""
+        cache = SemanticAnswerCache(bag_of_words_embed, similarity_threshold=0.5)
+        cache.store("B field in a 500-turn 20 cm solenoid at 2 A", "6.28 mT")
+        assert cache.lookup("B field in a 500-turn 20 cm solenoid at 3 A") is None
+
+    def test_miss_below_threshold(self):
+        """Test that dissimilar questions miss."""
+        cache = SemanticAnswerCache(bag_of_words_embed, similarity_threshold=0.95)
+        cache.store("Convert 2 T to Gauss", "20000 Gauss")
+        assert cache.lookup("Energy stored by 2 T in a small volume") is None
+
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL."""
+        cache = SemanticAnswerCache(bag_of_words_embed, ttl_seconds=0)
+        cache.store("Convert 2 T to Gauss", "20000 Gauss")
+        assert cache.lookup("Convert 2 T to Gauss") is None
+        assert cache.get_stats()["expirations"] == 1
+
+    def test_lru_eviction(self):
+        """Test that the oldest entry is evicted at capacity."""
+        cache = SemanticAnswerCache(bag_of_words_embed, max_entries=2)
+        cache.store("Convert 1 T to Gauss", "10000 Gauss")
+        cache.store("Convert 2 T to Gauss", "20000 Gauss")
+        cache.store("Convert 3 T to Gauss", "30000 Gauss")
+        assert cache.lookup("Convert 1 T to Gauss") is None
+        assert cache.lookup("Convert 3 T to Gauss") == "30000 Gauss"
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_miss_on_different_target_or_material(self):
+        """Test that a different target unit or material never reuses an answer."""
+        cache = SemanticAnswerCache(bag_of_words_embed, similarity_threshold=0.5)
+        cache.store("Convert 1.2 T to Gauss", "12000 Gauss")
+        cache.store("Relative permeability of iron", "5000")
+        assert cache.lookup("Convert 1.2 T to mT") is None
+        assert cache.lookup("Relative permeability of ferrite") is None
+        assert cache.lookup("Relative permeability of iron") == "5000"
+
+    def test_embedding_outside_lock(self):
+        """Test that a slow embedding does not hold the lock other sessions need."""
+        started, release = threading.Event(), threading.Event()
+
+        def slow_embed(texts):
+            if texts == ["Convert 2 T to Gauss"]:
+                started.set()
+                release.wait(5)
+            return bag_of_words_embed(texts)
+
+        cache = SemanticAnswerCache(slow_embed)
+        cache.store("Convert 1 T to Gauss", "10000 Gauss")
+        writer = threading.Thread(target=cache.store, args=("Convert 2 T to Gauss", "20000 Gauss"))
+        writer.start()
+        assert started.wait(5)
+        assert cache.lookup("Convert 1 T to Gauss") == "10000 Gauss"
+        release.set()
+        writer.join(5)
+        assert cache.get_stats()["entries"] == 2
+
+    def test_hit_rate_stats(self):
+        """Test hit-rate bookkeeping."""
+        cache = SemanticAnswerCache(bag_of_words_embed)
+        cache.store("Convert 1 T to Gauss", "10000 Gauss")
+        cache.lookup("Convert 1 T to Gauss")
+        cache.lookup("Convert 5 T to Gauss")
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_embeddings_unavailable(self):
+        """Test that the cache is a no-op without embeddings."""
+        cache = SemanticAnswerCache(lambda texts: [])
+        cache.store("Convert 1 T to Gauss", "10000 Gauss")
+        assert cache.lookup("Convert 1 T to Gauss") is None
+        assert cache.get_stats()["entries"] == 0
+
+    def test_invalid_threshold(self):
+        """Test that an out-of-range threshold is rejected."""
+        with pytest.raises(ValueError):
+            SemanticAnswerCache(bag_of_words_embed, similarity_threshold=1.5)
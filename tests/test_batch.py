@@ -0,0 +1,157 @@
+"""Tests for vectorized batch calculations."""
+
+import json
+
+import pytest
+from mcp_server.dispatch import run_tool
+from mcp_server.tools import batch, circuits, fields
+
+
+class TestBatchGrid:
+    """Tests for parameter-grid sweeps."""
+
+    def test_current_sweep_matches_scalar_tool(self):
+        """Test a 0.1–5 A sweep against solenoid_field."""
+        result = batch.batch_calculate(
+            "solenoid_field",
+            grid={"turns": 500, "length_m": 0.2, "current_A": {"start": 0.1, "stop": 5, "step": 0.1}},
+        )
+        assert result["count"] == 50
+        assert result["fixed"] == {"turns": 500.0, "length_m": 0.2}
+        currents = result["columns"]["current_A"]
+        assert currents[0] == pytest.approx(0.1)
+        assert currents[-1] == pytest.approx(5.0)
+        for current, B in zip(currents, result["columns"]["B_tesla"]):
+            assert B == pytest.approx(fields.solenoid_field(500, 0.2, current)["B_tesla"], rel=1e-12)
+
+    def test_cartesian_product(self):
+        """Test that every grid combination is evaluated."""
+        result = batch.batch_calculate(
+            "reluctance",
+            grid={"length_m": [0.1, 0.2], "area_m2": [1e-4, 2e-4, 4e-4], "relative_permeability": 2000},
+        )
+        assert result["count"] == 6
+        assert result["columns"]["length_m"] == [0.1, 0.1, 0.1, 0.2, 0.2, 0.2]
+        expected = circuits.reluctance(0.2, 1e-4, 2000)["reluctance_H_inv"]
+        assert result["summary"]["reluctance_H_inv"]["max"] == pytest.approx(expected)
+        assert result["summary"]["reluctance_H_inv"]["argmax"] == 3
+
+    def test_default_parameter(self):
+        """Test that magnetic_flux angle defaults to 0."""
+        result = batch.batch_calculate("magnetic_flux", grid={"B_tesla": [0.5, 1.0], "area_m2": 0.01})
+        assert result["columns"]["flux_Wb"] == pytest.approx([0.005, 0.01])
+
+    def test_grid_too_large(self):
+        """Test that oversized grids are rejected."""
+        result = batch.batch_calculate(
+            "mmf_required",
+            grid={"H_field": {"start": 0, "stop": 1000, "step": 0.001}, "path_length_m": [0.1, 0.2]},
+        )
+        assert "error" in result
+
+    def test_bad_range(self):
+        """Test that a range stepping away from stop is rejected."""
+        result = batch.batch_calculate(
+            "mmf_required", grid={"H_field": {"start": 0, "stop": 10, "step": -1}, "path_length_m": 0.1}
+        )
+        assert "Invalid batch input" in result["error"]
+
+
+class TestBatchArgSets:
+    """Tests for explicit argument lists and validation."""
+
+    def test_invalid_rows_reported(self):
+        """Test that invalid rows use the scalar error messages and null outputs."""
+        result = batch.batch_calculate("solenoid_field", arg_sets=[
+            {"turns": 100, "length_m": 0.1, "current_A": 1},
+            {"turns": 100, "length_m": 0, "current_A": 1},
+            {"turns": -5, "length_m": 0.1, "current_A": 1},
+        ])
+        assert result["valid_count"] == 1
+        assert result["columns"]["B_tesla"][1:] == [None, None]
+        assert result["errors"] == [
+            {"index": 1, "error": fields.solenoid_field(100, 0, 1)["error"]},
+            {"index": 2, "error": fields.solenoid_field(-5, 0.1, 1)["error"]},
+        ]
+        json.dumps(result, allow_nan=False)
+
+    def test_missing_parameter(self):
+        """Test that a missing required parameter is an error."""
+        result = batch.batch_calculate("energy_stored", arg_sets=[{"B_tesla": 1.0}])
+        assert "volume_m3" in result["error"]
+
+    def test_unknown_parameter(self):
+        """Test that unexpected parameters are rejected."""
+        result = batch.batch_calculate("biot_savart_wire", arg_sets=[{"current_A": 1, "distance_m": 0.1, "x": 1}])
+        assert "Unknown parameter" in result["error"]
+
+    def test_unsupported_tool(self):
+        """Test that non-numeric tools are rejected."""
+        assert "does not support" in batch.batch_calculate("material_lookup", arg_sets=[{}])["error"]
+
+    def test_requires_exactly_one_input(self):
+        """Test that arg_sets and grid are mutually exclusive."""
+        assert "error" in batch.batch_calculate("mmf_required")
+        assert "error" in batch.batch_calculate("mmf_required", arg_sets=[], grid={})
+
+    def test_all_rows_invalid(self):
+        """Test that a batch with no valid rows has an empty summary."""
+        result = batch.batch_calculate("biot_savart_wire", grid={"current_A": 1, "distance_m": [0, -1]})
+        assert result["valid_count"] == 0
+        assert result["summary"] == {}
+
+
+SCALAR_TOOLS = {
+    "solenoid_field": (fields.solenoid_field, [
+        {"turns": 500, "length_m": 0.2, "current_A": 2}, {"turns": 10, "length_m": 0, "current_A": 1},
+        {"turns": -1, "length_m": 0.1, "current_A": 1}]),
+    "biot_savart_wire": (fields.biot_savart_wire, [
+        {"current_A": 10, "distance_m": 0.05}, {"current_A": 10, "distance_m": -1}]),
+    "magnetic_flux": (fields.magnetic_flux, [
+        {"B_tesla": 1.2, "area_m2": 0.01, "angle_deg": 30}, {"B_tesla": 1.2, "area_m2": -0.01, "angle_deg": 0}]),
+    "energy_stored": (fields.energy_stored, [
+        {"B_tesla": 0.05, "volume_m3": 5e-4}, {"B_tesla": 0.05, "volume_m3": -1}]),
+    "reluctance": (circuits.reluctance, [
+        {"length_m": 0.1, "area_m2": 2e-4, "relative_permeability": 5000},
+        {"length_m": 0.1, "area_m2": 0, "relative_permeability": 5000},
+        {"length_m": 0.1, "area_m2": 2e-4, "relative_permeability": -1}]),
+    "mmf_required": (circuits.mmf_required, [
+        {"H_field": 1000, "path_length_m": 0.3}, {"H_field": 1000, "path_length_m": -0.3}]),
+}
+
+
+class TestBatchMatchesScalarTools:
+    """Tests that every batch tool agrees with its scalar tool."""
+
+    def test_every_tool_covered(self):
+        """Test that the comparison below covers every batch tool."""
+        assert set(SCALAR_TOOLS) == set(batch.BATCH_TOOLS)
+
+    @pytest.mark.parametrize("tool", sorted(SCALAR_TOOLS))
+    def test_outputs_and_errors(self, tool):
+        """Test every output column and error message against the scalar tool row by row."""
+        function, arg_sets = SCALAR_TOOLS[tool]
+        result = batch.batch_calculate(tool, arg_sets=arg_sets)
+        errors = {entry["index"]: entry["error"] for entry in result["errors"]}
+        outputs = [name for name in result["columns"] if name not in arg_sets[0]]
+        for index, args in enumerate(arg_sets):
+            scalar = function(**args)
+            if "error" in scalar:
+                assert errors[index] == scalar["error"]
+                continue
+            assert index not in errors
+            for name in outputs:
+                assert result["columns"][name][index] == pytest.approx(scalar[name], rel=1e-12)
+            assert set(outputs) <= set(scalar)
+        assert result["equation"] == function(**arg_sets[0])["equation"]
+
+
+class TestBatchDispatch:
+    """Tests for batch_calculate through the MCP server dispatch."""
+
+    def test_run_tool(self):
+        """Test that the server dispatches batch_calculate."""
+        result = run_tool("batch_calculate", {
+            "tool": "mmf_required", "grid": {"H_field": [100, 200], "path_length_m": 0.3},
+        })
+        assert result["columns"]["mmf_AT"] == pytest.approx([30.0, 60.0])
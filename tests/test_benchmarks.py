@@ -0,0 +1,85 @@
+"""Tests for the MCP server load-test helpers."""
+
+import os
+
+import pytest
+from benchmarks import mcp_load
+
+
+class TestLoadTestHelpers:
+    """Tests for mix parsing, percentiles, and baseline comparison."""
+
+    def test_parse_mix(self):
+        """Test weighted mix parsing with a default weight."""
+        assert mcp_load.parse_mix("solenoid_field=3, unit_convert") == [
+            ("solenoid_field", 3.0), ("unit_convert", 1.0)
+        ]
+
+    def test_parse_mix_unknown_tool(self):
+        """Test that tools without sample arguments are rejected."""
+        with pytest.raises(ValueError):
+            mcp_load.parse_mix("warp_drive=1")
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = list(range(1, 101))
+        assert mcp_load.percentile(values, 0.50) == 50
+        assert mcp_load.percentile(values, 0.99) == 99
+        assert mcp_load.percentile([], 0.5) == 0.0
+
+    def test_read_own_rss(self):
+        """Test reading this process's RSS where /proc exists."""
+        rss = mcp_load.read_rss_kb(os.getpid())
+        assert rss is None or rss > 0
+
+    def test_compare_to_baseline(self):
+        """Test that only changes beyond the tolerance are regressions."""
+        baseline = {"throughput_cps": 1000, "latency_ms": {"p50": 1.0, "p99": 5.0}, "errors": 0,
+                    "rss_kb": {"per_session": 200}}
+        report = {"throughput_cps": 700, "latency_ms": {"p50": 1.1, "p99": 9.0}, "errors": 0,
+                  "rss_kb": {"per_session": None}}
+        regressions = mcp_load.compare_to_baseline(report, baseline, tolerance=0.25)
+        assert len(regressions) == 2
+        assert regressions[0].startswith("throughput_cps")
+        assert regressions[1].startswith("latency_ms.p99")
+
+    def test_per_session_rss_floor(self):
+        """Test that small absolute RSS changes are not regressions however large relatively."""
+        baseline = {"throughput_cps": 1000, "errors": 0, "rss_kb": {"per_session": 263}}
+        noisy = {"throughput_cps": 1000, "errors": 0, "rss_kb": {"per_session": 900}}
+        grown = {"throughput_cps": 1000, "errors": 0, "rss_kb": {"per_session": 20000}}
+        assert mcp_load.compare_to_baseline(noisy, baseline) == []
+        assert mcp_load.compare_to_baseline(grown, baseline)[0].startswith("rss_kb.per_session")
+
+    def test_environment_mismatches(self):
+        """Test that differing run settings are reported and machine details are not."""
+        args = mcp_load.parse_args(["--calls", "300", "--sessions", "2"])
+        current = mcp_load.run_environment(args)
+        assert mcp_load.environment_mismatches(dict(current, python="0.0"), current) == []
+        recorded = dict(current, calls=1000, mix="solenoid_field=1")
+        mismatches = mcp_load.environment_mismatches(recorded, current)
+        assert [m.split(":")[0] for m in mismatches] == ["calls", "mix"]
+
+
+class TestInProcessRun:
+    """Tests for a short in-process benchmark run."""
+
+    @pytest.mark.asyncio
+    async def test_run_in_process(self):
+        """Test that a small run completes without errors."""
+        mix = mcp_load.parse_mix("solenoid_field=2,batch_calculate=1")
+        report = await mcp_load.run_in_process(mix, calls=30, concurrency=4, sessions=2)
+        assert report["calls"] == 30
+        assert report["errors"] == 0
+        assert report["throughput_cps"] > 0
+        assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"]
+
+    @pytest.mark.asyncio
+    async def test_mismatched_baseline_skipped(self, tmp_path, capsys):
+        """Test that a baseline recorded with other settings is not compared."""
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text('{"environment": {"calls": 5000}, "in_process": {"throughput_cps": 1e9}}')
+        status = await mcp_load.main(["--transport", "in_process", "--calls", "20", "--sessions", "1",
+                                      "--baseline", str(baseline)])
+        assert status == 0
+        assert "Skipping the baseline comparison" in capsys.readouterr().out
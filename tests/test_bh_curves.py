@@ -0,0 +1,219 @@
+"""Tests for B–H curves and nonlinear (saturating) magnetic circuit solves."""
+
+import json
+import time
+
+import numpy as np
+import pytest
+from mcp_server.dispatch import run_tool
+from mcp_server.tools import reluctance_network
+from mcp_server.tools.bh_curves import BH_TABLES, BHCurve, get_curve
+from mcp_server.tools.circuits import MU_0
+from mcp_server.tools.materials import MATERIALS
+from mcp_server.tools.reluctance_network import magnetic_circuit_solve, saturation_current
+
+GAPPED_CORE = [
+    {"name": "core", "from": "a", "to": "b", "length_m": 0.2, "area_m2": 1e-4, "material": "iron"},
+    {"name": "gap", "from": "b", "to": "a", "length_m": 0.0005, "area_m2": 1e-4, "relative_permeability": 1},
+]
+WINDING = {"name": "L1", "branch": "core", "turns": 200, "current_A": 0.0}
+
+
+def winding(current):
+    """The single winding of GAPPED_CORE at the given current."""
+    return [dict(WINDING, current_A=current)]
+
+
+def get_curve_from(table: dict) -> BHCurve:
+    """A fresh curve from a B–H table."""
+    return BHCurve(table["H_A_per_m"], table["B_T"])
+
+
+def series_flux_density(current: float) -> float:
+    """Core B of GAPPED_CORE by bisection on N·I = H·l_core + B·l_gap/μ₀."""
+    curve = get_curve("iron")
+    low, high = 0.0, 200 * current / 0.2
+    for _ in range(200):
+        H = (low + high) / 2
+        B = float(curve.evaluate(H)[0])
+        if H * 0.2 + B * 0.0005 / MU_0 > 200 * current:
+            high = H
+        else:
+            low = H
+    return float(curve.evaluate(low)[0])
+
+
+class TestBHCurve:
+    """Tests for the monotone piecewise-cubic curves."""
+
+    def test_matches_scipy_pchip(self):
+        """Test the precomputed coefficients against scipy's PCHIP."""
+        interpolate = pytest.importorskip("scipy.interpolate")
+        for table in BH_TABLES.values():
+            reference = interpolate.PchipInterpolator(table["H_A_per_m"], table["B_T"])
+            H = np.linspace(0, table["H_A_per_m"][-1], 5001)
+            B, dB = get_curve_from(table).evaluate(H)
+            np.testing.assert_allclose(B, reference(H), rtol=1e-12, atol=1e-15)
+            np.testing.assert_allclose(dB, reference(H, 1), rtol=1e-9, atol=1e-15)
+
+    def test_monotone_odd_and_saturating(self):
+        """Test B′ ≥ 0 everywhere, B(−H) = −B(H), and slope μ₀ beyond the table."""
+        curve = get_curve("silicon_steel")
+        H = np.linspace(-1e6, 1e6, 200001)
+        B, dB = curve.evaluate(H)
+        assert np.all(np.diff(B) > 0) and np.all(dB > 0)
+        np.testing.assert_allclose(B, -B[::-1], rtol=1e-12)
+        assert float(curve.evaluate(1e7)[1]) == MU_0
+
+    def test_agrees_with_material_table(self):
+        """Test that the initial slope is μ₀μᵣ and the knee approaches B_sat."""
+        for name in BH_TABLES:
+            curve = get_curve(name)
+            properties = MATERIALS[name]
+            assert curve.initial_permeability() == pytest.approx(MU_0 * properties["relative_permeability"], rel=0.01)
+            assert float(curve.evaluate(curve.H[-4])[0]) == pytest.approx(properties["saturation_flux_density_T"],
+                                                                          rel=0.05)
+
+    def test_energy_density(self):
+        """Test ∫H dB against a fine trapezoidal sum, inside and beyond the table."""
+        curve = get_curve("iron")
+        for H_end in [50.0, 2000.0, 5e5]:
+            H = np.linspace(0, H_end, 400001)
+            B, _ = curve.evaluate(H)
+            expected = np.sum((H[1:] + H[:-1]) / 2 * np.diff(B))
+            assert float(curve.energy_density(-H_end)) == pytest.approx(expected, rel=1e-6)
+
+    def test_linear_materials_have_no_curve(self):
+        """Test that air and magnets stay linear."""
+        assert get_curve("air") is None and get_curve("neodymium") is None
+        assert get_curve(" Iron ") is get_curve("iron")
+
+    def test_invalid_tables(self):
+        """Test table validation."""
+        with pytest.raises(ValueError):
+            BHCurve([0, 10, 5], [0, 1, 2])
+        with pytest.raises(ValueError):
+            BHCurve([1, 10], [0, 1])
+
+
+class TestNonlinearSolve:
+    """Tests for the Newton solve of saturating circuits."""
+
+    @pytest.mark.parametrize("current", [0.05, 1.0, 3.0, 10.0, 200.0])
+    def test_series_circuit_matches_bisection(self, current):
+        """Test the core flux density from linear through deep saturation."""
+        result = magnetic_circuit_solve(GAPPED_CORE, winding(current), nonlinear=True)
+        assert result["nonlinear"] and not [w for w in result["warnings"] if "converge" in w]
+        core = result["branches"][0]
+        assert core["B_tesla"] == pytest.approx(series_flux_density(current), rel=1e-8)
+        assert core["mmf_drop_AT"] + result["branches"][1]["mmf_drop_AT"] == pytest.approx(200 * current, rel=1e-9)
+
+    def test_low_field_matches_linear(self):
+        """Test that a weakly driven core agrees with the constant-μᵣ solve."""
+        linear = magnetic_circuit_solve(GAPPED_CORE, winding(0.01))
+        saturable = magnetic_circuit_solve(GAPPED_CORE, winding(0.01), nonlinear=True)
+        assert saturable["branches"][0]["flux_Wb"] == pytest.approx(linear["branches"][0]["flux_Wb"], rel=0.01)
+        assert saturable["windings"][0]["incremental_inductance_H"] == pytest.approx(
+            linear["windings"][0]["inductance_H"], rel=0.01)
+
+    def test_saturation_reported(self):
+        """Test the saturation warning and the effective and incremental μᵣ."""
+        result = magnetic_circuit_solve(GAPPED_CORE, winding(10.0), nonlinear=True)
+        core = result["branches"][0]
+        assert core["relative_permeability_incremental"] < core["relative_permeability_effective"] < 5000
+        assert any("saturated" in warning for warning in result["warnings"])
+        single = result["windings"][0]
+        assert single["incremental_inductance_H"] < single["secant_inductance_H"]
+
+    def test_incremental_inductance_is_derivative(self):
+        """Test the analytic incremental inductance against a finite difference of λ(I)."""
+        delta = 1e-4
+        linkage = [magnetic_circuit_solve(GAPPED_CORE, winding(I), nonlinear=True)["windings"][0]
+                   ["flux_linkage_Wb_turns"] for I in (3.0 - delta, 3.0 + delta)]
+        analytic = magnetic_circuit_solve(GAPPED_CORE, winding(3.0), nonlinear=True)
+        assert analytic["windings"][0]["incremental_inductance_H"] == pytest.approx(
+            (linkage[1] - linkage[0]) / (2 * delta), rel=1e-5)
+
+    def test_energy_is_integral_of_current(self):
+        """Test the stored energy against ∫ i dλ along the magnetization curve."""
+        sweep = saturation_current(GAPPED_CORE, winding(0.0), max_current_A=6.0, points=2000)["sweep"]
+        current, linkage = np.array(sweep["current_A"]), np.array(sweep["flux_linkage_Wb_turns"])
+        expected = np.sum((current[1:] + current[:-1]) / 2 * np.diff(linkage))
+        result = magnetic_circuit_solve(GAPPED_CORE, winding(6.0), nonlinear=True)
+        assert result["energy_J"] == pytest.approx(expected, rel=1e-5)
+
+    def test_parallel_legs_saturate_symmetrically(self):
+        """Test that equal outer legs still share flux equally when saturated."""
+        branches = [
+            {"name": "center", "from": "bottom", "to": "top", "length_m": 0.05, "area_m2": 2e-4, "material": "ferrite"},
+            {"name": "left", "from": "top", "to": "bottom", "length_m": 0.1, "area_m2": 1e-4, "material": "ferrite"},
+            {"name": "right", "from": "top", "to": "bottom", "length_m": 0.1, "area_m2": 1e-4, "material": "ferrite"},
+        ]
+        result = magnetic_circuit_solve(branches, [{"branch": "center", "turns": 50, "current_A": 200.0}],
+                                        nonlinear=True)
+        center, left, right = (branch["flux_Wb"] for branch in result["branches"])
+        assert left == pytest.approx(right, rel=1e-10) and left == pytest.approx(center / 2, rel=1e-10)
+        assert result["branches"][1]["B_tesla"] > MATERIALS["ferrite"]["saturation_flux_density_T"]
+
+    def test_linear_network_unchanged(self):
+        """Test that nonlinear=True without B–H curves gives the linear solve."""
+        branches = [dict(branch, relative_permeability=1000) for branch in GAPPED_CORE]
+        result = magnetic_circuit_solve(branches, winding(1.0), nonlinear=True)
+        assert result["nonlinear"] is False
+        assert result["branches"] == magnetic_circuit_solve(branches, winding(1.0))["branches"]
+
+
+class TestSaturationCurrent:
+    """Tests for the saturation-current sweep."""
+
+    def test_definition(self):
+        """Test that the incremental inductance at I_sat is 80% of the initial value."""
+        result = saturation_current(GAPPED_CORE, winding(0.0))
+        assert result["converged"] and result["limiting_branch"] == "core"
+        at_saturation = magnetic_circuit_solve(GAPPED_CORE, winding(result["saturation_current_A"]), nonlinear=True)
+        assert at_saturation["windings"][0]["incremental_inductance_H"] == pytest.approx(
+            0.8 * result["initial_inductance_H"], rel=0.01)
+
+    def test_branch_saturation_current(self):
+        """Test the current at which the core reaches the listed B_sat."""
+        result = saturation_current(GAPPED_CORE, winding(0.0), max_current_A=200.0, points=2000)
+        current = result["branch_saturation_current_A"]["core"]
+        assert series_flux_density(current) == pytest.approx(2.15, rel=1e-3)
+
+    def test_sparse_and_stacked_agree(self, monkeypatch):
+        """Test that per-column sparse solves match the stacked dense solve."""
+        stacked = saturation_current(GAPPED_CORE, winding(0.0), points=50)
+        monkeypatch.setattr(reluctance_network, "MAX_STACKED_NODES", 0)
+        sparse = saturation_current(GAPPED_CORE, winding(0.0), points=50)
+        assert "sparse" in sparse["solver"] and "stacked" in stacked["solver"]
+        np.testing.assert_allclose(sparse["sweep"]["incremental_inductance_H"],
+                                   stacked["sweep"]["incremental_inductance_H"], rtol=1e-9)
+
+    def test_sweep_speed(self):
+        """Test that a 2,000-point sweep stays fast."""
+        start = time.perf_counter()
+        result = saturation_current(GAPPED_CORE, winding(0.0), points=2000)
+        assert time.perf_counter() - start < 1.0
+        assert len(result["sweep"]["current_A"]) == 2000
+
+    def test_not_reached(self):
+        """Test the note when the sweep ends before saturation."""
+        result = saturation_current(GAPPED_CORE, winding(0.0), max_current_A=0.5)
+        assert result["saturation_current_A"] is None and "max_current_A" in result["note"]
+
+    def test_invalid_inputs(self):
+        """Test validation messages."""
+        linear = [dict(branch, relative_permeability=1000) for branch in GAPPED_CORE]
+        assert "B–H curve" in saturation_current(linear, winding(0.0))["error"]
+        assert "Unknown winding" in saturation_current(GAPPED_CORE, winding(0.0), winding="L2")["error"]
+        assert "Points" in saturation_current(GAPPED_CORE, winding(0.0), points=1)["error"]
+        assert "inductance_drop" in saturation_current(GAPPED_CORE, winding(0.0), inductance_drop=1.5)["error"]
+
+    def test_dispatch(self):
+        """Test the MCP dispatcher and JSON encoding of the result."""
+        result = run_tool("saturation_current", {"branches": GAPPED_CORE, "windings": winding(0.0), "points": 20})
+        assert result["saturation_current_A"] > 0
+        json.dumps(result, allow_nan=False)
+        nonlinear = run_tool("magnetic_circuit_solve", {"branches": GAPPED_CORE, "windings": winding(5.0),
+                                                        "nonlinear": True})
+        json.dumps(nonlinear, allow_nan=False)
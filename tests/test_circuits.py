@@ -89,3 +89,19 @@ class TestMMFRequired:
         """Test MMF with large values."""
         result = circuits.mmf_required(H_field=955000, path_length_m=0.05)
         assert result["mmf_AT"] == 47750
+
+
+class TestInductorHelpers:
+    """Tests for the gap and flux density helpers shared with design_optimize."""
+
+    def test_gap_restores_inductance(self):
+        """Test that core plus computed gap reluctance gives back L = N²/R."""
+        core = circuits.reluctance(0.1, 2e-4, 2000)["reluctance_H_inv"]
+        gap_reluctance, gap = circuits.gap_for_inductance(1e-3, 50, core, 2e-4)
+        assert 50 ** 2 / (core + gap_reluctance) == pytest.approx(1e-3)
+        assert circuits.reluctance(gap, 2e-4, 1)["reluctance_H_inv"] == pytest.approx(gap_reluctance)
+        assert circuits.gap_for_inductance(1e-3, 1, core, 2e-4)[1] < 0
+
+    def test_peak_flux_density(self):
+        """Test B = L·I/(N·A)."""
+        assert circuits.peak_flux_density(1e-3, 5.0, 50, 2e-4) == pytest.approx(0.5)
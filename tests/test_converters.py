@@ -1,7 +1,9 @@
 """Tests for unit conversions."""
 
-import pytest
 import math
+
+import numpy as np
+import pytest
 from mcp_server.tools import converters
 
 
@@ -106,3 +108,103 @@ class TestInvalidConversion:
         """Test conversion with non-existent units."""
         result = converters.convert_unit(1.0, "NotAUnit", "AlsoNotAUnit")
         assert "error" in result
+
+
+# SI value of one unit, written out independently of converters.UNITS
+REFERENCE_SI = {
+    "T": 1.0, "G": 1e-4, "Wb": 1.0, "Mx": 1e-8, "A/m": 1.0, "Oe": 1000 / (4 * math.pi),
+    "H": 1.0, "A": 1.0, "At": 1.0, "Gb": 10 / (4 * math.pi), "m": 1.0, "in": 0.0254,
+    "J": 1.0, "erg": 1e-7, "H/m": 1.0, "A/Wb": 1.0, "J/m^3": 1.0, "Wb/m2": 1.0,
+}
+REFERENCE_PREFIXES = {"": 1.0, "n": 1e-9, "u": 1e-6, "µ": 1e-6, "m": 1e-3, "c": 1e-2, "k": 1e3, "M": 1e6, "G": 1e9}
+
+
+def prefixed_units():
+    """Every reference unit with every reference prefix, with its SI value."""
+    units = {}
+    for symbol, value in REFERENCE_SI.items():
+        for prefix, scale in REFERENCE_PREFIXES.items():
+            units[prefix + symbol] = value * scale
+    return units
+
+
+class TestPrefixedAndCompoundUnits:
+    """Tests for SI prefixes, spelled-out names, and compound units."""
+
+    @pytest.mark.parametrize("value, from_unit, to_unit, expected", [
+        (1.0, "mT", "Gauss", 10.0),
+        (1.0, "kA/m", "Oe", 4 * math.pi),
+        (1.0, "nWb", "Maxwell", 0.1),
+        (2.0, "Wb/m^2", "mT", 2000.0),
+        (1.0, "kOe", "kA/m", 1 / (4 * math.pi) * 1000),
+        (1.0, "amperes per meter", "A/m", 1.0),
+        (5.0, "millitesla", "gauss", 50.0),
+        (1.0, "J/m³", "erg/cm3", 10.0),
+        (1.0, "1/H", "A/Wb", 1.0),
+        (3.0, "ampere-turns", "Gb", 3 * 4 * math.pi / 10),
+        (1.0, "µH", "nH", 1000.0),
+    ])
+    def test_conversions(self, value, from_unit, to_unit, expected):
+        """Test conversions the old pair table could not do."""
+        result = converters.convert_unit(value, from_unit, to_unit)
+        assert result["converted_value"] == pytest.approx(expected, rel=1e-12)
+
+    @pytest.mark.parametrize("value, from_unit, to_unit, expected", [
+        (1.0, "A_per_m", "Oersted", 4 * math.pi / 1000),
+        (2.0, "Wb_per_m2", "T", 2.0),
+        (1.0, "Oersted", "A_per_m", 1000 / (4 * math.pi)),
+    ])
+    def test_underscore_per_units(self, value, from_unit, to_unit, expected):
+        """Test the "_per_" unit spelling the original conversion table accepted."""
+        result = converters.convert_unit(value, from_unit, to_unit)
+        assert result["converted_value"] == pytest.approx(expected, rel=1e-12)
+
+    def test_dimension_vectors(self):
+        """Test that compound units reduce to the same base-unit exponents."""
+        assert converters.parse_unit("Wb/m2")[2] == converters.parse_unit("T")[2] == (0, 1, -2, -1)
+        assert converters.parse_unit("V*s")[2] == converters.parse_unit("Wb")[2]
+        assert converters.convert_unit(1.0, "T", "A/m")["error"].startswith("Cannot convert")
+        assert "Unknown unit" in converters.convert_unit(1.0, "mT", "Furlong")["error"]
+
+    def test_array_values(self):
+        """Test that a list of values is converted in one call."""
+        result = converters.convert_unit([0.1, 1.0, 25.0], "mT", "G")
+        assert result["converted_value"] == pytest.approx([1.0, 10.0, 250.0])
+        assert result["count"] == 3
+        values = np.random.default_rng(0).uniform(0, 1, (100, 30))
+        np.testing.assert_allclose(converters.convert_array(values, "kA/m", "Oe"), values * 4 * math.pi * 10 ** 3 / 1000)
+
+
+class TestEveryUnitPair:
+    """Correctness and speed over all pairs of prefixed units of the same dimension."""
+
+    def test_all_pairs(self):
+        """Test every pair against the reference SI values, and that errors are raised across dimensions."""
+        units = prefixed_units()
+        groups = {}
+        for unit in units:
+            groups.setdefault(converters.parse_unit(unit)[2], []).append(unit)
+        pairs = 0
+        for members in groups.values():
+            for a in members:
+                for b in members:
+                    factor, _ = converters.conversion_factor(a, b)
+                    assert factor == pytest.approx(units[a] / units[b], rel=1e-12)
+                    pairs += 1
+        assert pairs > 3000
+        with pytest.raises(ValueError):
+            converters.conversion_factor("mT", "kA/m")
+
+    def test_factor_cache(self):
+        """Test that repeated pairs are answered from the cache and arrays convert in one multiply."""
+        converters.conversion_factor.cache_clear()
+        converters.parse_unit.cache_clear()
+        for _ in range(1000):
+            converters.conversion_factor("mT", "G")
+        info = converters.conversion_factor.cache_info()
+        assert info.misses == 1 and info.hits == 999
+        assert converters.parse_unit.cache_info().misses == 2
+
+        converted = converters.convert_array(np.linspace(0, 1, 1_000_000), "mT", "G")
+        assert converted.shape == (1_000_000,)
+        assert converted[-1] == pytest.approx(10.0)
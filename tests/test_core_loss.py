@@ -0,0 +1,129 @@
+"""Tests for Steinmetz/iGSE core loss."""
+
+import json
+
+import numpy as np
+import pytest
+from mcp_server.dispatch import run_tool
+from mcp_server.tools.core_loss import core_loss, igse_ki, waveform_factor, waveform_shape
+from mcp_server.tools.material_store import material_search
+from mcp_server.tools.materials import lookup_material
+
+
+def igse_direct(times, flux, k, alpha, beta, frequency, amplitude, samples=200_001):
+    """iGSE loss by numerically integrating |dB/dt|^α over one finely sampled period."""
+    t = np.linspace(0, 1 / frequency, samples)
+    B = amplitude * np.interp(t * frequency, times, flux)
+    dBdt = np.diff(B) / np.diff(t)
+    delta_B = B.max() - B.min()
+    return igse_ki(k, alpha, beta) * delta_B ** (beta - alpha) * frequency * np.sum(np.abs(dBdt) ** alpha * np.diff(t))
+
+
+class TestSteinmetz:
+    """Tests for sinusoidal loss and material coefficients."""
+
+    def test_sine_matches_power_law(self):
+        """Test P = k · f^α · B^β with the catalog coefficients of N87."""
+        material = lookup_material("N87")
+        result = core_loss(1e5, 0.1, "N87", volume_m3=5e-6)
+        expected = material["steinmetz_k"] * 1e5 ** material["steinmetz_alpha"] * 0.1 ** material["steinmetz_beta"]
+        assert result["loss_W_per_m3"] == pytest.approx(expected, rel=1e-12)
+        assert result["loss_W"] == pytest.approx(expected * 5e-6, rel=1e-12)
+        assert result["waveform_factor"] == 1.0 and result["warnings"] == []
+
+    def test_builtin_and_custom_coefficients(self):
+        """Test a built-in material and explicit coefficients."""
+        assert core_loss(60, 1.5, "silicon_steel")["loss_W_per_m3"] == pytest.approx(49.3 * 60 ** 1.35 * 1.5 ** 1.9)
+        result = core_loss(1e3, 0.5, steinmetz={"k": 2.0, "alpha": 1.5, "beta": 2.0})
+        assert result["material"] == "custom"
+        assert result["loss_W_per_m3"] == pytest.approx(2.0 * 1e3 ** 1.5 * 0.25)
+
+    def test_grid_broadcast(self):
+        """Test that a frequency × amplitude map matches point-by-point calls."""
+        result = core_loss({"start": 2e4, "stop": 5e5, "num": 40, "log": True}, [0.05, 0.1, 0.2], "3C95")
+        frequencies = result["frequency_Hz"]
+        assert frequencies[0] == pytest.approx(2e4) and frequencies[-1] == pytest.approx(5e5)
+        assert np.allclose(np.diff(np.log(frequencies)), np.log(25) / 39)
+        loss = np.array(result["loss_W_per_m3"])
+        assert loss.shape == (40, 3)
+        for i in (0, 17, 39):
+            for j, B in enumerate([0.05, 0.1, 0.2]):
+                assert loss[i, j] == pytest.approx(core_loss(frequencies[i], B, "3C95")["loss_W_per_m3"])
+        assert result["summary"]["points"] == 120
+
+    def test_lookup_and_search_show_coefficients(self):
+        """Test that lookups and search results carry the coefficients where known."""
+        assert lookup_material("ferrite")["steinmetz_alpha"] == 1.3
+        assert lookup_material("iron")["steinmetz_k"] is None
+        assert lookup_material("Kool Mu 60")["steinmetz_beta"] == 2.0
+        magnets = material_search(category="permanent_magnet", limit=1)["materials"]
+        assert "steinmetz_k" not in magnets[0]
+
+
+class TestIGSE:
+    """Tests for piecewise-linear waveforms."""
+
+    @pytest.mark.parametrize("waveform", [
+        {"type": "triangle", "duty": 0.5},
+        {"type": "triangle", "duty": 0.15},
+        {"type": "trapezoid", "duty": 0.6},
+        {"type": "piecewise_linear", "times": [0, 0.1, 0.4, 0.7], "flux": [0, 3, 1, 2]},
+    ])
+    def test_matches_time_integration(self, waveform):
+        """Test the closed-form waveform factor against numerical integration of the iGSE."""
+        k, alpha, beta = 7.27, 1.3, 2.6
+        times, flux = waveform_shape(waveform)
+        result = core_loss(2e5, 0.08, steinmetz={"k": k, "alpha": alpha, "beta": beta}, waveform=waveform)
+        expected = igse_direct(times, flux, k, alpha, beta, 2e5, 0.08)
+        assert result["loss_W_per_m3"] == pytest.approx(expected, rel=1e-6)
+
+    def test_sampled_sine_reproduces_steinmetz(self):
+        """Test that a finely sampled sine through the iGSE gives the sine loss."""
+        t = np.linspace(0, 1, 1000)
+        result = core_loss(1e5, 0.1, "N87", waveform={"type": "piecewise_linear", "times": t.tolist(),
+                                                      "flux": np.sin(2 * np.pi * t).tolist()})
+        assert result["waveform_factor"] == pytest.approx(1.0, rel=1e-5)
+
+    def test_alpha_one_depends_on_swing_only(self):
+        """Test that with α = 1 any monotone up-down waveform loses as much as a sine."""
+        for duty in (0.05, 0.3, 0.9):
+            assert waveform_factor(*waveform_shape({"type": "triangle", "duty": duty}), 1.0, 1.0, 2.5) == \
+                pytest.approx(1.0)
+
+    def test_narrow_pulse_costs_more(self):
+        """Test that a steeper edge raises the loss when α > 1."""
+        factors = [core_loss(1e5, 0.1, "N87", waveform={"type": "triangle", "duty": d})["waveform_factor"]
+                   for d in (0.5, 0.2, 0.05)]
+        assert factors[0] < factors[1] < factors[2]
+        assert factors[0] < 1.0
+
+
+class TestCoreLossTool:
+    """Tests for warnings, validation, and dispatch."""
+
+    def test_warnings(self):
+        """Test warnings outside the fitted frequency range and above B_sat."""
+        warnings = core_loss(1e5, 2.5, "M19")["warnings"]
+        assert any("B_sat" in w for w in warnings)
+        assert any("Hz" in w for w in warnings)
+
+    def test_invalid_inputs(self):
+        """Test validation messages."""
+        assert "No core-loss coefficients" in core_loss(1e3, 0.1, "iron")["error"]
+        assert "not found" in core_loss(1e3, 0.1, "unobtainium")["error"]
+        assert "material or steinmetz" in core_loss(1e3, 0.1)["error"]
+        assert "step" in core_loss(1e3, 0.1, "N87", waveform={
+            "type": "piecewise_linear", "times": [0, 0.5, 0.5, 1], "flux": [0, 1, -1, 0]})["error"]
+        assert "Unknown waveform" in core_loss(1e3, 0.1, "N87", waveform={"type": "square"})["error"]
+        assert '{"type": "triangle", "duty": 0.5}' in core_loss(1e3, 0.1, "N87", waveform="triangle")["error"]
+        assert "positive" in core_loss(-1, 0.1, "N87")["error"]
+        assert "limit" in core_loss({"start": 1e3, "stop": 1e6, "num": 1000}, {"start": 0, "stop": 0.3, "num": 101},
+                                    "N87")["error"]
+
+    def test_dispatch(self):
+        """Test the MCP dispatcher and JSON encoding of a loss map."""
+        result = run_tool("core_loss", {"material": "ferrite", "frequency_Hz": [5e4, 1e5],
+                                        "flux_density_T": {"start": 0.05, "stop": 0.2, "num": 4},
+                                        "waveform": {"type": "trapezoid", "duty": 0.8}, "volume_m3": 1e-5})
+        assert np.array(result["loss_W"]).shape == (2, 4)
+        json.dumps(result, allow_nan=False)
@@ -0,0 +1,143 @@
+"""Tests for MCP server tool dispatch and the worker pool."""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from mcp_server import server
+from mcp_server.dispatch import ToolExecutor, run_tool
+
+
+def slow_tool(name, arguments):
+    """Block the calling thread for the requested time."""
+    time.sleep(arguments.get("seconds", 0.1))
+    return {"name": name, "thread": threading.current_thread().name}
+
+
+class TestRunTool:
+    """Tests for synchronous tool dispatch."""
+
+    def test_known_tool(self):
+        """Test a direct tool call."""
+        result = run_tool("unit_convert", {"value": 1.2, "from_unit": "T", "to_unit": "Gauss"})
+        assert result["converted_value"] == 12000
+
+    def test_unknown_tool(self):
+        """Test that unknown tools return an error dict."""
+        assert "Unknown tool" in run_tool("nope", {})["error"]
+
+    def test_missing_argument(self):
+        """Test that missing arguments return an error dict."""
+        assert "Tool execution failed" in run_tool("solenoid_field", {"turns": 10})["error"]
+
+
+class TestToolExecutor:
+    """Tests for inline and pooled execution."""
+
+    @pytest.mark.asyncio
+    async def test_inline_tools_skip_pool(self):
+        """Test that closed-form tools run on the event loop thread."""
+        executor = ToolExecutor()
+        result = await executor.execute("biot_savart_wire", {"current_A": 10, "distance_m": 0.05})
+        assert "B_tesla" in result
+        assert executor.get_stats()["inline_calls"] == 1
+        assert executor._pool is None
+
+    @pytest.mark.asyncio
+    async def test_pooled_call_does_not_block_loop(self):
+        """Test that a slow tool runs off the event loop."""
+        executor = ToolExecutor(inline_tools=frozenset(), tool_fn=slow_tool)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        result = await executor.execute("heavy", {"seconds": 0.2})
+        task.cancel()
+        executor.shutdown()
+        assert result["thread"].startswith("mcp-tool")
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        """Test that a pooled call past its timeout returns an error."""
+        executor = ToolExecutor(inline_tools=frozenset(), tool_fn=slow_tool, timeout_s=0.05)
+        result = await executor.execute("heavy", {"seconds": 0.3})
+        executor.shutdown(wait=False)
+        assert "timed out" in result["error"]
+        assert executor.get_stats()["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """Test that no more than max_concurrent calls are in flight."""
+        executor = ToolExecutor(inline_tools=frozenset(), tool_fn=slow_tool, max_workers=4, max_concurrent=2)
+        peak = 0
+
+        async def watch():
+            nonlocal peak
+            while True:
+                peak = max(peak, executor.get_stats()["in_flight"])
+                await asyncio.sleep(0.005)
+
+        watcher = asyncio.create_task(watch())
+        await asyncio.gather(*(executor.execute("heavy", {"seconds": 0.05}) for _ in range(6)))
+        watcher.cancel()
+        executor.shutdown()
+        assert peak == 2
+        assert executor.get_stats()["pooled_calls"] == 6
+
+    @pytest.mark.asyncio
+    async def test_cancellation(self):
+        """Test that cancelling the caller drops a queued call."""
+        started = []
+
+        def record_tool(name, arguments):
+            started.append(name)
+            time.sleep(0.1)
+            return {}
+
+        executor = ToolExecutor(inline_tools=frozenset(), tool_fn=record_tool, max_workers=1)
+        first = asyncio.create_task(executor.execute("first", {}))
+        second = asyncio.create_task(executor.execute("second", {}))
+        await asyncio.sleep(0.02)
+        second.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        await first
+        executor.shutdown()
+        assert started == ["first"]
+        assert executor.get_stats()["cancelled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_process_pool(self):
+        """Test that run_tool works in a process pool."""
+        executor = ToolExecutor(mode="process", max_workers=1, inline_tools=frozenset())
+        result = await executor.execute("material_lookup", {"material": "ferrite"})
+        executor.shutdown()
+        assert result["relative_permeability"] == 2000
+
+    def test_invalid_mode(self):
+        """Test that unknown pool modes are rejected."""
+        with pytest.raises(ValueError):
+            ToolExecutor(mode="fiber")
+
+
+class TestServerCallTool:
+    """Tests for the MCP server handler."""
+
+    @pytest.mark.asyncio
+    async def test_call_tool_returns_json_text(self):
+        """Test that the handler wraps the result as JSON text content."""
+        content = await server.call_tool("material_lookup", {"material": "iron"})
+        assert json.loads(content[0].text)["relative_permeability"] == 5000.0
+
+    def test_parse_args(self):
+        """Test worker pool options."""
+        args = server.parse_args(["--pool", "process", "--workers", "2", "--tool-timeout", "5"])
+        assert (args.pool, args.workers, args.tool_timeout) == ("process", 2, 5.0)
@@ -0,0 +1,95 @@
+"""Tests for the local fast path."""
+
+import os
+import pytest
+from agent.agent import SkillAgent
+from agent.fast_path import FastPathRouter
+
+SKILL_MD = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "skills",
+    "maxwell_magnetics",
+    "skill.md",
+)
+
+
+@pytest.fixture(scope="module")
+def router():
+    """Fast path built from the magnetics skill.md tool schemas."""
+    agent = SkillAgent.__new__(SkillAgent)
+    agent.skill_name = "maxwell_magnetics"
+    agent.mcp_pool = None
+    agent._skill_tool_owners = {}
+    with open(SKILL_MD) as f:
+        agent.skill_md = f.read()
+    tools = agent._parse_tools_from_skill_md()
+    return FastPathRouter(tools, agent.skill_md, agent.call_tool)
+
+
+class TestFastPathAnswers:
+    """Tests for requests the fast path should answer."""
+
+    def test_unit_conversion(self, router):
+        """Test a direct unit conversion request."""
+        assert router.try_answer("Convert 1.2 Tesla to Gauss.") == "1.2 T = 12000 Gauss"
+
+    def test_how_many_conversion(self, router):
+        """Test a 'how many X is Y' conversion request."""
+        assert router.try_answer("How many gauss is 0.3 T?") == "0.3 T = 3000 Gauss"
+
+    def test_prefixed_conversion(self, router):
+        """Test a conversion between a prefixed SI unit and a CGS unit."""
+        assert router.try_answer("Convert 5 mT to gauss") == "5.0 mT = 50 Gauss"
+
+    def test_factor_matches_converter(self, router):
+        """Test that the fast path uses the converter's exact Oersted factor."""
+        assert router.try_answer("Convert 100 Oe to kA/m") == "100.0 Oersted = 7.95775 kA/m"
+
+    def test_material_lookup(self, router):
+        """Test a material property request."""
+        answer = router.try_answer("What are the properties of mu-metal?")
+        assert "μᵣ = 80000.0" in answer
+
+    def test_solenoid_with_unit_scaling(self, router):
+        """Test that cm and turns are mapped onto solenoid_field parameters."""
+        answer = router.try_answer(
+            "What is the magnetic field at the center of a solenoid with 500 turns, 20cm long, carrying 2A?"
+        )
+        assert answer.startswith("B = 0.006283 T")
+
+    def test_reluctance_with_relative_permeability(self, router):
+        """Test μr extraction and cm² scaling for reluctance."""
+        answer = router.try_answer(
+            "Reluctance of a 10cm iron core (μr=5000) with 2cm² cross-section?"
+        )
+        assert answer.startswith("R = 7.958e+04")
+
+    def test_energy_with_liters(self, router):
+        """Test mT and liter scaling for energy_stored."""
+        answer = router.try_answer("How much energy is stored in a 50mT field occupying 0.5 liters?")
+        assert answer.startswith("W = 0.4974 J")
+
+
+class TestFastPathFallbacks:
+    """Tests for requests that must fall back to the model."""
+
+    def test_reasoning_question(self, router):
+        """Test that comparison questions go to the model."""
+        assert router.try_answer("Compare the permeability of silicon steel vs ferrite.") is None
+
+    def test_unused_quantity(self, router):
+        """Test that an unexplained number makes the request ambiguous."""
+        assert router.try_answer("Field 5 cm from the end of a 500-turn 20 cm solenoid at 2 A") is None
+
+    def test_missing_parameter(self, router):
+        """Test that a missing required parameter falls back."""
+        assert router.try_answer("What current gives 10 mT in a 500-turn 20 cm solenoid?") is None
+
+    def test_incompatible_units(self, router):
+        """Test that a conversion between different dimensions falls back."""
+        assert router.try_answer("Convert 1.2 Tesla to Oersted") is None
+
+    def test_stats(self, router):
+        """Test that attempts and answers are counted."""
+        stats = router.get_stats()
+        assert stats["attempts"] >= stats["answered"] > 0
@@ -0,0 +1,173 @@
+"""Tests for the binary field-map store and queries on stored maps."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+from mcp_server.dispatch import INLINE_TOOLS, run_tool
+from mcp_server.tools import field_store, loops, wire_paths
+
+GRID = {"r_m": {"start": 0, "stop": 0.03, "num": 31}, "z_m": {"start": -0.15, "stop": 0.15, "num": 61}}
+SQUARE = [[0, 0, 0], [0.1, 0, 0], [0.1, 0.1, 0], [0, 0.1, 0]]
+
+
+class TestStore:
+    """Tests for writing and memory-mapping stored maps."""
+
+    def test_round_trip(self, field_store_dir):
+        """Test that arrays, axes, and units survive a save/load and are memory-mapped."""
+        values = np.arange(12.0).reshape(3, 4)
+        saved = field_store.save_field_map(
+            "test", {"B_magnitude": values}, axes={"x_m": [0, 1, 2], "y_m": [0, 1, 2, 3]},
+            units={"B_magnitude": "T"}, summary={"max_B_tesla": 11.0},
+        )
+        assert saved["path"] == os.path.join(str(field_store_dir), saved["handle"])
+        header, arrays = field_store.load_field_map(saved["handle"])
+        assert isinstance(arrays["B_magnitude"], np.memmap)
+        assert arrays["B_magnitude"].dtype == np.float32
+        np.testing.assert_array_equal(arrays["B_magnitude"], values)
+        assert header["axes"]["y_m"] == [0, 1, 2, 3]
+        assert header["units"]["B_magnitude"] == "T"
+        assert header["summary"]["max_B_tesla"] == 11.0
+
+    def test_bad_handles(self):
+        """Test that unknown and malformed handles are rejected."""
+        with pytest.raises(KeyError):
+            field_store.load_field_map("fm_0123456789abcdef")
+        with pytest.raises(ValueError):
+            field_store.load_field_map("../../etc")
+        assert "error" in field_store.field_map_query("../../etc")
+
+    def test_eviction(self, monkeypatch):
+        """Test that the oldest maps are removed beyond MAX_STORED_MAPS."""
+        monkeypatch.setattr(field_store, "MAX_STORED_MAPS", 2)
+        handles = []
+        for value in range(3):
+            handles.append(field_store.save_field_map("test", {"B_magnitude": np.full(4, value)})["handle"])
+            os.utime(field_store.map_path(handles[-1]), (value, value))
+        with pytest.raises(KeyError):
+            field_store.load_field_map(handles[0])
+        assert field_store.load_field_map(handles[2])[1]["B_magnitude"][0] == 2
+
+    def test_eviction_survives_concurrent_removal(self, monkeypatch):
+        """Test that a map deleted by another process during the scan is skipped."""
+        monkeypatch.setattr(field_store, "MAX_STORED_MAPS", 1)
+        gone = field_store.save_field_map("test", {"B_magnitude": np.zeros(4)})["path"]
+        scandir = os.scandir
+
+        def racing_scandir(path):
+            if path == gone:
+                raise FileNotFoundError(path)
+            return scandir(path)
+
+        monkeypatch.setattr(field_store.os, "scandir", racing_scandir)
+        kept = field_store.save_field_map("test", {"B_magnitude": np.ones(4)})["handle"]
+        assert field_store.load_field_map(kept)[1]["B_magnitude"][0] == 1
+
+
+class TestFieldMapTools:
+    """Tests for field-map tools returning handles."""
+
+    def test_solenoid_map_stored(self):
+        """Test that a large grid returns a handle and summary matching the stored data."""
+        result = loops.solenoid_field_map(500, 0.2, 0.02, 2.0, **GRID)
+        assert "B_z_tesla" not in result
+        assert result["grid"]["z_m"] == {"min": -0.15, "max": 0.15, "num": 61}
+        header, arrays = field_store.load_field_map(result["field_map"]["handle"])
+        assert header["kind"] == "solenoid_field_map"
+        assert np.nanmax(arrays["B_magnitude"]) == pytest.approx(result["max_B_tesla"], rel=1e-6)
+        assert header["summary"]["uniformity"] == result["uniformity"]
+        assert len(json.dumps(result)) < 2000
+
+    def test_store_override(self):
+        """Test that store forces either form regardless of size."""
+        small = loops.solenoid_field_map(100, 0.1, 0.01, 1.0, z_m=[0.0, 0.01], store=True)
+        assert "field_map" in small and "B_z_tesla" not in small
+        large = loops.solenoid_field_map(100, 0.1, 0.01, 1.0, **GRID, store=False)
+        assert len(large["B_z_tesla"]) == 31 and "field_map" not in large
+
+    def test_wire_grid(self):
+        """Test a 3-D grid of field points around a square loop."""
+        grid = {"x_m": {"start": 0, "stop": 0.1, "num": 11}, "y_m": {"start": 0, "stop": 0.1, "num": 11},
+                "z_m": [0.01, 0.02]}
+        result = wire_paths.wire_path_field(SQUARE, grid, 1.0, closed=True)
+        _, arrays = field_store.load_field_map(result["field_map"]["handle"])
+        assert arrays["B"].shape == (11, 11, 2, 3)
+        direct = wire_paths.wire_path_field(SQUARE, [[0.05, 0.05, 0.02]], 1.0, closed=True)["B_tesla"][0]
+        np.testing.assert_allclose(arrays["B"][5, 5, 1], direct, rtol=1e-6)
+
+    def test_wire_point_list_stored(self):
+        """Test that a long point list is stored with its points and singular points counted."""
+        points = [[x, 0, 0] for x in np.linspace(-0.05, 0.05, 201)]
+        result = wire_paths.wire_path_field(SQUARE, points, 1.0, closed=True)
+        assert result["singular_count"] == 101 and len(result["singular_points"]) == 100
+        _, arrays = field_store.load_field_map(result["field_map"]["handle"])
+        np.testing.assert_allclose(arrays["points"], points)
+
+    def test_grid_limit(self):
+        """Test the grid point limit and unknown axes."""
+        big = {"x_m": {"start": 0, "stop": 1, "num": 100}, "y_m": {"start": 0, "stop": 1, "num": 100},
+               "z_m": {"start": 0, "stop": 1, "num": 100}}
+        assert "limit" in wire_paths.wire_path_field(SQUARE, big, 1.0)["error"]
+        assert "Unknown grid axis" in wire_paths.wire_path_field(SQUARE, {"r_m": 0}, 1.0)["error"]
+
+
+class TestFieldMapQuery:
+    """Tests for summarizing and sampling stored maps."""
+
+    @pytest.fixture
+    def handle(self):
+        return loops.solenoid_field_map(500, 0.2, 0.02, 2.0, **GRID)["field_map"]["handle"]
+
+    def test_whole_map(self, handle):
+        """Test that the unbounded summary matches the tool's peak."""
+        result = field_store.field_map_query(handle)
+        assert result["kind"] == "solenoid_field_map"
+        assert result["shape"] == [31, 61]
+        assert result["region"]["max_B_point"]["r_m"] == pytest.approx(0.02, abs=1.5e-3)
+
+    def test_bounds(self, handle):
+        """Test that the bore region is far more uniform than the whole map."""
+        bore = field_store.field_map_query(handle, bounds={"r_m": [0, 0.005], "z_m": [-0.02, 0.02]})
+        whole = field_store.field_map_query(handle)
+        assert bore["region"]["uniformity"] < 0.01 < whole["region"]["uniformity"]
+        assert "error" in field_store.field_map_query(handle, bounds={"x_m": [0, 1]})
+        assert "error" in field_store.field_map_query(handle, bounds={"r_m": [1, 2]})
+
+    def test_samples(self, handle):
+        """Test nearest-grid-point samples against the inline tool, with null on a winding."""
+        result = field_store.field_map_query(handle, at=[{"r_m": 0.0, "z_m": 0.0}, {"r_m": 0.02, "z_m": -0.095}])
+        center = result["samples"][0]
+        expected = loops.solenoid_field_map(500, 0.2, 0.02, 2.0)["B_center_tesla"]
+        assert center["B_z"] == pytest.approx(expected, rel=1e-6)
+        assert result["samples"][1]["B_z"] is None
+
+    def test_point_map_samples(self):
+        """Test index samples on a stored point list."""
+        points = [[0.05, 0.05, z] for z in np.linspace(0.01, 0.1, 150)]
+        handle = wire_paths.wire_path_field(SQUARE, points, 1.0, closed=True)["field_map"]["handle"]
+        result = field_store.field_map_query(handle, at=[0])
+        assert len(result["samples"][0]["B"]) == 3
+        assert result["region"]["max_B_point"]["index"] == 0
+        assert "error" in field_store.field_map_query(handle, at=[500])
+        assert "error" in field_store.field_map_query(handle, bounds={"x_m": [0, 1]})
+
+    def test_chunked_summary(self, monkeypatch):
+        """Test that a summary read in small slabs equals one over the whole array."""
+        values = np.random.default_rng(0).random((37, 11))
+        values[3, :] = np.nan
+        values[[5, 30], [2, 7]] = 2.0  # tied peaks: the first one is reported
+        monkeypatch.setattr(field_store, "SUMMARY_CHUNK_ELEMENTS", 20)
+        summary = field_store.magnitude_summary(values, lambda index: index)
+        assert summary["max_B_point"] == 5 * 11 + 2
+        assert summary["min_B_tesla"] == np.nanmin(values)
+        assert summary["mean_B_tesla"] == pytest.approx(np.nanmean(values), rel=1e-12)
+        assert field_store.magnitude_summary(np.full((4, 3), np.nan), lambda index: index) == {}
+
+    def test_dispatch(self, handle):
+        """Test the MCP dispatcher and JSON encoding of the result."""
+        result = run_tool("field_map_query", {"handle": handle, "at": [{"r_m": 0.02, "z_m": 0.1}]})
+        json.dumps(result, allow_nan=False)
+        # Reads files, so it runs on the pool rather than the event loop
+        assert "field_map_query" not in INLINE_TOOLS
@@ -0,0 +1,224 @@
+"""Tests for reloading skill.md and knowledge documents without a restart."""
+
+import os
+import re
+import shutil
+
+import pytest
+from agent.hot_reload import SkillFileWatcher
+from agent.knowledge_base import KnowledgeBase
+from tests.helpers import bag_of_words_embed, text_response
+
+SKILL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "skills",
+    "maxwell_magnetics",
+)
+
+
+def touch(path: str, text: str) -> None:
+    """Rewrite a file and move its mtime forward so the change is always visible."""
+    with open(path, "w") as f:
+        f.write(text)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+class FakeCollection:
+    """In-memory stand-in for a Chroma collection that counts embedded documents."""
+
+    def __init__(self):
+        self.rows = {}
+        self.embedded = 0
+
+    def get(self, ids=None, include=()):
+        ids = [i for i in (ids if ids is not None else self.rows) if i in self.rows]
+        return {
+            "ids": ids,
+            "metadatas": [self.rows[i]["metadata"] for i in ids],
+            "embeddings": [self.rows[i]["embedding"] for i in ids],
+        }
+
+    def upsert(self, ids, documents, metadatas, embeddings=None):
+        if embeddings is None:
+            embeddings = bag_of_words_embed(documents)
+            self.embedded += len(documents)
+        for chunk_id, document, metadata, embedding in zip(ids, documents, metadatas, embeddings):
+            self.rows[chunk_id] = {"document": document, "metadata": metadata, "embedding": embedding}
+
+    def delete(self, ids):
+        for chunk_id in ids:
+            self.rows.pop(chunk_id, None)
+
+    def count(self):
+        return len(self.rows)
+
+
+@pytest.fixture
+def skill_copy(tmp_path):
+    """Copy of the magnetics skill that tests may edit."""
+    skill_dir = tmp_path / "maxwell_magnetics"
+    shutil.copytree(SKILL_DIR, skill_dir)
+    return str(skill_dir)
+
+
+@pytest.fixture
+def fake_kb(tmp_path):
+    """KnowledgeBase over a temporary knowledge/ directory with a fake collection."""
+    knowledge_dir = tmp_path / "knowledge"
+    knowledge_dir.mkdir()
+    (knowledge_dir / "cores.md").write_text("# Cores\n\nIntro\n\n## Ferrite\n\nLow loss\n\n## Steel\n\nHigh Bsat\n")
+    (knowledge_dir / "units.md").write_text("# Units\n\n## Tesla\n\nSI unit of flux density\n")
+
+    kb = KnowledgeBase.__new__(KnowledgeBase)
+    kb.skill_name = "test_skill"
+    kb.knowledge_dir = str(knowledge_dir)
+    kb.persist_dir = str(tmp_path / ".chroma_db")
+    kb.lock_timeout_s = 5.0
+    kb.available = True
+    kb.collection = FakeCollection()
+    return kb
+
+
+class TestSkillFileWatcher:
+    """Tests for mtime polling of skill files."""
+
+    def test_no_changes(self, skill_copy):
+        """Test that an untouched skill reports nothing."""
+        watcher = SkillFileWatcher(skill_copy, min_interval_s=0)
+        assert watcher.poll() == {"skill_md": False, "knowledge": set()}
+
+    def test_skill_md_change(self, skill_copy):
+        """Test that editing skill.md is reported."""
+        watcher = SkillFileWatcher(skill_copy, min_interval_s=0)
+        skill_file = os.path.join(skill_copy, "skill.md")
+        with open(skill_file) as f:
+            touch(skill_file, f.read() + "\n")
+        assert watcher.poll()["skill_md"] is True
+        assert watcher.poll()["skill_md"] is False
+
+    def test_knowledge_changes(self, skill_copy):
+        """Test that added and removed knowledge files are reported."""
+        watcher = SkillFileWatcher(skill_copy, min_interval_s=0)
+        knowledge_dir = os.path.join(skill_copy, "knowledge")
+        removed = sorted(os.listdir(knowledge_dir))[0]
+        os.remove(os.path.join(knowledge_dir, removed))
+        touch(os.path.join(knowledge_dir, "new_notes.md"), "# Notes\n")
+
+        changes = watcher.poll()
+        assert changes["skill_md"] is False
+        assert {os.path.basename(path) for path in changes["knowledge"]} == {removed, "new_notes.md"}
+
+    def test_min_interval(self, skill_copy):
+        """Test that polls within the interval skip the filesystem scan."""
+        watcher = SkillFileWatcher(skill_copy, min_interval_s=3600)
+        touch(os.path.join(skill_copy, "skill.md"), "changed")
+        assert watcher.poll()["skill_md"] is False
+        assert watcher.poll(force=True)["skill_md"] is True
+
+
+class TestSyncDocuments:
+    """Tests for incremental re-indexing of knowledge documents."""
+
+    def test_initial_load(self, fake_kb):
+        """Test that every chunk is embedded on first sync."""
+        counts = fake_kb.sync_documents()
+        assert counts["added"] == 5
+        assert counts["embedded"] == 5
+        assert fake_kb.collection.count() == 5
+
+    def test_unchanged(self, fake_kb):
+        """Test that a second sync embeds nothing."""
+        fake_kb.sync_documents()
+        counts = fake_kb.sync_documents()
+        assert counts["unchanged"] == 5
+        assert counts["embedded"] == 0
+
+    def test_only_modified_chunk_embedded(self, fake_kb):
+        """Test that editing one section re-embeds only that chunk."""
+        fake_kb.sync_documents()
+        path = os.path.join(fake_kb.knowledge_dir, "cores.md")
+        with open(path) as f:
+            content = f.read()
+        with open(path, "w") as f:
+            f.write(content.replace("High Bsat", "High Bsat, high loss"))
+
+        counts = fake_kb.sync_documents()
+        assert counts["updated"] == 1
+        assert counts["embedded"] == 1
+        assert "high loss" in fake_kb.collection.rows["cores_2"]["document"]
+
+    def test_moved_chunk_reuses_embedding(self, fake_kb):
+        """Test that inserting a section re-embeds only the new text."""
+        fake_kb.sync_documents()
+        path = os.path.join(fake_kb.knowledge_dir, "cores.md")
+        with open(path) as f:
+            content = f.read()
+        with open(path, "w") as f:
+            f.write(content.replace("## Ferrite", "## Powder\n\nDistributed gap\n\n## Ferrite"))
+
+        before = fake_kb.collection.embedded
+        counts = fake_kb.sync_documents()
+        assert counts["added"] == 1
+        assert fake_kb.collection.embedded - before == 1
+        assert fake_kb.collection.count() == 6
+
+    def test_removed_file(self, fake_kb):
+        """Test that chunks of a deleted document are dropped."""
+        fake_kb.sync_documents()
+        os.remove(os.path.join(fake_kb.knowledge_dir, "units.md"))
+        counts = fake_kb.sync_documents()
+        assert counts["removed"] == 2
+        assert not any(chunk_id.startswith("units_") for chunk_id in fake_kb.collection.rows)
+
+
+class TestAgentReload:
+    """Tests for SkillAgent picking up skill edits between requests."""
+
+    @pytest.fixture
+    def agent(self, scripted_agent, skill_copy):
+        agent = scripted_agent([text_response("ok")], hot_reload=True)
+        agent.skill_dir = skill_copy
+        agent.skill_watcher = SkillFileWatcher(skill_copy, min_interval_s=0)
+        return agent
+
+    def edit_skill_md(self, agent, edit):
+        skill_file = os.path.join(agent.skill_dir, "skill.md")
+        with open(skill_file) as f:
+            touch(skill_file, edit(f.read()))
+
+    def test_tool_removed(self, agent):
+        """Test that a tool deleted from skill.md disappears on the next request."""
+        self.edit_skill_md(agent, lambda text: re.sub(r"### unit_convert\n.*?(?=### )", "", text, flags=re.S))
+        agent.run_agentic_loop("What is 1 T in gauss?")
+        assert "unit_convert" not in [tool["name"] for tool in agent.tools]
+        assert "unit_convert" not in [tool["name"] for tool in agent.client.messages.calls[0]["tools"]]
+
+    def test_routing_updated(self, agent):
+        """Test that Model Routing edits take effect."""
+        self.edit_skill_md(agent, lambda text: text.replace("claude-haiku-4-5", "claude-fast-test"))
+        assert agent.check_for_updates() == {"skill_md": True}
+        assert agent.model_router.fast_model == "claude-fast-test"
+
+    def test_routing_swapped_whole(self, agent):
+        """Test that a reload replaces the router in one assignment and keeps its statistics."""
+        router = agent.model_router
+        router.record(router.fast_model, 0.1)
+        self.edit_skill_md(agent, lambda text: text.replace("claude-haiku-4-5", "claude-fast-test"))
+        agent.check_for_updates()
+        assert agent.model_router is not router
+        assert router.fast_model == "claude-haiku-4-5"
+        assert agent.model_router.get_stats()["models"]["claude-haiku-4-5"]["calls"] == 1
+
+    def test_invalid_skill_md_kept(self, agent):
+        """Test that a skill.md without tools leaves the previous definition in place."""
+        tools = agent.tools
+        self.edit_skill_md(agent, lambda text: text.replace("## Tool Reference", "## Tools"))
+        assert agent.check_for_updates() == {}
+        assert agent.tools is tools
+
+    def test_disabled_by_default(self, scripted_agent):
+        """Test that agents without hot_reload never touch the filesystem."""
+        agent = scripted_agent([])
+        assert agent.skill_watcher is None
+        assert agent.check_for_updates() == {}
@@ -0,0 +1,137 @@
+"""Loopback tests for the streamable HTTP transport."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+import pytest_asyncio
+from mcp import ClientSession
+from mcp_server import server
+
+try:
+    from mcp.client.streamable_http import streamable_http_client
+except ImportError:  # mcp < 1.24
+    from mcp.client.streamable_http import streamablehttp_client as streamable_http_client
+from mcp_server.dispatch import ToolExecutor
+from mcp_server.http_transport import create_http_app, create_uvicorn_server
+
+
+@pytest_asyncio.fixture
+async def http_server():
+    """Serve the MCP server on a free loopback port."""
+    shutdowns = []
+    server.tool_executor = ToolExecutor()
+    http_app = create_http_app(
+        server.app,
+        get_stats=server.get_server_stats,
+        on_shutdown=lambda: shutdowns.append(True),
+    )
+    uvicorn_server = create_uvicorn_server(http_app, port=0, shutdown_timeout_s=2)
+    task = asyncio.create_task(uvicorn_server.serve())
+    while not uvicorn_server.started:
+        await asyncio.sleep(0.01)
+    port = uvicorn_server.servers[0].sockets[0].getsockname()[1]
+
+    yield f"http://127.0.0.1:{port}", shutdowns
+
+    uvicorn_server.should_exit = True
+    await task
+
+
+async def _convert(url: str, value: float) -> tuple:
+    """Open a session, call unit_convert twice, and return (session id, results)."""
+    async with streamable_http_client(f"{url}/mcp/") as (read, write, get_session_id):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            results = []
+            for _ in range(2):
+                response = await session.call_tool(
+                    "unit_convert", {"value": value, "from_unit": "T", "to_unit": "Gauss"}
+                )
+                results.append(json.loads(response.content[0].text)["converted_value"])
+            return get_session_id(), results
+
+
+class TestHttpTransport:
+    """Tests for multi-client streamable HTTP serving."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sessions(self, http_server):
+        """Test that several clients get separate sessions on one server."""
+        url, _ = http_server
+        outcomes = await asyncio.gather(*(_convert(url, value) for value in (1, 2, 3)))
+        session_ids = {session_id for session_id, _ in outcomes}
+        assert len(session_ids) == 3
+        assert [results for _, results in outcomes] == [[10000, 10000], [20000, 20000], [30000, 30000]]
+
+    @pytest.mark.asyncio
+    async def test_list_tools(self, http_server):
+        """Test that the tool list is served over HTTP."""
+        url, _ = http_server
+        async with streamable_http_client(f"{url}/mcp/") as (read, write, _):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                tools = await session.list_tools()
+        assert {tool.name for tool in tools.tools} >= {"solenoid_field", "unit_convert"}
+
+    @pytest.mark.asyncio
+    async def test_per_session_state(self, http_server):
+        """Test that tool calls are counted per session."""
+        url, _ = http_server
+        async with streamable_http_client(f"{url}/mcp/") as (read, write, _):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                await session.call_tool("material_lookup", {"material": "iron"})
+                async with httpx.AsyncClient() as client:
+                    stats = (await client.get(f"{url}/stats")).json()
+        assert stats["active_sessions"] >= 1
+        assert stats["session_tool_calls"] >= 1
+        assert stats["executor"]["inline_calls"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_health_and_graceful_shutdown(self, http_server):
+        """Test the health endpoint and that shutdown cleanup is not run early."""
+        url, shutdowns = http_server
+        async with httpx.AsyncClient() as client:
+            assert (await client.get(f"{url}/health")).json() == {"status": "ok"}
+        assert shutdowns == []
+
+    @pytest.mark.asyncio
+    async def test_unknown_session_rejected(self, http_server):
+        """Test that a request for an unknown session id gets 404."""
+        url, _ = http_server
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                f"{url}/mcp/",
+                headers={
+                    "mcp-session-id": "does-not-exist",
+                    "accept": "application/json, text/event-stream",
+                    "content-type": "application/json",
+                },
+                json={"jsonrpc": "2.0", "id": 1, "method": "tools/list"},
+            )
+        assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_shutdown_runs_cleanup():
+    """Test that stopping the server runs the shutdown hook."""
+    shutdowns = []
+    http_app = create_http_app(server.app, on_shutdown=lambda: shutdowns.append(True))
+    uvicorn_server = create_uvicorn_server(http_app, port=0)
+    task = asyncio.create_task(uvicorn_server.serve())
+    while not uvicorn_server.started:
+        await asyncio.sleep(0.01)
+    uvicorn_server.should_exit = True
+    await task
+    assert shutdowns == [True]
+
+
+def test_session_options_follow_mcp_version(monkeypatch):
+    """Test that session limits are only passed to managers that accept them (mcp 1.8 has neither)."""
+    from mcp_server import http_transport
+
+    assert http_transport.session_manager_options(60, 5) == {"session_idle_timeout": 60, "max_sessions": 5}
+    monkeypatch.setattr(http_transport, "_MANAGER_PARAMS", {"app": None, "json_response": None})
+    assert http_transport.session_manager_options(60, 5) == {}
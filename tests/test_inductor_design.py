@@ -0,0 +1,146 @@
+"""Tests for the inductor design-space search."""
+
+import itertools
+import json
+import math
+import time
+
+import numpy as np
+import pytest
+from mcp_server.dispatch import run_tool
+from mcp_server.tools.circuits import MU_0
+from mcp_server.tools.inductor_design import design_optimize, pareto_front
+from mcp_server.tools.materials import MATERIALS
+from mcp_server.tools.reluctance_network import magnetic_circuit_solve
+
+
+def dominated(row, others):
+    """Whether any row of others is no worse everywhere and better somewhere."""
+    return bool(np.any(np.all(others <= row, axis=1) & np.any(others < row, axis=1)))
+
+
+class TestParetoFront:
+    """Tests for the non-dominated filter."""
+
+    def test_matches_brute_force(self):
+        """Test against a pairwise dominance check on random points."""
+        points = np.random.default_rng(3).random((400, 3))
+        front = set(pareto_front(points).tolist())
+        expected = {i for i in range(len(points)) if not dominated(points[i], points)}
+        assert front == expected
+
+    def test_duplicates_and_ties(self):
+        """Test that one of equal points is kept and a tie on one objective is resolved by the other."""
+        points = np.array([[1.0, 2.0], [1.0, 2.0], [1.0, 3.0], [2.0, 1.0]])
+        assert sorted(pareto_front(points).tolist()) in ([0, 3], [1, 3])
+
+
+class TestDesignConstraints:
+    """Tests that every returned design meets the target and constraints."""
+
+    def test_designs_feasible(self):
+        """Test exact inductance, the flux density limit, and window fill."""
+        result = design_optimize(1e-3, 5.0, 4e-4, max_results=100)
+        assert result["feasible"] + result["pruned"] == result["evaluated"]
+        for design in result["designs"] + list(result["best"].values()):
+            assert design["inductance_H"] == pytest.approx(1e-3, rel=1e-9)
+            assert design["saturation_fraction"] <= 0.8 * (1 + 1e-9)
+            assert design["window_fill"] <= 1.0
+            assert design["gap_m"] >= 0.0
+
+    def test_front_is_non_dominated(self):
+        """Test that no returned design dominates another and the bests are on the front."""
+        result = design_optimize(1e-3, 5.0, 4e-4, max_results=100)
+        points = np.array([[d["core_volume_m3"], d["copper_loss_W"]] for d in result["designs"]])
+        assert result["pareto_count"] == len(points) <= 100
+        assert not any(dominated(p, points) for p in points)
+        assert result["best"]["core_volume_m3"]["core_volume_m3"] == points[:, 0].min()
+        assert result["best"]["copper_loss_W"]["copper_loss_W"] == points[:, 1].min()
+
+    def test_pruning_matches_brute_force(self):
+        """Test the pruned search against checking every grid point directly."""
+        areas = np.geomspace(5e-5, 5e-4, 7)
+        lengths = [0.05, 0.1, 0.2]
+        turns = np.arange(1, 401)
+        L, I, window, max_gap = 2e-3, 3.0, 3e-4, 2e-3
+        result = design_optimize(L, I, window, materials=["iron", "ferrite"], core_area_m2=areas.tolist(),
+                                 path_length_m=lengths, turns=turns.tolist(), max_gap_m=max_gap,
+                                 objectives=["core_volume_m3", "turns"], max_results=100)
+        wire = I / 5e6
+        feasible = []
+        for name, A, l, N in itertools.product(["iron", "ferrite"], areas, lengths, turns):
+            p = MATERIALS[name]
+            gap = (N ** 2 / L - l / (MU_0 * p["relative_permeability"] * A)) * MU_0 * A
+            B = L * I / (N * A)
+            if gap >= 0 and gap <= max_gap and B <= 0.8 * p["saturation_flux_density_T"] and N * wire <= 0.4 * window:
+                feasible.append((A * l, N))
+        assert result["evaluated"] == 2 * len(areas) * len(lengths) * len(turns)
+        assert result["feasible"] == len(feasible)
+        feasible = np.array(feasible)
+        expected = sorted(map(tuple, feasible[pareto_front(feasible)]))
+        found = sorted((d["core_volume_m3"], d["turns"]) for d in result["designs"])
+        assert [n for _, n in found] == [n for _, n in expected]
+        assert [v for v, _ in found] == pytest.approx([v for v, _ in expected], rel=1e-12)
+
+    def test_inductance_matches_circuit_solver(self):
+        """Test a design's core and gap against magnetic_circuit_solve."""
+        design = design_optimize(5e-4, 2.0, 2e-4, materials=["silicon_steel"])["best"]["core_volume_m3"]
+        A = design["core_area_m2"]
+        branches = [
+            {"name": "core", "from": "a", "to": "b", "length_m": design["path_length_m"], "area_m2": A,
+             "material": "silicon_steel"},
+            {"name": "gap", "from": "b", "to": "a", "length_m": design["gap_m"], "area_m2": A,
+             "relative_permeability": 1},
+        ]
+        windings = [{"branch": "core", "turns": design["turns"], "current_A": 2.0}]
+        result = magnetic_circuit_solve(branches, windings)
+        assert result["windings"][0]["inductance_H"] == pytest.approx(5e-4, rel=1e-9)
+
+    def test_default_path_length(self):
+        """Test the square-frame path length used without path_length_m."""
+        design = design_optimize(1e-3, 5.0, 4e-4)["best"]["core_volume_m3"]
+        expected = 4 * (math.sqrt(4e-4) + math.sqrt(design["core_area_m2"]))
+        assert design["path_length_m"] == pytest.approx(expected)
+
+
+class TestDesignOptimizeTool:
+    """Tests for validation, infeasible specs, dispatch, and speed."""
+
+    def test_invalid_inputs(self):
+        """Test validation messages."""
+        assert "inductance_H" in design_optimize(0, 1.0, 1e-4)["error"]
+        assert "objective" in design_optimize(1e-3, 1.0, 1e-4, objectives=["cost"])["error"]
+        assert "fill_factor" in design_optimize(1e-3, 1.0, 1e-4, fill_factor=1.5)["error"]
+        assert "not found" in design_optimize(1e-3, 1.0, 1e-4, materials=["unobtainium"])["error"]
+        assert "saturation" in design_optimize(1e-3, 1.0, 1e-4, materials=["air"])["error"]
+        assert "whole numbers" in design_optimize(1e-3, 1.0, 1e-4, turns=[10.5])["error"]
+        assert "no turns" in design_optimize(1e-3, 100.0, 1e-6)["error"]
+
+    def test_infeasible(self):
+        """Test the report when the window cannot hold enough turns."""
+        result = design_optimize(1.0, 10.0, 1e-4, core_area_m2=1e-4)
+        assert result["error"] == "No design meets all constraints"
+        assert result["min_turns_needed"] > result["window_turns"]
+
+    def test_catalog_materials(self):
+        """Test catalog grades and three objectives."""
+        result = design_optimize(1e-4, 10.0, 5e-4, materials=["3C95", "M19", "Kool Mu 60"],
+                                 objectives=["core_volume_m3", "copper_loss_W", "gap_m"])
+        assert {d["material"] for d in result["designs"]} <= {"3C95", "M19", "Kool Mu 60"}
+        assert set(result["best"]) == {"core_volume_m3", "copper_loss_W", "gap_m"}
+
+    def test_dispatch(self):
+        """Test the MCP dispatcher and JSON encoding of the result."""
+        result = run_tool("design_optimize", {"inductance_H": 1e-3, "current_A": 5, "window_area_m2": 4e-4,
+                                              "max_results": 5})
+        assert len(result["designs"]) == 5
+        json.dumps(result, allow_nan=False)
+
+    def test_large_search_speed(self):
+        """Test that a search over millions of grid points stays fast."""
+        start = time.perf_counter()
+        result = design_optimize(1e-3, 5.0, 4e-4, core_area_m2={"start": 1e-5, "stop": 1e-2, "num": 200},
+                                 path_length_m={"start": 0.05, "stop": 0.5, "num": 50}, max_gap_m=2e-3)
+        elapsed = time.perf_counter() - start
+        assert result["evaluated"] > 5_000_000 and result["pruned"] > result["feasible"]
+        assert elapsed < 2.0
@@ -0,0 +1,216 @@
+"""Tests for multi-process coordination of knowledge index builds."""
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+import types
+
+import pytest
+from agent.knowledge_base import KnowledgeBase, index_lock
+
+WORKERS = 12
+
+
+class SharedFileCollection:
+    """Collection stand-in persisted to a JSON file, so several processes share one store.
+
+    Every embedded document is appended to a log, and each read-modify-write
+    sleeps briefly. Unserialized builders would therefore interleave and show
+    up as duplicate embeddings.
+    """
+
+    def __init__(self, persist_dir: str):
+        self.path = os.path.join(persist_dir, "collection.json")
+        self.log_path = os.path.join(persist_dir, "embedded.log")
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, rows: dict) -> None:
+        with open(self.path, "w") as f:
+            json.dump(rows, f)
+
+    def get(self, ids=None, include=()):
+        rows = self._load()
+        ids = [i for i in (ids if ids is not None else rows) if i in rows]
+        return {
+            "ids": ids,
+            "metadatas": [rows[i]["metadata"] for i in ids],
+            "embeddings": [rows[i]["embedding"] for i in ids],
+        }
+
+    def upsert(self, ids, documents, metadatas, embeddings=None):
+        rows = self._load()
+        if embeddings is None:
+            embeddings = [[float(len(document))] for document in documents]
+            with open(self.log_path, "a") as f:
+                f.write("".join(f"{os.getpid()} {chunk_id}\n" for chunk_id in ids))
+        time.sleep(0.05)
+        for chunk_id, document, metadata, embedding in zip(ids, documents, metadatas, embeddings):
+            rows[chunk_id] = {"document": document, "metadata": metadata, "embedding": embedding}
+        self._save(rows)
+
+    def delete(self, ids):
+        rows = self._load()
+        for chunk_id in ids:
+            rows.pop(chunk_id, None)
+        self._save(rows)
+
+    def count(self):
+        return len(self._load())
+
+
+def open_knowledge_base(skill_dir: str, start, results) -> None:
+    """Worker process: wait for the start signal, then load the shared index."""
+    kb = KnowledgeBase.__new__(KnowledgeBase)
+    kb.skill_dir = skill_dir
+    kb.skill_name = os.path.basename(skill_dir)
+    kb.knowledge_dir = os.path.join(skill_dir, "knowledge")
+    kb.persist_dir = os.path.join(skill_dir, ".chroma_db")
+    kb.lock_timeout_s = 60.0
+    kb.available = True
+    os.makedirs(kb.persist_dir, exist_ok=True)
+    kb.collection = SharedFileCollection(kb.persist_dir)
+
+    start.wait()
+    counts = kb.sync_documents()
+    results.put((os.getpid(), counts, kb.collection.count()))
+
+
+@pytest.fixture
+def skill_dir(tmp_path):
+    """Skill directory with a few knowledge documents and no index yet."""
+    skill_dir = tmp_path / "test_skill"
+    knowledge_dir = skill_dir / "knowledge"
+    knowledge_dir.mkdir(parents=True)
+    for name in ("cores", "windings", "units"):
+        sections = "".join(f"\n## {name} {i}\n\nNotes on {name} {i}\n" for i in range(4))
+        (knowledge_dir / f"{name}.md").write_text(f"# {name}\n{sections}")
+    return str(skill_dir)
+
+
+def run_workers(skill_dir: str, count: int) -> list:
+    """Start `count` processes at the same instant and collect their results."""
+    context = multiprocessing.get_context("spawn")
+    start = context.Event()
+    results = context.Queue()
+    processes = [
+        context.Process(target=open_knowledge_base, args=(skill_dir, start, results))
+        for _ in range(count)
+    ]
+    for process in processes:
+        process.start()
+    start.set()
+    collected = [results.get(timeout=60) for _ in processes]
+    for process in processes:
+        process.join(timeout=10)
+        assert process.exitcode == 0
+    return collected
+
+
+class TestIndexLock:
+    """Tests for the index build lock."""
+
+    def test_exclusive(self, tmp_path):
+        """Test that a second holder times out while the lock is held."""
+        with index_lock(str(tmp_path), timeout_s=1.0) as first:
+            assert first is True
+            with index_lock(str(tmp_path), timeout_s=0.1) as second:
+                assert second is False
+        with index_lock(str(tmp_path), timeout_s=0.1) as again:
+            assert again is True
+
+    def test_read_only_on_timeout(self, skill_dir, capsys):
+        """Test that a process that cannot get the lock skips the build."""
+        kb = KnowledgeBase.__new__(KnowledgeBase)
+        kb.skill_name = "test_skill"
+        kb.knowledge_dir = os.path.join(skill_dir, "knowledge")
+        kb.persist_dir = os.path.join(skill_dir, ".chroma_db")
+        kb.lock_timeout_s = 0.1
+        kb.available = True
+        os.makedirs(kb.persist_dir)
+        kb.collection = SharedFileCollection(kb.persist_dir)
+
+        with index_lock(kb.persist_dir, timeout_s=1.0):
+            counts = kb.sync_documents()
+        assert counts["embedded"] == 0
+        assert "read-only" in capsys.readouterr().out
+
+    def test_existing_collection_opened_on_timeout(self, skill_dir, monkeypatch):
+        """Test that a constructor that cannot get the lock opens the collection instead of creating it."""
+        calls = []
+
+        class FakeClient:
+            def __init__(self, path):
+                self.path = path
+
+            def get_or_create_collection(self, name, **kwargs):
+                calls.append(("create", name))
+                return SharedFileCollection(self.path)
+
+            def get_collection(self, name, **kwargs):
+                calls.append(("open", name))
+                return SharedFileCollection(self.path)
+
+        chromadb = types.ModuleType("chromadb")
+        chromadb.PersistentClient = FakeClient
+        utils = types.ModuleType("chromadb.utils")
+        utils.embedding_functions = types.SimpleNamespace(DefaultEmbeddingFunction=lambda: None)
+        chromadb.utils = utils
+        monkeypatch.setitem(sys.modules, "chromadb", chromadb)
+        monkeypatch.setitem(sys.modules, "chromadb.utils", utils)
+
+        persist_dir = os.path.join(skill_dir, ".chroma_db")
+        os.makedirs(persist_dir)
+        with index_lock(persist_dir, timeout_s=1.0):
+            kb = KnowledgeBase(skill_dir, lock_timeout_s=0.1)
+        assert kb.available
+        assert calls == [("open", "test_skill_knowledge")]
+
+
+class TestConcurrentBuild:
+    """Stress tests with many processes opening an empty index at once."""
+
+    def test_single_builder(self, skill_dir):
+        """Test that exactly one process embeds each chunk and all see the full index."""
+        results = run_workers(skill_dir, WORKERS)
+
+        with open(os.path.join(skill_dir, ".chroma_db", "embedded.log")) as f:
+            embedded = [line.split() for line in f.read().splitlines()]
+        chunk_ids = [chunk_id for _, chunk_id in embedded]
+        assert len(chunk_ids) == len(set(chunk_ids)) == 15
+        assert len({pid for pid, _ in embedded}) == 1
+
+        builders = [counts for _, counts, _ in results if counts["embedded"]]
+        assert len(builders) == 1
+        assert all(document_count == 15 for _, _, document_count in results)
+
+    def test_restart_skips_build(self, skill_dir):
+        """Test that processes started after a build reuse the index."""
+        run_workers(skill_dir, 2)
+        results = run_workers(skill_dir, 4)
+        assert all(counts["embedded"] == 0 and counts["unchanged"] == 15 for _, counts, _ in results)
+
+    def test_real_chroma(self, tmp_path):
+        """Test concurrent KnowledgeBase construction against a real Chroma store."""
+        pytest.importorskip("chromadb")
+
+        skill_dir = tmp_path / "test_skill"
+        (skill_dir / "knowledge").mkdir(parents=True)
+        (skill_dir / "knowledge" / "notes.md").write_text("# Notes\n\n## A\n\nFerrite\n\n## B\n\nSteel\n")
+
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(4) as pool:
+            document_counts = pool.map(construct_real, [str(skill_dir)] * 4)
+        assert document_counts == [3] * 4
+
+
+def construct_real(skill_dir: str) -> int:
+    """Worker process: build a real KnowledgeBase and report its document count."""
+    return KnowledgeBase(skill_dir).get_stats()["document_count"]
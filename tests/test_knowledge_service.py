@@ -0,0 +1,230 @@
+"""Tests for the MCP server's shared knowledge service."""
+
+import asyncio
+import math
+import threading
+import time
+
+import pytest
+from mcp_server import server
+from mcp_server.http_transport import create_http_app, create_uvicorn_server
+from mcp_server.knowledge_service import KnowledgeService
+from tests.helpers import bag_of_words_embed
+
+DOCUMENTS = {
+    "materials": "Ferrite cores have high resistivity and low eddy current loss at high frequency.",
+    "safety": "Strong neodymium magnets can pinch fingers and erase credit cards.",
+    "mistakes": "Forgetting the air gap makes the computed reluctance far too small.",
+}
+
+
+class FakeKnowledgeBase:
+    """In-memory knowledge base with bag-of-words embeddings that records batch sizes."""
+
+    def __init__(self, skill_dir):
+        self.skill_dir = skill_dir
+        self.available = True
+        self.retrieve_batches = []
+        self.embed_batches = []
+        self.query_vectors = []
+
+    def retrieve_many(self, queries, top_k=3, query_vectors=None):
+        self.retrieve_batches.append(len(queries))
+        self.query_vectors.append(query_vectors)
+        time.sleep(0.01)  # model latency lets concurrent requests queue up
+        results = []
+        vectors = bag_of_words_embed(queries)
+        if query_vectors is not None:
+            vectors = [given if given is not None else own for given, own in zip(query_vectors, vectors)]
+        for vector in vectors:
+            scored = []
+            for name, text in DOCUMENTS.items():
+                doc_vector = bag_of_words_embed([text])[0]
+                dot = sum(a * b for a, b in zip(vector, doc_vector))
+                norm = math.sqrt(sum(a * a for a in vector) * sum(b * b for b in doc_vector)) or 1.0
+                scored.append({"name": name, "section": 0, "content": text, "score": dot / norm, "source": ""})
+            results.append(sorted(scored, key=lambda doc: doc["score"], reverse=True)[:top_k])
+        return results
+
+    def embed(self, texts):
+        self.embed_batches.append(len(texts))
+        return bag_of_words_embed(texts)
+
+    def get_stats(self):
+        return {"status": "available", "document_count": len(DOCUMENTS)}
+
+
+@pytest.fixture
+def two_skills(tmp_path, monkeypatch):
+    """skills/ directory with the default skill and a thermal skill."""
+    from mcp_server import knowledge_service
+
+    for name in ("maxwell_magnetics", "thermal_design"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "skill.md").write_text(f"# {name}")
+    monkeypatch.setattr(knowledge_service, "SKILLS_DIR", str(tmp_path))
+    return str(tmp_path)
+
+
+@pytest.fixture
+def service():
+    """Knowledge service backed by the fake knowledge base."""
+    knowledge_service = KnowledgeService(knowledge_base_factory=FakeKnowledgeBase, batch_window_s=0.02)
+    yield knowledge_service
+    knowledge_service.shutdown()
+
+
+class TestKnowledgeService:
+    """Tests for search, embedding, and batching."""
+
+    @pytest.mark.asyncio
+    async def test_search(self, service):
+        """Test that the best-matching document comes first."""
+        result = await service.handle("knowledge_search", {"query": "ferrite eddy current loss", "top_k": 2})
+        assert [doc["name"] for doc in result["results"]][0] == "materials"
+        assert len(result["results"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_searches_share_batches(self, service):
+        """Test that concurrent queries are embedded together."""
+        queries = [f"query about ferrite number {i}" for i in range(8)]
+        results = await asyncio.gather(*(
+            service.handle("knowledge_search", {"query": query, "top_k": 1 + i % 3})
+            for i, query in enumerate(queries)
+        ))
+        assert [len(result["results"]) for result in results] == [1 + i % 3 for i in range(8)]
+        assert len(service.knowledge_base.retrieve_batches) < 8
+        assert service.get_stats()["search_batching"]["largest_batch"] > 1
+
+    @pytest.mark.asyncio
+    async def test_search_many_is_one_batch(self, service):
+        """Test that one multi-query call is retrieved in a single batch, in query order."""
+        result = await service.handle("knowledge_search_many", {
+            "queries": ["ferrite eddy current", "neodymium fingers", "air gap reluctance"], "top_k": 1,
+        })
+        assert [docs[0]["name"] for docs in result["results"]] == ["materials", "safety", "mistakes"]
+        assert service.knowledge_base.retrieve_batches == [3]
+        assert "error" in await service.handle("knowledge_search_many", {"queries": []})
+        assert "error" in await service.handle("knowledge_search_many", {"queries": ["x"] * 101})
+
+    @pytest.mark.asyncio
+    async def test_embed_batches_split_correctly(self, service):
+        """Test that batched embeddings go back to the right caller."""
+        requests = [["air gap"], ["ferrite core", "neodymium"], ["safety"]]
+        results = await asyncio.gather(*(service.handle("embed_texts", {"texts": texts}) for texts in requests))
+        for texts, result in zip(requests, results):
+            assert result["embeddings"] == bag_of_words_embed(texts)
+        assert service.knowledge_base.embed_batches == [4]
+
+    @pytest.mark.asyncio
+    async def test_client_embedding_used(self, service):
+        """Test that a query sent with its embedding is searched by that vector in a shared batch."""
+        vector = bag_of_words_embed(["ferrite cores eddy current loss"])[0]
+        with_vector, without = await asyncio.gather(
+            service.handle("knowledge_search", {"query": "magnets pinch fingers", "top_k": 1, "embedding": vector}),
+            service.handle("knowledge_search", {"query": "magnets pinch fingers", "top_k": 1}),
+        )
+        assert service.knowledge_base.query_vectors == [[vector, None]]
+        assert with_vector["results"][0]["name"] == "materials"
+        assert without["results"][0]["name"] == "safety"
+
+    @pytest.mark.asyncio
+    async def test_validation(self, service):
+        """Test argument validation."""
+        assert "error" in await service.handle("knowledge_search", {"query": ""})
+        assert "error" in await service.handle("knowledge_search", {"query": "x", "embedding": ["a"]})
+        assert "error" in await service.handle("knowledge_search", {"query": "x", "top_k": 500})
+        assert "error" in await service.handle("embed_texts", {"texts": "not a list"})
+
+    @pytest.mark.asyncio
+    async def test_stats(self, service):
+        """Test the knowledge_stats tool."""
+        stats = await service.handle("knowledge_stats", {})
+        assert stats["available"] is True
+        assert stats["knowledge_base"]["document_count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_one_collection_per_skill(self, two_skills):
+        """Test that each skill named in a request gets its own knowledge base."""
+        service = KnowledgeService(skill_name="maxwell_magnetics", knowledge_base_factory=FakeKnowledgeBase)
+        try:
+            results = await asyncio.gather(
+                service.handle("knowledge_search", {"query": "ferrite", "top_k": 1}),
+                service.handle("knowledge_search", {"query": "heat sink", "top_k": 2, "skill": "thermal_design"}),
+            )
+            assert [result["skill"] for result in results] == ["maxwell_magnetics", "thermal_design"]
+            assert [len(result["results"]) for result in results] == [1, 2]
+            assert service.knowledge_base_for("thermal_design").skill_dir.endswith("thermal_design")
+            assert service.knowledge_base_for("thermal_design") is not service.knowledge_base
+
+            stats = await service.handle("knowledge_stats", {"skill": "thermal_design"})
+            assert stats["skill"] == "thermal_design"
+            assert stats["loaded_skills"] == ["maxwell_magnetics", "thermal_design"]
+            for skill in ("plasma_physics", "../maxwell_magnetics"):
+                result = await service.handle("knowledge_search", {"query": "x", "skill": skill})
+                assert "Unknown skill" in result["error"]
+        finally:
+            service.shutdown()
+
+
+@pytest.fixture
+def http_knowledge_server():
+    """MCP server with the fake knowledge service, on a loopback port in a background thread."""
+    original = server.knowledge_service
+    server.knowledge_service = KnowledgeService(knowledge_base_factory=FakeKnowledgeBase)
+    uvicorn_server = create_uvicorn_server(create_http_app(server.app), port=0)
+    thread = threading.Thread(target=lambda: asyncio.run(uvicorn_server.serve()), daemon=True)
+    thread.start()
+    while not uvicorn_server.started:
+        time.sleep(0.01)
+    port = uvicorn_server.servers[0].sockets[0].getsockname()[1]
+
+    yield f"http://127.0.0.1:{port}/mcp/"
+
+    uvicorn_server.should_exit = True
+    thread.join(10)
+    server.knowledge_service.shutdown()
+    server.knowledge_service = original
+
+
+class TestRemoteKnowledgeBase:
+    """Tests for agents using the shared service instead of a local knowledge base."""
+
+    def test_agent_uses_remote_knowledge(self, scripted_agent, http_knowledge_server):
+        """Test that a SkillAgent retrieves and embeds through the server."""
+        agent = scripted_agent([], knowledge_url=http_knowledge_server)
+        try:
+            assert agent.knowledge_base.available
+            docs = agent.knowledge_base.retrieve("neodymium magnets pinch fingers", top_k=1)
+            assert docs[0]["name"] == "safety"
+            assert agent.knowledge_base.embed(["air gap"]) == bag_of_words_embed(["air gap"])
+            assert "### safety" in agent.knowledge_base.format_context(docs)
+            many = agent.knowledge_base.retrieve_many(["neodymium fingers", "ferrite eddy current"], top_k=1)
+            assert [docs[0]["name"] for docs in many] == ["safety", "materials"]
+            assert server.knowledge_service.knowledge_base.retrieve_batches[-1] == 2
+            assert agent.tool_selector is not None
+        finally:
+            agent.close()
+
+    def test_other_skill_served(self, two_skills, http_knowledge_server):
+        """Test that a client for a second skill searches that skill's collection."""
+        from agent.remote_knowledge import RemoteKnowledgeBase
+
+        knowledge_base = RemoteKnowledgeBase(http_knowledge_server, skill_name="thermal_design")
+        try:
+            assert knowledge_base.available
+            assert knowledge_base.retrieve("neodymium magnets", top_k=1)[0]["name"] == "safety"
+            assert server.knowledge_service.get_stats()["loaded_skills"] == ["maxwell_magnetics", "thermal_design"]
+        finally:
+            knowledge_base.close()
+
+    def test_skill_mismatch_disables_retrieval(self, http_knowledge_server):
+        """Test that a skill the server cannot serve is not used."""
+        from agent.remote_knowledge import RemoteKnowledgeBase
+
+        knowledge_base = RemoteKnowledgeBase(http_knowledge_server, skill_name="other_skill")
+        try:
+            assert not knowledge_base.available
+            assert knowledge_base.retrieve("anything") == []
+        finally:
+            knowledge_base.close()
@@ -0,0 +1,140 @@
+"""Tests for exact loop and finite-solenoid fields."""
+
+import json
+import math
+
+import numpy as np
+import pytest
+from mcp_server.dispatch import run_tool
+from mcp_server.tools import field_store, fields, loops, wire_paths
+from mcp_server.tools.fields import MU_0
+
+
+class TestEllipticIntegrals:
+    """Tests for the AGM evaluation of K(m) and E(m)."""
+
+    def test_known_values(self):
+        """Test against tabulated values."""
+        K, E = loops.ellipke([0.0, 0.5, 0.9])
+        assert K[0] == pytest.approx(math.pi / 2, rel=1e-15)
+        assert E[0] == pytest.approx(math.pi / 2, rel=1e-15)
+        assert K[1] == pytest.approx(1.8540746773013719, rel=1e-14)
+        assert E[1] == pytest.approx(1.3506438810476755, rel=1e-14)
+        assert K[2] == pytest.approx(2.5780921133481733, rel=1e-14)
+        assert E[2] == pytest.approx(1.1047747327040733, rel=1e-14)
+
+    def test_near_one(self):
+        """Test the logarithmic growth of K as m → 1 and E → 1."""
+        K, E = loops.ellipke(1 - 1e-12)
+        assert K == pytest.approx(math.log(4 / math.sqrt(1e-12)), rel=1e-6)
+        assert E == pytest.approx(1.0, abs=1e-10)
+
+
+class TestLoopField:
+    """Tests for a single circular loop."""
+
+    def test_on_axis(self):
+        """Test B_z = μ₀Ia² / (2(a² + z²)^{3/2}) on the axis."""
+        z = np.array([0.0, 0.05, -0.2])
+        Br, Bz = loops.loop_field(0.1, 3.0, 0.0, z)
+        np.testing.assert_allclose(Bz, MU_0 * 3.0 * 0.01 / (2 * (0.01 + z ** 2) ** 1.5), rtol=1e-13)
+        np.testing.assert_array_equal(Br, 0.0)
+
+    def test_dipole_far_field(self):
+        """Test that far away the loop looks like a magnetic dipole."""
+        a, I, R, theta = 0.01, 1.0, 5.0, 0.7
+        r, z = R * math.sin(theta), R * math.cos(theta)
+        Br, Bz = loops.loop_field(a, I, r, z)
+        moment = I * math.pi * a ** 2
+        B_radial = MU_0 * moment * 2 * math.cos(theta) / (4 * math.pi * R ** 3)
+        B_polar = MU_0 * moment * math.sin(theta) / (4 * math.pi * R ** 3)
+        assert float(Bz) == pytest.approx(B_radial * math.cos(theta) - B_polar * math.sin(theta), rel=1e-5)
+        assert float(Br) == pytest.approx(B_radial * math.sin(theta) + B_polar * math.cos(theta), rel=1e-5)
+
+    def test_matches_polygon_loop_off_axis(self):
+        """Test against the independent finite-segment engine with a fine polygon."""
+        angles = np.linspace(0, 2 * math.pi, 4001)[:-1]
+        path = (0.05 * np.column_stack([np.cos(angles), np.sin(angles), np.zeros_like(angles)])).tolist()
+        points = [[0.03, 0, 0.01], [0.08, 0, -0.02], [0.049, 0, 0.001]]
+        polygon = wire_paths.wire_path_field(path, points, 2.0, closed=True)["B_tesla"]
+        for (x, _, z), (Bx, _, Bz_expected) in zip(points, polygon):
+            Br, Bz = loops.loop_field(0.05, 2.0, x, z)
+            assert float(Br) == pytest.approx(Bx, rel=1e-4)
+            assert float(Bz) == pytest.approx(Bz_expected, rel=1e-4)
+
+    def test_on_wire(self):
+        """Test that the winding itself is NaN and B_r is odd in z."""
+        Br, Bz = loops.loop_field(0.1, 1.0, [0.1, 0.05, 0.05], [0.0, 0.02, -0.02])
+        assert math.isnan(Bz[0]) and math.isnan(Br[0])
+        assert Br[1] == pytest.approx(-Br[2])
+        assert Bz[1] == pytest.approx(Bz[2])
+
+
+class TestSolenoidFieldMap:
+    """Tests for finite solenoids built from loops."""
+
+    def test_center_matches_current_sheet(self):
+        """Test the center field against μ₀nI · (L/2) / √((L/2)² + a²)."""
+        turns, length, radius, current = 500, 0.2, 0.02, 2.0
+        result = loops.solenoid_field_map(turns, length, radius, current)
+        half = length / 2
+        expected = MU_0 * turns / length * current * half / math.hypot(half, radius)
+        assert result["B_center_tesla"] == pytest.approx(expected, rel=1e-5)
+
+    def test_long_solenoid_approaches_ideal(self):
+        """Test that a long coil's center field approaches solenoid_field."""
+        result = loops.solenoid_field_map(2000, 1.0, 0.01, 1.0)
+        ideal = fields.solenoid_field(2000, 1.0, 1.0)["B_tesla"]
+        assert result["B_center_tesla"] == pytest.approx(ideal, rel=1e-3)
+        assert result["end_to_center_ratio"] == pytest.approx(0.5, rel=1e-2)
+
+    def test_single_loop(self):
+        """Test that one turn of zero length is a loop at z = 0."""
+        result = loops.solenoid_field_map(1, 0.0, 0.1, 1.0, z_m=[0.0, 0.1])
+        assert result["B_z_tesla"][0][0] == pytest.approx(MU_0 / (2 * 0.1))
+        assert result["B_z_tesla"][0][1] == pytest.approx(MU_0 * 0.01 / (2 * 0.02 ** 1.5))
+
+    def test_multi_layer(self):
+        """Test that two layers give the sum of two single-layer coils."""
+        two = loops.coil_field_map(200, 0.1, 0.01, 1.0, [0.0, 0.005], [0.0, 0.04], outer_radius_m=0.02, layers=2)
+        inner = loops.coil_field_map(100, 0.1, 0.01, 1.0, [0.0, 0.005], [0.0, 0.04])
+        outer = loops.coil_field_map(100, 0.1, 0.02, 1.0, [0.0, 0.005], [0.0, 0.04])
+        np.testing.assert_allclose(two[1], inner[1] + outer[1], rtol=1e-12)
+
+    def test_grid_and_cache(self):
+        """Test grid shape and that the unit-current map is reused across currents."""
+        loops._unit_field_map.cache_clear()
+        grid = {"r_m": {"start": 0, "stop": 0.03, "num": 100}, "z_m": {"start": -0.15, "stop": 0.15, "num": 100}}
+        first = loops.solenoid_field_map(500, 0.2, 0.02, 2.0, **grid)
+        second = loops.solenoid_field_map(500, 0.2, 0.02, 4.0, **grid)
+        assert first["field_map"] and "B_z_tesla" not in first
+        header, arrays = field_store.load_field_map(first["field_map"]["handle"])
+        assert arrays["B_z"].shape == (100, 100) and len(header["axes"]["z_m"]) == 100
+        assert second["max_B_tesla"] == pytest.approx(2 * first["max_B_tesla"])
+        assert loops._unit_field_map.cache_info().hits >= 2
+
+    def test_matches_direct_loop_sum(self):
+        """Test the offset-sharing evaluation against a plain sum over turns."""
+        r, z = np.array([0.0, 0.01, 0.025]), np.linspace(-0.1, 0.1, 9)
+        Br, Bz = loops.coil_field_map(40, 0.08, 0.02, 1.5, r, z)
+        positions = (np.arange(40) + 0.5) * 0.002 - 0.04
+        direct_r = sum(loops.loop_field(0.02, 1.5, r[:, None], z[None, :] - p)[0] for p in positions)
+        direct_z = sum(loops.loop_field(0.02, 1.5, r[:, None], z[None, :] - p)[1] for p in positions)
+        np.testing.assert_allclose(Br, direct_r, rtol=1e-10, atol=1e-18)
+        np.testing.assert_allclose(Bz, direct_z, rtol=1e-10)
+
+    def test_invalid_inputs(self):
+        """Test validation messages."""
+        assert "error" in loops.solenoid_field_map(10, 0.1, 0.0, 1.0)
+        assert "error" in loops.solenoid_field_map(10, 0.1, 0.01, 1.0, layers=3)
+        assert "error" in loops.solenoid_field_map(10, 0.1, 0.01, 1.0, layers=2)
+        assert "limit" in loops.solenoid_field_map(
+            10, 0.1, 0.01, 1.0, r_m={"start": 0, "stop": 1, "num": 1000}, z_m={"start": 0, "stop": 1, "num": 1000}
+        )["error"]
+
+    def test_dispatch(self):
+        """Test the MCP dispatcher and JSON encoding of the result."""
+        result = run_tool("solenoid_field_map", {"turns": 100, "length_m": 0.1, "radius_m": 0.01, "current_A": 1.0,
+                                                 "r_m": [0.0, 0.01], "z_m": [0.0, 0.0005]})
+        assert result["singular_count"] == 1 and "singular_points" not in result
+        json.dumps(result, allow_nan=False)
@@ -0,0 +1,179 @@
+"""Tests for the indexed material catalog and material_search."""
+
+import json
+import time
+
+import numpy as np
+import pytest
+from mcp_server.dispatch import run_tool
+from mcp_server.tools import material_store, materials
+from mcp_server.tools.material_store import MaterialStore, material_search
+from mcp_server.tools.reluctance_network import magnetic_circuit_solve
+
+
+def synthetic_records(count, seed=0):
+    """Random grades with log-uniform μᵣ, uniform B_sat, log-uniform coercivity, and some gaps."""
+    rng = np.random.default_rng(seed)
+    mu_r = 10 ** rng.uniform(0, 5, count)
+    b_sat = rng.uniform(0.2, 2.4, count)
+    coercivity = 10 ** rng.uniform(-1, 6, count)
+    b_sat[::7] = np.nan
+    return [
+        {"name": f"grade {i}", "category": f"family{i % 5}", "relative_permeability": mu_r[i],
+         "saturation_flux_density_T": None if np.isnan(b_sat[i]) else b_sat[i], "coercivity_A_per_m": coercivity[i]}
+        for i in range(count)
+    ]
+
+
+class TestCatalog:
+    """Tests for loading the bundled and extra catalogs."""
+
+    def test_builtin_materials_kept(self):
+        """Test that the six MATERIALS entries are in the store with their values."""
+        store = material_store.get_store()
+        for name, properties in materials.MATERIALS.items():
+            record = store.record(store.find(name))
+            for column in ["relative_permeability", "saturation_flux_density_T", "coercivity_A_per_m"]:
+                assert record[column] == properties[column]
+        assert len(store) > 60
+
+    def test_lookup_finds_catalog_grades(self):
+        """Test that material_lookup resolves catalog names and aliases, and suggests near misses."""
+        assert materials.lookup_material("NdFeB N52")["remanence_T"] == 1.45
+        assert materials.lookup_material("m-19")["name"] == "M19"
+        assert materials.lookup_material("silicon-steel") == materials.MATERIALS["silicon_steel"]
+        missing = materials.lookup_material("3C96")
+        assert "error" in missing and "3C95" in missing["similar_materials"]
+
+    def test_extra_catalog(self, tmp_path, monkeypatch):
+        """Test a JSON catalog from MAXWELL_MATERIAL_CATALOG, replacing a bundled grade."""
+        path = tmp_path / "extra.json"
+        path.write_text(json.dumps({"materials": [
+            {"name": "Custom 9000", "aliases": ["C9k"], "category": "ferrite_mnzn", "relative_permeability": 9000},
+            {"name": "N87", "category": "ferrite_mnzn", "relative_permeability": 2400,
+             "saturation_flux_density_T": 0.49},
+        ]}))
+        monkeypatch.setenv("MAXWELL_MATERIAL_CATALOG", str(path))
+        material_store.get_store.cache_clear()
+        try:
+            assert materials.lookup_material("c9k")["relative_permeability"] == 9000
+            assert materials.lookup_material("N87")["relative_permeability"] == 2400
+        finally:
+            material_store.get_store.cache_clear()
+
+    def test_invalid_records(self):
+        """Test that nameless records and empty stores are rejected."""
+        with pytest.raises(ValueError):
+            MaterialStore([{"relative_permeability": 10}])
+        with pytest.raises(ValueError):
+            MaterialStore([])
+
+    def test_catalog_material_in_circuit(self):
+        """Test that reluctance networks accept catalog grades by name."""
+        branches = [{"name": "core", "from": "a", "to": "b", "length_m": 0.1, "area_m2": 1e-4, "material": "3C95"},
+                    {"name": "gap", "from": "b", "to": "a", "length_m": 0.001, "area_m2": 1e-4,
+                     "relative_permeability": 1}]
+        result = magnetic_circuit_solve(branches, [{"branch": "core", "turns": 10, "current_A": 100.0}])
+        assert any("3C95" in warning for warning in result["warnings"])
+
+
+class TestRangeQueries:
+    """Tests for indexed property queries."""
+
+    def test_range_and_sort(self):
+        """Test μᵣ ≥ 3000 and B_sat ≥ 1.5 T sorted by coercivity against a direct scan."""
+        result = material_search(filters={"mu_r": {"min": 3000}, "saturation_flux_density_T": [1.5, None]},
+                                 sort_by="coercivity", limit=100)
+        found = result["materials"]
+        assert result["count"] == len(found) > 10
+        assert all(m["relative_permeability"] >= 3000 and m["saturation_flux_density_T"] >= 1.5 for m in found)
+        coercivity = [m["coercivity_A_per_m"] for m in found]
+        assert coercivity == sorted(coercivity)
+        store = material_store.get_store()
+        expected = np.sum((store.columns["relative_permeability"] >= 3000)
+                          & (store.columns["saturation_flux_density_T"] >= 1.5))
+        assert result["count"] == expected
+
+    def test_category_and_descending(self):
+        """Test a category filter with a descending sort on remanence."""
+        result = material_search(category="permanent_magnet", sort_by="br", descending=True, limit=3)
+        assert [m["name"] for m in result["materials"]] == ["N52", "N50", "N45"]
+        assert "note" in result
+
+    def test_query_matches_scan(self):
+        """Test indexed queries against a brute-force scan of a synthetic catalog."""
+        records = synthetic_records(5000)
+        store = MaterialStore(records)
+        rows = store.query({"relative_permeability": (100, 5000), "saturation_flux_density_T": (None, 1.0)},
+                           category="family2", sort_by="coercivity_A_per_m")
+        expected = [i for i, r in enumerate(records)
+                    if 100 <= r["relative_permeability"] <= 5000 and r["saturation_flux_density_T"] is not None
+                    and r["saturation_flux_density_T"] <= 1.0 and r["category"] == "family2"]
+        expected.sort(key=lambda i: records[i]["coercivity_A_per_m"])
+        assert list(rows) == expected
+
+    def test_missing_values_sort_last(self):
+        """Test that rows without the sort property follow the others."""
+        store = MaterialStore(synthetic_records(50))
+        rows = store.query(sort_by="saturation_flux_density_T", descending=True)
+        values = store.columns["saturation_flux_density_T"][rows]
+        missing = np.isnan(values)
+        assert missing.sum() == 8 and np.all(missing[-8:])
+        assert np.all(np.diff(values[:-8]) <= 0)
+
+    def test_large_catalog_speed(self):
+        """Test that range queries and name matches over 50,000 grades stay fast."""
+        store = MaterialStore(synthetic_records(50_000))
+        start = time.perf_counter()
+        for _ in range(20):
+            store.query({"relative_permeability": (3000, None), "saturation_flux_density_T": (1.5, None)},
+                        sort_by="coercivity_A_per_m")
+            store.match_scores("grade 4242")
+        assert (time.perf_counter() - start) / 20 < 0.05
+        assert int(np.argmax(store.match_scores("grade 4242"))) == 4242
+
+
+class TestFuzzyNames:
+    """Tests for n-gram name matching."""
+
+    @pytest.mark.parametrize("query, expected", [
+        ("silicon-steel", "silicon_steel"),
+        ("NdFeB N52", "N52"),
+        ("Mu Metal", "mu_metal"),
+        ("ferroxcube 3c95", "3C95"),
+        ("permalloy80", "Permalloy 80"),
+        ("kool mu", "Kool Mu 60"),
+        ("hiperco", "Hiperco 50"),
+    ])
+    def test_best_match(self, query, expected):
+        """Test that spelling variants rank the intended material first."""
+        assert material_search(name=query)["materials"][0]["name"] == expected
+
+    def test_name_with_filters(self):
+        """Test a name query restricted by a property range."""
+        result = material_search(name="ndfeb", filters={"coercivity_A_per_m": {"min": 900000}}, limit=20)
+        names = [m["name"] for m in result["materials"]]
+        assert names == ["N42", "N42SH"]
+        assert all(m["match_score"] >= material_store.MIN_MATCH_SCORE for m in result["materials"])
+
+    def test_no_match(self):
+        """Test that an unrelated name matches nothing."""
+        assert material_search(name="xyzzy")["count"] == 0
+
+
+class TestMaterialSearchTool:
+    """Tests for validation and dispatch."""
+
+    def test_invalid_inputs(self):
+        """Test validation messages."""
+        assert "Unknown property" in material_search(filters={"density": {"min": 1}})["error"]
+        assert "Unknown property" in material_search(sort_by="price")["error"]
+        assert "min" in material_search(filters={"mu_r": {"above": 1}})["error"]
+        assert "limit" in material_search(limit=0)["error"]
+        assert "available_categories" in material_search(category="unobtainium")
+
+    def test_dispatch(self):
+        """Test the MCP dispatcher and JSON encoding of the result."""
+        result = run_tool("material_search", {"filters": {"b_sat": {"min": 2.2}}, "sort_by": "b_sat"})
+        assert [m["name"] for m in result["materials"]][-1] == "Hiperco 50"
+        json.dumps(result, allow_nan=False)
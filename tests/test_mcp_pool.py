@@ -0,0 +1,94 @@
+"""Tests for the MCP worker pool tool backend."""
+
+import concurrent.futures
+import json
+import os
+import signal
+import time
+
+import pytest
+from agent.mcp_pool import MCPWorkerPool
+
+
+def _worker_pids() -> list:
+    """PIDs of server subprocesses started by this test process."""
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{entry}/cmdline") as f:
+                cmdline = f.read()
+        except (OSError, IndexError):
+            continue
+        if parent == os.getpid() and "server.py" in cmdline:
+            pids.append(int(entry))
+    return pids
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """Two persistent server workers shared by the tests in this module."""
+    worker_pool = MCPWorkerPool(size=2, health_check_interval_s=0.5, restart_backoff_s=0.1).start()
+    yield worker_pool
+    worker_pool.close()
+
+
+class TestMCPWorkerPool:
+    """Tests for dispatch, load spreading, and restarts."""
+
+    def test_call(self, pool):
+        """Test a tool call through a worker."""
+        result = pool.call("unit_convert", {"value": 1.2, "from_unit": "T", "to_unit": "Gauss"})
+        assert result["converted_value"] == 12000
+
+    def test_error_result_passed_through(self, pool):
+        """Test that tool errors come back as error dicts."""
+        assert "error" in pool.call("solenoid_field", {"turns": 10, "length_m": 0, "current_A": 1})
+
+    def test_concurrent_calls_spread_across_workers(self, pool):
+        """Test that concurrent calls from many threads use every worker."""
+        before = [worker["calls"] for worker in pool.get_stats()["workers"]]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda current: pool.call("solenoid_field", {"turns": 100, "length_m": 0.1, "current_A": current}),
+                range(1, 41),
+            ))
+        assert all("B_tesla" in result for result in results)
+        after = [worker["calls"] for worker in pool.get_stats()["workers"]]
+        assert all(a > b for a, b in zip(after, before))
+
+    @pytest.mark.skipif(not os.path.isdir("/proc"), reason="needs /proc to find worker processes")
+    def test_crashed_worker_restarts(self, pool):
+        """Test that calls survive a killed worker and the worker comes back."""
+        os.kill(_worker_pids()[0], signal.SIGKILL)
+        for _ in range(4):
+            assert "B_tesla" in pool.call("biot_savart_wire", {"current_A": 10, "distance_m": 0.05})
+
+        deadline = time.monotonic() + 15
+        while pool.get_stats()["healthy"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.1)
+        stats = pool.get_stats()
+        assert stats["healthy"] == 2
+        assert sum(worker["restarts"] for worker in stats["workers"]) >= 1
+
+
+class TestAgentBackend:
+    """Tests for SkillAgent with the MCP worker backend."""
+
+    def test_agent_routes_tools_to_pool(self, scripted_agent):
+        """Test that call_tool and run_plan steps go through the workers."""
+        agent = scripted_agent([], mcp_workers=1)
+        try:
+            result = json.loads(agent.call_tool("material_lookup", {"material": "ferrite"}))
+            assert result["relative_permeability"] == 2000
+            plan = json.loads(agent.call_tool("run_plan", {"steps": [
+                {"id": "b", "tool": "solenoid_field", "args": {"turns": 500, "length_m": 0.2, "current_A": 2}},
+                {"id": "g", "tool": "unit_convert", "args": {"value": "$b.B_tesla", "from_unit": "T", "to_unit": "Gauss"}},
+            ]}))
+            assert plan["steps_run"] == 2
+            assert agent.mcp_pool.get_stats()["workers"][0]["calls"] == 3
+        finally:
+            agent.close()
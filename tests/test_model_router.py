@@ -0,0 +1,119 @@
+"""Tests for per-turn model routing."""
+
+import os
+from types import SimpleNamespace
+
+from agent.model_router import ModelRouter, parse_routing_config
+from tests.helpers import text_response, tool_use_response
+
+SKILL_MD = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "skills",
+    "maxwell_magnetics",
+    "skill.md",
+)
+
+
+class TestRoutingConfig:
+    """Tests for parsing the skill.md Model Routing section."""
+
+    def test_parse_skill_md(self):
+        """Test that the magnetics skill configures both models."""
+        with open(SKILL_MD) as f:
+            config = parse_routing_config(f.read())
+        assert config["strong_model"] == "claude-sonnet-4-6"
+        assert config["fast_model"] == "claude-haiku-4-5"
+        assert config["simple_query_max_words"] == 30
+        assert config["escalate_final_synthesis"] is True
+
+    def test_missing_section(self):
+        """Test that a skill without the section yields no settings."""
+        assert parse_routing_config("# Skill\n\n## Tool Reference\n") == {}
+
+
+class TestRoutingPolicy:
+    """Tests for query classification and model choice."""
+
+    def test_simple_query(self):
+        """Test that a short numeric question is simple."""
+        router = ModelRouter()
+        assert router.classify("Field of a 500-turn 20 cm solenoid at 2 A?") == "simple"
+
+    def test_reasoning_query(self):
+        """Test that design questions are complex."""
+        router = ModelRouter()
+        assert router.classify("Should I use ferrite or silicon steel for a 50 kHz inductor?") == "complex"
+
+    def test_retrieval_signal(self):
+        """Test that a strong knowledge-base match marks a question complex."""
+        router = ModelRouter(strong_retrieval_score=0.6)
+        assert router.classify("MRI magnets", [{"score": 0.8}]) == "complex"
+        assert router.classify("MRI magnets", [{"score": 0.3}]) == "simple"
+
+    def test_choose(self):
+        """Test planning goes to the strong model and dispatch to the fast model."""
+        router = ModelRouter(strong_model="strong", fast_model="fast")
+        assert router.choose("complex", after_tool_results=False) == "strong"
+        assert router.choose("complex", after_tool_results=True, tools_failed=True) == "fast"
+        assert router.choose("simple", after_tool_results=False) == "fast"
+
+    def test_synthesis_escalated_before_the_call(self):
+        """Test that the likely final synthesis of a complex question goes straight to the strong model."""
+        router = ModelRouter(strong_model="strong", fast_model="fast")
+        assert router.choose("complex", after_tool_results=True) == "strong"
+        assert router.should_escalate("complex", after_tool_results=True)
+        assert not router.should_escalate("simple", after_tool_results=True)
+        relaxed = ModelRouter(strong_model="strong", fast_model="fast", escalate_final_synthesis=False)
+        assert relaxed.choose("complex", after_tool_results=True) == "fast"
+
+    def test_routing_disabled(self):
+        """Test that identical models never escalate."""
+        router = ModelRouter(strong_model="same", fast_model="same")
+        assert not router.should_escalate("complex", after_tool_results=True)
+
+    def test_stats(self):
+        """Test per-model token and latency bookkeeping."""
+        router = ModelRouter(strong_model="strong", fast_model="fast")
+        usage = SimpleNamespace(input_tokens=10, output_tokens=5)
+        router.record("fast", 0.1, usage)
+        router.record("fast", 0.3, usage)
+        router.record("strong", 1.0, usage, escalation=True)
+        stats = router.get_stats()
+        assert stats["models"]["fast"]["calls"] == 2
+        assert stats["models"]["fast"]["input_tokens"] == 20
+        assert stats["models"]["fast"]["p50_latency_s"] == 0.1
+        assert stats["models"]["strong"]["output_tokens"] == 5
+        assert stats["escalations"] == 1
+
+
+class TestAgentRouting:
+    """Tests for routing inside the agentic loop."""
+
+    def test_complex_query_routing(self, scripted_agent):
+        """Test plan on strong, a retry after a tool error on fast, and one strong synthesis."""
+        agent = scripted_agent(
+            [
+                tool_use_response(("material_lookup", {"material": "unobtainium"})),
+                tool_use_response(("material_lookup", {"material": "ferrite"})),
+                text_response("final answer"),
+            ],
+            model_routing={"strong_model": "strong", "fast_model": "fast"},
+        )
+        answer = agent.run_agentic_loop("Explain whether ferrite suits a 100 kHz transformer")
+        models = [call["model"] for call in agent.client.messages.calls]
+        assert models == ["strong", "fast", "strong"]
+        assert answer == "final answer"
+        assert agent.model_router.get_stats()["escalations"] == 1
+
+    def test_simple_query_routing(self, scripted_agent):
+        """Test that a simple query never touches the strong model."""
+        agent = scripted_agent(
+            [
+                tool_use_response(("solenoid_field", {"turns": 500, "length_m": 0.2, "current_A": 2})),
+                text_response("6.28 mT"),
+            ],
+            model_routing={"strong_model": "strong", "fast_model": "fast"},
+        )
+        agent.run_agentic_loop("Field of a 500-turn 20 cm solenoid at 2 A?")
+        models = [call["model"] for call in agent.client.messages.calls]
+        assert models == ["fast", "fast"]
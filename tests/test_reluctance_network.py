@@ -0,0 +1,164 @@
+"""Tests for the magnetic reluctance network solver."""
+
+import json
+import time
+
+import pytest
+from mcp_server.dispatch import run_tool
+from mcp_server.tools import reluctance_network
+from mcp_server.tools.circuits import MU_0, reluctance
+from mcp_server.tools.reluctance_network import magnetic_circuit_solve
+
+GAPPED_CORE = [
+    {"name": "core", "from": "a", "to": "b", "length_m": 0.2, "area_m2": 1e-4, "material": "iron"},
+    {"name": "gap", "from": "b", "to": "a", "length_m": 0.001, "area_m2": 1e-4, "relative_permeability": 1},
+]
+
+
+def e_core(center_turns=100, current=1.0):
+    """E-core: center leg with a gap between nodes top/bottom, two outer legs in parallel."""
+    branches = [
+        {"name": "center", "from": "bottom", "to": "top", "length_m": 0.05, "area_m2": 2e-4, "material": "ferrite"},
+        {"name": "center_gap", "from": "top", "to": "gap", "reluctance_H_inv": 1e6},
+        {"name": "left", "from": "gap", "to": "bottom", "length_m": 0.1, "area_m2": 1e-4, "material": "ferrite"},
+        {"name": "right", "from": "gap", "to": "bottom", "length_m": 0.1, "area_m2": 1e-4, "material": "ferrite"},
+    ]
+    windings = [{"name": "primary", "branch": "center", "turns": center_turns, "current_A": current}]
+    return branches, windings
+
+
+class TestSeriesAndParallel:
+    """Tests against hand-derived circuits."""
+
+    def test_gapped_core(self):
+        """Test Φ = NI / (R_core + R_gap) and L = N² / R_total."""
+        result = magnetic_circuit_solve(GAPPED_CORE, [{"branch": "core", "turns": 100, "current_A": 1.0}])
+        total = (reluctance(0.2, 1e-4, 5000)["reluctance_H_inv"] + reluctance(0.001, 1e-4, 1)["reluctance_H_inv"])
+        core, gap = result["branches"]
+        assert core["flux_Wb"] == pytest.approx(100 / total, rel=1e-12)
+        assert gap["flux_Wb"] == pytest.approx(core["flux_Wb"], rel=1e-12)
+        assert gap["B_tesla"] == pytest.approx(100 / total / 1e-4, rel=1e-12)
+        assert gap["H_A_per_m"] == pytest.approx(gap["B_tesla"] / MU_0, rel=1e-12)
+        assert core["mmf_drop_AT"] + gap["mmf_drop_AT"] == pytest.approx(100, rel=1e-12)
+        assert result["windings"][0]["inductance_H"] == pytest.approx(100 ** 2 / total, rel=1e-12)
+        assert result["energy_J"] == pytest.approx(0.5 * 100 ** 2 / total, rel=1e-12)
+
+    def test_e_core_outer_legs_share_flux(self):
+        """Test that symmetric outer legs each carry half the center-leg flux."""
+        branches, windings = e_core()
+        result = magnetic_circuit_solve(branches, windings)
+        flux = {branch["name"]: branch["flux_Wb"] for branch in result["branches"]}
+        assert flux["left"] == pytest.approx(flux["center"] / 2, rel=1e-12)
+        assert flux["right"] == pytest.approx(flux["left"], rel=1e-12)
+        legs = reluctance(0.1, 1e-4, 2000)["reluctance_H_inv"] / 2
+        total = reluctance(0.05, 2e-4, 2000)["reluctance_H_inv"] + 1e6 + legs
+        assert flux["center"] == pytest.approx(100 / total, rel=1e-12)
+        assert result["branches"][1]["B_tesla"] is None
+
+    def test_series_mmf_source(self):
+        """Test a branch MMF source (e.g. a magnet) with no windings."""
+        result = magnetic_circuit_solve([
+            {"name": "magnet", "from": 0, "to": 1, "reluctance_H_inv": 2e6, "mmf_AT": 500},
+            {"name": "return", "from": 1, "to": 0, "reluctance_H_inv": 3e6},
+        ])
+        assert result["branches"][0]["flux_Wb"] == pytest.approx(500 / 5e6)
+        assert "windings" not in result
+
+    def test_disconnected_networks(self):
+        """Test that separate circuits in one netlist are solved independently."""
+        second = [dict(branch, **{"from": branch["to"] + "2", "to": branch["from"] + "2", "name": branch["name"] + "2"})
+                  for branch in GAPPED_CORE]
+        windings = [{"branch": "core", "turns": 100, "current_A": 1.0}, {"branch": "core2", "turns": 50, "current_A": 1.0}]
+        result = magnetic_circuit_solve(GAPPED_CORE + second, windings)
+        flux = [branch["flux_Wb"] for branch in result["branches"]]
+        assert flux[2] == pytest.approx(flux[0] / 2, rel=1e-12)
+        assert result["inductance_matrix_H"][0][1] == 0.0
+
+
+class TestWindings:
+    """Tests for inductance and coupling of several windings."""
+
+    def test_transformer(self):
+        """Test M = N₁N₂/R and k = 1 for two windings on one closed core."""
+        windings = [
+            {"name": "primary", "branch": "core", "turns": 100, "current_A": 1.0},
+            {"name": "secondary", "branch": "gap", "turns": 20, "current_A": 0.0},
+        ]
+        result = magnetic_circuit_solve(GAPPED_CORE, windings)
+        L = result["inductance_matrix_H"]
+        assert L[0][1] == pytest.approx(L[1][0], rel=1e-12)
+        assert L[0][1] == pytest.approx(L[0][0] * 20 / 100, rel=1e-12)
+        assert result["coupling_coefficients"][0][1] == pytest.approx(1.0, rel=1e-12)
+        assert result["windings"][1]["flux_linkage_Wb_turns"] == pytest.approx(L[1][0], rel=1e-12)
+
+    def test_opposing_windings_cancel(self):
+        """Test that direction -1 subtracts the winding's MMF."""
+        windings = [
+            {"branch": "core", "turns": 100, "current_A": 1.0},
+            {"branch": "core", "turns": 100, "current_A": 1.0, "direction": -1},
+        ]
+        result = magnetic_circuit_solve(GAPPED_CORE, windings)
+        assert result["branches"][0]["flux_Wb"] == pytest.approx(0.0, abs=1e-20)
+        assert result["inductance_matrix_H"][0][1] < 0
+
+    def test_leakage_reduces_coupling(self):
+        """Test that a leakage path between the windings gives k < 1."""
+        branches = [
+            {"name": "left", "from": "a", "to": "b", "reluctance_H_inv": 1e5},
+            {"name": "leak", "from": "b", "to": "a", "reluctance_H_inv": 1e6},
+            {"name": "right", "from": "b", "to": "a", "reluctance_H_inv": 1e5},
+        ]
+        windings = [{"branch": "left", "turns": 10, "current_A": 1.0},
+                    {"branch": "right", "turns": 10, "current_A": 0.0}]
+        result = magnetic_circuit_solve(branches, windings)
+        assert 0 < result["coupling_coefficients"][0][1] < 1
+
+
+class TestSolver:
+    """Tests for saturation warnings, the dense fallback, validation, and scale."""
+
+    def test_saturation_warning(self):
+        """Test that branches above the material's B_sat are flagged."""
+        result = magnetic_circuit_solve(GAPPED_CORE, [{"branch": "core", "turns": 2000, "current_A": 10.0}])
+        assert len(result["warnings"]) == 1 and "core" in result["warnings"][0]
+        assert magnetic_circuit_solve(GAPPED_CORE, [{"branch": "core", "turns": 10, "current_A": 1.0}])["warnings"] == []
+
+    def test_dense_fallback(self, monkeypatch):
+        """Test that the NumPy solver gives the same fluxes without scipy."""
+        branches, windings = e_core()
+        sparse = magnetic_circuit_solve(branches, windings)
+        monkeypatch.setattr(reluctance_network, "scipy", None)
+        dense = magnetic_circuit_solve(branches, windings)
+        assert dense["solver"].startswith("dense")
+        for a, b in zip(sparse["branches"], dense["branches"]):
+            assert a["flux_Wb"] == pytest.approx(b["flux_Wb"], rel=1e-10)
+
+    def test_invalid_netlists(self):
+        """Test validation messages."""
+        assert "at least one branch" in magnetic_circuit_solve([])["error"]
+        assert "not found" in magnetic_circuit_solve([dict(GAPPED_CORE[0], material="unobtainium")])["error"]
+        assert "same node" in magnetic_circuit_solve([dict(GAPPED_CORE[0], to="a")])["error"]
+        assert "unique" in magnetic_circuit_solve([GAPPED_CORE[0], GAPPED_CORE[0]])["error"]
+        assert "length_m" in magnetic_circuit_solve([{"from": 0, "to": 1, "material": "iron"}])["error"]
+        assert "unknown branch" in magnetic_circuit_solve(GAPPED_CORE, [{"branch": "leg", "turns": 1}])["error"]
+        assert "turns" in magnetic_circuit_solve(GAPPED_CORE, [{"branch": "core", "turns": 0}])["error"]
+
+    def test_large_ladder(self):
+        """Test a 10,000-section ladder network against its closed-form limit."""
+        sections = 10_000
+        branches = [{"name": f"s{i}", "from": i, "to": i + 1, "reluctance_H_inv": 1.0} for i in range(sections)]
+        branches += [{"name": f"p{i}", "from": i + 1, "to": "ground", "reluctance_H_inv": 1.0}
+                     for i in range(sections)]
+        branches.append({"name": "source", "from": "ground", "to": 0, "reluctance_H_inv": 1e-9, "mmf_AT": 1.0})
+        start = time.perf_counter()
+        result = magnetic_circuit_solve(branches)
+        assert time.perf_counter() - start < 5.0
+        # An infinite ladder of unit series and shunt reluctances has input reluctance (1 + √5) / 2
+        assert result["branches"][-1]["flux_Wb"] == pytest.approx(2 / (1 + 5 ** 0.5), rel=1e-6)
+
+    def test_dispatch(self):
+        """Test the MCP dispatcher and JSON encoding of the result."""
+        branches, windings = e_core()
+        result = run_tool("magnetic_circuit_solve", {"branches": branches, "windings": windings})
+        assert len(result["branches"]) == 4
+        json.dumps(result, allow_nan=False)
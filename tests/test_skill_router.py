@@ -0,0 +1,205 @@
+"""Tests for multi-skill agents and per-request skill routing."""
+
+import json
+import os
+import shutil
+
+import pytest
+from agent.skill_router import SkillRouter, parse_skill_header
+from agent.tool_selector import ToolSelector
+from tests.helpers import bag_of_words_embed, text_response
+
+SKILLS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "skills")
+
+THERMAL_SKILL_MD = """# Thermal Design SME Agent Skill Definition
+
+**Purpose:** Size heat sinks and estimate junction temperature from thermal resistance and power dissipation.
+
+**Domain:** Heat transfer, thermal management, cooling
+
+---
+
+## Use Case Decision Table
+
+| Problem Type | Tool(s) to Use | Notes |
+|---|---|---|
+| Heat sink sizing | `thermal_resistance` | Junction-to-ambient temperature rise from power dissipation. |
+
+---
+
+## Tool Reference
+
+### thermal_resistance
+
+```
+Input: { power_w: float, resistance_c_per_w: float }
+Output: { temperature_rise_c: float }
+```
+
+**Use Case:** Temperature rise of a heat sink for a given power dissipation.
+
+### junction_temperature
+
+```
+Input: { power_w: float, ambient_c: float }
+Output: { junction_c: float }
+```
+
+**Use Case:** Junction temperature at a given ambient.
+"""
+
+THERMAL_TOOLS_PY = """def thermal_resistance(power_w, resistance_c_per_w):
+    return {"temperature_rise_c": power_w * resistance_c_per_w}
+"""
+
+
+@pytest.fixture
+def magnetics_md():
+    """Raw text of the magnetics skill."""
+    with open(os.path.join(SKILLS_DIR, "maxwell_magnetics", "skill.md")) as f:
+        return f.read()
+
+
+@pytest.fixture
+def skills_dir(tmp_path, monkeypatch):
+    """skills/ directory with the magnetics skill and a small thermal skill."""
+    import agent.agent
+
+    skills_dir = tmp_path / "skills"
+    shutil.copytree(os.path.join(SKILLS_DIR, "maxwell_magnetics"), skills_dir / "maxwell_magnetics")
+    (skills_dir / "thermal_design").mkdir()
+    (skills_dir / "thermal_design" / "skill.md").write_text(THERMAL_SKILL_MD)
+    (skills_dir / "thermal_design" / "tools.py").write_text(THERMAL_TOOLS_PY)
+    monkeypatch.setattr(agent.agent, "SKILLS_DIR", str(skills_dir))
+    return str(skills_dir)
+
+
+class TestSkillHeader:
+    """Tests for reading the Purpose/Domain header."""
+
+    def test_magnetics_header(self, magnetics_md):
+        """Test that the magnetics skill header is parsed."""
+        header = parse_skill_header(magnetics_md)
+        assert header["title"] == "Magnetics SME Agent Skill Definition"
+        assert header["purpose"].startswith("Enable AI agents to solve electromagnetics")
+        assert "magnetic circuit design" in header["domain"]
+
+    def test_missing_header(self):
+        """Test that a skill.md without the header yields empty fields."""
+        assert parse_skill_header("## Tool Reference\n\n**Purpose:** ignored") == {
+            "title": "", "purpose": "", "domain": ""
+        }
+
+
+class TestSkillRouter:
+    """Tests for choosing skills by header similarity."""
+
+    def test_routes_to_matching_skill(self, magnetics_md):
+        """Test that each question goes to its own domain only."""
+        router = SkillRouter(
+            {"maxwell_magnetics": magnetics_md, "thermal_design": THERMAL_SKILL_MD}, bag_of_words_embed
+        )
+        assert router.route("What heat sink keeps the junction temperature low at 20 W power dissipation?") == [
+            "thermal_design"
+        ]
+        assert router.route("Design a magnetic circuit for electromagnetics material properties") == [
+            "maxwell_magnetics"
+        ]
+
+    def test_low_similarity_includes_all(self, magnetics_md):
+        """Test that a question matching no skill well gets every skill."""
+        router = SkillRouter(
+            {"maxwell_magnetics": magnetics_md, "thermal_design": THERMAL_SKILL_MD},
+            bag_of_words_embed,
+            min_similarity=0.99,
+        )
+        assert router.route("Hello there") == ["maxwell_magnetics", "thermal_design"]
+        assert router.get_stats()["all_skills_fallbacks"] == 1
+
+    def test_embeddings_unavailable(self, magnetics_md):
+        """Test that routing falls back to every skill without embeddings."""
+        router = SkillRouter({"maxwell_magnetics": magnetics_md, "thermal_design": THERMAL_SKILL_MD}, lambda texts: [])
+        assert not router.available
+        assert router.route("heat sink") == ["maxwell_magnetics", "thermal_design"]
+
+    def test_stats(self, magnetics_md):
+        """Test per-skill request counts."""
+        router = SkillRouter(
+            {"maxwell_magnetics": magnetics_md, "thermal_design": THERMAL_SKILL_MD}, bag_of_words_embed
+        )
+        router.route("heat sink thermal resistance cooling")
+        stats = router.get_stats()
+        assert stats["routes"] == 1
+        assert stats["requests_per_skill"]["thermal_design"] == 1
+
+
+class TestMultiSkillAgent:
+    """Tests for an agent that loads several skills."""
+
+    @pytest.fixture
+    def agent(self, scripted_agent, skills_dir):
+        agent = scripted_agent([text_response("ok")], skills=["maxwell_magnetics", "thermal_design"])
+        agent.skill_router = SkillRouter(
+            {name: skill.skill_md for name, skill in agent.skills.items()}, bag_of_words_embed
+        )
+        return agent
+
+    def test_loads_every_skill(self, agent):
+        """Test that tools of both skills are loaded and the first skill is primary."""
+        assert agent.skill_name == "maxwell_magnetics"
+        assert set(agent.skills) == {"maxwell_magnetics", "thermal_design"}
+        names = [tool["name"] for tool in agent.tools]
+        assert "solenoid_field" in names and "thermal_resistance" in names
+
+    def test_only_routed_skill_sent(self, agent):
+        """Test that the prompt and tools of a request come from the routed skill only."""
+        agent.run_agentic_loop("What heat sink keeps the junction temperature low at 20 W power dissipation?")
+        call = agent.client.messages.calls[0]
+        assert {tool["name"] for tool in call["tools"]} == {"thermal_resistance", "junction_temperature"}
+        assert "Thermal Design SME" in call["system"]
+        assert "Magnetics SME" not in call["system"]
+
+    def test_question_embedded_once(self, agent):
+        """Test that routing, every routed skill's retrieval and tool selection share one embedding."""
+        question = "Heat sink and magnetic circuit for a power inductor at 20 W dissipation"
+        embedded, received = [], []
+
+        def counting_embed(texts):
+            embedded.extend(texts)
+            return bag_of_words_embed(texts)
+
+        def retrieve(query, top_k=3, query_vector=None):
+            received.append(query_vector)
+            return []
+
+        agent.knowledge_base.embed = counting_embed
+        agent.skill_router = SkillRouter(
+            {name: skill.skill_md for name, skill in agent.skills.items()}, counting_embed, min_similarity=0.0,
+            relative_margin=1.0,
+        )
+        for skill in agent.skills.values():
+            skill.knowledge_base.retrieve = retrieve
+            skill.tool_selector = ToolSelector(skill.tools, skill.skill_md, counting_embed, min_similarity=0.0)
+        agent.run_agentic_loop(question)
+        assert embedded.count(question) == 1
+        assert len(received) == 2 and all(vector is not None for vector in received)
+
+    def test_skill_tools_dispatched(self, agent):
+        """Test that an added skill's tools run from its tools.py next to the built-in tools."""
+        assert json.loads(agent.call_tool("thermal_resistance", {"power_w": 20, "resistance_c_per_w": 1.5})) == {
+            "temperature_rise_c": 30.0
+        }
+        missing = json.loads(agent.call_tool("junction_temperature", {"power_w": 1, "ambient_c": 25}))
+        assert "no function" in missing["error"]
+        assert "B_tesla" in json.loads(agent.call_tool("solenoid_field", {"turns": 10, "length_m": 0.1, "current_A": 1}))
+
+    def test_unknown_skill(self, scripted_agent, skills_dir):
+        """Test that an unknown skill name is rejected."""
+        with pytest.raises(ValueError, match="not found"):
+            scripted_agent([], skills=["maxwell_magnetics", "plasma_physics"])
+
+    def test_single_skill_unchanged(self, scripted_agent, skills_dir):
+        """Test that listing only one skill keeps the single-skill agent."""
+        agent = scripted_agent([], skills=["maxwell_magnetics"])
+        assert agent.skill_router is None
+        assert agent.skills == {}
@@ -0,0 +1,148 @@
+"""Tests for Monte Carlo tolerance analysis."""
+
+import json
+import math
+import time
+
+import numpy as np
+import pytest
+from mcp_server.dispatch import run_tool
+from mcp_server.tools.fields import MU_0
+from mcp_server.tools.tolerance import CHUNK_SIZE, _merge_moments, tolerance_analysis
+
+
+class TestStatistics:
+    """Tests of the sampled statistics against closed forms."""
+
+    def test_linear_normal(self):
+        """Test that a normal current gives a normal B with the scaled mean and std."""
+        result = tolerance_analysis("solenoid_field", {
+            "turns": 500, "length_m": 0.2, "current_A": {"distribution": "normal", "mean": 2.0, "std": 0.1},
+        }, samples=200_000, seed=1)
+        B = result["outputs"]["B_tesla"]
+        n = MU_0 * 500 / 0.2
+        assert B["mean"] == pytest.approx(2.0 * n, rel=1e-3)
+        assert B["std"] == pytest.approx(0.1 * n, rel=1e-2)
+        assert B["percentiles"]["p50"] == pytest.approx(2.0 * n, rel=1e-3)
+        assert B["percentiles"]["p95"] == pytest.approx((2.0 + 1.6449 * 0.1) * n, rel=2e-3)
+        assert result["fixed"] == {"turns": 500.0, "length_m": 0.2}
+
+    def test_uniform_percentiles_and_histogram(self):
+        """Test uniform percentiles and a flat histogram."""
+        result = tolerance_analysis("mmf_required", {
+            "H_field": 1000.0, "path_length_m": {"distribution": "uniform", "low": 0.1, "high": 0.3},
+        }, samples=400_000, percentiles=[10, 90], bins=10, seed=2)
+        mmf = result["outputs"]["mmf_AT"]
+        assert mmf["percentiles"]["p10"] == pytest.approx(120.0, rel=2e-3)
+        assert mmf["percentiles"]["p90"] == pytest.approx(280.0, rel=2e-3)
+        histogram = mmf["histogram"]
+        assert len(histogram["counts"]) == 10
+        assert sum(histogram["counts"]) + histogram["below"] + histogram["above"] == 400_000
+        assert np.std(histogram["counts"]) / np.mean(histogram["counts"]) < 0.02
+
+    def test_nominal_tolerance(self):
+        """Test that a relative tolerance is ±3σ (normal) or a flat band (uniform)."""
+        normal = tolerance_analysis("biot_savart_wire", {
+            "current_A": {"nominal": 10.0, "tolerance": 0.06}, "distance_m": 0.01}, seed=3)
+        assert normal["inputs"]["current_A"] == "normal(mean=10, std=0.2)"
+        flat = tolerance_analysis("biot_savart_wire", {
+            "current_A": {"nominal": 10.0, "tolerance": 0.06, "distribution": "uniform"}, "distance_m": 0.01}, seed=3)
+        B = flat["outputs"]["B_tesla"]
+        nominal = MU_0 * 10.0 / (2 * math.pi * 0.01)
+        assert B["min"] >= nominal * 0.94 and B["max"] <= nominal * 1.06
+
+    def test_merge_moments(self):
+        """Test that merged chunk moments equal those of the whole sample."""
+        data = np.random.default_rng(4).normal(size=(1000, 3)) * [1, 10, 1e-3] + [0, 5, 1e3]
+        moments = (0, None, None)
+        for part in np.array_split(data, 7):
+            centered = part - part.mean(axis=0)
+            moments = _merge_moments(moments, (len(part), part.mean(axis=0), centered.T @ centered))
+        centered = data - data.mean(axis=0)
+        assert moments[0] == 1000
+        assert np.allclose(moments[1], data.mean(axis=0), rtol=1e-12)
+        assert np.allclose(moments[2], centered.T @ centered, rtol=1e-10)
+
+
+class TestSensitivityAndYield:
+    """Tests for sensitivity rankings, invalid samples, and yield."""
+
+    def test_ranking(self):
+        """Test that the widest relative spread ranks first and shares sum to one."""
+        result = tolerance_analysis("reluctance", {
+            "length_m": {"nominal": 0.1, "tolerance": 0.01},
+            "area_m2": {"nominal": 1e-4, "tolerance": 0.03},
+            "relative_permeability": {"nominal": 2000, "tolerance": 0.3},
+        }, seed=5)
+        ranking = result["sensitivity"]["reluctance_H_inv"]
+        assert [entry["input"] for entry in ranking] == ["relative_permeability", "area_m2", "length_m"]
+        assert ranking[0]["correlation"] < 0 and ranking[2]["correlation"] > 0
+        assert sum(entry["variance_share"] for entry in ranking) == pytest.approx(1.0)
+
+    def test_invalid_samples(self):
+        """Test that samples failing the tool's checks are counted and excluded."""
+        result = tolerance_analysis("solenoid_field", {
+            "turns": 100, "length_m": {"distribution": "normal", "mean": 0.01, "std": 0.01}, "current_A": 1.0,
+        }, samples=100_000, seed=6)
+        invalid = result["invalid"]["Length must be positive"]
+        assert invalid == pytest.approx(100_000 * 0.1587, rel=0.05)
+        assert result["valid_samples"] + invalid == 100_000
+
+    def test_yield(self):
+        """Test the yield of a uniform input against an analytic fraction."""
+        result = tolerance_analysis("magnetic_flux", {
+            "B_tesla": {"distribution": "uniform", "low": 0.9, "high": 1.1}, "area_m2": 1.0,
+        }, samples=200_000, limits={"flux_Wb": {"min": 0.95, "max": 1.05}}, seed=7)
+        assert result["yield"]["fraction"] == pytest.approx(0.5, abs=4 * result["yield"]["standard_error"])
+        assert result["yield"]["failing_by_output"]["flux_Wb"] == 200_000 - result["yield"]["passing"]
+
+
+class TestToleranceTool:
+    """Tests for reproducibility, validation, dispatch, and speed."""
+
+    def test_reproducible_with_workers(self):
+        """Test that a seed gives identical results in one process and in a pool."""
+        inputs = {"B_tesla": {"distribution": "triangular", "low": 0.5, "mode": 1.0, "high": 1.2},
+                  "volume_m3": {"distribution": "lognormal", "median": 1e-4, "sigma": 0.1}}
+        samples = 3 * CHUNK_SIZE + 17
+        single = tolerance_analysis("energy_stored", inputs, samples=samples, seed=8)
+        pooled = tolerance_analysis("energy_stored", inputs, samples=samples, seed=8, workers=2)
+        assert single["chunks"] == 4
+        assert single == pooled
+
+    def test_invalid_inputs(self):
+        """Test validation messages."""
+        assert "does not support" in tolerance_analysis("solenoid_field_map", {})["error"]
+        assert "Unknown parameter" in tolerance_analysis("reluctance", {"radius_m": 1})["error"]
+        assert "Missing parameter" in tolerance_analysis("reluctance", {"length_m": 1})["error"]
+        assert "Unknown distribution" in tolerance_analysis(
+            "mmf_required", {"H_field": {"distribution": "cauchy"}, "path_length_m": 1})["error"]
+        assert "needs low, high" in tolerance_analysis(
+            "mmf_required", {"H_field": {"distribution": "uniform", "low": 1}, "path_length_m": 1})["error"]
+        assert "distribution" in tolerance_analysis("mmf_required", {"H_field": 1, "path_length_m": 1})["error"]
+        assert "samples" in tolerance_analysis(
+            "mmf_required", {"H_field": {"nominal": 1, "tolerance": 0.1}, "path_length_m": 1}, samples=10)["error"]
+        assert "Unknown output" in tolerance_analysis(
+            "mmf_required", {"H_field": {"nominal": 1, "tolerance": 0.1}, "path_length_m": 1},
+            limits={"B_tesla": [0, 1]})["error"]
+
+    def test_dispatch(self):
+        """Test the MCP dispatcher and JSON encoding of the result."""
+        result = run_tool("tolerance_analysis", {
+            "tool": "reluctance",
+            "inputs": {"length_m": 0.1, "area_m2": 1e-4, "relative_permeability": {"nominal": 2000, "tolerance": 0.2}},
+            "samples": 1000, "seed": 9, "limits": {"reluctance_H_inv": [None, 4.2e5]},
+        })
+        assert result["seed"] == 9 and "yield" in result
+        json.dumps(result, allow_nan=False)
+
+    def test_million_samples_speed(self):
+        """Test that a million samples are summarized quickly."""
+        start = time.perf_counter()
+        result = tolerance_analysis("reluctance", {
+            "length_m": {"nominal": 0.1, "tolerance": 0.02},
+            "area_m2": {"distribution": "uniform", "low": 0.95e-4, "high": 1.05e-4},
+            "relative_permeability": {"distribution": "normal", "mean": 2000, "std": 200},
+        }, samples=1_000_000, seed=10)
+        assert result["valid_samples"] == 1_000_000
+        assert time.perf_counter() - start < 3.0
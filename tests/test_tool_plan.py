@@ -0,0 +1,170 @@
+"""Tests for the run_plan DAG executor."""
+
+import json
+import threading
+import time
+
+from agent import tool_plan
+from mcp_server.tools import circuits, converters, fields, materials
+
+TOOLS = {
+    "solenoid_field": fields.solenoid_field,
+    "magnetic_flux": fields.magnetic_flux,
+    "reluctance": circuits.reluctance,
+    "unit_convert": converters.convert_unit,
+    "material_lookup": lambda material: materials.lookup_material(material),
+}
+
+
+def call_tool(name, args):
+    """Run a tool function directly."""
+    return TOOLS[name](**args)
+
+
+class TestPlanValidation:
+    """Tests for plan validation."""
+
+    def test_cycle_rejected(self):
+        """Test that a dependency cycle is rejected."""
+        steps = [
+            {"id": "a", "tool": "unit_convert", "args": {"value": "$b.converted_value", "from_unit": "T", "to_unit": "Gauss"}},
+            {"id": "b", "tool": "unit_convert", "args": {"value": "$a.converted_value", "from_unit": "T", "to_unit": "Gauss"}},
+        ]
+        assert "cycle" in tool_plan.execute_plan(steps, call_tool)["error"]
+
+    def test_unknown_reference(self):
+        """Test that references to missing steps are rejected."""
+        steps = [{"id": "a", "tool": "unit_convert", "args": {"value": "$nope.x", "from_unit": "T", "to_unit": "Gauss"}}]
+        assert "unknown step" in tool_plan.execute_plan(steps, call_tool)["error"]
+
+    def test_nested_run_plan_rejected(self):
+        """Test that plans cannot recurse."""
+        steps = [{"id": "a", "tool": "run_plan", "args": {"steps": []}}]
+        assert "error" in tool_plan.execute_plan(steps, call_tool)
+
+    def test_empty_plan(self):
+        """Test that an empty plan is rejected."""
+        assert "error" in tool_plan.execute_plan([], call_tool)
+
+
+class TestPlanExecution:
+    """Tests for executing chained tool calls."""
+
+    def test_chain(self):
+        """Test material_lookup → reluctance with a field reference."""
+        steps = [
+            {"id": "mat", "tool": "material_lookup", "args": {"material": "iron"}},
+            {"id": "rel", "tool": "reluctance", "args": {
+                "length_m": 0.1, "area_m2": 0.0002, "relative_permeability": "$mat.relative_permeability"}},
+        ]
+        result = tool_plan.execute_plan(steps, call_tool)
+        assert result["order"] == ["mat", "rel"]
+        expected = circuits.reluctance(0.1, 0.0002, 5000.0)["reluctance_H_inv"]
+        assert result["results"]["rel"]["reluctance_H_inv"] == expected
+
+    def test_diamond(self):
+        """Test a DAG whose branches both feed from one step."""
+        steps = [
+            {"id": "b", "tool": "solenoid_field", "args": {"turns": 500, "length_m": 0.2, "current_A": 2}},
+            {"id": "gauss", "tool": "unit_convert", "args": {"value": "$b.B_tesla", "from_unit": "T", "to_unit": "Gauss"}},
+            {"id": "flux", "tool": "magnetic_flux", "args": {"B_tesla": "$b.B_tesla", "area_m2": 0.001}},
+            {"id": "mx", "tool": "unit_convert", "args": {"value": "$flux.flux_Wb", "from_unit": "Wb", "to_unit": "Maxwell"}},
+        ]
+        result = tool_plan.execute_plan(steps, call_tool)
+        assert result["steps_run"] == 4
+        assert result["errors"] == {}
+        assert abs(result["results"]["gauss"]["converted_value"] - 62.83185307) < 1e-6
+
+    def test_independent_steps_run_in_parallel(self):
+        """Test that independent steps overlap in time."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_tool(name, args):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+            return {"ok": True}
+
+        steps = [{"id": f"s{i}", "tool": "any", "args": {}} for i in range(4)]
+        result = tool_plan.execute_plan(steps, slow_tool)
+        assert result["steps_run"] == 4
+        assert max(peak) > 1
+
+    def test_failed_step_skips_dependents(self):
+        """Test that dependents of a failing step are skipped."""
+        steps = [
+            {"id": "mat", "tool": "material_lookup", "args": {"material": "unobtainium"}},
+            {"id": "rel", "tool": "reluctance", "args": {
+                "length_m": 0.1, "area_m2": 0.0002, "relative_permeability": "$mat.relative_permeability"}},
+            {"id": "ok", "tool": "unit_convert", "args": {"value": 1, "from_unit": "T", "to_unit": "Gauss"}},
+        ]
+        result = tool_plan.execute_plan(steps, call_tool)
+        assert "not found" in result["errors"]["mat"]
+        assert result["errors"]["rel"].startswith("Skipped")
+        assert result["results"]["ok"]["converted_value"] == 10000
+
+    def test_skip_cascade_in_reverse_id_order(self):
+        """Test that a failure skips a whole chain whose ids sort against the dependency order."""
+        steps = [
+            {"id": "a", "tool": "unit_convert", "args": {"value": "$b.converted_value", "from_unit": "T",
+                                                        "to_unit": "Gauss"}},
+            {"id": "b", "tool": "unit_convert", "args": {"value": "$c.converted_value", "from_unit": "T",
+                                                        "to_unit": "Gauss"}},
+            {"id": "c", "tool": "unit_convert", "args": {"value": "$x.relative_permeability", "from_unit": "T",
+                                                        "to_unit": "Gauss"}},
+            {"id": "x", "tool": "material_lookup", "args": {"material": "unobtainium"}},
+        ]
+        result = tool_plan.execute_plan(steps, call_tool)
+        assert "not found" in result["errors"]["x"]
+        assert all(result["errors"][step_id].startswith("Skipped") for step_id in ("a", "b", "c"))
+        assert set(result["results"]) | set(result["errors"]) == {"a", "b", "c", "x"}
+
+    def test_missing_field(self):
+        """Test that a reference to a missing result field is an error."""
+        steps = [
+            {"id": "b", "tool": "solenoid_field", "args": {"turns": 500, "length_m": 0.2, "current_A": 2}},
+            {"id": "c", "tool": "unit_convert", "args": {"value": "$b.nope", "from_unit": "T", "to_unit": "Gauss"}},
+        ]
+        result = tool_plan.execute_plan(steps, call_tool)
+        assert "no field 'nope'" in result["errors"]["c"]
+
+    def test_cancel_stops_plan(self):
+        """Test that a set cancel event starts no further steps and returns without waiting."""
+        cancel = threading.Event()
+        started = []
+
+        def slow_tool(name, args):
+            started.append(name)
+            cancel.set()
+            time.sleep(0.5)
+            return {"value": 1}
+
+        steps = [
+            {"id": "a", "tool": "first", "args": {}},
+            {"id": "b", "tool": "second", "args": {"x": "$a.value"}},
+        ]
+        begin = time.monotonic()
+        result = tool_plan.execute_plan(steps, slow_tool, cancel_event=cancel)
+        assert time.monotonic() - begin < 0.4
+        assert started == ["first"]
+        assert result["errors"] == {"a": "Cancelled: deadline reached", "b": "Cancelled: deadline reached"}
+
+
+class TestAgentRunPlan:
+    """Tests for run_plan as an agent tool."""
+
+    def test_run_plan_tool(self, scripted_agent):
+        """Test that run_plan is parsed from skill.md and dispatched."""
+        agent = scripted_agent([])
+        assert "run_plan" in [tool["name"] for tool in agent.tools]
+        result = json.loads(agent.call_tool("run_plan", {"steps": [
+            {"id": "mat", "tool": "material_lookup", "args": {"material": "mu_metal"}},
+            {"id": "rel", "tool": "reluctance", "args": {
+                "length_m": 0.1, "area_m2": 0.0002, "relative_permeability": "$mat.relative_permeability"}},
+        ]}))
+        assert result["steps_run"] == 2
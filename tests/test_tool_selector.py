@@ -0,0 +1,121 @@
+"""Tests for per-request tool subset selection."""
+
+import os
+
+import pytest
+from agent.agent import SkillAgent
+from agent.tool_selector import ToolSelector, estimate_tokens, parse_use_case_table
+from tests.helpers import bag_of_words_embed, text_response, tool_use_response
+
+SKILL_MD = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "skills",
+    "maxwell_magnetics",
+    "skill.md",
+)
+
+
+@pytest.fixture(scope="module")
+def skill():
+    """Tools and raw text of the magnetics skill."""
+    agent = SkillAgent.__new__(SkillAgent)
+    agent.skill_name = "maxwell_magnetics"
+    with open(SKILL_MD) as f:
+        agent.skill_md = f.read()
+    return agent._parse_tools_from_skill_md(), agent.skill_md
+
+
+class TestUseCaseTable:
+    """Tests for Use Case Decision Table parsing."""
+
+    def test_every_tool_documented(self, skill):
+        """Test that each parsed tool has a use-case row."""
+        tools, skill_md = skill
+        documents = parse_use_case_table(skill_md)
+        assert {tool["name"] for tool in tools} <= set(documents)
+        assert "infinite straight wires" in documents["biot_savart_wire"]
+
+
+class TestToolSelector:
+    """Tests for tool selection and token accounting."""
+
+    def test_selects_relevant_tools(self, skill):
+        """Test that a wire question keeps the wire tool and drops most others."""
+        tools, skill_md = skill
+        selector = ToolSelector(tools, skill_md, bag_of_words_embed, top_k=2, min_similarity=0.1)
+        names = [tool["name"] for tool in selector.select("Field around a long straight wire")]
+        assert "biot_savart_wire" in names
+        assert len(names) < len(tools)
+
+    def test_used_tools_kept(self, skill):
+        """Test that tools already used in the conversation are always sent."""
+        tools, skill_md = skill
+        selector = ToolSelector(tools, skill_md, bag_of_words_embed, top_k=1, min_similarity=0.1)
+        names = [tool["name"] for tool in selector.select("Field around a long straight wire", {"unit_convert"})]
+        assert "unit_convert" in names
+
+    def test_low_similarity_falls_back(self, skill):
+        """Test that an unmatched question gets the full tool list."""
+        tools, skill_md = skill
+        selector = ToolSelector(tools, skill_md, bag_of_words_embed, min_similarity=0.99)
+        assert selector.select("Hello there") == tools
+        assert selector.get_stats()["full_list_fallbacks"] == 1
+
+    def test_embeddings_unavailable(self, skill):
+        """Test that selection is disabled without embeddings."""
+        tools, skill_md = skill
+        selector = ToolSelector(tools, skill_md, lambda texts: [])
+        assert not selector.available
+        assert selector.select("Field around a wire") == tools
+
+    def test_token_savings(self, skill):
+        """Test that savings are reported against the full tool payload."""
+        tools, skill_md = skill
+        selector = ToolSelector(tools, skill_md, bag_of_words_embed, top_k=1, min_similarity=0.1)
+        selected = selector.select("Field around a long straight wire")
+        stats = selector.get_stats()
+        assert stats["estimated_tokens_saved"] == estimate_tokens(tools) - estimate_tokens(selected)
+        assert stats["savings_rate"] > 0
+
+
+class TestAgentToolSelection:
+    """Tests for tool selection inside the agentic loop."""
+
+    def test_subset_sent_and_used_tools_added(self, scripted_agent):
+        """Test that each call gets the subset plus tools already used."""
+        agent = scripted_agent(
+            [
+                tool_use_response(("unit_convert", {"value": 1, "from_unit": "T", "to_unit": "Gauss"})),
+                text_response("done"),
+            ]
+        )
+        agent.tool_selector = ToolSelector(
+            agent.tools, agent.skill_md, bag_of_words_embed, top_k=1, min_similarity=0.1
+        )
+        agent.run_agentic_loop("Field around a long straight wire in Gauss")
+        first, second = agent.client.messages.calls
+        assert len(first["tools"]) < len(agent.tools)
+        assert "unit_convert" in [tool["name"] for tool in second["tools"]]
+
+    def test_question_embedded_once(self, scripted_agent):
+        """Test that the question is embedded once per request, not per model call."""
+        agent = scripted_agent(
+            [
+                tool_use_response(("unit_convert", {"value": 1, "from_unit": "T", "to_unit": "Gauss"})),
+                tool_use_response(("unit_convert", {"value": 2, "from_unit": "T", "to_unit": "Gauss"})),
+                text_response("done"),
+            ]
+        )
+        question = "Field around a long straight wire in Gauss"
+        embedded = []
+
+        def counting_embed(texts):
+            embedded.extend(texts)
+            return bag_of_words_embed(texts)
+
+        # The selector embeds with the knowledge base's model, as in the agent
+        agent.knowledge_base.embed = counting_embed
+        agent.tool_selector = ToolSelector(agent.tools, agent.skill_md, counting_embed, min_similarity=0.1)
+        agent.run_agentic_loop(question)
+        assert len(agent.client.messages.calls) == 3
+        assert embedded.count(question) == 1
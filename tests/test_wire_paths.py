@@ -0,0 +1,100 @@
+"""Tests for the finite-segment Biot–Savart engine."""
+
+import json
+import math
+
+import numpy as np
+import pytest
+from mcp_server.dispatch import run_tool
+from mcp_server.tools import fields, wire_paths
+from mcp_server.tools.fields import MU_0
+
+
+def square(side: float) -> list:
+    """Vertices of a square loop in the z = 0 plane, counter-clockwise."""
+    return [[0, 0, 0], [side, 0, 0], [side, side, 0], [0, side, 0]]
+
+
+class TestSegmentField:
+    """Tests for the vectorized segment field against closed-form limits."""
+
+    def test_infinite_wire_limit(self):
+        """Test that a very long segment matches biot_savart_wire."""
+        for distance in (0.001, 0.01, 0.1):
+            result = wire_paths.wire_path_field([[-1e4, 0, 0], [1e4, 0, 0]], [[0, distance, 0]], 10.0)
+            expected = fields.biot_savart_wire(10.0, distance)["B_tesla"]
+            assert result["B_magnitude_tesla"][0] == pytest.approx(expected, rel=1e-6)
+
+    def test_right_hand_rule(self):
+        """Test the field direction around a wire carrying current along +x."""
+        result = wire_paths.wire_path_field([[-10, 0, 0], [10, 0, 0]], [[0, 0.1, 0], [0, 0, 0.1]], 1.0)
+        above, beside = result["B_tesla"]
+        assert above[2] > 0 and abs(above[0]) < 1e-15 and abs(above[1]) < 1e-15
+        assert beside[1] < 0
+
+    def test_finite_segment(self):
+        """Test a finite segment against B = μ₀I/(4πd) · (sin θ₂ − sin θ₁)."""
+        d, half = 0.05, 0.2
+        result = wire_paths.wire_path_field([[-half, 0, 0], [half, 0, 0]], [[0, d, 0]], 3.0)
+        expected = MU_0 * 3.0 / (4 * math.pi * d) * 2 * half / math.hypot(half, d)
+        assert result["B_magnitude_tesla"][0] == pytest.approx(expected, rel=1e-12)
+
+    def test_square_loop_center(self):
+        """Test the center of a square loop against 2√2 μ₀I / (πa)."""
+        side = 0.1
+        result = wire_paths.wire_path_field(square(side), [[side / 2, side / 2, 0]], 1.0, closed=True)
+        assert result["B_tesla"][0][2] == pytest.approx(2 * math.sqrt(2) * MU_0 / (math.pi * side), rel=1e-12)
+
+    def test_many_segments_approach_circular_loop(self):
+        """Test that a fine polygon approaches the circular-loop center field μ₀I / (2R)."""
+        angles = np.linspace(0, 2 * math.pi, 721)[:-1]
+        path = np.column_stack([np.cos(angles), np.sin(angles), np.zeros_like(angles)]).tolist()
+        result = wire_paths.wire_path_field(path, [[0, 0, 0]], 1.0, closed=True)
+        assert result["B_tesla"][0][2] == pytest.approx(MU_0 / 2, rel=1e-4)
+
+    def test_chunking_does_not_change_result(self):
+        """Test that small blocks give the same sum as one block."""
+        rng = np.random.default_rng(0)
+        vertices = rng.normal(size=(41, 3))
+        points = rng.normal(size=(300, 3)) + 5
+        full, _ = wire_paths.segment_field(vertices[:-1], vertices[1:], points, 2.0)
+        for chunk_pairs in (1, 7, 40, 1000):
+            chunked, _ = wire_paths.segment_field(vertices[:-1], vertices[1:], points, 2.0, chunk_pairs=chunk_pairs)
+            np.testing.assert_allclose(chunked, full, rtol=1e-9)
+
+
+class TestWirePathTool:
+    """Tests for the wire_path_field tool interface."""
+
+    def test_point_on_wire(self):
+        """Test that points on the filament are reported instead of returning inf."""
+        result = wire_paths.wire_path_field([[0, 0, 0], [1, 0, 0]], [[0.5, 0, 0], [0, 0, 0], [0.5, 1, 0]], 1.0)
+        assert result["singular_points"] == [0, 1]
+        assert result["B_tesla"][0] is None
+        assert result["B_magnitude_tesla"][2] > 0
+        json.dumps(result, allow_nan=False)
+
+    def test_collinear_point_outside_segment(self):
+        """Test that a point on the segment's line but past its end sees zero field."""
+        result = wire_paths.wire_path_field([[0, 0, 0], [1, 0, 0]], [[2, 0, 0]], 1.0)
+        assert result["singular_points"] == []
+        assert result["B_magnitude_tesla"][0] == 0.0
+
+    def test_peak_location(self):
+        """Test that the strongest field is reported with its point."""
+        result = wire_paths.wire_path_field([[-1, 0, 0], [1, 0, 0]], [[0, 0.5, 0], [0, 0.01, 0]], 1.0)
+        assert result["max_B_point"] == [0, 0.01, 0]
+
+    def test_invalid_inputs(self):
+        """Test validation messages."""
+        assert "error" in wire_paths.wire_path_field([[0, 0, 0]], [[1, 1, 1]], 1.0)
+        assert "error" in wire_paths.wire_path_field([[0, 0], [1, 1]], [[1, 1, 1]], 1.0)
+        assert "error" in wire_paths.wire_path_field([[0, 0, 0], [0, 0, 0]], [[1, 1, 1]], 1.0)
+        too_many = [[0, 0, 1]] * (wire_paths.MAX_POINTS + 1)
+        assert "limit" in wire_paths.wire_path_field([[0, 0, 0], [1, 0, 0]], too_many, 1.0)["error"]
+
+    def test_dispatch(self):
+        """Test that the MCP dispatcher routes wire_path_field."""
+        result = run_tool("wire_path_field", {"path": square(0.1), "points": [[0.05, 0.05, 0]], "current_A": 1.0, "closed": True})
+        assert result["segments"] == 4
+        assert result["path_length_m"] == pytest.approx(0.4)